@@ -207,13 +207,16 @@ def get_or_create_session(session_id: Optional[str], meeting_id: Optional[str])
 
 @router.get('/status')
 def get_ai_status():
-    """Check if AI is available"""
+    """Check if AI is available (cached health state, no live ping)"""
     from app.core.config import get_settings
+    from app.llm.clients.llm_health import llm_health
     settings = get_settings()
+    available = is_gemini_available()
     
     return {
-        'groq_available': is_gemini_available(),
-        'status': 'ready' if is_gemini_available() else 'mock_mode',
+        'groq_available': available,
+        'status': 'ready' if available else 'mock_mode',
+        'health': llm_health.snapshot(),
         'model': getattr(settings, 'groq_model', None),
         'api_key_set': bool(getattr(settings, 'groq_api_key', '') and len(getattr(settings, 'groq_api_key', '')) > 10),
         'api_key_preview': (getattr(settings, 'groq_api_key', '')[:8] + '...') if getattr(settings, 'groq_api_key', '') else None
@@ -224,7 +227,7 @@ def get_ai_status():
 async def test_groq():
     """Test Groq API directly"""
     from app.core.config import get_settings
-    from groq import Groq
+    from app.llm.clients.groq_client import achat_completion
     
     settings = get_settings()
     
@@ -232,15 +235,13 @@ async def test_groq():
         return {'error': 'No API key configured', 'key': None}
     
     try:
-        client = Groq(api_key=settings.groq_api_key)
-        resp = client.chat.completions.create(
-            messages=[{"role": "user", "content": "Say hello in Vietnamese"}],
-            model=settings.groq_model,
-            max_tokens=30
+        response = await achat_completion(
+            [{"role": "user", "content": "Say hello in Vietnamese"}],
+            max_tokens=30,
         )
         return {
             'success': True,
-            'response': resp.choices[0].message.content,
+            'response': response,
             'model': settings.groq_model
         }
     except Exception as e:
@@ -27,15 +27,7 @@ async def ingest_diarization(session_id: str, payload: Dict[str, Any]):
             end = float(seg["end"])
         except (KeyError, TypeError, ValueError):
             continue
-        confidence = seg.get("confidence", 1.0)
-        stream_state.speaker_segments.append(
-            {
-                "speaker": speaker,
-                "start": start,
-                "end": end,
-                "confidence": float(confidence if confidence is not None else 1.0),
-            }
-        )
+        stream_state.speaker_segments.add(speaker, start, end, seg.get("confidence", 1.0))
 
     logger.info("diarization_ingested session_id=%s segments=%s", session_id, len(stream_state.speaker_segments))
     return {"status": "ok"}
@@ -47,5 +39,5 @@ async def get_diarization(session_id: str):
     if not session:
         return {"status": "error", "reason": "session_not_found"}
     stream_state = session.stream_state
-    segments = sorted(stream_state.speaker_segments, key=lambda s: s.get("start", 0.0))
-    return {"status": "ok", "segments": segments}
+    # Timeline is kept ordered by start, no sort needed.
+    return {"status": "ok", "segments": stream_state.speaker_segments.to_list()}
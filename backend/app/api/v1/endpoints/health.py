@@ -1,8 +1,21 @@
 from fastapi import APIRouter
 
+from app.services.audio_ingest_buffer import ingest_stats
+from app.services.audio_vad import voice_gate_metrics
+from app.services.smartvoice_channel import smartvoice_channels
+
 router = APIRouter()
 
 
 @router.get('/')
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@router.get('/audio')
+def audio_health():
+    return {
+        "vad": voice_gate_metrics.stats(),
+        "ingest": ingest_stats(),
+        "smartvoice": smartvoice_channels.stats(),
+    }
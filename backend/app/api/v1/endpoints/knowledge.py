@@ -3,6 +3,7 @@ Knowledge Hub API endpoints
 """
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 
@@ -17,8 +18,13 @@ from app.schemas.knowledge import (
     KnowledgeSearchResponse,
     KnowledgeQueryRequest,
     KnowledgeQueryResponse,
+    KnowledgeIngestJob,
+    KnowledgeReindexRequest,
+    KnowledgeReindexStatus,
 )
 from app.services import knowledge_service
+from app.services.knowledge_cache import cache_stats
+from app.services.knowledge_rerank import chunk_reranker
 
 router = APIRouter(tags=["knowledge"])
 
@@ -72,9 +78,9 @@ async def upload_document(
 ):
     """
     Upload a new knowledge document.
-    
-    In production, this would handle actual file upload and storage.
-    Currently just stores metadata (mock implementation).
+
+    Returns as soon as the file is staged; extraction and indexing run in the
+    background. Track them with the returned job_id.
     """
     # Parse tags
     tag_list = []
@@ -103,6 +109,46 @@ async def upload_document(
     return await knowledge_service.upload_document(db, data, file)
 
 
+@router.get("/jobs/{job_id}", response_model=KnowledgeIngestJob)
+async def get_ingest_job(job_id: UUID):
+    """Progress of a document ingestion job"""
+    job = await knowledge_service.get_ingest_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_ingest_job(job_id: UUID):
+    """Server-sent events with the job state on every change, until it is done or failed"""
+    if not await knowledge_service.get_ingest_job(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+
+    async def events():
+        async for job in knowledge_service.stream_ingest_job(job_id):
+            yield f"event: progress\ndata: {job.model_dump_json()}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.post("/jobs/{job_id}/retry", response_model=KnowledgeIngestJob)
+async def retry_ingest_job(job_id: UUID):
+    """Re-queue a failed ingestion job; it resumes from its last completed stage"""
+    job = await knowledge_service.retry_ingest_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
+
+
 @router.put("/documents/{document_id}", response_model=KnowledgeDocument)
 async def update_document(
     document_id: UUID,
@@ -119,6 +165,28 @@ async def update_document(
     return doc
 
 
+@router.put("/documents/{document_id}/file", response_model=KnowledgeDocumentUploadResponse)
+async def replace_document_file(
+    document_id: UUID,
+    file: UploadFile = File(...),
+    file_type: Optional[str] = Form(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Upload a new revision of a document's file.
+
+    Only changed chunks are re-embedded; searches keep using the previous
+    revision until the new index is published. Track it with the returned job_id.
+    """
+    result = await knowledge_service.replace_document_file(db, document_id, file, file_type)
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+    return result
+
+
 @router.delete("/documents/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
     document_id: UUID,
@@ -156,13 +224,19 @@ async def query_knowledge(
     return await knowledge_service.query_knowledge_ai(db, request)
 
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters for the query-embedding, semantic answer and rerank score caches (this process)."""
+    return {**cache_stats(), "rerank": chunk_reranker.stats()}
+
+
 @router.post("/ingest/{document_id}")
 async def ingest_document(
     document_id: UUID,
     db: Session = Depends(get_db),
 ):
     """
-    Trigger ingestion + embedding for a document (stub implementation).
+    Queue an incremental re-index of a document (only changed chunks are embedded).
     """
     result = await knowledge_service.ingest_document(db, document_id)
     if not result:
@@ -170,7 +244,29 @@ async def ingest_document(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found",
         )
-    return {"status": result["status"]}
+    return {"status": result["status"], "job_id": result["job_id"]}
+
+
+@router.get("/reindex", response_model=KnowledgeReindexStatus)
+async def get_reindex_status():
+    """Progress of the bulk re-index"""
+    return knowledge_service.reindex_status()
+
+
+@router.post("/reindex", response_model=KnowledgeReindexStatus, status_code=status.HTTP_202_ACCEPTED)
+async def start_reindex(request: KnowledgeReindexRequest):
+    """
+    Re-index all documents embedded by another model (e.g. after changing the
+    embedding provider), or every document with force. Runs in the background,
+    throttled; each document switches to its new chunks atomically.
+    """
+    return knowledge_service.start_reindex(force=request.force)
+
+
+@router.delete("/reindex", response_model=KnowledgeReindexStatus)
+async def stop_reindex():
+    """Stop queueing documents for the bulk re-index (queued jobs still finish)"""
+    return await knowledge_service.stop_reindex()
 
 
 @router.get("/recent-queries")
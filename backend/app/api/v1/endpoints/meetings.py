@@ -224,18 +224,22 @@ def update_meeting_phase(
         session = session_store.get(meeting_id)
         if session and session.stream_state and session.stream_state.final_stream:
             try:
-                # Check if transcript already exists in database
+                # Chunks beyond the live horizon were already spilled to the DB
+                # as 1..spilled; only the in-memory remainder is saved here.
+                final_stream = session.stream_state.final_stream
+                spilled = final_stream.spilled
                 existing_chunks = transcript_service.list_transcript_chunks(
                     db=db,
                     meeting_id=meeting_id,
+                    from_index=spilled + 1 if spilled else None,
                     limit=1
                 )
                 
-                # Only save if no transcript exists yet (avoid duplicates)
+                # Only save if the remainder is not in the database yet (avoid duplicates)
                 if existing_chunks.total == 0:
                     # Convert FinalTranscriptChunk to TranscriptChunkCreate
                     chunks_to_save = []
-                    for idx, chunk in enumerate(session.stream_state.final_stream, start=1):
+                    for idx, chunk in enumerate(final_stream.unspilled(), start=spilled + 1):
                         chunks_to_save.append(TranscriptChunkCreate(
                             chunk_index=idx,
                             start_time=chunk.time_start,
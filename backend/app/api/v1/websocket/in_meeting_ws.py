@@ -3,26 +3,40 @@ import inspect
 import json
 import logging
 import time
-from typing import Any, Dict, List, Optional
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from app.core.config import get_settings
 from app.core.realtime_security import verify_audio_ingest_token
 from app.llm.chains.in_meeting_chain import summarize_and_classify
 from app.schemas.realtime import AudioStartMessage
+from app.schemas.transcript import TranscriptChunkCreate
+from app.services.audio_ingest_buffer import AudioIngestBuffer, active_ingest_buffers, build_ingest_buffer
+from app.services.audio_vad import AudioFrame, VoiceActivityGate, build_voice_gate, voice_gate_metrics
+from app.services.in_meeting_writer import persistence_writer
 from app.services.realtime_bus import session_bus
 from app.services.realtime_ingest import ingestTranscript
 from app.services.realtime_session_store import FinalTranscriptChunk, session_store
+from app.services.realtime_tick_pool import recap_tick_pool
+from app.services.speaker_alignment import best_overlap
 from app.services.smartvoice_streaming import SmartVoiceStreamingConfig, is_smartvoice_configured, stream_recognize
 
 router = APIRouter()
 stream_workers: Dict[str, asyncio.Task] = {}
+_stream_ready: Dict[str, asyncio.Event] = {}
 logger = logging.getLogger(__name__)
 
 RECAP_WINDOW_SEC = 60.0
 ROLLING_RETENTION_SEC = 120.0
 RECAP_TICK_SEC = 30.0
 RECAP_WINDOW_MIN = 30.0
+FINAL_SPILL_BATCH = 200
+THROTTLE_EVENT_INTERVAL_SEC = 1.0
+STREAM_IDLE_SEC = 900.0
+CONSUMER_LEASE_SEC = 30.0
 
 
 class _AudioClock:
@@ -61,19 +75,7 @@ def _coerce_float(value: Any, default: float) -> float:
 
 
 def _match_speaker_by_time(segments, t_start: float, t_end: float):
-    best = None
-    best_overlap = 0.0
-
-    for seg in segments:
-        overlap = min(t_end, seg["end"]) - max(t_start, seg["start"])
-        if overlap > best_overlap:
-            best_overlap = overlap
-            best = seg
-
-    if best_overlap <= 0:
-        return None
-
-    return best
+    return best_overlap(segments, t_start, t_end)
 
 def _compute_tick_anchor(stream_state) -> float:
     anchor = stream_state.max_seen_time_end or 0.0
@@ -108,6 +110,41 @@ def _append_final_chunk(stream_state, chunk: FinalTranscriptChunk, now: float) -
     _prune_stream_state(stream_state)
 
 
+def _is_meeting_id(session_id: str) -> bool:
+    try:
+        uuid.UUID(str(session_id))
+    except ValueError:
+        return False
+    return True
+
+
+def _schedule_final_spill(session_id: str, stream_state) -> None:
+    """Hand chunks beyond the in-memory horizon to the DB, numbered like the end-of-meeting save."""
+    if not _is_meeting_id(session_id):
+        # Nothing to persist into; the log keeps dropping its oldest overflow.
+        return
+    first_index = stream_state.final_stream.spilled + 1
+    chunks = stream_state.final_stream.take_spill()
+    if not chunks:
+        return
+    persistence_writer.enqueue_transcripts(
+        session_id,
+        [
+            TranscriptChunkCreate(
+                chunk_index=first_index + offset,
+                start_time=chunk.time_start,
+                end_time=chunk.time_end,
+                speaker=chunk.speaker,
+                text=chunk.text,
+                confidence=chunk.confidence,
+                language=chunk.lang,
+                meeting_id=session_id,
+            )
+            for offset, chunk in enumerate(chunks)
+        ],
+    )
+
+
 def _update_last_transcript(stream_state, chunk: FinalTranscriptChunk, seq: int, is_final: bool, now: float) -> None:
     stream_state.last_transcript_seq = max(stream_state.last_transcript_seq, seq)
     stream_state.last_transcript_chunk = chunk
@@ -149,7 +186,24 @@ def _should_recap_tick(stream_state, now: float) -> bool:
     return (anchor - stream_state.last_recap_tick_anchor) >= RECAP_TICK_SEC
 
 
-def _run_recap_tick(session_id: str, stream_state, now: float) -> Optional[Dict[str, Any]]:
+@dataclass
+class _RecapJob:
+    """Snapshot of the window taken on the event loop; the LLM runs on it off-loop."""
+
+    cursor_before: int
+    cursor_target: int
+    anchor: float
+    include_partial: bool
+    window_text: str
+    window_chunks: int
+    window_start: float
+    window_end: float
+    window_duration: float
+    meta: Dict[str, Any] = field(default_factory=dict)
+    llm_latency_ms: int = 0
+
+
+def _prepare_recap_tick(session_id: str, stream_state, now: float) -> Optional[_RecapJob]:
     cursor_before = stream_state.recap_cursor_seq
     anchor = _compute_tick_anchor(stream_state)
     include_partial = stream_state.last_partial_chunk is not None and stream_state.last_partial_seq >= stream_state.last_final_seq
@@ -174,17 +228,52 @@ def _run_recap_tick(session_id: str, stream_state, now: float) -> Optional[Dict[
         )
         return None
 
-    meta = {
-        "current_topic_id": stream_state.current_topic_id,
-        "current_topic": stream_state.last_topic_payload,
-        "window_start": window_start,
-        "window_end": window_end,
-    }
+    return _RecapJob(
+        cursor_before=cursor_before,
+        cursor_target=stream_state.last_transcript_seq,
+        anchor=anchor,
+        include_partial=include_partial,
+        window_text=window_text,
+        window_chunks=len(window_chunks),
+        window_start=window_start,
+        window_end=window_end,
+        window_duration=window_duration,
+        meta={
+            "current_topic_id": stream_state.current_topic_id,
+            "current_topic": dict(stream_state.last_topic_payload or {}),
+            "window_start": window_start,
+            "window_end": window_end,
+        },
+    )
+
+
+def _call_recap_llm(job: _RecapJob) -> Dict[str, Any]:
+    """Blocking LLM call; runs on the recap worker pool, touches only the job snapshot."""
     llm_start = time.time()
-    result = summarize_and_classify(window_text, meta=meta)
-    llm_latency_ms = int((time.time() - llm_start) * 1000)
-    parse_ok = bool(meta.get("parse_ok"))
+    result = summarize_and_classify(job.window_text, meta=job.meta)
+    job.llm_latency_ms = int((time.time() - llm_start) * 1000)
+    return result
 
+
+def _apply_recap_result(
+    session_id: str,
+    stream_state,
+    job: _RecapJob,
+    result: Dict[str, Any],
+    now: float,
+) -> Optional[Dict[str, Any]]:
+    """Merge a finished tick into the stream state by recap cursor (stale results are dropped)."""
+    if stream_state.recap_cursor_seq > job.cursor_before:
+        # A newer tick (or a skip) already advanced the cursor past this job's snapshot.
+        logger.info(
+            "recap_tick_stale session_id=%s job_cursor=%s state_cursor=%s",
+            session_id,
+            job.cursor_target,
+            stream_state.recap_cursor_seq,
+        )
+        return None
+
+    parse_ok = bool(job.meta.get("parse_ok"))
     recap = result.get("recap") or ""
     topic_payload = result.get("topic") or {}
     intent_payload = result.get("intent") or {}
@@ -193,18 +282,21 @@ def _run_recap_tick(session_id: str, stream_state, now: float) -> Optional[Dict[
     if not topic_id:
         topic_id = stream_state.current_topic_id or "T0"
     topic_title = topic_payload.get("title") if isinstance(topic_payload.get("title"), str) else "General"
-    topic_start = _coerce_float(topic_payload.get("start_t"), window_start)
-    topic_end = _coerce_float(topic_payload.get("end_t"), window_end)
+    topic_start = _coerce_float(topic_payload.get("start_t"), job.window_start)
+    topic_end = _coerce_float(topic_payload.get("end_t"), job.window_end)
     if topic_end < topic_start:
         topic_end = topic_start
 
     if topic_payload.get("new_topic") or not stream_state.topic_segments:
-        stream_state.topic_segments.append({
+        segment = {
             "topic_id": topic_id,
             "title": topic_title,
             "start_t": topic_start,
             "end_t": topic_end,
-        })
+        }
+        stream_state.topic_segments.append(segment)
+        if _is_meeting_id(session_id):
+            persistence_writer.enqueue_topic_segment(session_id, segment)
     stream_state.current_topic_id = topic_id
     stream_state.last_topic_payload = topic_payload
     stream_state.last_intent_payload = intent_payload
@@ -213,24 +305,24 @@ def _run_recap_tick(session_id: str, stream_state, now: float) -> Optional[Dict[
     stream_state.last_live_recap = recap
     stream_state.last_recap = recap
 
-    stream_state.recap_cursor_seq = stream_state.last_transcript_seq
+    stream_state.recap_cursor_seq = max(stream_state.recap_cursor_seq, job.cursor_target)
     stream_state.last_recap_tick_at = now
-    stream_state.last_recap_tick_anchor = anchor
+    stream_state.last_recap_tick_anchor = max(stream_state.last_recap_tick_anchor, job.anchor)
     _prune_stream_state(stream_state)
 
     logger.info(
         "recap_tick session_id=%s cursor=%s->%s window=%.2f-%.2f duration=%.2fs anchor=%.2f chunks=%s llm_ms=%s parse_ok=%s include_partial=%s",
         session_id,
-        cursor_before,
+        job.cursor_before,
         stream_state.recap_cursor_seq,
-        window_start,
-        window_end,
-        window_duration,
-        anchor,
-        len(window_chunks),
-        llm_latency_ms,
+        job.window_start,
+        job.window_end,
+        job.window_duration,
+        job.anchor,
+        job.window_chunks,
+        job.llm_latency_ms,
         parse_ok,
-        include_partial,
+        job.include_partial,
     )
 
     return {
@@ -242,7 +334,7 @@ def _run_recap_tick(session_id: str, stream_state, now: float) -> Optional[Dict[
         "recap": recap,
         "topic": topic_payload,
         "intent_payload": intent_payload,
-        "transcript_window": window_text,
+        "transcript_window": job.window_text,
         "semantic_intent_label": stream_state.semantic_intent_label,
         "semantic_intent_slots": stream_state.semantic_intent_slots,
         "topic_segments": stream_state.topic_segments,
@@ -254,17 +346,17 @@ def _run_recap_tick(session_id: str, stream_state, now: float) -> Optional[Dict[
         # Deprecated in realtime tick; kept for backward-compatible payload shape.
         "tool_suggestions": [],
         "debug_info": {
-            "recap_cursor_before": cursor_before,
+            "recap_cursor_before": job.cursor_before,
             "recap_cursor_seq": stream_state.recap_cursor_seq,
             "window_sec": RECAP_WINDOW_SEC,
-            "window_start": window_start,
-            "window_end": window_end,
-            "window_duration": window_duration,
-            "window_chunks": len(window_chunks),
-            "include_partial": include_partial,
-            "llm_latency_ms": llm_latency_ms,
+            "window_start": job.window_start,
+            "window_end": job.window_end,
+            "window_duration": job.window_duration,
+            "window_chunks": job.window_chunks,
+            "include_partial": job.include_partial,
+            "llm_latency_ms": job.llm_latency_ms,
             "parse_ok": parse_ok,
-            "raw_len": meta.get("raw_len"),
+            "raw_len": job.meta.get("raw_len"),
             "last_recap_tick_anchor": stream_state.last_recap_tick_anchor,
             "last_final_seq": stream_state.last_final_seq,
             "last_transcript_seq": stream_state.last_transcript_seq,
@@ -272,6 +364,31 @@ def _run_recap_tick(session_id: str, stream_state, now: float) -> Optional[Dict[
     }
 
 
+def _run_recap_tick(session_id: str, stream_state, now: float) -> Optional[Dict[str, Any]]:
+    """Synchronous prepare -> LLM -> apply (used by tests and tooling; the WS path uses the pool)."""
+    job = _prepare_recap_tick(session_id, stream_state, now)
+    if job is None:
+        return None
+    result = _call_recap_llm(job)
+    return _apply_recap_result(session_id, stream_state, job, result, now)
+
+
+def _schedule_recap_tick(session_id: str, stream_state, now: float) -> bool:
+    """Hand the tick to the recap worker pool; returns False if one is already in flight."""
+    if recap_tick_pool.is_busy(session_id):
+        return False
+    job = _prepare_recap_tick(session_id, stream_state, now)
+    if job is None:
+        return False
+
+    async def _on_done(result: Dict[str, Any]) -> None:
+        recap_state = _apply_recap_result(session_id, stream_state, job, result, time.time())
+        if recap_state:
+            await _publish_state_event(session_id, recap_state)
+
+    return recap_tick_pool.submit(session_id, _call_recap_llm, job, on_done=_on_done)
+
+
 async def _publish_state_event(session_id: str, state: Dict[str, Any]) -> None:
     version = session_store.next_state_version(session_id)
     await session_bus.publish(
@@ -290,7 +407,7 @@ async def _stream_consumer(session_id: str, queue: asyncio.Queue) -> None:
     try:
         while True:
             try:
-                event = await asyncio.wait_for(queue.get(), timeout=900)
+                event = await asyncio.wait_for(queue.get(), timeout=STREAM_IDLE_SEC)
             except asyncio.TimeoutError:
                 break
             if event.get("event") != "transcript_event":
@@ -306,7 +423,11 @@ async def _stream_consumer(session_id: str, queue: asyncio.Queue) -> None:
             confidence = payload.get("confidence")
             time_start = float(payload.get("time_start") or 0.0)
             time_end = float(payload.get("time_end") or 0.0)
-            speaker = payload.get("speaker") or "SPEAKER_01"
+            speaker = payload.get("speaker")
+            if not speaker and len(stream_state.speaker_segments):
+                match = _match_speaker_by_time(stream_state.speaker_segments, time_start, time_end)
+                speaker = match["speaker"] if match else None
+            speaker = speaker or "SPEAKER_01"
 
             chunk = FinalTranscriptChunk(
                 seq=seq,
@@ -321,29 +442,77 @@ async def _stream_consumer(session_id: str, queue: asyncio.Queue) -> None:
             _update_last_transcript(stream_state, chunk, seq, is_final, now)
             if is_final:
                 _append_final_chunk(stream_state, chunk, now)
+                if stream_state.final_stream.pending_spill() >= FINAL_SPILL_BATCH:
+                    _schedule_final_spill(session_id, stream_state)
 
-            recap_due = _should_recap_tick(stream_state, now)
-
-            if recap_due:
+            # Never wait on the LLM here: the tick runs on the recap pool and merges back by cursor,
+            # so transcript ingestion and fan-out keep flowing while it is in flight.
+            if _should_recap_tick(stream_state, now) and not recap_tick_pool.is_busy(session_id):
                 try:
-                    recap_state = _run_recap_tick(session_id, stream_state, now)
-                    if recap_state:
-                        await _publish_state_event(session_id, recap_state)
+                    _schedule_recap_tick(session_id, stream_state, now)
                 except Exception:
-                    pass
+                    logger.exception("recap tick scheduling failed (session_id=%s)", session_id)
     except asyncio.CancelledError:
         pass
     finally:
         session_bus.unsubscribe(session_id, queue)
-        stream_workers.pop(session_id, None)
+        if _is_meeting_id(session_id):
+            _schedule_final_spill(session_id, stream_state)
+            # Detached: the consumer may be finishing because it was cancelled.
+            asyncio.ensure_future(persistence_writer.close_session(session_id))
+
+
+async def _stream_worker(session_id: str) -> None:
+    """
+    Run the session's stream consumer in exactly one worker: hold the bus's
+    consumer lease while consuming, and stand by (retrying the claim) while
+    another worker holds it, so recap ticks and persistence never run twice.
+    """
+    ready = _stream_ready[session_id]
+    consumer: Optional[asyncio.Task] = None
+    claimed = False
+    try:
+        give_up_at = time.monotonic() + STREAM_IDLE_SEC
+        while not await session_bus.claim_consumer(session_id, CONSUMER_LEASE_SEC):
+            ready.set()
+            if time.monotonic() >= give_up_at:
+                return
+            await asyncio.sleep(CONSUMER_LEASE_SEC / 3)
+        claimed = True
+        queue = await session_bus.subscribe(session_id)
+        ready.set()
+        consumer = asyncio.create_task(_stream_consumer(session_id, queue))
+        while not consumer.done():
+            await asyncio.wait({consumer}, timeout=CONSUMER_LEASE_SEC / 3)
+            if not consumer.done() and not await session_bus.claim_consumer(session_id, CONSUMER_LEASE_SEC):
+                logger.warning("stream consumer lease lost to another worker (session_id=%s)", session_id)
+                consumer.cancel()
+                break
+        await asyncio.gather(consumer, return_exceptions=True)
+    finally:
+        ready.set()
+        if consumer is not None and not consumer.done():
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+        if stream_workers.get(session_id) is asyncio.current_task():
+            stream_workers.pop(session_id, None)
+            _stream_ready.pop(session_id, None)
+        if claimed:
+            try:
+                await session_bus.release_consumer(session_id)
+            except Exception:
+                logger.warning("stream consumer lease release failed (session_id=%s)", session_id)
 
 
-def _ensure_stream_worker(session_id: str) -> None:
+async def _ensure_stream_worker(session_id: str) -> None:
+    """Start the session's stream worker if needed; returns once it is subscribed (or standing by)."""
     task = stream_workers.get(session_id)
-    if task and not task.done():
-        return
-    queue = session_bus.subscribe(session_id)
-    stream_workers[session_id] = asyncio.create_task(_stream_consumer(session_id, queue))
+    if task is None or task.done():
+        _stream_ready[session_id] = asyncio.Event()
+        stream_workers[session_id] = asyncio.create_task(_stream_worker(session_id))
+    ready = _stream_ready.get(session_id)
+    if ready is not None:
+        await ready.wait()
 
 
 async def _safe_send_json(websocket: WebSocket, lock: asyncio.Lock, payload: Dict[str, Any]) -> None:
@@ -353,22 +522,26 @@ async def _safe_send_json(websocket: WebSocket, lock: asyncio.Lock, payload: Dic
 
 async def _smartvoice_to_bus(
     session_id: str,
-    audio_queue: "asyncio.Queue[Optional[bytes]]",
+    audio_buffer: AudioIngestBuffer,
     cfg: SmartVoiceStreamingConfig,
     audio_clock: _AudioClock,
-    websocket: WebSocket,
-    send_lock: asyncio.Lock,
+    notify: Callable[[Dict[str, Any]], Awaitable[None]],
 ) -> None:
-    last_end = 0.0
+    last_end = audio_clock.now_s()
     try:
-        stream_iter = stream_recognize(audio_queue, cfg)
+        stream_iter = stream_recognize(audio_buffer, cfg)
         if inspect.isawaitable(stream_iter):
             stream_iter = await stream_iter
         if not hasattr(stream_iter, "__aiter__"):
             raise TypeError("stream_recognize must return an async iterator")
         async for res in stream_iter:
-            time_end = res.time_end if res.time_end is not None else audio_clock.now_s()
-            time_start = res.time_start if res.time_start is not None else last_end
+            # SmartVoice times count only the audio it was sent; map them back past
+            # suppressed silences and dropped frames onto the stream clock.
+            timeline = audio_buffer.timeline
+            time_end = timeline.to_stream_time(res.time_end, end=True) if res.time_end is not None else None
+            time_start = timeline.to_stream_time(res.time_start) if res.time_start is not None else None
+            time_end = time_end if time_end is not None else audio_clock.now_s()
+            time_start = time_start if time_start is not None else last_end
             if time_end < time_start:
                 time_end = time_start
             last_end = time_end
@@ -392,19 +565,122 @@ async def _smartvoice_to_bus(
         raise
     except Exception as exc:
         logger.exception("smartvoice stream failed (session_id=%s)", session_id)
+        await notify(
+            {
+                "event": "error",
+                "session_id": session_id,
+                "message": f"smartvoice_error: {exc}",
+            }
+        )
+
+
+@dataclass
+class _AudioIngestSession:
+    """
+    Audio ingest state of a session, kept across reconnects of its audio socket.
+
+    When the socket drops without a `stop`, the session is detached for
+    AUDIO_RESUME_GRACE_SECONDS: the clock, VAD gate, ingest buffer and
+    SmartVoice stream stay alive, so a reconnect resumes on the same timeline
+    without re-recognizing anything. The client's `resume_offset_bytes` (bytes
+    of PCM it has sent in total) lines the new connection up with the server:
+    bytes the server already has are skipped; bytes lost in flight advance the
+    clock, so later timestamps stay in place.
+    """
+    session_id: str
+    clock: _AudioClock
+    received_bytes: int = 0
+    gate: Optional[VoiceActivityGate] = None
+    buffer: Optional[AudioIngestBuffer] = None
+    stt_task: Optional[asyncio.Task] = None
+    websocket: Optional[WebSocket] = None
+    send_lock: Optional[asyncio.Lock] = None
+    expiry_task: Optional[asyncio.Task] = None
+    reconnects: int = 0
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.clock.bytes_per_sample * max(1, self.clock.channels)
+
+    async def notify(self, payload: Dict[str, Any]) -> None:
+        websocket, lock = self.websocket, self.send_lock
+        if websocket is None or lock is None:
+            return
         try:
-            await _safe_send_json(
-                websocket,
-                send_lock,
-                {
-                    "event": "error",
-                    "session_id": session_id,
-                    "message": f"smartvoice_error: {exc}",
-                },
-            )
+            await _safe_send_json(websocket, lock, payload)
         except Exception:
             pass
 
+    def start_stt(self, cfg: SmartVoiceStreamingConfig) -> None:
+        """(Re)start the SmartVoice stream; a restarted stream maps its times from the current clock."""
+        if self.buffer is not None:
+            self.buffer.close()
+        self.buffer = build_ingest_buffer(self.clock.sample_rate_hz, self.clock.channels)
+        active_ingest_buffers[self.session_id] = self.buffer
+        self.stt_task = asyncio.create_task(
+            _smartvoice_to_bus(self.session_id, self.buffer, cfg, self.clock, self.notify)
+        )
+
+    def skip_lost(self, byte_len: int) -> None:
+        """Audio the client sent that never arrived: keep the clock (and gate positions) in step."""
+        self.received_bytes += byte_len
+        self.clock.advance(byte_len)
+        if self.gate is not None:
+            self.gate.skip(byte_len // self.frame_bytes)
+
+    def push(self, chunk: bytes) -> None:
+        if self.buffer is not None:
+            # Never waits on STT: the buffer coalesces, and drops audio over its budget.
+            # The gate holds back silence (emitting pre-roll with the next speech).
+            if self.gate is not None:
+                for frame in self.gate.process(chunk):
+                    self.buffer.push(frame)
+            else:
+                self.buffer.push(AudioFrame(pos=self.clock.total_samples, pcm=chunk))
+        self.received_bytes += len(chunk)
+        self.clock.advance(len(chunk))
+
+
+audio_ingest_sessions: Dict[str, _AudioIngestSession] = {}
+
+
+async def _finish_audio_session(state: _AudioIngestSession) -> None:
+    if audio_ingest_sessions.get(state.session_id) is state:
+        del audio_ingest_sessions[state.session_id]
+    if state.expiry_task is not None and state.expiry_task is not asyncio.current_task():
+        state.expiry_task.cancel()
+    if state.buffer is not None:
+        state.buffer.close()
+    if state.stt_task is not None:
+        try:
+            await asyncio.wait_for(state.stt_task, timeout=5)
+        except Exception:
+            state.stt_task.cancel()
+    if state.gate is not None:
+        voice_gate_metrics.record(state.gate)
+        logger.info("audio vad (session_id=%s): %s", state.session_id, state.gate.stats())
+    if state.buffer is not None:
+        if active_ingest_buffers.get(state.session_id) is state.buffer:
+            del active_ingest_buffers[state.session_id]
+        logger.info("audio ingest (session_id=%s): %s", state.session_id, state.buffer.stats())
+
+
+async def _expire_audio_session(state: _AudioIngestSession, grace_s: float) -> None:
+    await asyncio.sleep(grace_s)
+    if state.websocket is None:
+        logger.info("audio session not resumed within %.0fs (session_id=%s)", grace_s, state.session_id)
+        await _finish_audio_session(state)
+
+
+def _detach_audio_session(state: _AudioIngestSession) -> None:
+    state.websocket = None
+    state.send_lock = None
+    grace_s = get_settings().audio_resume_grace_seconds
+    if grace_s <= 0:
+        asyncio.create_task(_finish_audio_session(state))
+        return
+    state.expiry_task = asyncio.create_task(_expire_audio_session(state, grace_s))
+
 
 @router.websocket("/audio/{session_id}")
 async def audio_ingest(websocket: WebSocket, session_id: str):
@@ -429,7 +705,7 @@ async def audio_ingest(websocket: WebSocket, session_id: str):
     await websocket.accept()
     await websocket.send_json({"event": "connected", "channel": "audio", "session_id": session_id})
     send_lock = asyncio.Lock()
-    _ensure_stream_worker(session_id)
+    await _ensure_stream_worker(session_id)
 
     try:
         raw = await websocket.receive_text()
@@ -474,6 +750,40 @@ async def audio_ingest(websocket: WebSocket, session_id: str):
     else:
         stt_enabled = is_smartvoice_configured()
 
+    # Resume: reattach to the state a dropped connection left behind (same process),
+    # or, without one, start the clock where the client says the stream is.
+    state = audio_ingest_sessions.get(session_id)
+    resumed = state is not None
+    if state is None:
+        state = _AudioIngestSession(
+            session_id=session_id,
+            clock=_AudioClock(sample_rate_hz=expected.sample_rate_hz, channels=expected.channels),
+        )
+        audio_ingest_sessions[session_id] = state
+        if start_msg.resume_offset_bytes:
+            state.skip_lost(start_msg.resume_offset_bytes - start_msg.resume_offset_bytes % state.frame_bytes)
+    else:
+        state.reconnects += 1
+        if state.expiry_task is not None:
+            state.expiry_task.cancel()
+            state.expiry_task = None
+        previous = state.websocket
+        if previous is not None:  # half-open old connection: this one takes over
+            try:
+                await previous.close(code=1000)
+            except Exception:
+                pass
+    state.websocket = websocket
+    state.send_lock = send_lock
+
+    # Bytes of the incoming stream the server already has (resent after a reconnect).
+    client_offset = state.received_bytes
+    if resumed and start_msg.resume_offset_bytes is not None:
+        client_offset = start_msg.resume_offset_bytes - start_msg.resume_offset_bytes % state.frame_bytes
+        if client_offset > state.received_bytes:
+            state.skip_lost(client_offset - state.received_bytes)
+    skip_bytes = state.received_bytes - client_offset
+
     await _safe_send_json(
         websocket,
         send_lock,
@@ -486,23 +796,30 @@ async def audio_ingest(websocket: WebSocket, session_id: str):
                 "channels": expected.channels,
             },
             "stt_enabled": stt_enabled,
+            "resume": {
+                "resumed": resumed,
+                "offset_bytes": state.received_bytes,
+                "clock_s": state.clock.now_s(),
+            },
         },
     )
 
-    audio_queue: asyncio.Queue[Optional[bytes]] | None = None
-    audio_clock = _AudioClock(sample_rate_hz=expected.sample_rate_hz, channels=expected.channels)
-    stt_task: asyncio.Task | None = None
     if stt_enabled:
-        audio_queue = asyncio.Queue(maxsize=50)
-        stt_cfg = SmartVoiceStreamingConfig(
-            language_code=start_msg.language_code or session.config.language_code,
-            sample_rate_hz=expected.sample_rate_hz,
-            interim_results=session.config.interim_results,
-            enable_word_time_offsets=session.config.enable_word_time_offsets,
-        )
-        stt_task = asyncio.create_task(
-            _smartvoice_to_bus(session_id, audio_queue, stt_cfg, audio_clock, websocket, send_lock)
-        )
+        if state.gate is None:
+            vad_param = (websocket.query_params.get("vad") or "").strip().lower()
+            if vad_param in {"1", "true", "on", "yes"} or (
+                vad_param not in {"0", "false", "off", "no"} and get_settings().audio_vad_enabled
+            ):
+                state.gate = build_voice_gate(expected.sample_rate_hz, expected.channels, pos=state.clock.total_samples)
+        if state.stt_task is None or state.stt_task.done():
+            state.start_stt(
+                SmartVoiceStreamingConfig(
+                    language_code=start_msg.language_code or session.config.language_code,
+                    sample_rate_hz=expected.sample_rate_hz,
+                    interim_results=session.config.interim_results,
+                    enable_word_time_offsets=session.config.enable_word_time_offsets,
+                )
+            )
     else:
         try:
             await _safe_send_json(
@@ -516,16 +833,25 @@ async def audio_ingest(websocket: WebSocket, session_id: str):
     ingest_ok_sent = False
     received_bytes = 0
     received_frames = 0
+    last_throttle_at = 0.0
+    finished = False
 
     try:
         while True:
-            if stt_task is not None and stt_task.done():
+            if state.websocket is not websocket:
+                return  # superseded by a newer connection, which owns the state now
+            if state.stt_task is not None and state.stt_task.done():
+                finished = True
                 break
             message = await websocket.receive()
             if message.get("type") == "websocket.disconnect":
                 break
             if message.get("bytes") is not None:
                 chunk = message["bytes"]
+                if chunk and skip_bytes > 0:
+                    dropped = min(skip_bytes, len(chunk))
+                    skip_bytes -= dropped
+                    chunk = chunk[dropped:]
                 if chunk:
                     received_bytes += len(chunk)
                     received_frames += 1
@@ -542,19 +868,29 @@ async def audio_ingest(websocket: WebSocket, session_id: str):
                             },
                         )
 
-                    if audio_queue is not None:
-                        if audio_queue.full():
-                            suggested = min(
-                                max(start_msg.frame_ms * 2, session.config.recommended_frame_ms),
-                                session.config.max_frame_ms,
-                            )
-                            await _safe_send_json(
-                                websocket,
-                                send_lock,
-                                {"event": "throttle", "reason": "stt_backpressure", "suggested_frame_ms": suggested},
-                            )
-                        await audio_queue.put(chunk)
-                    audio_clock.advance(len(chunk))
+                    state.push(chunk)
+                    audio_buffer = state.buffer
+                    now = time.monotonic()
+                    if (
+                        audio_buffer is not None
+                        and audio_buffer.congested
+                        and now - last_throttle_at >= THROTTLE_EVENT_INTERVAL_SEC
+                    ):
+                        last_throttle_at = now
+                        suggested = min(
+                            max(start_msg.frame_ms * 2, session.config.recommended_frame_ms),
+                            session.config.max_frame_ms,
+                        )
+                        await _safe_send_json(
+                            websocket,
+                            send_lock,
+                            {
+                                "event": "throttle",
+                                "reason": "stt_backpressure",
+                                "suggested_frame_ms": suggested,
+                                "backlog_ms": audio_buffer.stats()["backlog_ms"],
+                            },
+                        )
                     session_store.touch(session_id)
                 continue
 
@@ -562,25 +898,18 @@ async def audio_ingest(websocket: WebSocket, session_id: str):
                 try:
                     obj = json.loads(message["text"])
                     if obj.get("type") == "stop":
+                        finished = True
                         break
                 except Exception:
                     pass
     except WebSocketDisconnect:
         pass
     finally:
-        if audio_queue is not None:
-            try:
-                audio_queue.put_nowait(None)
-            except Exception:
-                try:
-                    await audio_queue.put(None)
-                except Exception:
-                    pass
-        if stt_task is not None:
-            try:
-                await asyncio.wait_for(stt_task, timeout=5)
-            except Exception:
-                stt_task.cancel()
+        if state.websocket is websocket:
+            if finished:
+                await _finish_audio_session(state)
+            else:
+                _detach_audio_session(state)
         try:
             await websocket.close()
         except Exception:
@@ -592,7 +921,7 @@ async def in_meeting_ingest(websocket: WebSocket, session_id: str):
     await websocket.accept()
     await websocket.send_json({"event": "connected", "channel": "ingest", "session_id": session_id})
     session_store.ensure(session_id)
-    _ensure_stream_worker(session_id)
+    await _ensure_stream_worker(session_id)
     try:
         while True:
             try:
@@ -621,7 +950,7 @@ async def in_meeting_ingest(websocket: WebSocket, session_id: str):
                 await websocket.send_json({"event": "ingest_ack", "session_id": session_id, "seq": seq})
             except Exception as exc:
                 await websocket.send_json({"event": "error", "session_id": session_id, "message": str(exc)})
-            _ensure_stream_worker(session_id)
+            await _ensure_stream_worker(session_id)
     finally:
         try:
             await websocket.close()
@@ -632,7 +961,7 @@ async def in_meeting_ingest(websocket: WebSocket, session_id: str):
 @router.websocket("/frontend/{session_id}")
 async def in_meeting_frontend(websocket: WebSocket, session_id: str):
     await websocket.accept()
-    queue = session_bus.subscribe(session_id)
+    queue = await session_bus.subscribe(session_id)
     await websocket.send_json({"event": "connected", "channel": "frontend", "session_id": session_id})
     try:
         while True:
@@ -43,6 +43,58 @@ class Settings(BaseSettings):
     smartvoice_token_key: str = ''
     smartvoice_auth_url: str = ''  # optional: exchange token_id/token_key for access_token
     smartvoice_model: str = 'fast_streaming'
+    smartvoice_insecure: bool = False  # plaintext gRPC (local/dev endpoints only)
+    smartvoice_channel_pool_size: int = 1  # long-lived channels (each multiplexes many streams)
+    smartvoice_keepalive_seconds: float = 30.0  # HTTP/2 ping interval while calls are active
+    smartvoice_keepalive_timeout_seconds: float = 10.0
+    smartvoice_connect_timeout_seconds: float = 5.0  # startup warmup only
+    smartvoice_max_retries: int = 3  # UNAVAILABLE retries (exponential backoff)
+    smartvoice_retry_backoff_seconds: float = 0.5
+    smartvoice_token_refresh_margin_seconds: float = 60.0  # refresh auth token this long before expiry
+    smartvoice_token_default_ttl_seconds: float = 3000.0  # when the auth response has no expiry
+    # Batch (recorded audio) transcription: longer files are split into windows at pauses
+    smartvoice_long_audio_threshold_seconds: float = 120.0
+    smartvoice_batch_window_seconds: float = 60.0
+    smartvoice_batch_overlap_seconds: float = 2.0  # context before each cut, de-duplicated when stitching
+    smartvoice_batch_silence_search_seconds: float = 5.0  # look this far back from the window end for a pause
+    smartvoice_batch_max_in_flight: int = 4  # concurrent Recognize calls per recording
+
+    # Voice-activity gate on the audio ingest WS (silence is not sent to SmartVoice; ?vad=0|1 per socket)
+    audio_vad_enabled: bool = False
+    audio_vad_frame_ms: int = 30
+    audio_vad_threshold_dbfs: float = -45.0  # frames quieter than this are never speech
+    audio_vad_noise_margin_db: float = 10.0  # ...nor those less than this above the noise floor
+    audio_vad_hangover_ms: int = 500  # keep sending this long after speech (utterance endpointing)
+    audio_vad_preroll_ms: int = 300  # suppressed audio sent ahead of resumed speech (word onsets)
+    # Audio ingest buffer between the WS receive loop and the SmartVoice stream
+    audio_ingest_frame_ms: int = 100  # incoming frames are coalesced to this size for STT
+    audio_ingest_max_buffered_bytes: int = 320000  # per session (~10 s of 16 kHz mono); silent frames drop first
+    audio_resume_grace_seconds: float = 30.0  # keep clock + STT stream after a dropped audio socket (0 = off)
+
+    # Realtime in-meeting ticks (recap/topic/intent LLM calls off the WS consumer)
+    realtime_recap_workers: int = 4        # dedicated threads for recap ticks
+    realtime_recap_max_pending: int = 64   # skip (and retry later) beyond this many in-flight ticks
+    realtime_final_chunk_horizon: int = 2000     # final chunks kept in memory per session; older ones spill to DB
+    realtime_speaker_segment_limit: int = 20000  # diarization segments kept per session
+
+    # Live meeting persistence (write-behind: batched off the WS path)
+    live_persist_flush_items: int = 200            # flush a meeting's buffer at this many items
+    live_persist_flush_interval_seconds: float = 2.0  # ...or when its oldest item is this old
+    live_persist_max_retries: int = 3              # retries on transient DB errors
+    live_persist_max_buffered: int = 10000         # per-meeting cap while the DB is unreachable
+
+    # Realtime session event bus: "memory" (single process) or "redis" (uvicorn --workers N / multi-node)
+    realtime_bus_backend: str = 'memory'
+    redis_url: str = ''  # e.g. redis://localhost:6379/0
+    realtime_bus_key_prefix: str = 'meetmate:bus'
+    realtime_bus_stream_maxlen: int = 1000  # approximate per-session stream cap
+
+    # Realtime session store: "memory" (no persistence), "redis" or "postgres" snapshots
+    realtime_session_backend: str = 'memory'
+    realtime_session_key_prefix: str = 'meetmate:session'
+    realtime_session_snapshot_ttl_seconds: int = 86400   # redis snapshot expiry
+    realtime_session_idle_ttl_seconds: float = 7200.0    # evict from memory after this much inactivity
+    realtime_session_sweep_interval_seconds: float = 60.0  # snapshot + eviction sweep period
 
     # VNPT GoMeet (control APIs for join URL)
     gomeet_api_base_url: str = ''  # e.g. https://gomesainterk06.vnpt.vn/api/v1
@@ -53,7 +105,72 @@ class Settings(BaseSettings):
     groq_model: str = 'llama-3.1-8b-instant'
     ai_temperature: float = 0.7
     ai_max_tokens: int = 2048
-    
+
+    # LLM client (shared pooled connection)
+    llm_timeout_seconds: float = 30.0   # per-call timeout
+    llm_max_concurrency: int = 8        # max in-flight completions per process/event loop
+    llm_max_connections: int = 20       # HTTP connection pool size
+    llm_max_retries: int = 1            # SDK-level retries on connection errors / 429 / 5xx
+    llm_health_probe_interval_seconds: float = 60.0  # background probe when no real traffic
+    llm_health_ttl_seconds: float = 180.0            # cached state considered stale after this
+    llm_circuit_failure_threshold: int = 3           # consecutive failures before marking down
+    llm_circuit_open_seconds: float = 30.0           # how long the provider stays marked down
+
+    # Embeddings: "jina" (JINA_API_KEY), "local" (local_embeddings/server.py) or "inprocess" (sentence-transformers)
+    embedding_provider: str = 'jina'
+    embedding_local_url: str = 'http://localhost:8001'
+    embedding_inprocess_model: str = 'Alibaba-NLP/gte-small'
+    embedding_batch_size: int = 64          # max inputs per request
+    embedding_batch_max_chars: int = 60000  # max total characters per request
+    embedding_max_concurrency: int = 4      # concurrent batch requests (and pooled connections)
+    embedding_timeout_seconds: float = 60.0
+    embedding_max_retries: int = 3          # on 429 / 5xx / connection errors
+
+    # Knowledge search / RAG caches (in-process)
+    knowledge_query_cache_size: int = 2048               # normalized query -> embedding (0 disables)
+    knowledge_query_cache_ttl_seconds: float = 3600.0
+    knowledge_answer_cache_size: int = 64                # cached answers per scope (0 disables)
+    knowledge_answer_cache_ttl_seconds: float = 900.0
+    knowledge_answer_cache_threshold: float = 0.95       # min cosine similarity to reuse an answer
+
+    # Knowledge ANN index (see app/vectorstore/ann_index.py)
+    knowledge_ann_method: str = 'hnsw'                   # hnsw | ivfflat (hnsw needs pgvector >= 0.5)
+    knowledge_search_recall: float = 0.95                # default target recall@k (1.0 = exact scan)
+    knowledge_ann_project_index_min_rows: int = 20000    # partial per-project index above this many chunks
+    knowledge_ann_maintenance_work_mem: str = ''         # e.g. '1GB' for index builds
+    knowledge_hybrid_rrf_k: int = 60                     # reciprocal-rank fusion constant
+    knowledge_hybrid_vector_weight: float = 1.0          # RRF weight of the pgvector ranking
+    knowledge_hybrid_lexical_weight: float = 1.0         # RRF weight of the full-text ranking
+    knowledge_scoped_rag_budget_ms: float = 800.0        # in-meeting Q&A retrieval: buckets not answered by then are dropped
+    knowledge_scoped_rag_per_bucket: int = 8             # documents fetched per bucket (meeting / project / global)
+    knowledge_scoped_rag_limit: int = 8                  # hits returned after merging the buckets
+    knowledge_rerank_enabled: bool = False               # cross-encoder rerank before the RAG prompt (needs sentence-transformers)
+    knowledge_rerank_model: str = 'cross-encoder/mmarco-mMiniLMv2-L12-H384-v1'  # multilingual, CPU-friendly
+    knowledge_rerank_batch_size: int = 16                # (query, chunk) pairs per forward pass
+    knowledge_rerank_workers: int = 1                    # scoring threads (torch already uses several cores)
+    knowledge_rerank_top_n: int = 6                      # chunks kept for the prompt
+    knowledge_rerank_token_budget: int = 1500            # context tokens kept for the prompt (approximate)
+    knowledge_rerank_cache_size: int = 4096              # cached (query, chunk) scores (0 disables)
+    knowledge_rerank_cache_ttl_seconds: float = 900.0
+
+    # Knowledge ingestion jobs (app/workers/indexing_worker.py)
+    knowledge_ingest_workers: int = 2                    # documents processed concurrently per process
+    knowledge_ingest_max_attempts: int = 3               # automatic attempts before a job is marked failed
+    knowledge_ingest_retry_backoff_seconds: float = 10.0
+    knowledge_ingest_stale_after_seconds: float = 600.0  # running job without progress this long is re-claimed
+    knowledge_ingest_batch_chunks: int = 256             # chunks embedded + inserted per committed batch
+    knowledge_ingest_poll_interval_seconds: float = 1.0  # progress stream polling period
+    knowledge_extract_workers: int = 0                   # extraction processes (0 = one per CPU)
+    knowledge_extract_pages_per_task: int = 8            # PDF pages parsed per pool task
+    knowledge_extract_timeout_seconds: float = 300.0     # per parser call; the pool is reset when exceeded
+    knowledge_extract_memory_limit_mb: int = 1024        # address-space cap per extraction process (0 = none)
+    knowledge_chunk_max_tokens: int = 256                # chunk budget (approximate tokens: words + punctuation)
+    knowledge_chunk_overlap_tokens: int = 32             # trailing sentences repeated in the next chunk of a section
+    knowledge_chunk_tombstone_ttl_seconds: float = 3600.0  # replaced chunks kept (invisible) this long before purge
+    knowledge_reindex_max_in_flight: int = 1             # bulk reindex queues a document only below this many active jobs
+    knowledge_reindex_pause_seconds: float = 1.0         # pause between documents queued by a bulk reindex
+    knowledge_reindex_on_model_change: bool = False      # start a bulk reindex at startup for documents of another model
+
     # Security
     secret_key: str = 'dev-secret-key-change-in-production'
     supabase_jwt_secret: str = ''  # Set to Supabase JWT secret to verify Supabase tokens
@@ -7,23 +7,18 @@ from app.llm.prompts.in_meeting_prompts import (
     TOPIC_SEGMENT_PROMPT,
     RECAP_TOPIC_INTENT_PROMPT,
 )
-from app.llm.gemini_client import GeminiChat, get_gemini_client
+from app.llm.clients.groq_client import chat_completion
 from app.core.config import get_settings
 
 
 def _call_gemini(prompt: str) -> str:
-    client = get_gemini_client()
-    if not client:
-        return ""
+    """Blocking LLM call on the shared pooled client; run it off the event loop."""
     try:
         settings = get_settings()
-        resp = client.chat.completions.create(
-            model=settings.groq_model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=settings.ai_temperature,
+        return chat_completion(
+            [{"role": "user", "content": prompt}],
             max_tokens=min(settings.ai_max_tokens, 512),
         )
-        return resp.choices[0].message.content or ""
     except Exception as e:
         print(f"[Groq] error in _call_gemini: {e}")
         return ""
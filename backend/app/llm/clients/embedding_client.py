@@ -1,7 +1,13 @@
 from typing import List
 
+from app.llm.clients.embeddings import aembed_texts, embed_texts
+
 
 class EmbeddingClient:
+    """Thin wrapper over the configured embedding provider (see embeddings.py)."""
+
     def embed(self, texts: List[str]) -> list[list[float]]:
-        # Stub embeddings with zeros
-        return [[0.0 for _ in range(4)] for _ in texts]
\ No newline at end of file
+        return embed_texts(texts)
+
+    async def aembed(self, texts: List[str]) -> list[list[float]]:
+        return await aembed_texts(texts)
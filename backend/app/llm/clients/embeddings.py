@@ -0,0 +1,375 @@
+"""
+Embedding providers behind one batched, concurrent, retrying client.
+
+Providers (EMBEDDING_PROVIDER):
+- "jina"      Jina Inference API (JINA_API_KEY, see jina_embed.py for model/task/dims)
+- "local"     backend/local_embeddings/server.py (EMBEDDING_LOCAL_URL)
+- "inprocess" sentence-transformers loaded in this process (EMBEDDING_INPROCESS_MODEL)
+
+`aembed_texts` / `embed_texts` split inputs into batches bounded by item count
+and total characters, send them concurrently over a pooled HTTP client (capped
+by EMBEDDING_MAX_CONCURRENCY), retry 429/5xx/transport errors with backoff,
+and return vectors in input order.
+"""
+from __future__ import annotations
+
+import abc
+import asyncio
+import importlib.util
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import get_settings
+from app.llm.clients import jina_embed
+
+logger = logging.getLogger(__name__)
+
+Vector = List[float]
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class EmbeddingProvider(abc.ABC):
+    name = "base"
+
+    @property
+    def model_id(self) -> str:
+        """Identifies the vector space; stored vectors are only reused under the same id."""
+        return self.name
+
+    def is_available(self) -> bool:
+        return False
+
+    @abc.abstractmethod
+    async def aembed_batch(self, texts: List[str]) -> List[Vector]:
+        """Vectors for one batch, in input order."""
+
+    @abc.abstractmethod
+    def embed_batch(self, texts: List[str]) -> List[Vector]:
+        """Blocking `aembed_batch`."""
+
+
+class HttpEmbeddingProvider(EmbeddingProvider):
+    """A provider behind a JSON HTTP endpoint, sent over the pooled, retrying clients."""
+
+    @abc.abstractmethod
+    def build_request(self, texts: List[str]) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """(url, json body, headers)."""
+
+    @abc.abstractmethod
+    def parse_response(self, data: Dict[str, Any]) -> List[Vector]:
+        """Vectors from the decoded response body, in input order."""
+
+    async def aembed_batch(self, texts: List[str]) -> List[Vector]:
+        client, semaphore = _get_async_client()
+        url, body, headers = self.build_request(texts)
+        async with semaphore:
+            data = await _apost_with_retry(client, url, body, headers)
+        return self.parse_response(data)
+
+    def embed_batch(self, texts: List[str]) -> List[Vector]:
+        url, body, headers = self.build_request(texts)
+        return self.parse_response(_post_with_retry(_get_sync_client(), url, body, headers))
+
+
+class JinaEmbeddingProvider(HttpEmbeddingProvider):
+    name = "jina"
+
+    @property
+    def model_id(self) -> str:
+        dims = jina_embed.JINA_EMBED_DIM or "default"
+        return f"jina:{jina_embed.JINA_EMBED_MODEL}:{jina_embed.JINA_EMBED_TASK}:{dims}"
+
+    def is_available(self) -> bool:
+        return jina_embed.is_jina_available()
+
+    def build_request(self, texts: List[str]) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        if not jina_embed.JINA_API_KEY:
+            raise RuntimeError("JINA_API_KEY is not set")
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {jina_embed.JINA_API_KEY}",
+        }
+        return jina_embed.JINA_URL, jina_embed.build_payload(texts), headers
+
+    def parse_response(self, data: Dict[str, Any]) -> List[Vector]:
+        items = data.get("data", [])
+        # Jina tags each item with its input index; don't rely on response order.
+        if items and all("index" in item for item in items):
+            items = sorted(items, key=lambda item: item["index"])
+        return [item["embedding"] for item in items]
+
+
+class LocalServerEmbeddingProvider(HttpEmbeddingProvider):
+    name = "local"
+
+    def __init__(self, base_url: str, normalize: bool = True) -> None:
+        self.base_url = (base_url or "").rstrip("/")
+        self.normalize = normalize
+
+    @property
+    def model_id(self) -> str:
+        return f"local:{self.base_url}"
+
+    def is_available(self) -> bool:
+        return bool(self.base_url)
+
+    def build_request(self, texts: List[str]) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        return f"{self.base_url}/embed", {"texts": texts, "normalize": self.normalize}, {"Content-Type": "application/json"}
+
+    def parse_response(self, data: Dict[str, Any]) -> List[Vector]:
+        return data.get("embeddings", [])
+
+
+class InProcessEmbeddingProvider(EmbeddingProvider):
+    """sentence-transformers in this process (optional dependency, loaded on first use)."""
+
+    name = "inprocess"
+
+    def __init__(self, model_name: str, normalize: bool = True) -> None:
+        self.model_name = model_name
+        self.normalize = normalize
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model_id(self) -> str:
+        return f"inprocess:{self.model_name}"
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec("sentence_transformers") is not None
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer  # type: ignore
+
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def embed_batch(self, texts: List[str]) -> List[Vector]:
+        return self._get_model().encode(texts, normalize_embeddings=self.normalize).tolist()
+
+    async def aembed_batch(self, texts: List[str]) -> List[Vector]:
+        return await asyncio.to_thread(self.embed_batch, texts)
+
+
+# ---- provider selection ------------------------------------------------------------
+
+_provider: Optional[EmbeddingProvider] = None
+
+
+def create_provider() -> EmbeddingProvider:
+    settings = get_settings()
+    name = (settings.embedding_provider or "jina").strip().lower()
+    if name == "local":
+        return LocalServerEmbeddingProvider(settings.embedding_local_url)
+    if name == "inprocess":
+        return InProcessEmbeddingProvider(settings.embedding_inprocess_model)
+    return JinaEmbeddingProvider()
+
+
+def get_provider() -> EmbeddingProvider:
+    global _provider
+    if _provider is None:
+        _provider = create_provider()
+    return _provider
+
+
+def set_provider(provider: Optional[EmbeddingProvider]) -> None:
+    """Override the configured provider (tests / tooling). None resets to settings."""
+    global _provider
+    _provider = provider
+
+
+def is_embedding_available() -> bool:
+    return get_provider().is_available()
+
+
+# ---- pooled HTTP clients -------------------------------------------------------------
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+_sync_client: Optional[httpx.Client] = None
+_sync_executor: Optional[ThreadPoolExecutor] = None
+_sync_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    n = max(1, get_settings().embedding_max_concurrency)
+    return httpx.Limits(max_connections=n, max_keepalive_connections=n, keepalive_expiry=60.0)
+
+
+def _timeout() -> httpx.Timeout:
+    total = float(get_settings().embedding_timeout_seconds)
+    return httpx.Timeout(total, connect=min(10.0, total))
+
+
+def _get_async_client() -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None:
+        entry = (
+            httpx.AsyncClient(limits=_limits(), timeout=_timeout()),
+            asyncio.Semaphore(max(1, get_settings().embedding_max_concurrency)),
+        )
+        _async_clients[loop] = entry
+    return entry
+
+
+def _get_sync_client() -> httpx.Client:
+    global _sync_client
+    if _sync_client is None:
+        with _sync_lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(limits=_limits(), timeout=_timeout())
+    return _sync_client
+
+
+def _get_sync_executor() -> ThreadPoolExecutor:
+    global _sync_executor
+    if _sync_executor is None:
+        with _sync_lock:
+            if _sync_executor is None:
+                _sync_executor = ThreadPoolExecutor(
+                    max_workers=max(1, get_settings().embedding_max_concurrency),
+                    thread_name_prefix="embed",
+                )
+    return _sync_executor
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(30.0, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+    return min(10.0, 0.5 * (2 ** attempt))
+
+
+def _should_retry(exc: Exception) -> Tuple[bool, Optional[httpx.Response]]:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUS, exc.response
+    return isinstance(exc, httpx.TransportError), None
+
+
+def _raise_for_status(resp: httpx.Response) -> None:
+    if resp.is_error:
+        logger.error("embedding request failed %s: %s", resp.status_code, resp.text[:500])
+    resp.raise_for_status()
+
+
+async def _apost_with_retry(client: httpx.AsyncClient, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+    max_retries = get_settings().embedding_max_retries
+    attempt = 0
+    while True:
+        try:
+            resp = await client.post(url, json=body, headers=headers)
+            _raise_for_status(resp)
+            return resp.json()
+        except Exception as exc:
+            retry, response = _should_retry(exc)
+            if not retry or attempt >= max_retries:
+                raise
+            await asyncio.sleep(_retry_delay(attempt, response))
+            attempt += 1
+
+
+def _post_with_retry(client: httpx.Client, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+    max_retries = get_settings().embedding_max_retries
+    attempt = 0
+    while True:
+        try:
+            resp = client.post(url, json=body, headers=headers)
+            _raise_for_status(resp)
+            return resp.json()
+        except Exception as exc:
+            retry, response = _should_retry(exc)
+            if not retry or attempt >= max_retries:
+                raise
+            time.sleep(_retry_delay(attempt, response))
+            attempt += 1
+
+
+# ---- batching ----------------------------------------------------------------------------
+
+def split_batches(texts: List[str], max_items: int, max_chars: int) -> List[Tuple[int, List[str]]]:
+    """Split into (start_index, batch) pairs bounded by item count and total characters."""
+    batches: List[Tuple[int, List[str]]] = []
+    start = 0
+    current: List[str] = []
+    chars = 0
+    for idx, item in enumerate(texts):
+        if current and (len(current) >= max_items or chars + len(item) > max_chars):
+            batches.append((start, current))
+            start, current, chars = idx, [], 0
+        current.append(item)
+        chars += len(item)
+    if current:
+        batches.append((start, current))
+    return batches
+
+
+def _check(batch: List[str], vectors: List[Vector]) -> List[Vector]:
+    if len(vectors) != len(batch):
+        raise RuntimeError(f"embedding provider returned {len(vectors)} vectors for {len(batch)} inputs")
+    return vectors
+
+
+async def aembed_texts(texts: List[str], provider: Optional[EmbeddingProvider] = None) -> List[Vector]:
+    """Embed texts without blocking the event loop. Vectors are returned in input order."""
+    if not texts:
+        return []
+    provider = provider or get_provider()
+    settings = get_settings()
+    batches = split_batches(list(texts), settings.embedding_batch_size, settings.embedding_batch_max_chars)
+    results = await asyncio.gather(*(provider.aembed_batch(batch) for _, batch in batches))
+    out: List[Vector] = []
+    for (_, batch), vectors in zip(batches, results):
+        out.extend(_check(batch, vectors))
+    return out
+
+
+def embed_texts(texts: List[str], provider: Optional[EmbeddingProvider] = None) -> List[Vector]:
+    """Blocking variant for sync code paths (worker threads). Never call on the event loop thread."""
+    if not texts:
+        return []
+    provider = provider or get_provider()
+    settings = get_settings()
+    batches = split_batches(list(texts), settings.embedding_batch_size, settings.embedding_batch_max_chars)
+    if len(batches) == 1:
+        return _check(batches[0][1], provider.embed_batch(batches[0][1]))
+    futures = [_get_sync_executor().submit(provider.embed_batch, batch) for _, batch in batches]
+    out: List[Vector] = []
+    for (_, batch), future in zip(batches, futures):
+        out.extend(_check(batch, future.result()))
+    return out
+
+
+async def aclose() -> None:
+    """Close pooled connections (called on app shutdown)."""
+    global _sync_client, _sync_executor
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    entry = _async_clients.pop(loop, None) if loop is not None else None
+    if entry is not None:
+        await entry[0].aclose()
+    with _sync_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+        if _sync_executor is not None:
+            _sync_executor.shutdown(wait=False)
+            _sync_executor = None
@@ -0,0 +1,182 @@
+"""
+Shared Groq chat-completions client.
+
+All LLM calls go through this module so that:
+- async handlers use `AsyncGroq` and never block the event loop,
+- HTTP connections are pooled and reused instead of opened per call,
+- every call has a timeout and the number of in-flight completions is capped.
+
+The async client and its semaphore are bound to the running event loop
+(httpx/asyncio primitives cannot be shared across loops). Sync callers
+(LangGraph nodes, worker threads) share one pooled `Groq` client.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from groq import AsyncGroq, Groq
+
+from app.core.config import get_settings
+from app.llm.clients.llm_health import llm_health
+
+Messages = List[Dict[str, str]]
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[AsyncGroq, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+_sync_client: Optional[Groq] = None
+_sync_semaphore: Optional[threading.BoundedSemaphore] = None
+_sync_lock = threading.Lock()
+
+
+def is_groq_configured() -> bool:
+    """True when an API key is set (does not contact the provider)."""
+    return bool(get_settings().groq_api_key)
+
+
+def _limits() -> httpx.Limits:
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_connections,
+        keepalive_expiry=60.0,
+    )
+
+
+def _timeout(seconds: Optional[float] = None) -> httpx.Timeout:
+    settings = get_settings()
+    total = float(seconds if seconds is not None else settings.llm_timeout_seconds)
+    return httpx.Timeout(total, connect=min(10.0, total))
+
+
+def get_async_client() -> Tuple[Optional[AsyncGroq], Optional[asyncio.Semaphore]]:
+    """Return the (client, semaphore) pair for the running loop, creating it lazily."""
+    settings = get_settings()
+    if not settings.groq_api_key:
+        return None, None
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None:
+        http_client = httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+        client = AsyncGroq(
+            api_key=settings.groq_api_key,
+            http_client=http_client,
+            max_retries=settings.llm_max_retries,
+            timeout=_timeout(),
+        )
+        entry = (client, asyncio.Semaphore(settings.llm_max_concurrency))
+        _async_clients[loop] = entry
+    return entry
+
+
+def get_sync_client() -> Optional[Groq]:
+    """Return the process-wide pooled sync client (for threads / sync graph nodes)."""
+    global _sync_client, _sync_semaphore
+    settings = get_settings()
+    if not settings.groq_api_key:
+        return None
+    if _sync_client is None:
+        with _sync_lock:
+            if _sync_client is None:
+                _sync_client = Groq(
+                    api_key=settings.groq_api_key,
+                    http_client=httpx.Client(limits=_limits(), timeout=_timeout()),
+                    max_retries=settings.llm_max_retries,
+                    timeout=_timeout(),
+                )
+                _sync_semaphore = threading.BoundedSemaphore(settings.llm_max_concurrency)
+    return _sync_client
+
+
+def _build_kwargs(
+    messages: Messages,
+    model: Optional[str],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    timeout: Optional[float],
+) -> Dict[str, Any]:
+    settings = get_settings()
+    return {
+        "model": model or settings.groq_model,
+        "messages": messages,
+        "temperature": settings.ai_temperature if temperature is None else temperature,
+        "max_tokens": settings.ai_max_tokens if max_tokens is None else max_tokens,
+        "timeout": _timeout(timeout),
+    }
+
+
+async def achat_completion(
+    messages: Messages,
+    *,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> str:
+    """
+    Non-blocking chat completion. Returns the message content ("" when no key is set).
+    Raises on provider/timeout errors so callers can fall back.
+    """
+    client, semaphore = get_async_client()
+    if client is None or semaphore is None:
+        return ""
+    kwargs = _build_kwargs(messages, model, temperature, max_tokens, timeout)
+    async with semaphore:
+        try:
+            resp = await client.chat.completions.create(**kwargs)
+        except Exception as exc:
+            llm_health.record_failure(exc)
+            raise
+    llm_health.record_success()
+    return resp.choices[0].message.content or ""
+
+
+def chat_completion(
+    messages: Messages,
+    *,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> str:
+    """Blocking variant for sync code paths. Never call this on the event loop thread."""
+    client = get_sync_client()
+    if client is None or _sync_semaphore is None:
+        return ""
+    kwargs = _build_kwargs(messages, model, temperature, max_tokens, timeout)
+    with _sync_semaphore:
+        try:
+            resp = client.chat.completions.create(**kwargs)
+        except Exception as exc:
+            llm_health.record_failure(exc)
+            raise
+    llm_health.record_success()
+    return resp.choices[0].message.content or ""
+
+
+async def aprobe(timeout: float = 5.0) -> None:
+    """Cheap reachability check (lists models, costs no tokens). Raises on failure."""
+    client, _ = get_async_client()
+    if client is None:
+        raise RuntimeError("GROQ_API_KEY is not set")
+    await client.models.list(timeout=_timeout(timeout))
+
+
+async def aclose() -> None:
+    """Close pooled connections (called on app shutdown)."""
+    global _sync_client
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    entry = _async_clients.pop(loop, None) if loop is not None else None
+    if entry is not None:
+        await entry[0].close()
+    with _sync_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
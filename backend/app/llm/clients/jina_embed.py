@@ -9,7 +9,6 @@ Optional:
 - JINA_EMBED_DIMENSIONS (optional int, e.g., 1024 or 512)
 """
 import os
-import requests
 import logging
 from typing import List
 
@@ -26,11 +25,7 @@ def is_jina_available() -> bool:
     return bool(JINA_API_KEY)
 
 
-def embed_texts(texts: List[str]) -> List[List[float]]:
-    if not JINA_API_KEY:
-        raise RuntimeError("JINA_API_KEY is not set")
-    if not texts:
-        return []
+def build_payload(texts: List[str]) -> dict:
     payload = {
         "model": JINA_EMBED_MODEL,
         "task": JINA_EMBED_TASK,
@@ -45,15 +40,13 @@ def embed_texts(texts: List[str]) -> List[List[float]]:
                 logger.warning("JINA_EMBED_DIMENSIONS=%s không hợp lệ, bỏ qua (chỉ hỗ trợ 512 hoặc 1024)", JINA_EMBED_DIM)
         except ValueError:
             logger.warning("JINA_EMBED_DIMENSIONS=%s không phải số, bỏ qua", JINA_EMBED_DIM)
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {JINA_API_KEY}",
-    }
-    resp = requests.post(JINA_URL, json=payload, headers=headers, timeout=60)
-    try:
-        resp.raise_for_status()
-    except requests.HTTPError as e:
-        logger.error("Jina embed error %s: %s", resp.status_code, resp.text[:500])
-        raise e
-    data = resp.json()
-    return [item["embedding"] for item in data.get("data", [])]
+    return payload
+
+
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """Jina-only embedding (batched + retried). Prefer app.llm.clients.embeddings for provider-agnostic code."""
+    from app.llm.clients.embeddings import JinaEmbeddingProvider, embed_texts as _embed_texts
+
+    if not JINA_API_KEY:
+        raise RuntimeError("JINA_API_KEY is not set")
+    return _embed_texts(texts, provider=JinaEmbeddingProvider())
@@ -0,0 +1,142 @@
+"""
+Cached health state for the LLM provider (Groq).
+
+Callers read `llm_health.is_available()` instead of pinging the provider:
+- real traffic through `groq_client` reports success/failure passively,
+- a background task probes `models.list()` (no tokens) only when the cached
+  state is older than the probe interval,
+- after N consecutive failures the circuit opens and the provider is reported
+  down until the open window expires; the next call/probe then acts as a trial.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMHealthMonitor:
+    def __init__(self, probe: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.available: Optional[bool] = None
+        self.checked_at: float = 0.0
+        self.consecutive_failures: int = 0
+        self.circuit_open_until: float = 0.0
+        self.last_error: Optional[str] = None
+
+    # ---- passive reporting ----
+    def record_success(self) -> None:
+        with self._lock:
+            self.available = True
+            self.checked_at = time.time()
+            self.consecutive_failures = 0
+            self.circuit_open_until = 0.0
+            self.last_error = None
+
+    def record_failure(self, exc: BaseException | str) -> None:
+        settings = get_settings()
+        now = time.time()
+        with self._lock:
+            self.checked_at = now
+            self.consecutive_failures += 1
+            self.last_error = str(exc)[:300]
+            if self.consecutive_failures >= settings.llm_circuit_failure_threshold:
+                if self.available is not False:
+                    logger.warning(
+                        "LLM circuit opened after %s consecutive failures: %s",
+                        self.consecutive_failures,
+                        self.last_error,
+                    )
+                self.available = False
+                self.circuit_open_until = now + settings.llm_circuit_open_seconds
+
+    # ---- cached reads ----
+    def is_available(self) -> bool:
+        """Cached up/down state; never contacts the provider."""
+        settings = get_settings()
+        if not settings.groq_api_key:
+            return False
+        now = time.time()
+        with self._lock:
+            if self.circuit_open_until > now:
+                return False
+            if self.available is False and self.circuit_open_until:
+                # Open window elapsed: half-open, let the next call be the trial.
+                return True
+            stale = (now - self.checked_at) > settings.llm_health_ttl_seconds
+            if self.available is None or stale:
+                # Unknown/stale: optimistic until the background probe says otherwise.
+                return True
+            return bool(self.available)
+
+    def snapshot(self) -> Dict[str, Any]:
+        settings = get_settings()
+        with self._lock:
+            return {
+                "available": self.available,
+                "checked_at": self.checked_at or None,
+                "age_s": round(time.time() - self.checked_at, 1) if self.checked_at else None,
+                "consecutive_failures": self.consecutive_failures,
+                "circuit_open": self.circuit_open_until > time.time(),
+                "circuit_open_until": self.circuit_open_until or None,
+                "last_error": self.last_error,
+                "ttl_s": settings.llm_health_ttl_seconds,
+            }
+
+    # ---- active probing ----
+    async def probe_once(self) -> bool:
+        if self._probe is None or not get_settings().groq_api_key:
+            return False
+        try:
+            await self._probe()
+        except Exception as exc:
+            self.record_failure(exc)
+            return False
+        self.record_success()
+        return True
+
+    async def _run(self) -> None:
+        settings = get_settings()
+        interval = max(1.0, float(settings.llm_health_probe_interval_seconds))
+        while True:
+            with self._lock:
+                fresh = (time.time() - self.checked_at) < interval
+                circuit_open = self.circuit_open_until > time.time()
+            # Real traffic keeps the state fresh; only probe when idle or recovering.
+            if not fresh and not circuit_open:
+                await self.probe_once()
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        if not get_settings().groq_api_key:
+            return
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+async def _groq_probe() -> None:
+    from app.llm.clients.groq_client import aprobe
+
+    await aprobe()
+
+
+llm_health = LLMHealthMonitor(probe=_groq_probe)
@@ -3,42 +3,28 @@ LLM Client via Groq (replaces legacy Gemini usage)
 """
 import json
 from typing import Optional, List, Dict, Any
-from groq import Groq
 from app.core.config import get_settings
+from app.llm.clients.groq_client import achat_completion, get_sync_client, is_groq_configured
+from app.llm.clients.llm_health import llm_health
 
 settings = get_settings()
 
 
 def get_gemini_client():
-    """Return Groq client (legacy name kept for compatibility)."""
-    if not settings.groq_api_key:
-        return None
-    return Groq(api_key=settings.groq_api_key)
+    """Return the shared sync Groq client (legacy name kept for compatibility)."""
+    return get_sync_client()
 
 
 def is_gemini_available() -> bool:
-    """Check if Groq API key is configured."""
-    if not settings.groq_api_key:
-        print("[Groq] No API key configured")
-        return False
-    try:
-        client = Groq(api_key=settings.groq_api_key)
-        client.chat.completions.create(
-            messages=[{"role": "user", "content": "ping"}],
-            model=settings.groq_model,
-            max_tokens=8,
-        )
-        return True
-    except Exception as e:
-        print(f"[Groq] API error: {e}")
-        return False
+    """Cached Groq health state (see `llm_health`); never pings the provider."""
+    return llm_health.is_available()
 
 
 class GeminiChat:
     """Chat wrapper using Groq chat completions."""
     
     def __init__(self, system_prompt: Optional[str] = None, mock_response: Optional[str] = None):
-        self.client = get_gemini_client()
+        self.enabled = is_groq_configured()
         self.system_prompt = system_prompt or self._default_system_prompt()
         self.mock_response = mock_response or "AI dang o che do mock, chua cau hinh GROQ_API_KEY."
         self.history: List[Dict[str, str]] = []
@@ -57,7 +43,7 @@ Nguyên tắc:
 """
 
     async def chat(self, message: str, context: Optional[str] = None) -> str:
-        if not self.client:
+        if not self.enabled or not llm_health.is_available():
             return self._mock_response(message)
         try:
             messages = []
@@ -70,13 +56,7 @@ Nguyên tắc:
                 messages.append({"role": "assistant", "content": h["assistant"]})
             messages.append({"role": "user", "content": message})
 
-            resp = self.client.chat.completions.create(
-                model=settings.groq_model,
-                messages=messages,
-                temperature=settings.ai_temperature,
-                max_tokens=settings.ai_max_tokens,
-            )
-            assistant_message = resp.choices[0].message.content
+            assistant_message = await achat_completion(messages)
             assistant_message = self._clean_markdown(assistant_message)
             self.history.append({"user": message, "assistant": assistant_message})
             return assistant_message
@@ -3,7 +3,7 @@ import re
 from typing import Any, Dict, Optional, Tuple
 
 from app.core.config import get_settings
-from app.llm.gemini_client import get_gemini_client
+from app.llm.clients.groq_client import chat_completion, is_groq_configured
 from app.llm.prompts.in_meeting_prompts import INTENT_PROMPT
 
 
@@ -33,19 +33,16 @@ def _parse_intent_payload(text: str) -> Optional[Dict[str, Any]]:
 
 
 def _llm_intent(text: str, lang: str | None) -> Optional[Tuple[str, Dict[str, Any]]]:
-    client = get_gemini_client()
-    if not client:
+    if not is_groq_configured():
         return None
     prompt = INTENT_PROMPT + f"\n\nLanguage: {lang or 'vi'}\nText:\n{text.strip()}"
     try:
         settings = get_settings()
-        resp = client.chat.completions.create(
-            model=settings.groq_model,
-            messages=[{"role": "user", "content": prompt}],
+        content = chat_completion(
+            [{"role": "user", "content": prompt}],
             temperature=0.1,
             max_tokens=min(settings.ai_max_tokens, 128),
         )
-        content = resp.choices[0].message.content or ""
         payload = _parse_intent_payload(content)
         if not isinstance(payload, dict):
             return None
@@ -30,6 +30,17 @@ from app.api.v1.endpoints import (
     marketing,
 )
 from app.api.v1.websocket import in_meeting_ws
+from app.llm.clients import embeddings, groq_client
+from app.llm.clients.llm_health import llm_health
+from app.services.realtime_tick_pool import recap_tick_pool
+from app.services.realtime_bus import session_bus
+from app.services.realtime_session_store import session_store
+from app.services.in_meeting_writer import persistence_writer
+from app.workers.indexing_worker import bulk_reindexer, ingestion_worker
+from app.vectorstore.ingestion.extraction import extraction_engine
+from app.vectorstore.light_rag import light_rag_retriever
+from app.services.knowledge_rerank import chunk_reranker
+from app.services.smartvoice_channel import smartvoice_channels
 
 settings = get_settings()
 
@@ -89,6 +100,35 @@ upload_path.mkdir(parents=True, exist_ok=True)
 app.mount("/files", StaticFiles(directory=str(upload_path)), name="files")
 
 
+@app.on_event("startup")
+async def start_llm_health_probe():
+    llm_health.start()
+    session_store.start()
+    persistence_writer.start()
+    ingestion_worker.start()
+    smartvoice_channels.start()
+    if settings.knowledge_reindex_on_model_change:
+        bulk_reindexer.start()
+
+
+@app.on_event("shutdown")
+async def close_llm_client():
+    await llm_health.stop()
+    recap_tick_pool.shutdown()
+    await session_store.stop()
+    await persistence_writer.stop()
+    await bulk_reindexer.stop()
+    await ingestion_worker.stop()
+    extraction_engine.shutdown()
+    light_rag_retriever.shutdown()
+    chunk_reranker.shutdown()
+    await smartvoice_channels.close()
+    if hasattr(session_bus, "close"):
+        await session_bus.close()
+    await groq_client.aclose()
+    await embeddings.aclose()
+
+
 @app.get('/')
 def root():
     return {"message": "MeetMate backend scaffold running"}
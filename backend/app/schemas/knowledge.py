@@ -68,6 +68,42 @@ class KnowledgeDocumentUploadResponse(BaseModel):
     title: str
     file_url: str
     message: str = "Tài liệu đã được tải lên thành công"
+    job_id: Optional[UUID] = None  # background ingestion job; poll /knowledge/jobs/{job_id}
+
+
+class KnowledgeIngestJob(BaseModel):
+    """Background ingestion job status"""
+    id: UUID
+    document_id: UUID
+    status: str = Field(description="queued, running, done, failed")
+    stage: str = Field(description="last completed stage: queued, stored, indexed")
+    progress: float = 0.0
+    chunks_total: int = 0
+    chunks_done: int = 0
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class KnowledgeReindexRequest(BaseModel):
+    """Start a bulk re-index"""
+    force: bool = Field(False, description="Re-index every document, not only those embedded by another model")
+
+
+class KnowledgeReindexStatus(BaseModel):
+    """Progress of the bulk re-index in this process"""
+    running: bool = False
+    model_id: Optional[str] = None
+    force: bool = False
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    queued: int = 0
+    remaining: Optional[int] = None
+    error: Optional[str] = None
+
+    class Config:
+        protected_namespaces = ()
 
 
 class KnowledgeSearchRequest(BaseModel):
@@ -81,6 +117,7 @@ class KnowledgeSearchRequest(BaseModel):
     project_id: Optional[UUID] = None
     limit: int = 20
     offset: int = 0
+    recall: Optional[float] = Field(None, gt=0, le=1, description="Target ANN recall; 1.0 = exact search")
 
 
 class KnowledgeSearchResponse(BaseModel):
@@ -98,6 +135,7 @@ class KnowledgeQueryRequest(BaseModel):
     limit: int = 5
     meeting_id: Optional[UUID] = None
     project_id: Optional[UUID] = None
+    recall: Optional[float] = Field(None, gt=0, le=1, description="Target ANN recall; 1.0 = exact search")
 
 
 class KnowledgeQueryResponse(BaseModel):
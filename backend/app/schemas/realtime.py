@@ -53,6 +53,9 @@ class AudioStartMessage(BaseModel):
     frame_ms: int = 250
     stream_id: Optional[str] = None
     client_ts_ms: Optional[int] = None
+    # On reconnect: total PCM bytes the client has sent on this session (all connections),
+    # so the server can skip what it already has and keep the audio clock continuous.
+    resume_offset_bytes: Optional[int] = Field(default=None, ge=0)
 
 
 class TranscriptIngestPayload(BaseModel):
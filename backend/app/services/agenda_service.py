@@ -9,7 +9,6 @@ import json
 import re
 
 from sqlalchemy.orm import Session
-from groq import Groq
 
 from app.schemas.agenda import (
     AgendaItem,
@@ -21,6 +20,8 @@ from app.schemas.agenda import (
     AgendaSaveRequest,
 )
 from app.core.config import get_settings
+from app.llm.clients.groq_client import achat_completion
+from app.llm.clients.llm_health import llm_health
 
 logger = logging.getLogger(__name__)
 
@@ -259,13 +260,11 @@ async def generate_agenda_ai(
 ) -> AgendaGenerateResponse:
     """Generate agenda using Groq LLM"""
     
-    if not GROQ_AVAILABLE:
+    if not GROQ_AVAILABLE or not llm_health.is_available():
         logger.warning("Groq not available, returning mock agenda")
         return _generate_mock_agenda(request)
     
     try:
-        client = Groq(api_key=settings.groq_api_key)
-        
         # Build prompt
         prompt = f"""Bạn là AI assistant chuyên tạo agenda cho cuộc họp doanh nghiệp.
 
@@ -299,16 +298,13 @@ Trả về JSON theo format:
 
 Chỉ trả về JSON, không có text khác."""
 
-        resp = client.chat.completions.create(
-            model=settings.groq_model,
-            messages=[
+        response_text = await achat_completion(
+            [
                 {"role": "system", "content": "Bạn là trợ lý PMO, trả lời tiếng Việt, không markdown."},
                 {"role": "user", "content": prompt},
-            ],
-            temperature=settings.ai_temperature,
-            max_tokens=settings.ai_max_tokens,
+            ]
         )
-        response_text = resp.choices[0].message.content.strip()
+        response_text = response_text.strip()
         
         # Clean up response - remove markdown code blocks if present
         if response_text.startswith("```"):
@@ -0,0 +1,200 @@
+"""
+Per-session audio buffer between the ingest WebSocket and the SmartVoice stream.
+
+The receive loop pushes frames without ever waiting on STT (`push` is
+synchronous); `smartvoice_streaming` reads with `get`, like the asyncio.Queue it
+replaces. In between:
+
+- Frames are coalesced into `frame_ms` STT frames (a coalesced frame never
+  spans a gap), and a partial frame is flushed after `max_hold_ms` so quiet
+  periods don't add latency.
+- Buffered audio is capped at `max_bytes`. Over budget, silent frames (VAD
+  hangover / pre-roll) are dropped first, then the oldest speech, so a slow STT
+  stream costs transcript completeness rather than memory or receive latency.
+  `congested` tells the WebSocket to send the client a throttle event.
+- `timeline` records the stream position of each frame as it is handed to
+  STT; `to_stream_time` maps SmartVoice timestamps (which count only the audio
+  it received) back to the stream clock, across VAD suppression and drops.
+- Ingest lag (receive -> handed to STT) and backlog are tracked per session and
+  listed at GET /health/audio.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.services.audio_vad import AudioFrame
+
+
+class StreamTimeline:
+    """Forwarded-audio time -> stream time, from the positions of the forwarded frames."""
+
+    def __init__(self, sample_rate_hz: int) -> None:
+        self.sample_rate_hz = max(1, int(sample_rate_hz))
+        self._sent = 0
+        # (forwarded position, stream - forwarded offset) wherever the offset changes.
+        self._gap_pos: List[int] = []
+        self._gap_offset: List[int] = []
+
+    def record(self, pos: int, samples: int) -> None:
+        offset = pos - self._sent
+        if offset != (self._gap_offset[-1] if self._gap_offset else 0):
+            self._gap_pos.append(self._sent)
+            self._gap_offset.append(offset)
+        self._sent += samples
+
+    def to_stream_time(self, seconds: float, end: bool = False) -> float:
+        """
+        Map a time on the forwarded audio to the stream clock. A time right at a
+        gap maps after it, or before it with `end=True` (the end of a result).
+        """
+        pos = round(seconds * self.sample_rate_hz, 3)
+        i = (bisect.bisect_left if end else bisect.bisect_right)(self._gap_pos, pos)
+        return seconds + (self._gap_offset[i - 1] if i else 0) / self.sample_rate_hz
+
+
+@dataclass
+class _SttFrame:
+    pos: int
+    received_at: float
+    data: bytearray = field(default_factory=bytearray)
+    voiced: bool = False
+
+
+class AudioIngestBuffer:
+    def __init__(
+        self,
+        sample_rate_hz: int,
+        channels: int = 1,
+        frame_ms: int = 100,
+        max_bytes: int = 320_000,
+        max_hold_ms: Optional[int] = None,
+    ) -> None:
+        self.sample_rate_hz = max(1, int(sample_rate_hz))
+        self.channels = max(1, int(channels))
+        self.bytes_per_sample = 2 * self.channels
+        self.frame_bytes = max(self.bytes_per_sample, self.sample_rate_hz * int(frame_ms) // 1000 * self.bytes_per_sample)
+        self.max_bytes = max(self.frame_bytes, int(max_bytes))
+        self.max_hold_s = (frame_ms if max_hold_ms is None else max_hold_ms) / 1000.0
+        self.timeline = StreamTimeline(self.sample_rate_hz)
+        self._queue: Deque[_SttFrame] = deque()
+        self._queued_bytes = 0
+        self._acc: Optional[_SttFrame] = None
+        self._closed = False
+        self._ready = asyncio.Event()
+        self.frames_out = 0
+        self.dropped_silent_bytes = 0
+        self.dropped_voiced_bytes = 0
+        self.lag_ms_last = 0.0
+        self.lag_ms_max = 0.0
+
+    # ---- producer (WebSocket receive loop) -----------------------------------------
+
+    @property
+    def buffered_bytes(self) -> int:
+        return self._queued_bytes + (len(self._acc.data) if self._acc is not None else 0)
+
+    @property
+    def congested(self) -> bool:
+        return self.buffered_bytes * 2 >= self.max_bytes
+
+    def _seal(self) -> None:
+        if self._acc is not None and self._acc.data:
+            self._queue.append(self._acc)
+            self._queued_bytes += len(self._acc.data)
+        self._acc = None
+        self._ready.set()
+
+    def _enforce_budget(self) -> None:
+        while self.buffered_bytes > self.max_bytes and self._queue:
+            victim = next((f for f in self._queue if not f.voiced), None) or self._queue[0]
+            self._queue.remove(victim)
+            self._queued_bytes -= len(victim.data)
+            if victim.voiced:
+                self.dropped_voiced_bytes += len(victim.data)
+            else:
+                self.dropped_silent_bytes += len(victim.data)
+
+    def push(self, frame: AudioFrame) -> None:
+        """Add a frame (never blocks); may drop older audio to stay within `max_bytes`."""
+        if self._closed or not frame.pcm:
+            return
+        acc = self._acc
+        if acc is not None and frame.pos != acc.pos + len(acc.data) // self.bytes_per_sample:
+            self._seal()  # discontinuity: a coalesced frame stays contiguous
+            acc = None
+        if acc is None:
+            acc = self._acc = _SttFrame(pos=frame.pos, received_at=time.monotonic())
+        acc.data += frame.pcm
+        acc.voiced = acc.voiced or frame.voiced
+        if len(acc.data) >= self.frame_bytes:
+            self._seal()
+        self._enforce_budget()
+
+    def close(self) -> None:
+        """End of audio: `get` drains what is buffered, then returns None."""
+        self._closed = True
+        self._ready.set()
+
+    # ---- consumer (SmartVoice request stream) --------------------------------------
+
+    def _take(self) -> bytes:
+        frame = self._queue.popleft()
+        self._queued_bytes -= len(frame.data)
+        self.timeline.record(frame.pos, len(frame.data) // self.bytes_per_sample)
+        self.lag_ms_last = (time.monotonic() - frame.received_at) * 1000.0
+        self.lag_ms_max = max(self.lag_ms_max, self.lag_ms_last)
+        self.frames_out += 1
+        return bytes(frame.data)
+
+    async def get(self) -> Optional[bytes]:
+        """Next STT frame, or None once closed and drained."""
+        while True:
+            if self._queue:
+                return self._take()
+            acc = self._acc
+            if acc is not None and (self._closed or time.monotonic() - acc.received_at >= self.max_hold_s):
+                self._seal()
+                continue
+            if self._closed:
+                return None
+            self._ready.clear()
+            timeout = None if acc is None else max(0.0, self.max_hold_s - (time.monotonic() - acc.received_at))
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, float]:
+        bytes_per_ms = self.sample_rate_hz * self.bytes_per_sample / 1000.0
+        return {
+            "backlog_ms": round(self.buffered_bytes / bytes_per_ms, 1),
+            "lag_ms_last": round(self.lag_ms_last, 1),
+            "lag_ms_max": round(self.lag_ms_max, 1),
+            "frames_out": self.frames_out,
+            "dropped_silent_ms": round(self.dropped_silent_bytes / bytes_per_ms, 1),
+            "dropped_voiced_ms": round(self.dropped_voiced_bytes / bytes_per_ms, 1),
+        }
+
+
+# Buffers of the audio sockets currently open in this process, by session id.
+active_ingest_buffers: Dict[str, AudioIngestBuffer] = {}
+
+
+def build_ingest_buffer(sample_rate_hz: int, channels: int) -> AudioIngestBuffer:
+    settings = get_settings()
+    return AudioIngestBuffer(
+        sample_rate_hz,
+        channels,
+        frame_ms=settings.audio_ingest_frame_ms,
+        max_bytes=settings.audio_ingest_max_buffered_bytes,
+    )
+
+
+def ingest_stats() -> Dict[str, Dict[str, float]]:
+    return {session_id: buf.stats() for session_id, buf in list(active_ingest_buffers.items())}
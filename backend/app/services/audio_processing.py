@@ -3,12 +3,17 @@ Audio Processing Service
 Extract audio from video files and process audio for transcription
 """
 import logging
+import mmap
+import struct
 import subprocess
 import tempfile
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import wave
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -104,3 +109,115 @@ def get_audio_info(audio_path: str | Path) -> dict:
         logger.error(f"Failed to read audio file: {e}")
         raise RuntimeError(f"Failed to read audio file: {e}")
 
+
+
+@dataclass
+class PcmWav:
+    """16-bit PCM WAV data memory-mapped from disk (pages are read only when sliced)."""
+    samples: np.ndarray  # int16, frames x channels flattened; a view on `_mmap`
+    sample_rate: int
+    channels: int
+    _mmap: mmap.mmap
+
+    @property
+    def frames(self) -> int:
+        return self.samples.shape[0] // self.channels
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frames / self.sample_rate
+
+    def pcm_bytes(self, start_frame: int, end_frame: int) -> bytes:
+        return self.samples[start_frame * self.channels : end_frame * self.channels].tobytes()
+
+    def close(self) -> None:
+        self.samples = np.empty(0, dtype="<i2")
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # a slice is still referenced; the map is released with it
+
+    def __enter__(self) -> "PcmWav":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_pcm_wav(audio_path: str | Path) -> PcmWav:
+    """
+    Memory-map a 16-bit PCM WAV file. The RIFF chunks are walked to find `fmt `
+    and `data`, so the samples are never copied into memory as a whole.
+    """
+    audio_path = Path(audio_path)
+    if not audio_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    with open(audio_path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if mm[:4] != b"RIFF" or mm[8:12] != b"WAVE":
+            raise RuntimeError(f"Not a WAV file: {audio_path}")
+        pos, fmt, data = 12, None, None
+        while pos + 8 <= len(mm):
+            chunk_id, size = mm[pos : pos + 4], struct.unpack("<I", mm[pos + 4 : pos + 8])[0]
+            if chunk_id == b"fmt ":
+                fmt = struct.unpack("<HHIIHH", mm[pos + 8 : pos + 24])
+            elif chunk_id == b"data":
+                data = (pos + 8, min(size, len(mm) - pos - 8))
+                break
+            pos += 8 + size + (size & 1)
+        if fmt is None or data is None:
+            raise RuntimeError(f"WAV file has no fmt/data chunk: {audio_path}")
+        audio_format, channels, sample_rate, _, _, bits = fmt
+        if audio_format != 1 or bits != 16:
+            raise RuntimeError(f"Expected 16-bit PCM WAV, got format={audio_format} bits={bits}")
+        offset, size = data
+        samples = np.frombuffer(mm, dtype="<i2", count=size // 2, offset=offset)
+        return PcmWav(samples=samples, sample_rate=sample_rate, channels=channels, _mmap=mm)
+    except Exception:
+        mm.close()
+        raise
+
+
+def plan_windows(
+    wav: PcmWav,
+    window_seconds: float = 60.0,
+    overlap_seconds: float = 2.0,
+    search_seconds: float = 5.0,
+    frame_ms: int = 30,
+) -> List[Tuple[int, int]]:
+    """
+    Split a recording into (start_frame, end_frame) windows of at most
+    `window_seconds`. Each window ends at the quietest `frame_ms` frame within the
+    last `search_seconds` before its nominal end (a pause, so no word is cut),
+    and the next window starts `overlap_seconds` before that cut to give the
+    recognizer context; words in the overlap are de-duplicated when stitching.
+    """
+    rate = wav.sample_rate
+    total = wav.frames
+    window = max(1, int(window_seconds * rate))
+    overlap = max(0, int(overlap_seconds * rate))
+    search = min(max(0, int(search_seconds * rate)), max(0, window - overlap - 1))
+    frame = max(1, int(rate * frame_ms / 1000))
+    windows: List[Tuple[int, int]] = []
+    start = 0
+    while start < total:
+        end = start + window
+        if end >= total:
+            windows.append((start, total))
+            break
+        if search >= frame:
+            region_start = end - search
+            region = wav.samples[region_start * wav.channels : end * wav.channels]
+            n = len(region) // (frame * wav.channels)
+            energy = (
+                np.square(region[: n * frame * wav.channels].astype(np.float32))
+                .reshape(n, frame * wav.channels)
+                .mean(axis=1)
+            )
+            # Cut in the middle of the quietest frame (the latest one on ties).
+            quietest = n - 1 - int(np.argmin(energy[::-1]))
+            end = region_start + quietest * frame + frame // 2
+        windows.append((start, end))
+        start = max(end - overlap, start + 1)
+    return windows
@@ -0,0 +1,205 @@
+"""
+Voice-activity gate for the audio ingest WebSocket (in_meeting_ws.audio_ingest).
+
+Muted participants and pauses would otherwise stream silence to SmartVoice:
+paid recognition time, and a full `audio_queue` (throttle events).
+`VoiceActivityGate.process` splits each int16 PCM buffer into `frame_ms` frames
+and drops the quiet ones:
+
+- A frame is speech when its RMS level (dBFS, vectorized over the buffer) is
+  above `threshold_dbfs` and at least `noise_margin_db` above the tracked
+  noise floor. The floor only learns from non-speech frames outside the
+  hangover, so it follows slowly rising background noise but a long steady
+  talker never raises it; noise that is loud from the start is what
+  `threshold_dbfs` is for.
+- `hangover_ms` of audio keeps flowing after speech stops, so trailing
+  syllables survive and SmartVoice still sees the pause that ends an utterance.
+- `preroll_ms` of the latest suppressed audio is sent just before speech
+  resumes, so word onsets aren't clipped.
+
+Output frames carry their position on the full stream (the ingest
+`_AudioClock` timeline), so the ingest buffer (audio_ingest_buffer) can map
+SmartVoice timestamps, which count only the audio it received, back past the
+dropped silences.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List
+
+import numpy as np
+
+from app.core.config import get_settings
+
+
+@dataclass
+class AudioFrame:
+    pos: int  # stream position of the first sample (samples per channel)
+    pcm: bytes
+    voiced: bool = True  # False for hangover / pre-roll audio
+
+
+class VoiceActivityGate:
+    def __init__(
+        self,
+        sample_rate_hz: int,
+        channels: int = 1,
+        frame_ms: int = 30,
+        threshold_dbfs: float = -45.0,
+        noise_margin_db: float = 10.0,
+        hangover_ms: int = 500,
+        preroll_ms: int = 300,
+        pos: int = 0,
+    ) -> None:
+        self.sample_rate_hz = max(1, int(sample_rate_hz))
+        self.channels = max(1, int(channels))
+        self.frame = max(1, self.sample_rate_hz * int(frame_ms) // 1000)  # samples per channel
+        self.threshold_dbfs = float(threshold_dbfs)
+        self.noise_margin_db = float(noise_margin_db)
+        self.hangover = self.sample_rate_hz * int(hangover_ms) // 1000
+        self.preroll = self.sample_rate_hz * int(preroll_ms) // 1000
+        self._noise_db = self.threshold_dbfs - self.noise_margin_db
+        self._hang_left = 0
+        self._pending: Deque[AudioFrame] = deque()  # suppressed frames that may become pre-roll
+        self._pending_samples = 0
+        self._dropped = 0  # samples (per channel) removed from the stream so far
+        self._dropped_at_resume = 0
+        self.gaps = 0
+        self.received_samples = 0
+        self._pos = int(pos)  # stream position of the next incoming sample
+
+    # ---- classification ------------------------------------------------------------
+
+    def _levels_db(self, frames: np.ndarray) -> np.ndarray:
+        power = np.mean(np.square(frames.astype(np.float32) / 32768.0), axis=1)
+        return 10.0 * np.log10(power + 1e-12)
+
+    def _is_speech(self, level_db: float) -> bool:
+        speech = level_db > max(self.threshold_dbfs, self._noise_db + self.noise_margin_db)
+        if not speech and self._hang_left <= 0:
+            # Noise floor: follows quieter frames quickly and louder ones slowly; frozen during speech.
+            rate = 0.5 if level_db < self._noise_db else 0.005
+            self._noise_db += rate * (level_db - self._noise_db)
+        return speech
+
+    # ---- gating --------------------------------------------------------------------
+
+    def _frame_samples(self, frame: AudioFrame) -> int:
+        return len(frame.pcm) // (2 * self.channels)
+
+    def _drop_oldest(self) -> None:
+        while self._pending and self._pending_samples - self._frame_samples(self._pending[0]) >= self.preroll:
+            size = self._frame_samples(self._pending.popleft())
+            self._pending_samples -= size
+            self._dropped += size
+
+    def _resume(self, out: List[AudioFrame]) -> None:
+        """Speech after a suppressed stretch: release the pre-roll."""
+        if self._dropped != self._dropped_at_resume:
+            self._dropped_at_resume = self._dropped
+            self.gaps += 1
+        out.extend(self._pending)
+        self._pending.clear()
+        self._pending_samples = 0
+
+    def process(self, pcm: bytes) -> List[AudioFrame]:
+        """Frames to forward for one incoming PCM buffer (empty while suppressed), oldest first."""
+        samples = np.frombuffer(pcm, dtype="<i2")
+        samples = samples[: len(samples) - len(samples) % self.channels]
+        n = len(samples) // self.channels
+        if not n:
+            return []
+        base = self._pos
+        self._pos += n
+        self.received_samples += n
+        step = self.frame * self.channels
+        full = len(samples) // step
+        chunks = [samples[i * step : (i + 1) * step] for i in range(full)]
+        if len(samples) > full * step:
+            chunks.append(samples[full * step :])
+        levels = self._levels_db(samples[: full * step].reshape(full, step)) if full else np.empty(0)
+        if len(chunks) > full:
+            levels = np.append(levels, self._levels_db(chunks[-1].reshape(1, -1)))
+
+        out: List[AudioFrame] = []
+        for i, (chunk, level) in enumerate(zip(chunks, levels)):
+            size = len(chunk) // self.channels
+            frame = AudioFrame(pos=base + i * self.frame, pcm=chunk.tobytes(), voiced=False)
+            if self._is_speech(float(level)):
+                if self._pending or self._hang_left <= 0:
+                    self._resume(out)
+                self._hang_left = self.hangover
+                frame.voiced = True
+            elif self._hang_left > 0:
+                self._hang_left -= size
+            else:
+                self._pending.append(frame)
+                self._pending_samples += size
+                self._drop_oldest()
+                continue
+            out.append(frame)
+        return out
+
+    def skip(self, samples: int) -> None:
+        """Stream audio that will never arrive (lost across a reconnect)."""
+        self._pos += max(0, int(samples))
+        self._dropped += self._pending_samples  # no longer contiguous with what follows
+        self._pending.clear()
+        self._pending_samples = 0
+        self._hang_left = 0
+
+    def stats(self) -> Dict[str, float]:
+        received = self.received_samples / self.sample_rate_hz
+        suppressed = self._dropped / self.sample_rate_hz
+        return {
+            "received_seconds": round(received, 3),
+            "suppressed_seconds": round(suppressed, 3),
+            "suppressed_ratio": round(suppressed / received, 4) if received else 0.0,
+            "gaps": self.gaps,
+        }
+
+
+class VoiceGateMetrics:
+    """Process-wide totals over finished ingest sessions (GET /health/audio)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.sessions = 0
+        self.received_seconds = 0.0
+        self.suppressed_seconds = 0.0
+
+    def record(self, gate: VoiceActivityGate) -> None:
+        stats = gate.stats()
+        with self._lock:
+            self.sessions += 1
+            self.received_seconds += stats["received_seconds"]
+            self.suppressed_seconds += stats["suppressed_seconds"]
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            received, suppressed = self.received_seconds, self.suppressed_seconds
+            return {
+                "sessions": self.sessions,
+                "received_seconds": round(received, 3),
+                "suppressed_seconds": round(suppressed, 3),
+                "suppressed_ratio": round(suppressed / received, 4) if received else 0.0,
+            }
+
+
+def build_voice_gate(sample_rate_hz: int, channels: int, pos: int = 0) -> VoiceActivityGate:
+    settings = get_settings()
+    return VoiceActivityGate(
+        sample_rate_hz,
+        channels,
+        frame_ms=settings.audio_vad_frame_ms,
+        threshold_dbfs=settings.audio_vad_threshold_dbfs,
+        noise_margin_db=settings.audio_vad_noise_margin_db,
+        hangover_ms=settings.audio_vad_hangover_ms,
+        preroll_ms=settings.audio_vad_preroll_ms,
+        pos=pos,
+    )
+
+
+voice_gate_metrics = VoiceGateMetrics()
@@ -0,0 +1,169 @@
+"""
+Hybrid chunk retrieval for the knowledge base: pgvector + full-text, fused with RRF.
+
+Two legs run concurrently, each on its own DB session in a worker thread:
+- vector: cosine distance over `knowledge_chunk.embedding` via PgVectorClient (ANN knobs from ann_index)
+- lexical: `knowledge_chunk.content_tsv` (unaccented 'simple' tsvector, GIN) ORed over
+  the query words, plus substring matches for code-like tokens such as
+  "09/2020/TT-NHNN" through a trigram index on the unaccented content.
+  Both indexes come from infra/postgres/init/13_knowledge_chunk_fts.sql.
+
+Ranked lists are merged with reciprocal-rank fusion: score = sum(w / (k + rank)).
+Either leg may be empty (no embedding provider, no lexical terms, DB error) and
+the other still answers.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.vectorstore.pgvector_client import CHUNK_COLUMNS, ChunkFilter, PgVectorClient
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+# Regulation/document numbers: alphanumerics joined by / - . with at least one digit.
+_CODE_RE = re.compile(r"[^\W_]+(?:[/.\-][^\W_]+)+")
+_WORD_RE = re.compile(r"[^\W_]+")
+_STOPWORDS = {
+    "là", "gì", "của", "và", "có", "không", "cho", "các", "những", "được", "trong", "với",
+    "về", "theo", "này", "thì", "như", "nào", "nhé", "ạ", "ơi", "hãy", "giúp", "tôi", "mình",
+    "the", "a", "an", "of", "to", "in", "is", "are", "what", "for", "and", "or", "on", "how",
+}
+_MAX_TERMS = 32
+
+
+def lexical_terms(query: str) -> Tuple[List[str], List[str]]:
+    """(words for the tsquery, code-like tokens for substring match), lowercased, de-duplicated."""
+    q = (query or "").lower()
+    codes = list(dict.fromkeys(c for c in _CODE_RE.findall(q) if any(ch.isdigit() for ch in c)))
+    words = [w for w in dict.fromkeys(_WORD_RE.findall(q)) if w not in _STOPWORDS and (len(w) > 1 or w.isdigit())]
+    return words[:_MAX_TERMS], codes[:8]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Tuple[Hashable, float]]:
+    """Fuse ranked key lists; returns (key, score) best first. Ties keep first-seen order."""
+    scores: Dict[Hashable, float] = {}
+    for i, ranking in enumerate(rankings):
+        weight = 1.0 if weights is None else float(weights[i])
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def chunk_key(row: Row) -> Tuple[str, Any]:
+    return (str(row["id"]), row["chunk_index"])
+
+
+def _vector_leg(
+    bind: Any, filters: ChunkFilter, query_vec: Sequence[float], top_k: int, recall: Optional[float], per_document: bool
+) -> List[Row]:
+    return PgVectorClient(bind).search(query_vec, filters, top_k=top_k, recall=recall, per_document=per_document)
+
+
+def _lexical_leg(bind: Any, filters: ChunkFilter, words: List[str], codes: List[str], top_k: int) -> List[Row]:
+    where_clause, params = filters.to_sql()
+    params = {**params, "top_k": top_k, "tsq": " | ".join(words)}
+    matches = []
+    code_hits = []
+    if words:
+        matches.append("kc.content_tsv @@ q.tsq")
+    for i, code in enumerate(codes):
+        params[f"code_{i}"] = code
+        # Same expression as the trigram index, and the pattern folds to a constant.
+        cond = f"meetmate_unaccent(lower(kc.content)) LIKE '%' || meetmate_unaccent(:code_{i}) || '%'"
+        matches.append(cond)
+        code_hits.append(f"(CASE WHEN {cond} THEN 1 ELSE 0 END)")
+    code_score = " + ".join(code_hits) if code_hits else "0"
+    tsq_expr = "to_tsquery('simple', meetmate_unaccent(:tsq))" if words else "NULL::tsquery"
+    with Session(bind=bind) as db:
+        rows = db.execute(
+            text(
+                f"""
+                WITH q AS (SELECT {tsq_expr} AS tsq)
+                SELECT {CHUNK_COLUMNS},
+                    ({code_score}) + COALESCE(ts_rank_cd(kc.content_tsv, q.tsq), 0) AS lexical_score
+                FROM knowledge_chunk kc
+                JOIN knowledge_document kd ON kc.document_id = kd.id
+                CROSS JOIN q
+                WHERE {where_clause} AND ({' OR '.join(matches)})
+                ORDER BY lexical_score DESC
+                LIMIT :top_k
+                """
+            ),
+            params,
+        ).mappings().all()
+        return [dict(r) for r in rows]
+
+
+async def _run_leg(name: str, fn, *args) -> List[Row]:
+    try:
+        return await asyncio.to_thread(fn, *args)
+    except Exception as exc:
+        logger.warning("hybrid retrieval: %s leg failed: %s", name, exc)
+        return []
+
+
+async def hybrid_search_chunks(
+    db: Session,
+    query: str,
+    filters: ChunkFilter,
+    *,
+    query_vec: Optional[Sequence[float]],
+    top_k: int,
+    recall: Optional[float] = None,
+    per_document: bool = False,
+) -> List[Row]:
+    """
+    Fused chunk rows (document columns + content, chunk_index, page range, section), best first.
+    With `per_document`, the vector leg returns only each document's closest chunk.
+
+    Each row carries `rrf_score`, `distance` (None if only the lexical leg found
+    it) and `lexical_score` (None if only the vector leg found it).
+    """
+    settings = get_settings()
+    bind = db.get_bind()
+    words, codes = lexical_terms(query)
+    legs = []
+    if query_vec is not None:
+        legs.append(_run_leg("vector", _vector_leg, bind, filters, query_vec, top_k, recall, per_document))
+    else:
+        legs.append(asyncio.sleep(0, result=[]))
+    if words or codes:
+        legs.append(_run_leg("lexical", _lexical_leg, bind, filters, words, codes, top_k))
+    else:
+        legs.append(asyncio.sleep(0, result=[]))
+    vector_rows, lexical_rows = await asyncio.gather(*legs)
+
+    by_key: Dict[Tuple[str, Any], Row] = {}
+    for row in vector_rows:
+        by_key[chunk_key(row)] = {**row, "lexical_score": None}
+    for row in lexical_rows:
+        key = chunk_key(row)
+        if key in by_key:
+            by_key[key]["lexical_score"] = row["lexical_score"]
+        else:
+            by_key[key] = {**row, "distance": None}
+
+    fused = reciprocal_rank_fusion(
+        [[chunk_key(r) for r in vector_rows], [chunk_key(r) for r in lexical_rows]],
+        k=settings.knowledge_hybrid_rrf_k,
+        weights=(settings.knowledge_hybrid_vector_weight, settings.knowledge_hybrid_lexical_weight),
+    )
+    out = []
+    for key, score in fused[:top_k]:
+        row = by_key[key]
+        row["rrf_score"] = score
+        out.append(row)
+    return out
@@ -1,6 +1,6 @@
 from datetime import datetime, date
 import uuid
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
@@ -11,6 +11,37 @@ from app.models import (
     AdrHistory,
     ToolSuggestion,
 )
+from app.schemas.transcript import TranscriptChunkCreate
+from app.services import transcript_service
+
+_ACTION_INSERT = text("""
+    INSERT INTO action_item (
+        meeting_id, owner_user_id, description, deadline, priority,
+        status, source_text, external_task_link, external_task_id
+    )
+    VALUES (
+        :meeting_id, :owner_user_id, :description, :deadline, :priority,
+        :status, :source_text, :external_task_link, :external_task_id
+    )
+""")
+_DECISION_INSERT = text("""
+    INSERT INTO decision_item (
+        meeting_id, description, rationale, source_text, status
+    )
+    VALUES (
+        :meeting_id, :description, :rationale, :source_text, :status
+    )
+""")
+_RISK_INSERT = text("""
+    INSERT INTO risk_item (
+        meeting_id, description, severity, mitigation,
+        source_text, status, owner_user_id
+    )
+    VALUES (
+        :meeting_id, :description, :severity, :mitigation,
+        :source_text, :status, :owner_user_id
+    )
+""")
 
 
 def _coerce_uuid(value: Any) -> Optional[str]:
@@ -86,86 +117,135 @@ def persist_topic_segment(db: Session, meeting_id: str, segment: Dict[str, Any])
         return None
 
 
-def persist_adr(db: Session, meeting_id: str, actions: List[Dict[str, Any]], decisions: List[Dict[str, Any]], risks: List[Dict[str, Any]]) -> None:
-    action_query = text("""
-        INSERT INTO action_item (
-            meeting_id, owner_user_id, description, deadline, priority,
-            status, source_text, external_task_link, external_task_id
-        )
-        VALUES (
-            :meeting_id, :owner_user_id, :description, :deadline, :priority,
-            :status, :source_text, :external_task_link, :external_task_id
-        )
-    """)
-    decision_query = text("""
-        INSERT INTO decision_item (
-            meeting_id, description, rationale, source_text, status
-        )
-        VALUES (
-            :meeting_id, :description, :rationale, :source_text, :status
-        )
-    """)
-    risk_query = text("""
-        INSERT INTO risk_item (
-            meeting_id, description, severity, mitigation,
-            source_text, status, owner_user_id
+def _adr_rows(
+    meeting_id: str,
+    actions: List[Dict[str, Any]],
+    decisions: List[Dict[str, Any]],
+    risks: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], List[AdrHistory]]:
+    action_rows, decision_rows, risk_rows, history = [], [], [], []
+    for a in actions or []:
+        description = a.get("task") or a.get("description")
+        if not description:
+            continue
+        action_rows.append({
+            "meeting_id": meeting_id,
+            "owner_user_id": _coerce_uuid(a.get("owner") or a.get("owner_user_id")),
+            "description": description,
+            "deadline": _coerce_date(a.get("due_date") or a.get("deadline")),
+            "priority": a.get("priority") or "medium",
+            "status": a.get("status") or "proposed",
+            "source_text": a.get("source_text"),
+            "external_task_link": a.get("external_task_link"),
+            "external_task_id": a.get("external_task_id") or a.get("external_id"),
+        })
+        history.append(AdrHistory(meeting_id=meeting_id, item_type="action", payload=a, operation="add"))
+
+    for d in decisions or []:
+        description = d.get("title") or d.get("description")
+        if not description:
+            continue
+        rationale = d.get("rationale")
+        impact = d.get("impact")
+        if impact:
+            impact_note = f"Impact: {impact}"
+            rationale = f"{rationale}\n{impact_note}" if rationale else impact_note
+        decision_rows.append({
+            "meeting_id": meeting_id,
+            "description": description,
+            "rationale": rationale,
+            "source_text": d.get("source_text"),
+            "status": d.get("status") or "proposed",
+        })
+        history.append(AdrHistory(meeting_id=meeting_id, item_type="decision", payload=d, operation="add"))
+
+    for r in risks or []:
+        description = r.get("desc") or r.get("description")
+        if not description:
+            continue
+        risk_rows.append({
+            "meeting_id": meeting_id,
+            "description": description,
+            "severity": r.get("severity") or "medium",
+            "mitigation": r.get("mitigation"),
+            "source_text": r.get("source_text"),
+            "status": r.get("status") or "proposed",
+            "owner_user_id": _coerce_uuid(r.get("owner") or r.get("owner_user_id")),
+        })
+        history.append(AdrHistory(meeting_id=meeting_id, item_type="risk", payload=r, operation="add"))
+    return action_rows, decision_rows, risk_rows, history
+
+
+def write_adr(
+    db: Session,
+    meeting_id: str,
+    actions: List[Dict[str, Any]],
+    decisions: List[Dict[str, Any]],
+    risks: List[Dict[str, Any]],
+) -> None:
+    """Queue ADR inserts on `db` as one executemany per table (no commit, raises on error)."""
+    action_rows, decision_rows, risk_rows, history = _adr_rows(meeting_id, actions, decisions, risks)
+    if action_rows:
+        db.execute(_ACTION_INSERT, action_rows)
+    if decision_rows:
+        db.execute(_DECISION_INSERT, decision_rows)
+    if risk_rows:
+        db.execute(_RISK_INSERT, risk_rows)
+    db.add_all(history)
+
+
+def write_topic_segments(db: Session, meeting_id: str, segments: List[Dict[str, Any]]) -> None:
+    db.add_all([
+        TopicSegment(
+            meeting_id=meeting_id,
+            topic_id=segment.get("topic_id"),
+            title=segment.get("title"),
+            start_t=segment.get("start_t", 0.0),
+            end_t=segment.get("end_t", 0.0),
         )
-        VALUES (
-            :meeting_id, :description, :severity, :mitigation,
-            :source_text, :status, :owner_user_id
+        for segment in segments or []
+    ])
+
+
+def write_tool_suggestions(db: Session, meeting_id: str, suggestions: List[Dict[str, Any]]) -> None:
+    db.add_all([
+        ToolSuggestion(
+            meeting_id=meeting_id,
+            suggestion_id=s.get("suggestion_id"),
+            type=s.get("type"),
+            action_hash=s.get("action_hash"),
+            payload=s.get("payload"),
         )
-    """)
+        for s in suggestions or []
+    ])
+
+
+def persist_session_batch(
+    db: Session,
+    meeting_id: str,
+    transcripts: Optional[List[TranscriptChunkCreate]] = None,
+    topic_segments: Optional[List[Dict[str, Any]]] = None,
+) -> None:
+    """
+    Write one coalesced batch for a live session (used by the write-behind queue).
+    Transcripts are upserted first (idempotent); topic segments go in a single
+    transaction, so a retried batch never duplicates rows. Raises on failure.
+    """
+    if transcripts:
+        transcript_service.bulk_upsert_transcript_chunks(db, meeting_id, transcripts)
+    if not topic_segments:
+        return
     try:
-        for a in actions or []:
-            description = a.get("task") or a.get("description")
-            if not description:
-                continue
-            db.execute(action_query, {
-                "meeting_id": meeting_id,
-                "owner_user_id": _coerce_uuid(a.get("owner") or a.get("owner_user_id")),
-                "description": description,
-                "deadline": _coerce_date(a.get("due_date") or a.get("deadline")),
-                "priority": a.get("priority") or "medium",
-                "status": a.get("status") or "proposed",
-                "source_text": a.get("source_text"),
-                "external_task_link": a.get("external_task_link"),
-                "external_task_id": a.get("external_task_id") or a.get("external_id"),
-            })
-            db.add(AdrHistory(meeting_id=meeting_id, item_type="action", payload=a, operation="add"))
-
-        for d in decisions or []:
-            description = d.get("title") or d.get("description")
-            if not description:
-                continue
-            rationale = d.get("rationale")
-            impact = d.get("impact")
-            if impact:
-                impact_note = f"Impact: {impact}"
-                rationale = f"{rationale}\n{impact_note}" if rationale else impact_note
-            db.execute(decision_query, {
-                "meeting_id": meeting_id,
-                "description": description,
-                "rationale": rationale,
-                "source_text": d.get("source_text"),
-                "status": d.get("status") or "proposed",
-            })
-            db.add(AdrHistory(meeting_id=meeting_id, item_type="decision", payload=d, operation="add"))
-
-        for r in risks or []:
-            description = r.get("desc") or r.get("description")
-            if not description:
-                continue
-            db.execute(risk_query, {
-                "meeting_id": meeting_id,
-                "description": description,
-                "severity": r.get("severity") or "medium",
-                "mitigation": r.get("mitigation"),
-                "source_text": r.get("source_text"),
-                "status": r.get("status") or "proposed",
-                "owner_user_id": _coerce_uuid(r.get("owner") or r.get("owner_user_id")),
-            })
-            db.add(AdrHistory(meeting_id=meeting_id, item_type="risk", payload=r, operation="add"))
+        write_topic_segments(db, meeting_id, topic_segments)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
 
+
+def persist_adr(db: Session, meeting_id: str, actions: List[Dict[str, Any]], decisions: List[Dict[str, Any]], risks: List[Dict[str, Any]]) -> None:
+    try:
+        write_adr(db, meeting_id, actions, decisions, risks)
         db.commit()
     except Exception as e:
         db.rollback()
@@ -174,15 +254,7 @@ def persist_adr(db: Session, meeting_id: str, actions: List[Dict[str, Any]], dec
 
 def persist_tool_suggestions(db: Session, meeting_id: str, suggestions: List[Dict[str, Any]]) -> None:
     try:
-        for s in suggestions or []:
-            row = ToolSuggestion(
-                meeting_id=meeting_id,
-                suggestion_id=s.get("suggestion_id"),
-                type=s.get("type"),
-                action_hash=s.get("action_hash"),
-                payload=s.get("payload"),
-            )
-            db.add(row)
+        write_tool_suggestions(db, meeting_id, suggestions)
         db.commit()
     except Exception as e:
         db.rollback()
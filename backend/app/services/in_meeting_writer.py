@@ -0,0 +1,231 @@
+"""
+Write-behind persistence for live meetings.
+
+Live handlers enqueue transcript chunks and topic segments here instead of
+writing to the DB inline (the live tick no longer extracts ADR items or tool
+suggestions). Per meeting, events are coalesced (transcripts by chunk_index,
+topics by (topic_id, start_t)) and flushed as one batch when the buffer reaches
+`flush_max_items` or is older than `flush_interval_s`, and always on session
+close. Flushes run in a worker thread; transient DB errors are retried with
+backoff, and a batch that still fails is put back (bounded by `max_buffered`).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from app.core.config import get_settings
+from app.schemas.transcript import TranscriptChunkCreate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _MeetingBuffer:
+    transcripts: Dict[int, TranscriptChunkCreate] = field(default_factory=dict)
+    topic_segments: Dict[Tuple[Any, Any], Dict[str, Any]] = field(default_factory=dict)
+    first_enqueued_at: float = 0.0
+
+    def size(self) -> int:
+        return len(self.transcripts) + len(self.topic_segments)
+
+    def merge_back(self, older: "_MeetingBuffer") -> None:
+        """Re-queue a failed batch ahead of anything enqueued since (newer values win)."""
+        self.transcripts = {**older.transcripts, **self.transcripts}
+        self.topic_segments = {**older.topic_segments, **self.topic_segments}
+        self.first_enqueued_at = min(filter(None, (older.first_enqueued_at, self.first_enqueued_at)), default=0.0)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, (OperationalError, InterfaceError)):
+        return True
+    return isinstance(exc, DBAPIError) and bool(getattr(exc, "connection_invalidated", False))
+
+
+def _default_writer(meeting_id: str, batch: _MeetingBuffer) -> None:
+    from app.db.session import SessionLocal
+    from app.services.in_meeting_persistence import persist_session_batch
+
+    db = SessionLocal()
+    try:
+        persist_session_batch(
+            db,
+            meeting_id,
+            transcripts=list(batch.transcripts.values()),
+            topic_segments=list(batch.topic_segments.values()),
+        )
+    finally:
+        db.close()
+
+
+class WriteBehindQueue:
+    def __init__(
+        self,
+        flush_max_items: int = 200,
+        flush_interval_s: float = 2.0,
+        max_retries: int = 3,
+        retry_backoff_s: float = 0.5,
+        max_buffered: int = 10000,
+        writer: Optional[Callable[[str, _MeetingBuffer], None]] = None,
+    ) -> None:
+        self.flush_max_items = max(1, int(flush_max_items))
+        self.flush_interval_s = float(flush_interval_s)
+        self.max_retries = max(0, int(max_retries))
+        self.retry_backoff_s = float(retry_backoff_s)
+        self.max_buffered = max(self.flush_max_items, int(max_buffered))
+        self._writer = writer or _default_writer
+        self._buffers: Dict[str, _MeetingBuffer] = {}
+        self._flushing: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.flushed_batches = 0
+        self.failed_batches = 0
+        self.dropped_items = 0
+
+    # ---- enqueue (event loop thread) ------------------------------------------
+
+    def _buffer(self, meeting_id: str) -> _MeetingBuffer:
+        buf = self._buffers.get(meeting_id)
+        if buf is None:
+            buf = self._buffers[meeting_id] = _MeetingBuffer()
+        if not buf.first_enqueued_at:
+            buf.first_enqueued_at = time.monotonic()
+        return buf
+
+    def _after_enqueue(self, meeting_id: str) -> None:
+        if self._buffers[meeting_id].size() >= self.flush_max_items:
+            self._schedule_flush(meeting_id)
+
+    def enqueue_transcripts(self, meeting_id: str, chunks: List[TranscriptChunkCreate]) -> None:
+        buf = self._buffer(meeting_id)
+        for chunk in chunks:
+            buf.transcripts[chunk.chunk_index] = chunk
+        self._after_enqueue(meeting_id)
+
+    def enqueue_topic_segment(self, meeting_id: str, segment: Dict[str, Any]) -> None:
+        buf = self._buffer(meeting_id)
+        buf.topic_segments[(segment.get("topic_id"), segment.get("start_t"))] = dict(segment)
+        self._after_enqueue(meeting_id)
+
+    # ---- flushing ----------------------------------------------------------------
+
+    def _schedule_flush(self, meeting_id: str) -> None:
+        task = self._flushing.get(meeting_id)
+        if task is not None and not task.done():
+            return  # the running flush re-checks the buffer when it finishes
+        self._flushing[meeting_id] = asyncio.create_task(self._flush_loop(meeting_id))
+
+    async def _flush_loop(self, meeting_id: str) -> None:
+        while True:
+            buf = self._buffers.get(meeting_id)
+            if buf is None or buf.size() == 0:
+                return
+            if not await self._flush_batch(meeting_id):
+                return  # requeued after failure; the periodic sweep retries later
+            buf = self._buffers.get(meeting_id)
+            if buf is None or buf.size() < self.flush_max_items:
+                return
+
+    async def _flush_batch(self, meeting_id: str) -> bool:
+        """Write one batch. Returns False when it had to be requeued."""
+        batch = self._buffers.pop(meeting_id, None)
+        if batch is None or batch.size() == 0:
+            return True
+        attempt = 0
+        while True:
+            try:
+                await asyncio.to_thread(self._writer, meeting_id, batch)
+                self.flushed_batches += 1
+                return True
+            except Exception as exc:
+                if _is_transient(exc) and attempt < self.max_retries:
+                    attempt += 1
+                    await asyncio.sleep(self.retry_backoff_s * (2 ** (attempt - 1)))
+                    continue
+                self.failed_batches += 1
+                logger.exception("live persistence flush failed (meeting_id=%s items=%s)", meeting_id, batch.size())
+                if not _is_transient(exc):
+                    self.dropped_items += batch.size()
+                    return True
+                self._requeue(meeting_id, batch)
+                return False
+
+    def _requeue(self, meeting_id: str, batch: _MeetingBuffer) -> None:
+        merged = self._buffers.get(meeting_id)
+        if merged is not None:
+            merged.merge_back(batch)
+        else:
+            merged = batch
+        if merged.size() > self.max_buffered:
+            # DB has been down for a while; bound memory rather than grow without limit.
+            self.dropped_items += merged.size()
+            logger.warning("live persistence buffer overflow, dropping batch (meeting_id=%s)", meeting_id)
+            return
+        self._buffers[meeting_id] = merged
+
+    async def flush(self, meeting_id: str) -> None:
+        """Flush everything buffered for a meeting and wait for it."""
+        task = self._flushing.get(meeting_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        while self._buffers.get(meeting_id) and self._buffers[meeting_id].size():
+            if not await self._flush_batch(meeting_id):
+                break  # DB still unreachable; the periodic sweep retries
+        self._flushing.pop(meeting_id, None)
+
+    async def close_session(self, meeting_id: str) -> None:
+        await self.flush(meeting_id)
+
+    async def flush_due(self) -> None:
+        now = time.monotonic()
+        for meeting_id, buf in list(self._buffers.items()):
+            if buf.size() and now - buf.first_enqueued_at >= self.flush_interval_s:
+                self._schedule_flush(meeting_id)
+
+    def pending(self) -> int:
+        return sum(buf.size() for buf in self._buffers.values())
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending_items": self.pending(),
+            "flushed_batches": self.flushed_batches,
+            "failed_batches": self.failed_batches,
+            "dropped_items": self.dropped_items,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_s)
+            try:
+                await self.flush_due()
+            except Exception:
+                logger.exception("live persistence sweep failed")
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for meeting_id in list(self._buffers.keys()):
+            await self.flush(meeting_id)
+
+
+_settings = get_settings()
+persistence_writer = WriteBehindQueue(
+    flush_max_items=_settings.live_persist_flush_items,
+    flush_interval_s=_settings.live_persist_flush_interval_seconds,
+    max_retries=_settings.live_persist_max_retries,
+    max_buffered=_settings.live_persist_max_buffered,
+)
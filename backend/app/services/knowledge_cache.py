@@ -0,0 +1,225 @@
+"""
+In-process caches for knowledge search and RAG.
+
+- `QueryEmbeddingCache`: LRU + TTL map of normalized query text -> embedding,
+  so repeated searches skip the embedding round trip.
+- `SemanticAnswerCache`: stored `KnowledgeQueryResponse`s per retrieval scope
+  (meeting_id, project_id, limit). A cached answer is reused when a new query
+  embedding is within `threshold` cosine similarity of the cached one AND the
+  vector search returned exactly the same chunk set, so answers never outlive
+  the context they were generated from. Uploads/updates/deletes invalidate the
+  affected scopes (`invalidate`).
+
+Both are per-process. `QueryEmbeddingCache` is also used from worker threads
+(the blocking `embed` runs on the light-rag pool), so it is lock-protected;
+`SemanticAnswerCache` is only touched from the event loop thread.
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.llm.clients.embeddings import EmbeddingProvider, aembed_texts, embed_texts, get_provider
+
+Vector = List[float]
+ScopeKey = Tuple[Optional[str], Optional[str], int]
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: NUL-stripped, lowercased, whitespace collapsed."""
+    return _WS_RE.sub(" ", (query or "").replace("\x00", "")).strip().lower()
+
+
+def _unit(vector: Vector) -> Vector:
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0.0:
+        return list(vector)
+    return [x / norm for x in vector]
+
+
+def _dot(a: Vector, b: Vector) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+class QueryEmbeddingCache:
+    def __init__(self, max_entries: int = 2048, ttl_s: float = 3600.0) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_s = float(ttl_s)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Vector]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[Vector]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, vector = entry
+            if self.ttl_s > 0 and time.monotonic() - stored_at > self.ttl_s:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return vector
+
+    def put(self, key: Tuple[str, str], vector: Vector) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[Vector]:
+        vector = self.get(key)
+        with self._lock:
+            if vector is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return vector
+
+    async def aembed(self, query: str, provider: Optional[EmbeddingProvider] = None) -> Vector:
+        """Embedding for `query` (normalized), from cache or the configured provider."""
+        provider = provider or get_provider()
+        text = normalize_query(query)
+        key = (provider.model_id, text)
+        vector = self._lookup(key)
+        if vector is None:
+            vector = (await aembed_texts([text], provider=provider))[0]
+            self.put(key, vector)
+        return vector
+
+    def embed(self, query: str, provider: Optional[EmbeddingProvider] = None) -> Vector:
+        """Blocking `aembed`, for graph nodes and worker threads."""
+        provider = provider or get_provider()
+        text = normalize_query(query)
+        key = (provider.model_id, text)
+        vector = self._lookup(key)
+        if vector is None:
+            vector = embed_texts([text], provider=provider)[0]
+            self.put(key, vector)
+        return vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+@dataclass(slots=True)
+class _AnswerEntry:
+    vector: Vector  # unit length
+    chunk_key: FrozenSet[Hashable]
+    response: Any
+    stored_at: float
+
+
+class SemanticAnswerCache:
+    def __init__(self, max_entries_per_scope: int = 64, ttl_s: float = 900.0, threshold: float = 0.95) -> None:
+        self.max_entries_per_scope = max(0, int(max_entries_per_scope))
+        self.ttl_s = float(ttl_s)
+        self.threshold = float(threshold)
+        self._scopes: Dict[ScopeKey, Deque[_AnswerEntry]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries_per_scope > 0 and 0.0 < self.threshold <= 1.0
+
+    @staticmethod
+    def scope_key(meeting_id: Any, project_id: Any, limit: int) -> ScopeKey:
+        return (str(meeting_id) if meeting_id else None, str(project_id) if project_id else None, int(limit))
+
+    def lookup(self, scope: ScopeKey, vector: Vector, chunk_key: FrozenSet[Hashable]) -> Optional[Any]:
+        """Best cached response for a near-identical query over the same chunk set, else None."""
+        if not self.enabled:
+            return None
+        entries = self._scopes.get(scope)
+        best: Optional[_AnswerEntry] = None
+        best_sim = self.threshold
+        if entries:
+            now = time.monotonic()
+            if self.ttl_s > 0:
+                while entries and now - entries[0].stored_at > self.ttl_s:
+                    entries.popleft()
+            unit = _unit(vector)
+            for entry in entries:
+                if entry.chunk_key != chunk_key:
+                    continue
+                sim = _dot(unit, entry.vector)
+                if sim >= best_sim:
+                    best, best_sim = entry, sim
+        if best is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return best.response
+
+    def store(self, scope: ScopeKey, vector: Vector, chunk_key: FrozenSet[Hashable], response: Any) -> None:
+        if not self.enabled or not chunk_key:
+            return
+        entries = self._scopes.get(scope)
+        if entries is None:
+            entries = self._scopes[scope] = deque(maxlen=self.max_entries_per_scope)
+        entries.append(_AnswerEntry(_unit(vector), chunk_key, response, time.monotonic()))
+
+    def invalidate(self, meeting_id: Any = None, project_id: Any = None) -> None:
+        """
+        Drop answers whose retrieval could include a document with this scope:
+        unscoped queries always, plus queries filtered to the same meeting or project.
+        """
+        meeting_id = str(meeting_id) if meeting_id else None
+        project_id = str(project_id) if project_id else None
+        for scope in list(self._scopes):
+            scope_meeting, scope_project, _ = scope
+            if (
+                (scope_meeting is None and scope_project is None)
+                or (meeting_id is not None and scope_meeting == meeting_id)
+                or (project_id is not None and scope_project == project_id)
+            ):
+                del self._scopes[scope]
+                self.invalidations += 1
+
+    def invalidate_all(self) -> None:
+        self.invalidations += len(self._scopes)
+        self._scopes.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": sum(len(entries) for entries in self._scopes.values()),
+            "scopes": len(self._scopes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    return {"query_embeddings": query_embedding_cache.stats(), "answers": answer_cache.stats()}
+
+
+_settings = get_settings()
+query_embedding_cache = QueryEmbeddingCache(
+    max_entries=_settings.knowledge_query_cache_size,
+    ttl_s=_settings.knowledge_query_cache_ttl_seconds,
+)
+answer_cache = SemanticAnswerCache(
+    max_entries_per_scope=_settings.knowledge_answer_cache_size,
+    ttl_s=_settings.knowledge_answer_cache_ttl_seconds,
+    threshold=_settings.knowledge_answer_cache_threshold,
+)
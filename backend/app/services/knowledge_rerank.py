@@ -0,0 +1,205 @@
+"""
+Optional rerank stage between knowledge retrieval and the LLM prompt.
+
+Hybrid retrieval returns up to `max(limit * 3, 12)` chunks in fused order. A
+small local cross-encoder (sentence-transformers `CrossEncoder`, on CPU)
+scores each (query, chunk) pair, and only the best chunks that fit
+`token_budget` (at most `top_n`) go into the prompt.
+
+- Scoring runs in a dedicated thread pool (the model releases the GIL), in
+  batches of `batch_size` pairs. The model loads on first use.
+- Scores are cached by (query hash, chunk row id) with LRU + TTL, so follow-up
+  questions and retries only score chunks they haven't seen. The query hash
+  covers the model name and the normalized query; a reindex gives changed
+  chunks new row ids (unchanged ones keep theirs), so no stale score is reused.
+- Without sentence-transformers (optional dependency) or with the stage
+  disabled, chunks pass through in retrieval order.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+from app.services.knowledge_cache import normalize_query
+from app.vectorstore.ingestion.chunking import count_tokens
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, Hashable]
+
+
+def select_within_budget(
+    scores: Sequence[float], token_counts: Sequence[int], top_n: int, token_budget: int
+) -> List[int]:
+    """
+    Indexes of the chunks to keep, best score first: at most `top_n`, skipping
+    any chunk that no longer fits `token_budget`. The best chunk is always kept.
+    """
+    order = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+    kept: List[int] = []
+    used = 0
+    for i in order:
+        if len(kept) >= top_n:
+            break
+        if kept and used + token_counts[i] > token_budget:
+            continue
+        kept.append(i)
+        used += token_counts[i]
+    return kept
+
+
+class CrossEncoderReranker:
+    def __init__(
+        self,
+        model_name: str,
+        enabled: bool = False,
+        batch_size: int = 16,
+        max_workers: int = 1,
+        max_length: int = 512,
+        top_n: int = 6,
+        token_budget: int = 1500,
+        cache_size: int = 4096,
+        cache_ttl_s: float = 900.0,
+    ) -> None:
+        self.model_name = model_name
+        self.enabled = bool(enabled)
+        self.batch_size = max(1, int(batch_size))
+        self.max_workers = max(1, int(max_workers))
+        self.max_length = max(32, int(max_length))
+        self.top_n = max(1, int(top_n))
+        self.token_budget = max(1, int(token_budget))
+        self.cache_size = max(0, int(cache_size))
+        self.cache_ttl_s = float(cache_ttl_s)
+        self._model = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[CacheKey, Tuple[float, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+
+    def is_available(self) -> bool:
+        return self.enabled and importlib.util.find_spec("sentence_transformers") is not None
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder  # type: ignore
+
+                    self._model = CrossEncoder(self.model_name, max_length=self.max_length, device="cpu")
+        return self._model
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rerank")
+        return self._executor
+
+    def query_hash(self, query: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+    # ---- score cache ---------------------------------------------------------------
+
+    def _cached(self, key: CacheKey) -> Optional[float]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored_at, score = entry
+            if self.cache_ttl_s > 0 and time.monotonic() - stored_at > self.cache_ttl_s:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return score
+
+    def _store(self, key: CacheKey, score: float) -> None:
+        if self.cache_size == 0:
+            return
+        with self._lock:
+            self._cache[key] = (time.monotonic(), score)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ---- scoring -------------------------------------------------------------------
+
+    def _predict(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        model = self._get_model()
+        scores: List[float] = []
+        for start in range(0, len(pairs), self.batch_size):
+            batch = pairs[start : start + self.batch_size]
+            scores.extend(float(s) for s in model.predict(batch, show_progress_bar=False))
+            self.batches += 1
+        return scores
+
+    def score(self, query: str, items: Sequence[Tuple[Hashable, str]]) -> List[float]:
+        """Relevance of each (chunk key, text) to `query` (blocking); cached pairs are not re-scored."""
+        qhash = self.query_hash(query)
+        scores: List[Optional[float]] = [self._cached((qhash, key)) for key, _ in items]
+        missing = [i for i, s in enumerate(scores) if s is None]
+        self.hits += len(items) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            fresh = self._predict([(query, items[i][1]) for i in missing])
+            for i, value in zip(missing, fresh):
+                scores[i] = value
+                self._store((qhash, items[i][0]), value)
+        return [float(s) for s in scores]  # type: ignore[arg-type]
+
+    async def ascore(self, query: str, items: Sequence[Tuple[Hashable, str]]) -> List[float]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self.score, query, items)
+
+    async def rerank(self, query: str, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Chunks (dicts with `key` and `text`) to put in the prompt, best first,
+        each with a `rerank_score`. Unchanged when the stage is off or fails.
+        """
+        if not chunks or not self.is_available():
+            return chunks
+        try:
+            scores = await self.ascore(query, [(c["key"], c["text"]) for c in chunks])
+        except Exception as exc:
+            logger.warning("rerank failed, keeping retrieval order: %s", exc)
+            return chunks
+        keep = select_within_budget(scores, [count_tokens(c["text"]) for c in chunks], self.top_n, self.token_budget)
+        return [{**chunks[i], "rerank_score": scores[i]} for i in keep]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "available": self.is_available(),
+            "model": self.model_name,
+            "cache_size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "batches": self.batches,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_settings = get_settings()
+chunk_reranker = CrossEncoderReranker(
+    model_name=_settings.knowledge_rerank_model,
+    enabled=_settings.knowledge_rerank_enabled,
+    batch_size=_settings.knowledge_rerank_batch_size,
+    max_workers=_settings.knowledge_rerank_workers,
+    top_n=_settings.knowledge_rerank_top_n,
+    token_budget=_settings.knowledge_rerank_token_budget,
+    cache_size=_settings.knowledge_rerank_cache_size,
+    cache_ttl_s=_settings.knowledge_rerank_cache_ttl_seconds,
+)
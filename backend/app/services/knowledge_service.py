@@ -1,15 +1,13 @@
 """
 Knowledge Service - Document management and search for Knowledge Hub
 """
+import asyncio
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from uuid import UUID, uuid4
 import logging
-from pathlib import Path
 from sqlalchemy import text
 import json
-import io
-import pdfplumber
 import re
 
 from fastapi import UploadFile
@@ -25,15 +23,29 @@ from app.schemas.knowledge import (
     KnowledgeSearchResponse,
     KnowledgeQueryRequest,
     KnowledgeQueryResponse,
+    KnowledgeIngestJob,
 )
 from app.llm.gemini_client import GeminiChat, is_gemini_available
-from app.llm.clients.jina_embed import embed_texts, is_jina_available
-from app.vectorstore.pgvector_client import PgVectorClient
+from app.llm.clients.embeddings import is_embedding_available
+from app.services.hybrid_retrieval import chunk_key as _chunk_key, hybrid_search_chunks
+from app.services.knowledge_cache import answer_cache, query_embedding_cache
+from app.services.knowledge_rerank import chunk_reranker
+from app.vectorstore.ingestion.loaders import sanitize_text as _sanitize_text
+from app.vectorstore.pgvector_client import ChunkFilter
+from app.vectorstore.ingestion.pipelines import (
+    UPLOAD_DIR,
+    create_job,
+    get_job,
+    job_progress,
+    queue_reindex_job,
+    requeue_failed_job,
+    stage_upload,
+    with_session,
+)
+from app.workers.indexing_worker import bulk_reindexer, ingestion_worker
 from app.services.storage_client import (
-    build_object_key,
     generate_presigned_get_url,
     is_storage_configured,
-    upload_bytes_to_storage,
     delete_object,
 )
 from app.core.config import get_settings
@@ -205,6 +217,17 @@ def _with_presigned_url(doc: KnowledgeDocument) -> KnowledgeDocument:
     return doc
 
 
+def _chunk_location(row) -> str:
+    """Page range / section of a chunk row for citations ("" for chunks indexed without them)."""
+    parts = []
+    page, page_end = row.get("page"), row.get("page_end")
+    if page:
+        parts.append(f"trang {page}" if not page_end or page_end == page else f"trang {page}-{page_end}")
+    if row.get("section"):
+        parts.append(row["section"])
+    return ", ".join(parts)
+
+
 def _row_to_doc(row) -> KnowledgeDocument:
     """Map DB row -> KnowledgeDocument; fill missing fields with defaults."""
     return KnowledgeDocument(
@@ -227,18 +250,6 @@ def _row_to_doc(row) -> KnowledgeDocument:
     )
 
 
-def _sanitize_text(text: str) -> str:
-    """Remove NUL and trim."""
-    if not text:
-        return ""
-    return text.replace("\x00", "").strip()
-
-
-def _normalize_for_embedding(text: str) -> str:
-    """Lowercase + sanitize for case-insensitive embeddings/search."""
-    return _sanitize_text(text).lower()
-
-
 def _is_smalltalk_or_noise(query: str) -> bool:
     """Heuristic: greetings or too-short queries => handle without RAG."""
     q = (query or "").strip().lower()
@@ -254,93 +265,6 @@ def _is_smalltalk_or_noise(query: str) -> bool:
     return any(q == kw or q.startswith(kw + " ") for kw in smalltalk_keywords)
 
 
-def _format_vector(vec: list[float]) -> str:
-    """Format embedding list to Postgres vector literal."""
-    return "[" + ",".join(f"{x:.6f}" for x in vec) + "]"
-
-
-def _extract_pdf_text(file_bytes: bytes) -> str:
-    """Extract text from PDF bytes using pdfplumber."""
-    try:
-        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-            pages = [p.extract_text() or "" for p in pdf.pages]
-        return "\n".join(pages)
-    except Exception as exc:
-        logger.error("PDF extract failed: %s", exc)
-        return ""
-
-
-def _extract_docx_text(file_bytes: bytes) -> str:
-    """Extract text from DOCX bytes using python-docx if available."""
-    try:
-        from docx import Document  # type: ignore
-    except Exception as exc:
-        logger.error("DOCX extract skipped (python-docx not available?): %s", exc)
-        return ""
-    try:
-        doc = Document(io.BytesIO(file_bytes))
-        parts: List[str] = []
-        for p in doc.paragraphs:
-            text = (p.text or "").strip()
-            if text:
-                parts.append(text)
-        # Optionally extract table cells
-        for table in doc.tables:
-            for row in table.rows:
-                cells = [c.text.strip() for c in row.cells if c.text and c.text.strip()]
-                if cells:
-                    parts.append(" | ".join(cells))
-        return "\n".join(parts)
-    except Exception as exc:
-        logger.error("DOCX extract failed: %s", exc)
-        return ""
-
-
-def _extract_excel_text(file_bytes: bytes) -> str:
-    """Extract text from XLSX/XLS using openpyxl if available."""
-    try:
-        from openpyxl import load_workbook  # type: ignore
-    except Exception as exc:
-        logger.error("Excel extract skipped (openpyxl not available?): %s", exc)
-        return ""
-    try:
-        wb = load_workbook(io.BytesIO(file_bytes), data_only=True, read_only=True)
-        lines: List[str] = []
-        for sheet in wb:
-            lines.append(f"# {sheet.title}")
-            for idx, row in enumerate(sheet.iter_rows(values_only=True)):
-                if idx >= 200:  # avoid huge sheets
-                    break
-                cells = []
-                for val in row:
-                    if val is None:
-                        continue
-                    text = str(val).strip()
-                    if text:
-                        cells.append(text)
-                if cells:
-                    lines.append(" | ".join(cells))
-            if len(lines) > 2000:
-                break
-        return "\n".join(lines)
-    except Exception as exc:
-        logger.error("Excel extract failed: %s", exc)
-        return ""
-def _chunk_text(text: str, max_len: int = 1200, overlap: int = 200) -> list[str]:
-    """Greedy chunk by characters with overlap."""
-    chunks = []
-    start = 0
-    n = len(text)
-    while start < n:
-        end = min(n, start + max_len)
-        chunk = text[start:end]
-        chunks.append(chunk)
-        if end == n:
-            break
-        start = end - overlap
-    return [c.strip() for c in chunks if c.strip()]
-
-
 async def list_documents(
     db: Session,
     skip: int = 0,
@@ -444,40 +368,24 @@ async def upload_document(
     data: KnowledgeDocumentCreate,
     file: Optional[UploadFile] = None,
 ) -> KnowledgeDocumentUploadResponse:
-    """Upload a new knowledge document (mock metadata, real storage if configured)"""
+    """
+    Stage the file, record the document and queue its ingestion job, then return.
+
+    Storage upload, text extraction, embedding and chunk inserts run in the
+    background (app/vectorstore/ingestion/pipelines.py); poll the returned job.
+    """
     doc_id = uuid4()
     
     file_ext = data.file_type.lower()
-    storage_key = None
     file_url = data.file_url or f"/mock/knowledge/{doc_id}.{file_ext}"
     file_size = data.file_size or 0
+    staging_path = None
 
-    # Handle actual file upload if provided
+    # Spool to local disk off the event loop; served under /files until it reaches object storage.
     if file:
-        filename = file.filename or f"{doc_id}.{file_ext}"
-        content = await file.read()
-        file_size = len(content)
-
-        if is_storage_configured():
-            try:
-                object_key = build_object_key(filename, prefix="knowledge")
-                upload_bytes_to_storage(content, object_key, content_type=file.content_type)
-                storage_key = object_key
-                # Return a presigned URL so the frontend can access the private object
-                presigned_url = generate_presigned_get_url(object_key, expires_in=3600)
-                if presigned_url:
-                    file_url = presigned_url
-            except Exception as exc:
-                logger.error("Upload to storage failed, falling back to local file: %s", exc)
-
-        # Fallback to local storage if storage not configured or failed
-        if not storage_key:
-            upload_dir = Path(__file__).parent.parent / "uploaded_files"
-            upload_dir.mkdir(parents=True, exist_ok=True)
-            stored_name = f"{doc_id}.{file_ext}"
-            stored_path = upload_dir / stored_name
-            stored_path.write_bytes(content)
-            file_url = f"/files/{stored_name}"
+        staging_path = await asyncio.to_thread(stage_upload, file.file, doc_id, file_ext)
+        file_size = staging_path.stat().st_size
+        file_url = f"/files/{staging_path.name}"
 
     # Get uploaded_by name (mock - would query user table in production)
     uploaded_by_name = "Current User"  # Would fetch from user table
@@ -491,7 +399,7 @@ async def upload_document(
         file_type=data.file_type,
         file_size=file_size or 1024000,  # Default 1MB
         file_url=file_url,
-        storage_key=storage_key,
+        storage_key=None,
         tags=data.tags or [],
         category=data.category,
         uploaded_by=data.uploaded_by,
@@ -504,8 +412,8 @@ async def upload_document(
     _mock_knowledge_docs[str(doc_id)] = doc
     logger.info(f"[Mock] Uploaded knowledge document: {doc.title}")
 
-    # Persist metadata to DB
-    doc_persisted = False
+    # Persist metadata + ingestion job in one transaction
+    job_id = None
     try:
         db.execute(
             text(
@@ -534,7 +442,7 @@ async def upload_document(
                 "tags": doc.tags,
                 "file_type": doc.file_type,
                 "file_size": doc.file_size,
-                "storage_key": doc.storage_key,
+                "storage_key": None,
                 "file_url": doc.file_url,
                 "org_id": None,
                 "project_id": str(data.project_id) if data.project_id else None,
@@ -542,104 +450,169 @@ async def upload_document(
                 "visibility": None,
             },
         )
+        job_id = create_job(db, doc_id, file_ext, staging_path)
         db.commit()
-        doc_persisted = True
     except Exception as exc:
+        db.rollback()
+        job_id = None
         logger.error("Failed to persist knowledge_document to DB: %s", exc)
 
-    # Auto-embed and store chunks if HF is available
-    try:
-        if not doc_persisted:
-            raise RuntimeError("knowledge_document row not persisted; skip embedding to avoid FK errors")
-        text_content = ""
-        # If original file content is available, try decode
-        try:
-            if file and "content" in locals() and content:
-                # Extract by type
-                if file_ext == "pdf":
-                    text_content = _sanitize_text(_extract_pdf_text(content))
-                elif file_ext in ("doc", "docx"):
-                    text_content = _sanitize_text(_extract_docx_text(content))
-                elif file_ext in ("xls", "xlsx"):
-                    text_content = _sanitize_text(_extract_excel_text(content))
-                else:
-                    text_content = _sanitize_text(content.decode("utf-8", errors="ignore"))
-        except Exception:
-            text_content = ""
-
-        if not text_content:
-            # Fallback: use description/title
-            text_parts = [doc.title]
-            if doc.description:
-                text_parts.append(doc.description)
-            text_content = _sanitize_text("\n".join(text_parts))
-
-        chunks = _chunk_text(text_content) if text_content else []
-        if chunks and is_jina_available():
-            chunks = [_sanitize_text(c) for c in chunks if _sanitize_text(c)]
-            # skip if still empty
-            if not chunks:
-                raise ValueError("No valid text chunks to embed (maybe binary/pdf without extraction)")
-            embed_inputs = [_normalize_for_embedding(c) for c in chunks]
-            embeddings = embed_texts(embed_inputs)
-            for idx, (chunk, emb) in enumerate(zip(chunks, embeddings)):
-                emb_literal = "[" + ",".join(str(x) for x in emb) + "]"
-                db.execute(
-                    text(
-                        """
-                        INSERT INTO knowledge_chunk (
-                            id, document_id, chunk_index, content, embedding, scope_meeting, scope_project, created_at
-                        )
-                        VALUES (
-                            :id, :document_id, :chunk_index, :content, CAST(:embedding AS vector),
-                            :scope_meeting, :scope_project, now()
-                        )
-                        """
-                    ),
-                    {
-                        "id": str(uuid4()),
-                        "document_id": str(doc_id),
-                        "chunk_index": idx,
-                        "content": chunk,
-                        "embedding": emb_literal,
-                        "scope_meeting": str(data.meeting_id) if getattr(data, "meeting_id", None) else None,
-                        "scope_project": str(data.project_id) if getattr(data, "project_id", None) else None,
-                    },
-                )
-            db.commit()
-    except Exception as exc:
-        logger.error("Auto-embed failed: %s", exc, exc_info=True)
-    
+    if job_id is not None:
+        ingestion_worker.submit(job_id)
+
     return KnowledgeDocumentUploadResponse(
         id=doc_id,
         title=doc.title,
         file_url=file_url,
-        message="Tài liệu đã được tải lên thành công",
+        message="Tài liệu đã được tải lên, đang xử lý nội dung" if job_id else "Tài liệu đã được tải lên thành công",
+        job_id=job_id,
     )
 
 
+def _job_to_schema(job: dict) -> KnowledgeIngestJob:
+    return KnowledgeIngestJob(**{k: v for k, v in job.items() if k in KnowledgeIngestJob.model_fields}, progress=job_progress(job))
+
+
+async def get_ingest_job(job_id: UUID) -> Optional[KnowledgeIngestJob]:
+    job = await asyncio.to_thread(with_session, get_job, job_id)
+    return _job_to_schema(job) if job else None
+
+
+async def retry_ingest_job(job_id: UUID) -> Optional[KnowledgeIngestJob]:
+    """Re-queue a failed job; it resumes from its last completed stage."""
+    if await asyncio.to_thread(with_session, requeue_failed_job, job_id):
+        ingestion_worker.submit(job_id)
+    return await get_ingest_job(job_id)
+
+
+async def stream_ingest_job(job_id: UUID) -> AsyncIterator[KnowledgeIngestJob]:
+    """Yield the job whenever it changes, until it is done or failed (short-lived DB sessions per poll)."""
+    interval = get_settings().knowledge_ingest_poll_interval_seconds
+    last = None
+    while True:
+        job = await get_ingest_job(job_id)
+        if job is None:
+            return
+        snapshot = (job.status, job.stage, job.chunks_total, job.chunks_done, job.attempts, job.error)
+        if snapshot != last:
+            last = snapshot
+            yield job
+        if job.status in ("done", "failed"):
+            return
+        await asyncio.sleep(interval)
+
+
+def _has_source_file(row) -> bool:
+    """False for metadata-only documents, whose chunks are built from title/description."""
+    return bool(row.get("storage_key")) or (row.get("file_url") or "").startswith("/files/")
+
+
+async def _queue_reindex(document_id: UUID, file_type: Optional[str]) -> Optional[UUID]:
+    try:
+        job_id = await asyncio.to_thread(with_session, queue_reindex_job, document_id, file_type)
+    except Exception as exc:
+        logger.error("Failed to queue re-index of knowledge document %s: %s", document_id, exc)
+        return None
+    ingestion_worker.submit(job_id)
+    return job_id
+
+
 async def ingest_document(db: Session, document_id: UUID) -> Optional[dict]:
     """
-    Ingest a document into vector store.
-    Current implementation is a stub: combines metadata text and upserts to PgVectorClient.
+    Queue a re-index of a stored document from its file (or metadata). Only
+    chunks whose content changed are embedded; search switches over atomically.
     """
-    doc = _mock_knowledge_docs.get(str(document_id))
-    if not doc:
+    row = db.execute(
+        text("SELECT id, file_type FROM knowledge_document WHERE id = :id"),
+        {"id": str(document_id)},
+    ).mappings().first()
+    if not row:
         return None
+    job_id = await _queue_reindex(document_id, row["file_type"])
+    if job_id is None:
+        return {"status": "failed", "document_id": document_id, "job_id": None}
+    return {"status": "queued", "document_id": document_id, "job_id": job_id}
+
+
+async def replace_document_file(
+    db: Session,
+    document_id: UUID,
+    file: UploadFile,
+    file_type: Optional[str] = None,
+) -> Optional[KnowledgeDocumentUploadResponse]:
+    """
+    Upload a new revision of a document's file and queue its re-index. The
+    previous chunks stay searchable until the new ones are published.
+    """
+    row = db.execute(
+        text("SELECT id, title, file_type, file_url, storage_key FROM knowledge_document WHERE id = :id"),
+        {"id": str(document_id)},
+    ).mappings().first()
+    if not row:
+        return None
+    file_ext = (file_type or row["file_type"] or "pdf").lower()
+    old_local = None
+    if (row["file_url"] or "").startswith("/files/"):
+        old_local = UPLOAD_DIR / row["file_url"][len("/files/"):]
+
+    staging_path = await asyncio.to_thread(stage_upload, file.file, document_id, file_ext)
+    file_url = f"/files/{staging_path.name}"
+    try:
+        # storage_key is cleared so the job's storage stage uploads the new revision.
+        db.execute(
+            text(
+                """
+                UPDATE knowledge_document
+                SET file_type = :file_type, file_size = :file_size, file_url = :file_url,
+                    storage_key = NULL, updated_at = now()
+                WHERE id = :id
+                """
+            ),
+            {
+                "id": str(document_id),
+                "file_type": file_ext,
+                "file_size": staging_path.stat().st_size,
+                "file_url": file_url,
+            },
+        )
+        job_id = create_job(db, document_id, file_ext, staging_path)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.error("Failed to record new revision of knowledge document %s: %s", document_id, exc)
+        raise
+
+    ingestion_worker.submit(job_id)
+    try:
+        if row["storage_key"] and is_storage_configured():
+            await asyncio.to_thread(delete_object, row["storage_key"])
+        if old_local is not None and old_local != staging_path and old_local.exists():
+            old_local.unlink()
+    except Exception as exc:
+        logger.warning("Cleanup of previous revision of %s failed: %s", document_id, exc)
+
+    return KnowledgeDocumentUploadResponse(
+        id=document_id,
+        title=row["title"],
+        file_url=file_url,
+        message="Đã tải lên phiên bản mới, đang cập nhật chỉ mục",
+        job_id=job_id,
+    )
 
-    parts = [doc.title]
-    if doc.description:
-        parts.append(doc.description)
-    if doc.tags:
-        parts.append(" ".join(doc.tags))
-    content = "\n".join(parts)
 
-    settings = get_settings()
-    client = PgVectorClient(connection=settings.database_url)
-    client.upsert([content])
+def reindex_status() -> dict:
+    return bulk_reindexer.status()
 
-    logger.info("Ingested document %s into vector store (stub)", document_id)
-    return {"status": "embedded", "document_id": document_id}
+
+def start_reindex(force: bool = False) -> dict:
+    """Start a background re-index of all documents embedded by another model (or all, with force)."""
+    bulk_reindexer.start(force=force)
+    return bulk_reindexer.status()
+
+
+async def stop_reindex() -> dict:
+    await bulk_reindexer.stop()
+    return bulk_reindexer.status()
 
 
 async def update_document(
@@ -673,7 +646,26 @@ async def update_document(
                 params,
             ).mappings().first()
             if row:
+                scope_fields = [
+                    assignment
+                    for key, assignment in (
+                        ("meeting_id", "scope_meeting = :meeting_id"),
+                        ("project_id", "scope_project = :project_id"),
+                    )
+                    if key in params
+                ]
+                if scope_fields:
+                    # Keep the denormalized chunk scope used by vector search in step.
+                    db.execute(
+                        text(f"UPDATE knowledge_chunk SET {', '.join(scope_fields)} WHERE document_id = :id"),
+                        params,
+                    )
                 db.commit()
+                # The old scope isn't known here (meeting/project may have moved), so drop everything.
+                answer_cache.invalidate_all()
+                if ("title" in params or "description" in params) and not _has_source_file(row):
+                    # Metadata-only documents are indexed from title/description.
+                    await _queue_reindex(document_id, row.get("file_type"))
                 return _with_presigned_url(_row_to_doc(row))
     except Exception as exc:
         logger.warning("DB update_document failed, fallback to mock: %s", exc)
@@ -697,14 +689,16 @@ async def delete_document(db: Session, document_id: UUID) -> bool:
     # Fetch storage key and file_url for cleanup
     storage_key = None
     file_url = None
+    scope = None
     try:
         row = db.execute(
-            text("SELECT storage_key, file_url FROM knowledge_document WHERE id = :id"),
+            text("SELECT storage_key, file_url, meeting_id, project_id FROM knowledge_document WHERE id = :id"),
             {"id": str(document_id)},
         ).mappings().first()
         if row:
             storage_key = row.get("storage_key")
             file_url = row.get("file_url")
+            scope = (row.get("meeting_id"), row.get("project_id"))
     except Exception as exc:
         logger.warning("Failed to fetch document before delete: %s", exc)
 
@@ -721,6 +715,11 @@ async def delete_document(db: Session, document_id: UUID) -> bool:
         )
         db.commit()
         deleted = result.rowcount > 0
+        if deleted:
+            if scope is not None:
+                answer_cache.invalidate(*scope)
+            else:
+                answer_cache.invalidate_all()
     except Exception as exc:
         logger.error("Failed to delete document %s: %s", document_id, exc, exc_info=True)
         db.rollback()
@@ -736,7 +735,7 @@ async def delete_document(db: Session, document_id: UUID) -> bool:
             delete_object(storage_key)
         # Delete local file if stored locally (/files/ or uploaded_files)
         if file_url and file_url.startswith("/files/"):
-            local_path = Path(__file__).parent.parent / file_url.lstrip("/")
+            local_path = UPLOAD_DIR / file_url[len("/files/"):]
             if local_path.exists():
                 local_path.unlink()
     except Exception as exc:
@@ -745,96 +744,58 @@ async def delete_document(db: Session, document_id: UUID) -> bool:
     return deleted
 
 
-def _build_vector_filters(request: KnowledgeSearchRequest):
-    filters = ["1=1"]
-    params = {
-        "chunk_limit": max(request.limit * 4, 20),
-    }
-    if request.source:
-        filters.append("kd.source = :source")
-        params["source"] = request.source
-    if request.category:
-        filters.append("kd.category = :category")
-        params["category"] = request.category
-    # Tags filter kept simple: intersects
-    if request.tags:
-        filters.append("kd.tags && :tags")
-        params["tags"] = request.tags
-    if getattr(request, "meeting_id", None):
-        filters.append("COALESCE(kd.meeting_id, kc.scope_meeting) = :meeting_id")
-        params["meeting_id"] = str(request.meeting_id)
-    if getattr(request, "project_id", None):
-        filters.append("COALESCE(kd.project_id, kc.scope_project) = :project_id")
-        params["project_id"] = str(request.project_id)
-    return " AND ".join(filters), params
-
-
-async def _vector_search_documents(
+def _build_vector_filters(request: KnowledgeSearchRequest) -> ChunkFilter:
+    return ChunkFilter(
+        meeting_id=str(request.meeting_id) if getattr(request, "meeting_id", None) else None,
+        project_id=str(request.project_id) if getattr(request, "project_id", None) else None,
+        source=request.source,
+        category=request.category,
+        tags=request.tags or None,
+    )
+
+
+async def _embed_query(query: str) -> Optional[list[float]]:
+    """Query embedding, or None (retrieval then runs lexical-only)."""
+    if not is_embedding_available():
+        return None
+    try:
+        return await query_embedding_cache.aembed(query)
+    except Exception as exc:
+        logger.error("Query embedding failed, lexical retrieval only: %s", exc, exc_info=True)
+        return None
+
+
+async def _hybrid_search_documents(
     db: Session,
     request: KnowledgeSearchRequest,
 ) -> Optional[KnowledgeSearchResponse]:
-    """Search using pgvector; returns None on failure."""
-    if not is_jina_available():
-        return None
+    """Hybrid (pgvector + full-text) chunk search grouped by document; None on failure or no hits."""
     try:
-        query_vec = embed_texts([_normalize_for_embedding(request.query)])[0]
-        vec_literal = _format_vector(query_vec)
-
-        where_clause, params = _build_vector_filters(request)
-        params.update(
-            {
-                "query_vec": vec_literal,
-                "offset": request.offset,
-            }
+        query_vec = await _embed_query(request.query)
+        # Several lexical hits can belong to one document; over-fetch before grouping.
+        chunk_limit = (request.offset + request.limit) * 3
+        rows = await hybrid_search_chunks(
+            db,
+            request.query,
+            _build_vector_filters(request),
+            query_vec=query_vec,
+            top_k=chunk_limit,
+            recall=request.recall,
+            per_document=True,
         )
-
-        rows = db.execute(
-            text(
-                f"""
-                SELECT
-                    kd.id,
-                    kd.title,
-                    kd.description,
-                    kd.source,
-                    kd.category,
-                    kd.tags,
-                    kd.file_type,
-                    kd.file_size,
-                    kd.storage_key,
-                    kd.file_url,
-                    kd.created_at,
-                    kd.updated_at,
-                    NULL::text AS document_type,
-                    (kc.embedding <=> CAST(:query_vec AS vector)) AS distance
-                FROM knowledge_chunk kc
-                JOIN knowledge_document kd ON kc.document_id = kd.id
-                WHERE {where_clause}
-                ORDER BY distance ASC
-                LIMIT :chunk_limit
-                """
-            ),
-            params,
-        ).mappings().all()
-
         if not rows:
             return None
 
-        # Deduplicate by document, keep best distance
-        doc_best = {}
+        # Rows are in fused order, so a document's first chunk is its best one.
+        doc_rows = {}
         for r in rows:
-            doc_id = r["id"]
-            dist = r["distance"]
-            if doc_id not in doc_best or dist < doc_best[doc_id]["distance"]:
-                doc_best[doc_id] = {"row": r, "distance": dist}
-
-        ordered = sorted(doc_best.values(), key=lambda x: x["distance"])
-        ordered = ordered[request.offset : request.offset + request.limit]
+            doc_rows.setdefault(r["id"], r)
 
-        docs = [_with_presigned_url(_row_to_doc(item["row"])) for item in ordered]
-        total = len(doc_best)
-        return KnowledgeSearchResponse(documents=docs, total=total, query=request.query)
+        ordered = list(doc_rows.values())[request.offset : request.offset + request.limit]
+        docs = [_with_presigned_url(_row_to_doc(r)) for r in ordered]
+        return KnowledgeSearchResponse(documents=docs, total=len(doc_rows), query=request.query)
     except Exception as exc:
-        logger.error("Vector search failed, fallback to text: %s", exc, exc_info=True)
+        logger.error("Hybrid search failed, fallback to metadata search: %s", exc, exc_info=True)
         return None
 
 
@@ -842,13 +803,13 @@ async def search_documents(
     db: Session,
     request: KnowledgeSearchRequest,
 ) -> KnowledgeSearchResponse:
-    """Vector search first; fallback to simple text search."""
-    # Vector search using Jina embedding + pgvector
-    vector_result = await _vector_search_documents(db, request)
-    if vector_result:
-        return vector_result
+    """Hybrid chunk search first; metadata match only for documents that have no chunks."""
+    hybrid_result = await _hybrid_search_documents(db, request)
+    if hybrid_result:
+        return hybrid_result
 
-    # Fallback to text search
+    # Documents uploaded while no embedding provider was configured were never chunked;
+    # title/description/tag matching is the only way to find those.
     try:
         conditions = ["1=1"]
         params = {
@@ -899,11 +860,44 @@ async def search_documents(
         return KnowledgeSearchResponse(documents=[], total=0, query=request.query)
 
 
+def _rag_chunk(row: dict) -> dict:
+    return {
+        # Chunk row id: a revised document's chunks get new ids, so stale rerank scores never match.
+        "key": str(row["chunk_id"]),
+        "doc_id": row["id"],
+        "title": row["title"],
+        "distance": row["distance"],
+        "location": _chunk_location(row),
+        "text": _sanitize_text(row["content"])[:800],
+    }
+
+
+def _context_parts(chunks: List[dict]) -> List[str]:
+    parts = []
+    for ch in chunks:
+        score = f"{ch['distance']:.3f}" if ch["distance"] is not None else "keyword"
+        where = f" | {ch['location']}" if ch["location"] else ""
+        parts.append(f"[{ch['title']}{where} | score={score}] {ch['text']}")
+    return parts
+
+
+def _rag_prompt(query: str, context: str) -> str:
+    return f"""Câu hỏi: {query}
+
+Context (top chunks):
+{context}
+
+Yêu cầu:
+- Trả lời ngắn gọn, không markdown.
+- Nếu dùng thông tin, nêu rõ tên tài liệu trong ngoặc [].
+- Nếu không đủ thông tin, trả lời rằng không đủ dữ liệu."""
+
+
 async def query_knowledge_ai(
     db: Session,
     request: KnowledgeQueryRequest,
 ) -> KnowledgeQueryResponse:
-    """RAG query using pgvector + Groq"""
+    """RAG query: hybrid (pgvector + full-text) retrieval, then the LLM"""
     # Smalltalk/noise handling
     if _is_smalltalk_or_noise(request.query):
         answer = "Xin chào! Bạn muốn hỏi gì về tài liệu/policy? Hãy mô tả rõ hơn nhé."
@@ -919,83 +913,59 @@ async def query_knowledge_ai(
     relevant_docs: List[KnowledgeDocument] = []
     citations: List[str] = []
     best_score = None
+    query_vec = None
+    chunk_key = frozenset()
+    cache_scope = answer_cache.scope_key(request.meeting_id, request.project_id, request.limit)
 
-    if is_jina_available():
-        try:
-            query_vec = embed_texts([_normalize_for_embedding(request.query)])[0]
-            vec_literal = _format_vector(query_vec)
-
-            where_clause, params = _build_vector_filters(
-                KnowledgeSearchRequest(
-                    query=request.query,
-                    limit=top_k_chunks,
-                    offset=0,
-                    source=None,
-                    category=None,
-                    tags=None,
-                    meeting_id=request.meeting_id,
-                    project_id=request.project_id,
-                )
+    try:
+        query_vec = await _embed_query(request.query)
+        filters = _build_vector_filters(
+            KnowledgeSearchRequest(
+                query=request.query,
+                limit=top_k_chunks,
+                offset=0,
+                source=None,
+                category=None,
+                tags=None,
+                meeting_id=request.meeting_id,
+                project_id=request.project_id,
             )
-            params.update({"query_vec": vec_literal, "top_k": top_k_chunks})
+        )
+        rows = await hybrid_search_chunks(
+            db,
+            request.query,
+            filters,
+            query_vec=query_vec,
+            top_k=top_k_chunks,
+            recall=request.recall,
+        )
 
-            rows = db.execute(
-                text(
-                    f"""
-                    SELECT
-                        kd.id,
-                        kd.title,
-                        kd.description,
-                        kd.source,
-                        kd.category,
-                        kd.tags,
-                        kd.file_type,
-                    kd.file_size,
-                    kd.storage_key,
-                    kd.file_url,
-                    kd.created_at,
-                    kd.updated_at,
-                    NULL::text AS document_type,
-                    kc.content,
-                    kc.chunk_index,
-                    (kc.embedding <=> CAST(:query_vec AS vector)) AS distance
-                FROM knowledge_chunk kc
-                JOIN knowledge_document kd ON kc.document_id = kd.id
-                    WHERE {where_clause}
-                    ORDER BY distance ASC
-                    LIMIT :top_k
-                    """
-                ),
-                params,
-            ).mappings().all()
-
-            # Dedup docs and collect top chunks
-            doc_best = {}
-            for r in rows:
-                doc_id = r["id"]
-                dist = r["distance"]
-                if doc_id not in doc_best or dist < doc_best[doc_id]["distance"]:
-                    doc_best[doc_id] = {"row": r, "distance": dist}
-                chunks.append(
-                    {
-                        "doc_id": doc_id,
-                        "title": r["title"],
-                        "distance": dist,
-                        "text": _sanitize_text(r["content"])[:800],
-                    }
-                )
+        # Same question (semantically) over the same retrieved chunks -> same answer.
+        chunk_key = frozenset(_chunk_key(r) for r in rows)
+        if query_vec is not None:
+            cached = answer_cache.lookup(cache_scope, query_vec, chunk_key)
+            if cached is not None:
+                return cached
 
-            ordered_docs = sorted(doc_best.values(), key=lambda x: x["distance"])
-            relevant_docs = [_with_presigned_url(_row_to_doc(item["row"])) for item in ordered_docs[: request.limit]]
-            citations = [d.title for d in relevant_docs]
-            best_score = ordered_docs[0]["distance"] if ordered_docs else None
-        except Exception as exc:
-            logger.error("RAG query vector path failed: %s", exc, exc_info=True)
+        # Dedup docs (first row per doc is its best fused rank) and collect top chunks
+        doc_rows = {}
+        for r in rows:
+            doc_rows.setdefault(r["id"], r)
+            chunks.append(_rag_chunk(r))
+
+        top_rows = list(doc_rows.values())[: request.limit]
+        relevant_docs = [_with_presigned_url(_row_to_doc(r)) for r in top_rows]
+        citations = [
+            f"{r['title']} ({_chunk_location(r)})" if _chunk_location(r) else r["title"] for r in top_rows
+        ]
+        distances = [r["distance"] for r in rows if r["distance"] is not None]
+        best_score = min(distances) if distances else None
+        # Optional cross-encoder pass: only the most relevant chunks that fit the token budget.
+        chunks = await chunk_reranker.rerank(request.query, chunks)
+    except Exception as exc:
+        logger.error("RAG retrieval failed: %s", exc, exc_info=True)
 
-    # Build context
-    context_parts = []
-    for ch in chunks[: top_k_chunks]:
-        context_parts.append(f"[{ch['title']} | score={ch['distance']:.3f}] {ch['text']}")
+    context_parts = _context_parts(chunks[:top_k_chunks])
     context = "\n".join(context_parts) if context_parts else "Không có ngữ cảnh liên quan."
 
     # If no context at all, avoid repeating 'Không đủ dữ liệu', give gentle ask for clarification
@@ -1039,25 +1009,19 @@ Hãy:
                     "Chỉ dùng thông tin trong Context. Nếu thiếu thông tin, nói rõ."
                 )
             )
-            prompt = f"""Câu hỏi: {request.query}
-
-Context (top chunks):
-{context}
-
-Yêu cầu:
-- Trả lời ngắn gọn, không markdown.
-- Nếu dùng thông tin, nêu rõ tên tài liệu trong ngoặc [].
-- Nếu không đủ thông tin, trả lời rằng không đủ dữ liệu."""
-            answer = await chat.chat(prompt)
+            answer = await chat.chat(_rag_prompt(request.query, context))
             confidence = 0.90 if relevant_docs else 0.60
             if best_score is not None:
                 confidence = max(0.5, min(0.98, 1 - float(best_score)))
-            return KnowledgeQueryResponse(
+            response = KnowledgeQueryResponse(
                 answer=answer,
                 relevant_documents=relevant_docs,
                 confidence=confidence,
                 citations=citations,
             )
+            if query_vec is not None:
+                answer_cache.store(cache_scope, query_vec, chunk_key, response)
+            return response
         except Exception as exc:
             logger.error("Groq query failed: %s", exc)
 
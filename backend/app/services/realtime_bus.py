@@ -1,5 +1,20 @@
-from app.services.session_event_bus import SessionEventBus
+from app.core.config import get_settings
+from app.services.session_event_bus import RedisStreamSessionEventBus, SessionEventBus
 
 
-session_bus = SessionEventBus()
+def create_session_bus():
+    """Pick the bus backend: in-process memory (default) or Redis Streams for multi-worker deployments."""
+    settings = get_settings()
+    backend = (settings.realtime_bus_backend or "memory").strip().lower()
+    if backend == "redis":
+        if not settings.redis_url:
+            raise RuntimeError("REALTIME_BUS_BACKEND=redis requires REDIS_URL")
+        return RedisStreamSessionEventBus.from_url(
+            settings.redis_url,
+            key_prefix=settings.realtime_bus_key_prefix,
+            stream_maxlen=settings.realtime_bus_stream_maxlen,
+        )
+    return SessionEventBus()
 
+
+session_bus = create_session_bus()
@@ -0,0 +1,137 @@
+"""
+Snapshot backends for `RealtimeSessionStore`.
+
+Backends only move JSON-serializable dicts; (de)serialization of the session
+dataclasses lives in `realtime_session_store`. All methods are blocking and are
+called from the sweeper via a worker thread, or on a cache miss.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSnapshotBackend:
+    """No-op backend: sessions live only in process memory."""
+
+    persistent = False
+
+    def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        return None
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def delete(self, session_id: str) -> None:
+        return None
+
+
+class RedisSnapshotBackend(SessionSnapshotBackend):
+    """One JSON blob per session under `{prefix}:{session_id}`, expiring after `ttl_seconds`."""
+
+    persistent = True
+
+    def __init__(self, redis_client: Any, key_prefix: str = "meetmate:session", ttl_seconds: int = 86400) -> None:
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.ttl_seconds = int(ttl_seconds)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisSnapshotBackend":
+        try:
+            import redis  # type: ignore
+        except Exception as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("redis package is required for the redis session backend") from exc
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}:{session_id}"
+
+    def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        payload = json.dumps(data, ensure_ascii=False, default=str)
+        self.redis.setex(self._key(session_id), self.ttl_seconds, payload)
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.redis.get(self._key(session_id))
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        return json.loads(raw)
+
+    def delete(self, session_id: str) -> None:
+        self.redis.delete(self._key(session_id))
+
+
+class PostgresSnapshotBackend(SessionSnapshotBackend):
+    """Upserts into `realtime_session_snapshot` (see infra/postgres/init/10_realtime_session_snapshot.sql)."""
+
+    persistent = True
+
+    def __init__(self, engine: Any = None) -> None:
+        if engine is None:
+            from app.db.session import engine as app_engine
+
+            engine = app_engine
+        self.engine = engine
+
+    def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        from sqlalchemy import text
+
+        payload = json.dumps(data, ensure_ascii=False, default=str)
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO realtime_session_snapshot (session_id, data, updated_at)
+                    VALUES (:session_id, CAST(:data AS jsonb), now())
+                    ON CONFLICT (session_id)
+                    DO UPDATE SET data = EXCLUDED.data, updated_at = now()
+                    """
+                ),
+                {"session_id": session_id, "data": payload},
+            )
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        from sqlalchemy import text
+
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT data FROM realtime_session_snapshot WHERE session_id = :session_id"),
+                {"session_id": session_id},
+            ).fetchone()
+        if not row:
+            return None
+        data = row[0]
+        return json.loads(data) if isinstance(data, str) else data
+
+    def delete(self, session_id: str) -> None:
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM realtime_session_snapshot WHERE session_id = :session_id"),
+                {"session_id": session_id},
+            )
+
+
+def create_snapshot_backend() -> SessionSnapshotBackend:
+    """Pick the snapshot backend: memory (default, no persistence), redis or postgres."""
+    settings = get_settings()
+    backend = (settings.realtime_session_backend or "memory").strip().lower()
+    if backend == "redis":
+        if not settings.redis_url:
+            raise RuntimeError("REALTIME_SESSION_BACKEND=redis requires REDIS_URL")
+        return RedisSnapshotBackend.from_url(
+            settings.redis_url,
+            key_prefix=settings.realtime_session_key_prefix,
+            ttl_seconds=settings.realtime_session_snapshot_ttl_seconds,
+        )
+    if backend == "postgres":
+        return PostgresSnapshotBackend()
+    return SessionSnapshotBackend()
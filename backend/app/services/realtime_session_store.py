@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import logging
 import threading
 import time
 import uuid
 from collections import deque
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from typing import Any, Deque, Dict, List, Optional
 
+from app.core.config import get_settings
+from app.services.realtime_session_snapshot import SessionSnapshotBackend, create_snapshot_backend
+from app.services.realtime_timeline import FinalChunkLog, SpeakerTimeline
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class ExpectedAudio:
@@ -35,9 +44,11 @@ class RealtimeSession:
     transcript_buffer: str = ""
     state_version: int = 0
     stream_state: "InMeetingStreamState" = field(default_factory=lambda: InMeetingStreamState())
+    # Guards this session only; the store-wide lock just protects dict membership.
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class FinalTranscriptChunk:
     seq: int
     time_start: float
@@ -50,9 +61,13 @@ class FinalTranscriptChunk:
 
 @dataclass
 class InMeetingStreamState:
-    final_stream: List[FinalTranscriptChunk] = field(default_factory=list)
+    final_stream: FinalChunkLog = field(
+        default_factory=lambda: FinalChunkLog(max_chunks=get_settings().realtime_final_chunk_horizon)
+    )
     final_by_seq: Dict[int, FinalTranscriptChunk] = field(default_factory=dict)
-    speaker_segments: List[Dict[str, Any]] = field(default_factory=list)
+    speaker_segments: SpeakerTimeline = field(
+        default_factory=lambda: SpeakerTimeline(max_segments=get_settings().realtime_speaker_segment_limit)
+    )
     rolling_window: Deque[FinalTranscriptChunk] = field(default_factory=deque)
     last_final_seq: int = 0
     last_transcript_seq: int = 0
@@ -77,58 +92,189 @@ class InMeetingStreamState:
     risks: List[Dict[str, Any]] = field(default_factory=list)
 
 
+_CHUNK_FIELDS = {f.name for f in fields(FinalTranscriptChunk)}
+_CHUNK_COLLECTIONS = ("final_stream", "final_by_seq", "rolling_window", "speaker_segments")
+
+
+def _chunk_from_dict(data: Optional[Dict[str, Any]]) -> Optional[FinalTranscriptChunk]:
+    if not data:
+        return None
+    return FinalTranscriptChunk(**{k: v for k, v in data.items() if k in _CHUNK_FIELDS})
+
+
+def session_to_dict(session: RealtimeSession) -> Dict[str, Any]:
+    """JSON-serializable snapshot of a session (call with `session.lock` held)."""
+    state = session.stream_state
+    stream: Dict[str, Any] = {}
+    for f in fields(state):
+        if f.name in _CHUNK_COLLECTIONS:
+            continue
+        value = getattr(state, f.name)
+        stream[f.name] = asdict(value) if isinstance(value, FinalTranscriptChunk) else copy.deepcopy(value)
+    stream["final_stream"] = [asdict(chunk) for chunk in state.final_stream.unspilled()]
+    stream["final_stream_spilled"] = state.final_stream.spilled
+    stream["final_by_seq"] = [asdict(chunk) for chunk in state.final_by_seq.values()]
+    stream["rolling_window"] = [asdict(chunk) for chunk in state.rolling_window]
+    stream["speaker_segments"] = state.speaker_segments.to_list()
+    return {
+        "session_id": session.session_id,
+        "config": asdict(session.config),
+        "created_at_s": session.created_at_s,
+        "last_activity_s": session.last_activity_s,
+        "transcript_buffer": session.transcript_buffer,
+        "state_version": session.state_version,
+        "stream_state": stream,
+    }
+
+
+def session_from_dict(data: Dict[str, Any]) -> RealtimeSession:
+    """Rebuild a session from `session_to_dict` output; unknown keys are ignored."""
+    config_data = dict(data.get("config") or {})
+    config_data["expected_audio"] = ExpectedAudio(**(config_data.get("expected_audio") or {}))
+    config_fields = {f.name for f in fields(RealtimeSessionConfig)}
+    config = RealtimeSessionConfig(**{k: v for k, v in config_data.items() if k in config_fields})
+
+    stream_data = dict(data.get("stream_state") or {})
+    # Keep chunk identity shared between final_stream / final_by_seq / rolling_window.
+    by_seq: Dict[int, FinalTranscriptChunk] = {}
+    for raw in stream_data.get("final_stream") or []:
+        chunk = _chunk_from_dict(raw)
+        by_seq[chunk.seq] = chunk
+    settings = get_settings()
+    final_stream = FinalChunkLog(by_seq.values(), max_chunks=settings.realtime_final_chunk_horizon)
+    final_stream.spilled = int(stream_data.get("final_stream_spilled") or 0)
+    for raw in stream_data.get("final_by_seq") or []:
+        chunk = _chunk_from_dict(raw)
+        by_seq.setdefault(chunk.seq, chunk)
+    rolling_window = deque(
+        by_seq.get(int(raw.get("seq", 0))) or _chunk_from_dict(raw) for raw in stream_data.get("rolling_window") or []
+    )
+    stream_fields = {f.name for f in fields(InMeetingStreamState)}
+    scalars = {
+        k: v
+        for k, v in stream_data.items()
+        if k in stream_fields
+        and k not in _CHUNK_COLLECTIONS
+        and k not in ("last_transcript_chunk", "last_partial_chunk")
+    }
+    stream_state = InMeetingStreamState(
+        final_stream=final_stream,
+        final_by_seq=by_seq,
+        rolling_window=rolling_window,
+        speaker_segments=SpeakerTimeline(
+            stream_data.get("speaker_segments") or [],
+            max_segments=settings.realtime_speaker_segment_limit,
+        ),
+        last_transcript_chunk=_chunk_from_dict(stream_data.get("last_transcript_chunk")),
+        last_partial_chunk=_chunk_from_dict(stream_data.get("last_partial_chunk")),
+        **scalars,
+    )
+    return RealtimeSession(
+        session_id=data["session_id"],
+        config=config,
+        created_at_s=float(data.get("created_at_s") or time.time()),
+        last_activity_s=float(data.get("last_activity_s") or time.time()),
+        transcript_buffer=data.get("transcript_buffer") or "",
+        state_version=int(data.get("state_version") or 0),
+        stream_state=stream_state,
+    )
+
+
 class RealtimeSessionStore:
-    def __init__(self) -> None:
+    """
+    In-process session registry with optional snapshot/restore and idle eviction.
+
+    - `_lock` only guards the `_sessions` dict; per-session mutations take `session.lock`.
+    - With a snapshot backend, sessions missing from memory (restart, eviction, other
+      worker) are restored on `get` / `ensure`, and the sweeper persists dirty sessions.
+    - The sweeper evicts sessions idle longer than `idle_ttl_s` (snapshotting them first).
+    """
+
+    def __init__(
+        self,
+        backend: Optional[SessionSnapshotBackend] = None,
+        idle_ttl_s: float = 7200.0,
+        sweep_interval_s: float = 60.0,
+    ) -> None:
         self._sessions: Dict[str, RealtimeSession] = {}
         self._lock = threading.Lock()
+        self.backend = backend or SessionSnapshotBackend()
+        self.idle_ttl_s = float(idle_ttl_s)
+        self.sweep_interval_s = float(sweep_interval_s)
+        self._snapshot_at: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
 
-    def create(self, config: RealtimeSessionConfig) -> RealtimeSession:
-        session_id = str(uuid.uuid4())
-        session = RealtimeSession(session_id=session_id, config=config)
+    def _put(self, session: RealtimeSession) -> RealtimeSession:
         with self._lock:
-            self._sessions[session_id] = session
+            self._sessions[session.session_id] = session
         return session
 
-    def create_with_id(self, session_id: str, config: RealtimeSessionConfig) -> RealtimeSession:
-        session = RealtimeSession(session_id=session_id, config=config)
+    def _restore(self, session_id: str) -> Optional[RealtimeSession]:
+        try:
+            data = self.backend.load(session_id)
+        except Exception:
+            logger.exception("session snapshot load failed (session_id=%s)", session_id)
+            return None
+        if not data:
+            return None
+        try:
+            restored = session_from_dict(data)
+        except Exception:
+            logger.exception("session snapshot is unreadable (session_id=%s)", session_id)
+            return None
         with self._lock:
-            self._sessions[session_id] = session
-        return session
+            # Another caller may have created/restored it meanwhile; keep the first one.
+            existing = self._sessions.setdefault(session_id, restored)
+            if existing is restored:
+                self._snapshot_at[session_id] = restored.last_activity_s
+        return existing
 
-    def get(self, session_id: str) -> Optional[RealtimeSession]:
+    def _get_or_create(self, session_id: str, config: Optional[RealtimeSessionConfig] = None) -> RealtimeSession:
         with self._lock:
-            return self._sessions.get(session_id)
+            existing = self._sessions.get(session_id)
+        if existing:
+            return existing
+        restored = self._restore(session_id)
+        if restored:
+            return restored
+        with self._lock:
+            return self._sessions.setdefault(
+                session_id,
+                RealtimeSession(session_id=session_id, config=config or RealtimeSessionConfig()),
+            )
 
-    def ensure(self, session_id: str, config: Optional[RealtimeSessionConfig] = None) -> RealtimeSession:
+    def create(self, config: RealtimeSessionConfig) -> RealtimeSession:
+        session_id = str(uuid.uuid4())
+        return self._put(RealtimeSession(session_id=session_id, config=config))
+
+    def create_with_id(self, session_id: str, config: RealtimeSessionConfig) -> RealtimeSession:
+        return self._put(RealtimeSession(session_id=session_id, config=config))
+
+    def get(self, session_id: str) -> Optional[RealtimeSession]:
         with self._lock:
             existing = self._sessions.get(session_id)
-            if existing:
-                existing.last_activity_s = time.time()
-                return existing
-            session = RealtimeSession(
-                session_id=session_id,
-                config=config or RealtimeSessionConfig(),
-            )
-            self._sessions[session_id] = session
-            return session
+        return existing or self._restore(session_id)
+
+    def ensure(self, session_id: str, config: Optional[RealtimeSessionConfig] = None) -> RealtimeSession:
+        session = self._get_or_create(session_id, config)
+        with session.lock:
+            session.last_activity_s = time.time()
+        return session
 
     def touch(self, session_id: str) -> None:
         with self._lock:
             sess = self._sessions.get(session_id)
-            if sess:
+        if sess:
+            with sess.lock:
                 sess.last_activity_s = time.time()
 
     def append_transcript(self, session_id: str, text: str, max_chars: int = 4000) -> str:
         if not text:
-            with self._lock:
-                sess = self._sessions.get(session_id)
-                return sess.transcript_buffer if sess else ""
+            sess = self.get(session_id)
+            return sess.transcript_buffer if sess else ""
 
-        with self._lock:
-            sess = self._sessions.get(session_id)
-            if not sess:
-                sess = RealtimeSession(session_id=session_id, config=RealtimeSessionConfig())
-                self._sessions[session_id] = sess
+        sess = self._get_or_create(session_id)
+        with sess.lock:
             combined = f"{sess.transcript_buffer}\n{text}".strip() if sess.transcript_buffer else text.strip()
             if len(combined) > max_chars:
                 combined = combined[-max_chars:]
@@ -137,14 +283,133 @@ class RealtimeSessionStore:
             return combined
 
     def next_state_version(self, session_id: str) -> int:
-        with self._lock:
-            sess = self._sessions.get(session_id)
-            if not sess:
-                sess = RealtimeSession(session_id=session_id, config=RealtimeSessionConfig())
-                self._sessions[session_id] = sess
+        sess = self._get_or_create(session_id)
+        with sess.lock:
             sess.state_version = (sess.state_version or 0) + 1
             sess.last_activity_s = time.time()
             return sess.state_version
 
+    def remove(self, session_id: str) -> None:
+        """Drop a session from memory and from the snapshot backend (explicit end of meeting)."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._snapshot_at.pop(session_id, None)
+        try:
+            self.backend.delete(session_id)
+        except Exception:
+            logger.exception("session snapshot delete failed (session_id=%s)", session_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    # ---- snapshot / eviction -------------------------------------------------
+
+    def collect_snapshots(self, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Serialize sessions changed since their last snapshot (all of them with `force`)."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        out: Dict[str, Dict[str, Any]] = {}
+        for sess in sessions:
+            with sess.lock:
+                if not force and self._snapshot_at.get(sess.session_id, -1.0) >= sess.last_activity_s:
+                    continue
+                out[sess.session_id] = session_to_dict(sess)
+        return out
+
+    def save_snapshots(self, snapshots: Dict[str, Dict[str, Any]]) -> int:
+        """Write serialized sessions to the backend (blocking). Returns how many were saved."""
+        saved = 0
+        for session_id, data in snapshots.items():
+            try:
+                self.backend.save(session_id, data)
+            except Exception:
+                logger.exception("session snapshot save failed (session_id=%s)", session_id)
+                continue
+            with self._lock:
+                self._snapshot_at[session_id] = float(data.get("last_activity_s") or 0.0)
+            saved += 1
+        return saved
+
+    def idle_sessions(self, idle_ttl_s: Optional[float] = None, now: Optional[float] = None) -> List[str]:
+        ttl = self.idle_ttl_s if idle_ttl_s is None else float(idle_ttl_s)
+        now = time.time() if now is None else now
+        with self._lock:
+            return [sid for sid, sess in self._sessions.items() if now - sess.last_activity_s > ttl]
+
+    def evict_idle(
+        self, idle_ttl_s: Optional[float] = None, now: Optional[float] = None, persist: bool = True
+    ) -> List[str]:
+        """
+        Drop sessions idle longer than the TTL from memory. Sessions whose latest state
+        has not been snapshotted yet are saved first (no-op for the memory backend), or
+        with `persist=False` kept for a later sweep. Call on the event loop thread:
+        live handlers mutate `stream_state` there without taking `session.lock`.
+        """
+        ttl = self.idle_ttl_s if idle_ttl_s is None else float(idle_ttl_s)
+        now = time.time() if now is None else now
+        evicted: List[str] = []
+        for session_id in self.idle_sessions(ttl, now):
+            with self._lock:
+                sess = self._sessions.get(session_id)
+            if sess is None:
+                continue
+            with sess.lock:
+                dirty = self.backend.persistent and self._snapshot_at.get(session_id, -1.0) < sess.last_activity_s
+                if dirty and not persist:
+                    continue
+                data = session_to_dict(sess) if dirty else None
+            if data is not None and self.save_snapshots({session_id: data}) == 0:
+                continue  # keep it in memory rather than lose state
+            with self._lock:
+                current = self._sessions.get(session_id)
+                # Skip if it was touched (or replaced) while we were saving.
+                if current is not sess or now - sess.last_activity_s <= ttl:
+                    continue
+                self._sessions.pop(session_id, None)
+                self._snapshot_at.pop(session_id, None)
+            evicted.append(session_id)
+        if evicted:
+            logger.info("realtime sessions evicted idle=%s remaining=%s", len(evicted), len(self))
+        return evicted
+
+    async def sweep_once(self) -> List[str]:
+        # Serialize on the loop thread (where WS handlers mutate state), write off-loop,
+        # then evict on the loop: idle sessions were just saved, and any still dirty wait.
+        snapshots = self.collect_snapshots()
+        if snapshots and self.backend.persistent:
+            await asyncio.to_thread(self.save_snapshots, snapshots)
+        return self.evict_idle(persist=False)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval_s)
+            try:
+                await self.sweep_once()
+            except Exception:
+                logger.exception("realtime session sweep failed")
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        # Final flush so a restart can resume live meetings.
+        if self.backend.persistent:
+            await asyncio.to_thread(self.save_snapshots, self.collect_snapshots())
+
 
-session_store = RealtimeSessionStore()
+_settings = get_settings()
+session_store = RealtimeSessionStore(
+    backend=create_snapshot_backend(),
+    idle_ttl_s=_settings.realtime_session_idle_ttl_seconds,
+    sweep_interval_s=_settings.realtime_session_sweep_interval_seconds,
+)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class SessionTickPool:
+    """
+    Bounded worker pool for blocking per-session ticks (recap/topic/intent LLM calls).
+
+    - Work runs on a dedicated thread pool so the WS consumer never waits on the LLM.
+    - At most one in-flight tick per session; `submit` returns False while busy.
+    - Total pending ticks are capped; when saturated new ticks are skipped (the
+      caller's cursor is not advanced, so the tick is simply retried later).
+    - `on_done` runs back on the event loop, so state merges never race the consumer.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(self.max_workers, int(max_pending))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.submitted = 0
+        self.skipped_busy = 0
+        self.skipped_saturated = 0
+        self.failed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="realtime-tick")
+        return self._executor
+
+    def is_busy(self, session_id: str) -> bool:
+        task = self._in_flight.get(session_id)
+        return task is not None and not task.done()
+
+    def pending(self) -> int:
+        return sum(1 for task in self._in_flight.values() if not task.done())
+
+    def submit(
+        self,
+        session_id: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_done: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ) -> bool:
+        if self.is_busy(session_id):
+            self.skipped_busy += 1
+            return False
+        if self.pending() >= self.max_pending:
+            self.skipped_saturated += 1
+            return False
+        self.submitted += 1
+        task = asyncio.create_task(self._run(session_id, fn, args, on_done))
+        self._in_flight[session_id] = task
+        return True
+
+    async def _run(
+        self,
+        session_id: str,
+        fn: Callable[..., Any],
+        args: tuple,
+        on_done: Optional[Callable[[Any], Awaitable[None]]],
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+            if on_done is not None:
+                await on_done(result)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.failed += 1
+            logger.exception("realtime tick failed (session_id=%s)", session_id)
+        finally:
+            current = self._in_flight.get(session_id)
+            if current is asyncio.current_task():
+                self._in_flight.pop(session_id, None)
+
+    async def wait_idle(self, session_id: str) -> None:
+        task = self._in_flight.get(session_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "pending": self.pending(),
+            "submitted": self.submitted,
+            "skipped_busy": self.skipped_busy,
+            "skipped_saturated": self.skipped_saturated,
+            "failed": self.failed,
+        }
+
+    def shutdown(self) -> None:
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        self._in_flight.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_settings = get_settings()
+recap_tick_pool = SessionTickPool(
+    max_workers=_settings.realtime_recap_workers,
+    max_pending=_settings.realtime_recap_max_pending,
+)
@@ -0,0 +1,148 @@
+"""
+Compact per-session timelines for live meetings.
+
+- `FinalChunkLog`: bounded log of final transcript chunks. Only the most recent
+  `max_chunks` stay in memory; older chunks are queued for spilling to the DB
+  (`take_spill`) so a multi-hour meeting keeps a flat memory footprint.
+- `SpeakerTimeline`: diarization segments stored column-wise (array-backed
+  start/end/confidence, interned speaker ids) and kept ordered by start time,
+  so reads never sort and overlap lookups are a bisect instead of a scan.
+"""
+from __future__ import annotations
+
+import bisect
+from array import array
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+
+class FinalChunkLog:
+    """Append-only ring of final chunks with an overflow queue for spilling."""
+
+    __slots__ = ("max_chunks", "spilled", "dropped", "_chunks", "_pending_spill")
+
+    def __init__(self, chunks: Iterable[Any] = (), max_chunks: int = 2000) -> None:
+        self.max_chunks = max(1, int(max_chunks))
+        self.spilled = 0  # chunks handed out by take_spill (already persisted or being persisted)
+        self.dropped = 0  # chunks lost because nobody drained the spill queue
+        self._chunks: Deque[Any] = deque()
+        self._pending_spill: Deque[Any] = deque()
+        for chunk in chunks:
+            self.append(chunk)
+
+    def append(self, chunk: Any) -> None:
+        self._chunks.append(chunk)
+        if len(self._chunks) > self.max_chunks:
+            self._pending_spill.append(self._chunks.popleft())
+            # Never let the overflow queue become the unbounded list we are replacing.
+            if len(self._pending_spill) > self.max_chunks:
+                self._pending_spill.popleft()
+                self.dropped += 1
+
+    def pending_spill(self) -> int:
+        return len(self._pending_spill)
+
+    def take_spill(self) -> List[Any]:
+        """Pop chunks evicted from memory, oldest first. The caller owns persisting them."""
+        out = list(self._pending_spill)
+        self._pending_spill.clear()
+        self.spilled += len(out)
+        return out
+
+    def unspilled(self) -> List[Any]:
+        """Everything not yet handed to `take_spill` (overflow queue, then in-memory chunks)."""
+        return [*self._pending_spill, *self._chunks]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._chunks)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._chunks[index]
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks) or bool(self._pending_spill)
+
+
+class SpeakerTimeline:
+    """
+    Diarization segments ordered by start time, stored as parallel arrays.
+
+    Beyond `max_segments` the oldest (by start) are discarded in batches.
+    """
+
+    __slots__ = ("max_segments", "_starts", "_ends", "_confidences", "_speaker_ids", "_speakers", "_speaker_index", "_max_len")
+
+    def __init__(self, segments: Iterable[Dict[str, Any]] = (), max_segments: int = 20000) -> None:
+        self.max_segments = max(1, int(max_segments))
+        self._starts = array("d")
+        self._ends = array("d")
+        self._confidences = array("f")
+        self._speaker_ids = array("i")
+        self._speakers: List[str] = []
+        self._speaker_index: Dict[str, int] = {}
+        self._max_len = 0.0  # longest segment seen; bounds the left edge of overlap searches
+        for seg in segments:
+            self.add(seg["speaker"], seg["start"], seg["end"], seg.get("confidence", 1.0))
+
+    def _speaker_id(self, speaker: str) -> int:
+        sid = self._speaker_index.get(speaker)
+        if sid is None:
+            sid = len(self._speakers)
+            self._speakers.append(speaker)
+            self._speaker_index[speaker] = sid
+        return sid
+
+    def add(self, speaker: str, start: float, end: float, confidence: Optional[float] = 1.0) -> None:
+        start = float(start)
+        end = float(end)
+        # Segments normally arrive in order, so this is an append.
+        idx = len(self._starts) if not self._starts or start >= self._starts[-1] else bisect.bisect_right(self._starts, start)
+        self._starts.insert(idx, start)
+        self._ends.insert(idx, end)
+        self._confidences.insert(idx, float(1.0 if confidence is None else confidence))
+        self._speaker_ids.insert(idx, self._speaker_id(str(speaker)))
+        self._max_len = max(self._max_len, end - start)
+        # Trim in batches so the front deletion is amortized.
+        excess = len(self._starts) - self.max_segments
+        if excess > max(1, self.max_segments // 8):
+            for col in (self._starts, self._ends, self._confidences, self._speaker_ids):
+                del col[:excess]
+
+    def _segment(self, idx: int) -> Dict[str, Any]:
+        return {
+            "speaker": self._speakers[self._speaker_ids[idx]],
+            "start": self._starts[idx],
+            "end": self._ends[idx],
+            "confidence": float(self._confidences[idx]),
+        }
+
+    def overlapping(self, t_start: float, t_end: float) -> List[Dict[str, Any]]:
+        """Segments intersecting [t_start, t_end], ordered by start."""
+        lo = bisect.bisect_left(self._starts, t_start - self._max_len)
+        hi = bisect.bisect_right(self._starts, t_end)
+        return [self._segment(i) for i in range(lo, hi) if self._ends[i] > t_start and self._starts[i] < t_end]
+
+    def best_match(self, t_start: float, t_end: float) -> Optional[Dict[str, Any]]:
+        """Segment with the largest overlap with [t_start, t_end], or None."""
+        lo = bisect.bisect_left(self._starts, t_start - self._max_len)
+        hi = bisect.bisect_right(self._starts, t_end)
+        best_idx = -1
+        best_overlap = 0.0
+        for i in range(lo, hi):
+            overlap = min(t_end, self._ends[i]) - max(t_start, self._starts[i])
+            if overlap > best_overlap:
+                best_overlap = overlap
+                best_idx = i
+        return self._segment(best_idx) if best_idx >= 0 else None
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [self._segment(i) for i in range(len(self._starts))]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.to_list())
+
+    def __len__(self) -> int:
+        return len(self._starts)
@@ -1,6 +1,23 @@
 import asyncio
+import json
+import logging
+import uuid
 from collections import defaultdict
-from typing import Any, Dict, Set
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+def _deliver(queue: asyncio.Queue, envelope: Dict[str, Any]) -> None:
+    try:
+        queue.put_nowait(envelope)
+    except asyncio.QueueFull:
+        try:
+            queue.get_nowait()  # drop oldest
+            queue.put_nowait(envelope)
+        except Exception:
+            # If the consumer is still too slow, drop the event for that subscriber
+            pass
 
 
 class SessionEventBus:
@@ -15,7 +32,7 @@ class SessionEventBus:
         self.seq_counter: Dict[str, int] = defaultdict(int)
         self.max_queue_size = max_queue_size
 
-    def subscribe(self, session_id: str) -> asyncio.Queue:
+    async def subscribe(self, session_id: str) -> asyncio.Queue:
         queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
         self.subscribers[session_id].add(queue)
         return queue
@@ -35,6 +52,13 @@ class SessionEventBus:
         self.subscribers.pop(session_id, None)
         self.seq_counter.pop(session_id, None)
 
+    async def claim_consumer(self, session_id: str, ttl_s: float) -> bool:
+        """Single process: this one always runs the session's stream consumer."""
+        return True
+
+    async def release_consumer(self, session_id: str) -> None:
+        return None
+
     def _next_seq(self, session_id: str) -> int:
         self.seq_counter[session_id] = self.seq_counter.get(session_id, 0) + 1
         return self.seq_counter[session_id]
@@ -49,14 +73,221 @@ class SessionEventBus:
         envelope.setdefault("seq", self._next_seq(session_id))
 
         for queue in list(self.subscribers.get(session_id, [])):
+            _deliver(queue, envelope)
+
+        return envelope
+
+
+# INCR + XADD in one script so stream order always matches seq order across processes.
+_PUBLISH_SCRIPT = """
+local seq = redis.call('INCR', KEYS[2])
+redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[2], '*', 'seq', seq, 'data', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return seq
+"""
+
+# Take or extend the consumer lease if it is free or already ours.
+_CLAIM_SCRIPT = """
+local owner = redis.call('GET', KEYS[1])
+if owner and owner ~= ARGV[1] then
+  return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+return 1
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisStreamSessionEventBus:
+    """
+    Session event bus backed by Redis Streams, for multi-worker / multi-node deployments.
+
+    Same API as `SessionEventBus`. Publishing allocates the seq with a Redis INCR
+    (globally monotonic per session) and appends to `{prefix}:{session_id}`; each
+    process runs one XREAD reader per session with local subscribers and fans out
+    to their queues, so every subscriber sees events in seq order regardless of
+    which worker published them.
+
+    Per-session work that must run once (the in-meeting stream consumer) is
+    guarded by a lease: `claim_consumer` takes or renews `{prefix}:{session_id}:consumer`
+    for this process, and another worker can take over once it expires.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        max_queue_size: int = 100,
+        key_prefix: str = "meetmate:bus",
+        stream_maxlen: int = 1000,
+        ttl_seconds: int = 86400,
+        block_ms: int = 5000,
+    ) -> None:
+        self.redis = redis_client
+        self.max_queue_size = max_queue_size
+        self.key_prefix = key_prefix
+        self.stream_maxlen = stream_maxlen
+        self.ttl_seconds = ttl_seconds
+        self.block_ms = block_ms
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._readers: Dict[str, asyncio.Task] = {}
+        self._last_ids: Dict[str, str] = {}
+        self.instance_id = uuid.uuid4().hex
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisStreamSessionEventBus":
+        try:
+            import redis.asyncio as aioredis  # type: ignore
+        except Exception as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("redis package is required for the redis event bus backend") from exc
+        return cls(aioredis.from_url(url), **kwargs)
+
+    def _stream_key(self, session_id: str) -> str:
+        return f"{self.key_prefix}:{session_id}"
+
+    def _seq_key(self, session_id: str) -> str:
+        return f"{self.key_prefix}:{session_id}:seq"
+
+    def _consumer_key(self, session_id: str) -> str:
+        return f"{self.key_prefix}:{session_id}:consumer"
+
+    async def subscribe(self, session_id: str) -> asyncio.Queue:
+        """Subscribe; every event published after this returns is delivered to the queue."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.subscribers[session_id].add(queue)
+        if not self._reader_running(session_id):
+            # Pin the start position before returning, not when the reader task first runs.
+            start_id = await self._current_last_id(self._stream_key(session_id))
+            if not self._reader_running(session_id) and queue in self.subscribers.get(session_id, ()):
+                self._last_ids[session_id] = start_id
+                self._readers[session_id] = asyncio.create_task(self._read_loop(session_id))
+        return queue
+
+    def _reader_running(self, session_id: str) -> bool:
+        reader = self._readers.get(session_id)
+        return reader is not None and not reader.done()
+
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self.subscribers.get(session_id)
+        if not subscribers:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            self.subscribers.pop(session_id, None)
+            self._stop_reader(session_id)
+
+    async def claim_consumer(self, session_id: str, ttl_s: float) -> bool:
+        """Take, or renew, the session's consumer lease for this process; False if another worker holds it."""
+        claimed = await self.redis.eval(
+            _CLAIM_SCRIPT, 1, self._consumer_key(session_id), self.instance_id, int(ttl_s * 1000)
+        )
+        return bool(int(claimed))
+
+    async def release_consumer(self, session_id: str) -> None:
+        await self.redis.eval(_RELEASE_SCRIPT, 1, self._consumer_key(session_id), self.instance_id)
+
+    def clear_session(self, session_id: str) -> None:
+        """Drop local subscribers and schedule deletion of the session's stream and seq keys."""
+        self.subscribers.pop(session_id, None)
+        self._stop_reader(session_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.create_task(self.redis.delete(self._stream_key(session_id), self._seq_key(session_id)))
+
+    def _stop_reader(self, session_id: str) -> None:
+        reader = self._readers.pop(session_id, None)
+        self._last_ids.pop(session_id, None)
+        if reader is not None and not reader.done():
+            reader.cancel()
+
+    async def publish(self, session_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        envelope = dict(event or {})
+        envelope["session_id"] = session_id
+        data = json.dumps(envelope, ensure_ascii=False, default=str)
+        seq = await self.redis.eval(
+            _PUBLISH_SCRIPT,
+            2,
+            self._stream_key(session_id),
+            self._seq_key(session_id),
+            data,
+            self.stream_maxlen,
+            self.ttl_seconds,
+        )
+        envelope.setdefault("seq", int(seq))
+        return envelope
+
+    async def _read_loop(self, session_id: str) -> None:
+        key = self._stream_key(session_id)
+        if self._last_ids.get(session_id, "$") == "$":
+            # `subscribe` couldn't read the stream; pin it now so no event between two XREADs is skipped.
+            self._last_ids[session_id] = await self._current_last_id(key)
+        backoff = 0.5
+        while self.subscribers.get(session_id):
+            last_id = self._last_ids.get(session_id, "$")
             try:
-                queue.put_nowait(envelope)
-            except asyncio.QueueFull:
-                try:
-                    queue.get_nowait()  # drop oldest
-                    queue.put_nowait(envelope)
-                except Exception:
-                    # If the consumer is still too slow, drop the event for that subscriber
-                    pass
+                result = await self.redis.xread({key: last_id}, block=self.block_ms, count=100)
+                backoff = 0.5
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("redis bus read failed (session_id=%s)", session_id)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 10.0)
+                continue
+            if not result:
+                continue
+            for _stream, entries in result:
+                for entry_id, fields in entries:
+                    self._last_ids[session_id] = _as_str(entry_id)
+                    envelope = self._decode(fields)
+                    if envelope is None:
+                        continue
+                    for queue in list(self.subscribers.get(session_id, [])):
+                        _deliver(queue, envelope)
+
+    async def _current_last_id(self, key: str) -> str:
+        try:
+            entries = await self.redis.xrevrange(key, count=1)
+        except Exception:
+            return "$"
+        if entries:
+            return _as_str(entries[0][0])
+        return "0-0"
 
+    @staticmethod
+    def _decode(fields: Dict[Any, Any]) -> Optional[Dict[str, Any]]:
+        raw = fields.get(b"data", fields.get("data"))
+        if raw is None:
+            return None
+        try:
+            envelope = json.loads(_as_str(raw))
+        except ValueError:
+            return None
+        seq = fields.get(b"seq", fields.get("seq"))
+        if seq is not None:
+            envelope.setdefault("seq", int(_as_str(seq)))
         return envelope
+
+    async def close(self) -> None:
+        readers = list(self._readers.values())
+        for session_id in list(self._readers.keys()):
+            self._stop_reader(session_id)
+        await asyncio.gather(*readers, return_exceptions=True)
+        try:
+            await self.redis.aclose()
+        except AttributeError:  # redis<5
+            await self.redis.close()
+
+
+def _as_str(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return str(value)
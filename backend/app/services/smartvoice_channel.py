@@ -0,0 +1,287 @@
+"""
+Process-wide SmartVoice gRPC connectivity, shared by streaming (smartvoice_streaming)
+and batch (vnpt_stt_service) recognition.
+
+- `SmartVoiceTokenCache`: the static SMARTVOICE_ACCESS_TOKEN, or a token exchanged
+  from SMARTVOICE_TOKEN_ID/KEY at SMARTVOICE_AUTH_URL and cached until shortly
+  before it expires (`expires_in` / `expires_at` in the response, the JWT `exp`
+  claim, or a default TTL). Concurrent callers share one refresh; if a refresh
+  fails while the cached token is still valid, the cached one is used.
+- `SmartVoiceChannelManager`: `pool_size` long-lived channels per event loop
+  (grpc.aio channels are loop-bound) with HTTP/2 keepalive while calls are active
+  and gRPC's reconnect backoff, handed out round-robin. `call` retries a call on
+  UNAVAILABLE with exponential backoff and re-authenticates once on UNAUTHENTICATED (streams
+  use `retry_or_raise` directly, and only retry before their first response).
+  `warmup` (app startup) fetches the token and connects, so the first audio
+  WebSocket doesn't pay for TLS + auth.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import grpc
+import httpx
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Metadata = List[Tuple[str, str]]
+
+_RETRYABLE = {grpc.StatusCode.UNAVAILABLE}
+
+
+def _extract_token(resp_json: Any) -> Optional[str]:
+    if not isinstance(resp_json, dict):
+        return None
+    for key in ("access_token", "token"):
+        if isinstance(resp_json.get(key), str) and resp_json.get(key):
+            return resp_json[key]
+    data = resp_json.get("data")
+    if isinstance(data, dict):
+        for key in ("access_token", "token"):
+            if isinstance(data.get(key), str) and data.get(key):
+                return data[key]
+    return None
+
+
+def _jwt_exp(token: str) -> Optional[float]:
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+        return float(payload["exp"]) if isinstance(payload, dict) and "exp" in payload else None
+    except Exception:
+        return None
+
+
+def token_expiry(resp_json: Any, token: str, now: float, default_ttl_s: float) -> float:
+    """Wall-clock expiry of a freshly issued token."""
+    for scope in (resp_json, resp_json.get("data") if isinstance(resp_json, dict) else None):
+        if not isinstance(scope, dict):
+            continue
+        for key in ("expires_in", "expire_in", "expiresIn"):
+            if isinstance(scope.get(key), (int, float)) and scope[key] > 0:
+                return now + float(scope[key])
+        if isinstance(scope.get("expires_at"), (int, float)) and scope["expires_at"] > now:
+            return float(scope["expires_at"])
+    exp = _jwt_exp(token)
+    if exp is not None and exp > now:
+        return exp
+    return now + default_ttl_s
+
+
+class SmartVoiceTokenCache:
+    def __init__(self, refresh_margin_s: float = 60.0, default_ttl_s: float = 3000.0) -> None:
+        self.refresh_margin_s = float(refresh_margin_s)
+        self.default_ttl_s = float(default_ttl_s)
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+        self.fetches = 0
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+    async def _fetch(self) -> Tuple[str, float]:
+        settings = get_settings()
+        async with httpx.AsyncClient(timeout=15.0) as client:
+            resp = await client.post(
+                settings.smartvoice_auth_url,
+                json={"token_id": settings.smartvoice_token_id, "token_key": settings.smartvoice_token_key},
+            )
+            resp.raise_for_status()
+            body = resp.json()
+        token = _extract_token(body)
+        if not token:
+            raise RuntimeError("SmartVoice auth response missing access_token")
+        return token, token_expiry(body, token, time.time(), self.default_ttl_s)
+
+    async def get(self) -> Optional[str]:
+        settings = get_settings()
+        if settings.smartvoice_access_token:
+            return settings.smartvoice_access_token
+        if not (settings.smartvoice_auth_url and settings.smartvoice_token_id and settings.smartvoice_token_key):
+            return None
+        if self._token and time.time() < self._expires_at - self.refresh_margin_s:
+            return self._token
+        async with self._lock():
+            if self._token and time.time() < self._expires_at - self.refresh_margin_s:
+                return self._token  # refreshed while we waited
+            try:
+                self._token, self._expires_at = await self._fetch()
+                self.fetches += 1
+            except Exception as exc:
+                if self._token and time.time() < self._expires_at:
+                    logger.warning("SmartVoice token refresh failed, using cached token: %s", exc)
+                    return self._token
+                raise
+            return self._token
+
+    async def metadata(self) -> Metadata:
+        settings = get_settings()
+        metadata: Metadata = []
+        token = await self.get()
+        if token:
+            metadata.append(("authorization", f"Bearer {token}"))
+        if settings.smartvoice_token_id:
+            metadata.append(("token-id", settings.smartvoice_token_id))
+        if settings.smartvoice_token_key:
+            metadata.append(("token-key", settings.smartvoice_token_key))
+        return metadata
+
+
+class SmartVoiceChannelManager:
+    def __init__(
+        self,
+        tokens: Optional[SmartVoiceTokenCache] = None,
+        pool_size: int = 1,
+        keepalive_s: float = 30.0,
+        keepalive_timeout_s: float = 10.0,
+        connect_timeout_s: float = 5.0,
+        max_retries: int = 3,
+        retry_backoff_s: float = 0.5,
+    ) -> None:
+        self.tokens = tokens or SmartVoiceTokenCache()
+        self.pool_size = max(1, int(pool_size))
+        self.keepalive_s = float(keepalive_s)
+        self.keepalive_timeout_s = float(keepalive_timeout_s)
+        self.connect_timeout_s = float(connect_timeout_s)
+        self.max_retries = max(0, int(max_retries))
+        self.retry_backoff_s = float(retry_backoff_s)
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, List[grpc.aio.Channel]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._next = 0
+        self._warmup_task: Optional[asyncio.Task] = None
+        self.channels_opened = 0
+        self.retries = 0
+
+    def _options(self) -> List[Tuple[str, Any]]:
+        return [
+            ("grpc.keepalive_time_ms", int(self.keepalive_s * 1000)),
+            ("grpc.keepalive_timeout_ms", int(self.keepalive_timeout_s * 1000)),
+            # Ping only while calls are in flight: servers reject idle pings more often
+            # than every 5 minutes (GOAWAY too_many_pings); idle channels reconnect lazily.
+            ("grpc.keepalive_permit_without_calls", 0),
+            ("grpc.initial_reconnect_backoff_ms", int(self.retry_backoff_s * 1000)),
+            ("grpc.max_reconnect_backoff_ms", 10_000),
+            ("grpc.max_receive_message_length", 32 * 1024 * 1024),
+        ]
+
+    def _open(self) -> grpc.aio.Channel:
+        settings = get_settings()
+        if not settings.smartvoice_grpc_endpoint:
+            raise RuntimeError("SMARTVOICE_GRPC_ENDPOINT is not set")
+        self.channels_opened += 1
+        if settings.smartvoice_insecure:
+            return grpc.aio.insecure_channel(settings.smartvoice_grpc_endpoint, options=self._options())
+        return grpc.aio.secure_channel(
+            settings.smartvoice_grpc_endpoint, grpc.ssl_channel_credentials(), options=self._options()
+        )
+
+    def channel(self) -> grpc.aio.Channel:
+        """A pooled channel of the running loop (opened lazily; replaced if it was shut down)."""
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = self._pools[loop] = []
+        if len(pool) < self.pool_size:
+            pool.append(self._open())
+            return pool[-1]
+        self._next = (self._next + 1) % len(pool)
+        i = self._next
+        if pool[i].get_state(try_to_connect=False) == grpc.ChannelConnectivity.SHUTDOWN:
+            pool[i] = self._open()
+        return pool[i]
+
+    async def metadata(self) -> Metadata:
+        return await self.tokens.metadata()
+
+    def backoff(self, attempt: int) -> float:
+        return self.retry_backoff_s * (2 ** attempt)
+
+    async def retry_or_raise(self, exc: grpc.aio.AioRpcError, attempt: int) -> None:
+        """
+        After attempt number `attempt` (0-based) failed with `exc`: wait before
+        the next attempt, or re-raise. UNAVAILABLE is retried up to `max_retries`
+        times with exponential backoff; UNAUTHENTICATED once, with a fresh token.
+        """
+        code = exc.code()
+        if code == grpc.StatusCode.UNAUTHENTICATED and attempt == 0:
+            self.tokens.invalidate()
+        elif code in _RETRYABLE and attempt < self.max_retries:
+            await asyncio.sleep(self.backoff(attempt))
+        else:
+            raise exc
+        self.retries += 1
+        logger.info("SmartVoice call retry (%s): %s", code.name, exc.details())
+
+    async def call(self, fn: Callable[[grpc.aio.Channel, Metadata], Awaitable[T]]) -> T:
+        """Run `fn(channel, metadata)` (a unary call) with `retry_or_raise` semantics."""
+        attempt = 0
+        while True:
+            try:
+                return await fn(self.channel(), await self.metadata())
+            except grpc.aio.AioRpcError as exc:
+                await self.retry_or_raise(exc, attempt)
+                attempt += 1
+
+    async def warmup(self) -> None:
+        """Fetch the token and connect one channel ahead of the first request (best effort)."""
+        try:
+            await self.metadata()
+            await asyncio.wait_for(self.channel().channel_ready(), self.connect_timeout_s)
+            logger.info("SmartVoice channel ready")
+        except Exception as exc:
+            logger.warning("SmartVoice warmup failed (will connect on first use): %s", exc)
+
+    def start(self) -> None:
+        """Warm up in the background (app startup), if SmartVoice is configured."""
+        if get_settings().smartvoice_grpc_endpoint and self._warmup_task is None:
+            self._warmup_task = asyncio.get_running_loop().create_task(self.warmup())
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "channels_opened": self.channels_opened,
+            "retries": self.retries,
+            "token_fetches": self.tokens.fetches,
+        }
+
+    async def close(self) -> None:
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+            self._warmup_task = None
+        loop = asyncio.get_running_loop()
+        pool = self._pools.pop(loop, None) or []
+        await asyncio.gather(*(channel.close(grace=1.0) for channel in pool), return_exceptions=True)
+
+
+_settings = get_settings()
+smartvoice_channels = SmartVoiceChannelManager(
+    tokens=SmartVoiceTokenCache(
+        refresh_margin_s=_settings.smartvoice_token_refresh_margin_seconds,
+        default_ttl_s=_settings.smartvoice_token_default_ttl_seconds,
+    ),
+    pool_size=_settings.smartvoice_channel_pool_size,
+    keepalive_s=_settings.smartvoice_keepalive_seconds,
+    keepalive_timeout_s=_settings.smartvoice_keepalive_timeout_seconds,
+    connect_timeout_s=_settings.smartvoice_connect_timeout_seconds,
+    max_retries=_settings.smartvoice_max_retries,
+    retry_backoff_s=_settings.smartvoice_retry_backoff_seconds,
+)
@@ -1,16 +1,15 @@
 from __future__ import annotations
 
 import asyncio
-import os
 import sys
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Any, AsyncIterator, Optional
+from typing import Any, AsyncIterator, List, Optional, Protocol
 
 import grpc
-import httpx
 
 from app.core.config import get_settings
+from app.services.smartvoice_channel import smartvoice_channels
 
 
 settings = get_settings()
@@ -31,6 +30,15 @@ except Exception as exc:  # pragma: no cover - optional dependency until SmartVo
     ra = None  # type: ignore[assignment]
     _proto_import_error = exc
 
+# Audio held for replay until SmartVoice first responds (~10 s of 16 kHz 16-bit mono).
+_REPLAY_LIMIT_BYTES = 320_000
+
+
+class AudioSource(Protocol):
+    """What the request stream reads PCM from: an asyncio.Queue or an AudioIngestBuffer (None ends it)."""
+
+    async def get(self) -> Optional[bytes]: ...
+
 
 @dataclass(frozen=True)
 class SmartVoiceStreamingConfig:
@@ -68,63 +76,15 @@ def _smartvoice_time_to_seconds(value: Any) -> Optional[float]:
     return float(seconds) + (nanos / 1_000_000_000.0)
 
 
-def _extract_token(resp_json: Any) -> Optional[str]:
-    if not isinstance(resp_json, dict):
-        return None
-    for key in ("access_token", "token"):
-        if isinstance(resp_json.get(key), str) and resp_json.get(key):
-            return resp_json[key]
-    data = resp_json.get("data")
-    if isinstance(data, dict):
-        for key in ("access_token", "token"):
-            if isinstance(data.get(key), str) and data.get(key):
-                return data[key]
-    return None
-
-
-async def _fetch_access_token() -> Optional[str]:
-    if settings.smartvoice_access_token:
-        return settings.smartvoice_access_token
-
-    if settings.smartvoice_auth_url and settings.smartvoice_token_id and settings.smartvoice_token_key:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                settings.smartvoice_auth_url,
-                json={
-                    "token_id": settings.smartvoice_token_id,
-                    "token_key": settings.smartvoice_token_key,
-                },
-            )
-            resp.raise_for_status()
-            token = _extract_token(resp.json())
-            if token:
-                return token
-        raise RuntimeError("SmartVoice auth response missing access_token")
-
-    return None
-
-
-async def _build_metadata() -> list[tuple[str, str]]:
-    metadata: list[tuple[str, str]] = []
-    token = await _fetch_access_token()
-    if token:
-        metadata.append(("authorization", f"Bearer {token}"))
-    if settings.smartvoice_token_id:
-        metadata.append(("token-id", settings.smartvoice_token_id))
-    if settings.smartvoice_token_key:
-        metadata.append(("token-key", settings.smartvoice_token_key))
-    return metadata
-
-
 def stream_recognize(
-    audio_queue: "asyncio.Queue[Optional[bytes]]",
+    audio_queue: AudioSource,
     config: SmartVoiceStreamingConfig,
 ) -> AsyncIterator[SmartVoiceResult]:
     return _stream_recognize_impl(audio_queue, config)
 
 
 async def _stream_recognize_impl(
-    audio_queue: "asyncio.Queue[Optional[bytes]]",
+    audio_queue: AudioSource,
     config: SmartVoiceStreamingConfig,
 ) -> AsyncIterator[SmartVoiceResult]:
     """
@@ -139,13 +99,17 @@ async def _stream_recognize_impl(
     if not settings.smartvoice_grpc_endpoint:
         raise RuntimeError("SMARTVOICE_GRPC_ENDPOINT is not set")
 
-    metadata = await _build_metadata()
-    insecure = os.getenv("SMARTVOICE_INSECURE", "0").lower() in {"1", "true", "yes"}
-    channel = grpc.aio.insecure_channel(settings.smartvoice_grpc_endpoint) if insecure else grpc.aio.secure_channel(
-        settings.smartvoice_grpc_endpoint, grpc.ssl_channel_credentials()
-    )
-
-    async def request_gen():
+    # The stream runs on a pooled long-lived channel (smartvoice_channel). If it
+    # fails before SmartVoice has answered (UNAVAILABLE, expired token), it is
+    # reopened and the audio already taken from the queue is replayed, so the
+    # caller never sees the reconnect; after the first response errors propagate.
+    replay: List[bytes] = []
+    replay_bytes = 0
+    answered = False
+    ended = False
+
+    async def request_gen(resend: List[bytes]):
+        nonlocal replay_bytes, ended
         recognition_config = rasr.RecognitionConfig(
             language_code=config.language_code or "vi-VN",
             encoding=ra.AudioEncoding.LINEAR_PCM,
@@ -161,43 +125,64 @@ async def _stream_recognize_impl(
             interim_results=config.interim_results,
         )
         yield rasr.StreamingRecognizeRequest(streaming_config=streaming_config)
-        while True:
+        for chunk in resend:
+            yield rasr.StreamingRecognizeRequest(audio_content=chunk)
+        while not ended:
             chunk = await audio_queue.get()
             if chunk is None:
+                ended = True
                 break
+            if not answered:
+                replay_bytes += len(chunk)
+                if replay_bytes <= _REPLAY_LIMIT_BYTES:
+                    replay.append(chunk)
             yield rasr.StreamingRecognizeRequest(audio_content=chunk)
 
-    async with channel:
-        client = rasr_srv.VnptSpeechRecognitionStub(channel)
-        responses = client.StreamingRecognize(request_gen(), metadata=metadata)
-        async for resp in responses:
-            for result in getattr(resp, "results", []) or []:
-                alternatives = getattr(result, "alternatives", None) or []
-                if not alternatives:
-                    continue
-                alt = alternatives[0]
-                text = (getattr(alt, "transcript", "") or "").strip()
-                if not text:
-                    continue
-                confidence = float(getattr(alt, "confidence", 0.0) or 0.0)
-
-                time_start = None
-                time_end = None
-                words = getattr(alt, "words", None) or []
-                if words:
-                    try:
-                        time_start = _smartvoice_time_to_seconds(words[0].start_time)
-                        time_end = _smartvoice_time_to_seconds(words[-1].end_time)
-                    except Exception:
-                        time_start = None
-                        time_end = None
-
-                lang = (config.language_code.split("-")[0] if config.language_code else "vi").lower()
-                yield SmartVoiceResult(
-                    text=text,
-                    is_final=bool(getattr(result, "is_final", False)),
-                    confidence=confidence if confidence else 1.0,
-                    time_start=time_start,
-                    time_end=time_end,
-                    lang=lang,
-                )
+    attempt = 0
+    while True:
+        metadata = await smartvoice_channels.metadata()
+        client = rasr_srv.VnptSpeechRecognitionStub(smartvoice_channels.channel())
+        responses = client.StreamingRecognize(request_gen(list(replay)), metadata=metadata)
+        try:
+            async for resp in responses:
+                if not answered:
+                    answered = True
+                    replay.clear()
+                for result in getattr(resp, "results", []) or []:
+                    alternatives = getattr(result, "alternatives", None) or []
+                    if not alternatives:
+                        continue
+                    alt = alternatives[0]
+                    text = (getattr(alt, "transcript", "") or "").strip()
+                    if not text:
+                        continue
+                    confidence = float(getattr(alt, "confidence", 0.0) or 0.0)
+
+                    time_start = None
+                    time_end = None
+                    words = getattr(alt, "words", None) or []
+                    if words:
+                        try:
+                            time_start = _smartvoice_time_to_seconds(words[0].start_time)
+                            time_end = _smartvoice_time_to_seconds(words[-1].end_time)
+                        except Exception:
+                            time_start = None
+                            time_end = None
+
+                    lang = (config.language_code.split("-")[0] if config.language_code else "vi").lower()
+                    yield SmartVoiceResult(
+                        text=text,
+                        is_final=bool(getattr(result, "is_final", False)),
+                        confidence=confidence if confidence else 1.0,
+                        time_start=time_start,
+                        time_end=time_end,
+                        lang=lang,
+                    )
+            return
+        except grpc.aio.AioRpcError as exc:
+            if answered or replay_bytes > _REPLAY_LIMIT_BYTES:
+                raise
+            await smartvoice_channels.retry_or_raise(exc, attempt)
+            attempt += 1
+        finally:
+            responses.cancel()
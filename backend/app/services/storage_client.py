@@ -149,3 +149,19 @@ def delete_object(object_key: str) -> bool:
     except (BotoCoreError, ClientError) as exc:
         logger.error("Failed to delete object %s: %s", object_key, exc)
         return False
+
+
+def download_object_to_file(object_key: str, path) -> bool:
+    """Download an object to a local path. Returns False if not configured or on failure."""
+    if not is_storage_configured():
+        return False
+    client = _get_s3_client()
+    if not client:
+        return False
+    settings = get_settings()
+    try:
+        client.download_file(settings.supabase_s3_bucket, object_key, str(path))
+        return True
+    except (BotoCoreError, ClientError) as exc:
+        logger.error("Failed to download object %s: %s", object_key, exc)
+        return False
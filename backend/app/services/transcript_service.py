@@ -2,8 +2,10 @@
 Transcript Service
 """
 from datetime import datetime
-from typing import Optional, List
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
 from uuid import uuid4
+from psycopg2.extras import execute_values
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
@@ -145,18 +147,119 @@ def create_transcript_chunk(db: Session, data: TranscriptChunkCreate) -> Transcr
     )
 
 
+BULK_PAGE_SIZE = 500
+
+# Upsert keyed on (meeting_id, chunk_index) - needs uq_transcript_chunk_meeting_index
+# (infra/postgres/init/11_transcript_chunk_unique_index.sql).
+_BULK_UPSERT_SQL = """
+    INSERT INTO transcript_chunk (
+        id, meeting_id, chunk_index, start_time, end_time,
+        speaker, speaker_user_id, text, confidence, language, created_at
+    )
+    VALUES %s
+    ON CONFLICT (meeting_id, chunk_index) DO UPDATE SET
+        start_time = EXCLUDED.start_time,
+        end_time = EXCLUDED.end_time,
+        speaker = EXCLUDED.speaker,
+        speaker_user_id = EXCLUDED.speaker_user_id,
+        text = EXCLUDED.text,
+        confidence = EXCLUDED.confidence,
+        language = EXCLUDED.language
+    RETURNING id::text, chunk_index, created_at
+"""
+_BULK_TEMPLATE = "(%s, %s::uuid, %s, %s, %s, %s, %s::uuid, %s, %s, %s, %s)"
+
+
+def _iter_pages(chunks: Iterable[TranscriptChunkCreate], page_size: int) -> Iterator[List[TranscriptChunkCreate]]:
+    it = iter(chunks)
+    while True:
+        page = list(islice(it, page_size))
+        if not page:
+            return
+        # A single INSERT .. ON CONFLICT cannot touch the same key twice: last one wins.
+        by_index: Dict[int, TranscriptChunkCreate] = {}
+        for chunk in page:
+            by_index[chunk.chunk_index] = chunk
+        yield list(by_index.values())
+
+
+def _upsert_pages(
+    db: Session,
+    meeting_id: str,
+    chunks: Iterable[TranscriptChunkCreate],
+    page_size: int,
+) -> Iterator[Tuple[List[TranscriptChunkCreate], Dict[int, Tuple[str, datetime]]]]:
+    """Upsert page by page on the session's connection (no commit). Yields (page, {chunk_index: (id, created_at)})."""
+    cursor = db.connection().connection.cursor()
+    try:
+        for page in _iter_pages(chunks, page_size):
+            now = datetime.utcnow()
+            rows = [
+                (
+                    str(uuid4()), meeting_id, c.chunk_index, c.start_time, c.end_time,
+                    c.speaker, c.speaker_user_id, c.text, c.confidence, c.language, now,
+                )
+                for c in page
+            ]
+            returned = execute_values(
+                cursor, _BULK_UPSERT_SQL, rows, template=_BULK_TEMPLATE, page_size=len(rows), fetch=True
+            )
+            yield page, {row[1]: (row[0], row[2]) for row in returned}
+    finally:
+        cursor.close()
+
+
+def bulk_upsert_transcript_chunks(
+    db: Session,
+    meeting_id: str,
+    chunks: Iterable[TranscriptChunkCreate],
+    page_size: int = BULK_PAGE_SIZE,
+) -> int:
+    """
+    Insert or update chunks in one transaction, `page_size` rows per statement.
+    `chunks` may be a generator - only one page is held in memory at a time.
+    Returns the number of rows written.
+    """
+    written = 0
+    try:
+        for page, _ in _upsert_pages(db, meeting_id, chunks, page_size):
+            written += len(page)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return written
+
+
 def create_batch_transcript_chunks(
     db: Session, 
     meeting_id: str, 
     chunks: List[TranscriptChunkCreate]
 ) -> TranscriptChunkList:
-    """Create multiple transcript chunks at once"""
+    """Create (or update, on rerun) multiple transcript chunks at once"""
     created_chunks = []
     
-    for chunk in chunks:
-        chunk.meeting_id = meeting_id
-        created_chunk = create_transcript_chunk(db, chunk)
-        created_chunks.append(created_chunk)
+    try:
+        for page, returned in _upsert_pages(db, meeting_id, chunks, BULK_PAGE_SIZE):
+            for chunk in page:
+                chunk_id, created_at = returned[chunk.chunk_index]
+                created_chunks.append(TranscriptChunkResponse(
+                    id=chunk_id,
+                    meeting_id=meeting_id,
+                    chunk_index=chunk.chunk_index,
+                    start_time=chunk.start_time,
+                    end_time=chunk.end_time,
+                    speaker=chunk.speaker,
+                    speaker_user_id=chunk.speaker_user_id,
+                    text=chunk.text,
+                    confidence=chunk.confidence,
+                    language=chunk.language,
+                    created_at=created_at
+                ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     
     return TranscriptChunkList(chunks=created_chunks, total=len(created_chunks))
 
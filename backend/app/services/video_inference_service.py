@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from app.services import audio_processing, vnpt_stt_service, diarization_service, transcript_service
 from app.services import minutes_service
+from app.services.speaker_alignment import align_speakers
 from app.schemas.transcript import TranscriptChunkCreate
 
 logger = logging.getLogger(__name__)
@@ -195,46 +196,30 @@ def _merge_transcription_and_diarization(
     Returns:
         List of merged chunks with speaker, text, time_start, time_end
     """
-    merged = []
-    
-    # Create a mapping from time to speaker
-    speaker_map = []
-    for diar_seg in diarization_segments:
-        speaker_map.append({
-            "speaker": diar_seg["speaker"],
-            "start": diar_seg["start"],
-            "end": diar_seg["end"],
-        })
-    speaker_map.sort(key=lambda x: x["start"])
-    
-    # Assign speakers to transcription segments
+    normalized = []
     for trans_seg in transcription_segments:
         seg_start = trans_seg.get("time_start") or 0.0
-        seg_end = trans_seg.get("time_end") or seg_start + 1.0
-        seg_text = trans_seg.get("text", "")
-        seg_confidence = trans_seg.get("confidence", 1.0)
-        
-        # Find overlapping diarization segment
-        speaker = "UNKNOWN"
-        for diar_seg in speaker_map:
-            # Check if transcription segment overlaps with diarization segment
-            if seg_start >= diar_seg["start"] and seg_start < diar_seg["end"]:
-                speaker = diar_seg["speaker"]
-                break
-            elif seg_end > diar_seg["start"] and seg_end <= diar_seg["end"]:
-                speaker = diar_seg["speaker"]
-                break
-            elif seg_start <= diar_seg["start"] and seg_end >= diar_seg["end"]:
-                speaker = diar_seg["speaker"]
-                break
-        
-        merged.append({
-            "text": seg_text,
-            "speaker": speaker,
-            "start_time": seg_start,
-            "end_time": seg_end,
-            "confidence": seg_confidence,
+        normalized.append({
+            **trans_seg,
+            "time_start": seg_start,
+            "time_end": trans_seg.get("time_end") or seg_start + 1.0,
         })
-    
-    return merged
+
+    # Max-overlap sweep; segments with word timings are split where the speaker changes.
+    aligned = align_speakers(
+        normalized,
+        diarization_segments,
+        default_speaker="UNKNOWN",
+        split_on_speaker_change=True,
+    )
+    return [
+        {
+            "text": seg.get("text", ""),
+            "speaker": seg["speaker"],
+            "start_time": seg["time_start"],
+            "end_time": seg["time_end"],
+            "confidence": seg.get("confidence", 1.0),
+        }
+        for seg in aligned
+    ]
 
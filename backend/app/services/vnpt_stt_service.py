@@ -1,17 +1,25 @@
 """
 VNPT Speech-to-Text Service
 Non-streaming transcription using VNPT SmartVoice API
+
+Recordings longer than SMARTVOICE_LONG_AUDIO_THRESHOLD_SECONDS are not sent as
+one RecognizeRequest: the memory-mapped WAV is split into overlapping windows
+cut at pauses (audio_processing.plan_windows), windows are recognized
+concurrently (at most SMARTVOICE_BATCH_MAX_IN_FLIGHT at a time, each read from
+disk only when its slot frees up), and `stitch_windows` shifts word timestamps
+back to recording time and drops the words recognized twice in an overlap.
 """
+import asyncio
 import logging
-import os
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 from dataclasses import dataclass
 import grpc
-import wave
 
 from app.core.config import get_settings
+from app.services.audio_processing import PcmWav, open_pcm_wav, plan_windows
+from app.services.smartvoice_channel import smartvoice_channels
 
 logger = logging.getLogger(__name__)
 
@@ -43,24 +51,6 @@ class TranscriptionResult:
     words: Optional[List[Dict[str, Any]]] = None  # Optional word-level timestamps
 
 
-def _build_metadata() -> List[Tuple[str, str]]:
-    """Build gRPC metadata for authentication"""
-    metadata = []
-    
-    access_token = settings.smartvoice_access_token or os.getenv("SMARTVOICE_ACCESS_TOKEN", "")
-    token_id = settings.smartvoice_token_id or os.getenv("SMARTVOICE_TOKEN_ID", "")
-    token_key = settings.smartvoice_token_key or os.getenv("SMARTVOICE_TOKEN_KEY", "")
-    
-    if access_token:
-        metadata.append(("authorization", f"Bearer {access_token}"))
-    if token_id:
-        metadata.append(("token-id", token_id))
-    if token_key:
-        metadata.append(("token-key", token_key))
-    
-    return metadata
-
-
 def _smartvoice_time_to_seconds(value: Any) -> Optional[float]:
     """Convert SmartVoice time value to seconds"""
     if value is None:
@@ -74,20 +64,251 @@ def _smartvoice_time_to_seconds(value: Any) -> Optional[float]:
     return float(seconds) + (nanos / 1_000_000_000.0)
 
 
+def _parse_response(response: Any, language_code: str, enable_word_time_offsets: bool) -> TranscriptionResult:
+    segments = []
+    words_list = []
+    full_text_parts = []
+    total_confidence = 0.0
+    segment_count = 0
+
+    for result in getattr(response, "results", []) or []:
+        alternatives = getattr(result, "alternatives", None) or []
+        if not alternatives:
+            continue
+
+        alt = alternatives[0]
+        text = (getattr(alt, "transcript", "") or "").strip()
+        if not text:
+            continue
+
+        confidence = float(getattr(alt, "confidence", 0.0) or 0.0)
+        total_confidence += confidence
+        segment_count += 1
+        full_text_parts.append(text)
+
+        # Get word-level timestamps
+        words = getattr(alt, "words", None) or []
+        segment_words = []
+
+        time_start = None
+        time_end = None
+        if words:
+            try:
+                time_start = _smartvoice_time_to_seconds(words[0].start_time)
+                time_end = _smartvoice_time_to_seconds(words[-1].end_time)
+
+                for word_info in words:
+                    word_start = _smartvoice_time_to_seconds(word_info.start_time)
+                    word_end = _smartvoice_time_to_seconds(word_info.end_time)
+                    word_text = getattr(word_info, "word", "") or ""
+
+                    segment_words.append({
+                        "word": word_text,
+                        "start_time": word_start,
+                        "end_time": word_end,
+                    })
+                    words_list.append({
+                        "word": word_text,
+                        "start_time": word_start,
+                        "end_time": word_end,
+                    })
+            except Exception as e:
+                logger.warning(f"Failed to parse word timestamps: {e}")
+
+        segments.append({
+            "text": text,
+            "confidence": confidence,
+            "time_start": time_start,
+            "time_end": time_end,
+            "words": segment_words,
+        })
+
+    avg_confidence = total_confidence / segment_count if segment_count > 0 else 0.0
+    full_text = " ".join(full_text_parts)
+    lang = language_code.split("-")[0].lower() if language_code else "vi"
+
+    return TranscriptionResult(
+        text=full_text,
+        confidence=avg_confidence,
+        language=lang,
+        segments=segments,
+        words=words_list if enable_word_time_offsets else None,
+    )
+
+
+async def _recognize_pcm(
+    audio_data: bytes,
+    sample_rate: int,
+    channels: int,
+    language_code: str,
+    model: Optional[str],
+    enable_word_time_offsets: bool,
+) -> TranscriptionResult:
+    """One Recognize call for raw 16-bit PCM; times in the result are relative to `audio_data`."""
+    recognition_config = rasr.RecognitionConfig(
+        language_code=language_code,
+        encoding=ra.AudioEncoding.LINEAR_PCM,
+        sample_rate_hertz=sample_rate,
+        max_alternatives=1,
+        enable_automatic_punctuation=False,
+        enable_word_time_offsets=enable_word_time_offsets,
+        audio_channel_count=channels,
+        model=model or settings.smartvoice_model or "fast_streaming",
+    )
+    request = rasr.RecognizeRequest(
+        config=recognition_config,
+        audio=audio_data,
+    )
+
+    # Call API (pooled channel, cached token; UNAVAILABLE is retried with backoff)
+    try:
+        response = await smartvoice_channels.call(
+            lambda channel, metadata: rasr_srv.VnptSpeechRecognitionStub(channel).Recognize(request, metadata=metadata)
+        )
+    except grpc.RpcError as e:
+        logger.error(f"gRPC error during transcription: {e}")
+        raise RuntimeError(f"Transcription failed: {e.code()} - {e.details()}")
+    except Exception as e:
+        logger.error(f"Unexpected error during transcription: {e}")
+        raise RuntimeError(f"Transcription failed: {str(e)}")
+    return _parse_response(response, language_code, enable_word_time_offsets)
+
+
+def _shift(value: Optional[float], offset: float) -> Optional[float]:
+    return None if value is None else value + offset
+
+
+def _midpoint(start: Optional[float], end: Optional[float]) -> Optional[float]:
+    if start is None:
+        return end
+    return start if end is None else (start + end) / 2.0
+
+
+def stitch_windows(
+    windows: Sequence[Tuple[float, float]],
+    results: Sequence[TranscriptionResult],
+    language: str,
+    enable_word_time_offsets: bool = True,
+) -> TranscriptionResult:
+    """
+    Merge per-window results ((start, end) seconds of each window, in order) into
+    one transcript on the recording's timeline. Each window owns the time from
+    the previous window's end (a pause) to its own end; a word (or a segment
+    without word timings) is kept only by the window owning its midpoint, so the
+    overlap is transcribed once. A word repeated across the boundary is dropped.
+    """
+    segments: List[Dict[str, Any]] = []
+    words_list: List[Dict[str, Any]] = []
+    for i, ((offset, _), result) in enumerate(zip(windows, results)):
+        lo = windows[i - 1][1] if i > 0 else float("-inf")
+        hi = windows[i][1] if i + 1 < len(windows) else float("inf")
+        for seg in result.segments:
+            words = [
+                {**w, "start_time": _shift(w.get("start_time"), offset), "end_time": _shift(w.get("end_time"), offset)}
+                for w in seg.get("words") or []
+            ]
+            time_start = _shift(seg.get("time_start"), offset)
+            time_end = _shift(seg.get("time_end"), offset)
+            timed = [w for w in words if _midpoint(w["start_time"], w["end_time"]) is not None]
+            if timed:
+                kept = [w for w in timed if lo <= _midpoint(w["start_time"], w["end_time"]) < hi]
+                if kept and words_list and kept[0]["word"] == words_list[-1]["word"] and (
+                    kept[0]["start_time"] is not None
+                    and words_list[-1]["end_time"] is not None
+                    and kept[0]["start_time"] < words_list[-1]["end_time"]
+                ):
+                    kept = kept[1:]
+                if not kept:
+                    continue
+                text = seg["text"] if len(kept) == len(words) else " ".join(w["word"] for w in kept)
+                time_start = kept[0]["start_time"]
+                time_end = kept[-1]["end_time"]
+            else:
+                mid = _midpoint(time_start, time_end)
+                if mid is not None and not lo <= mid < hi:
+                    continue
+                kept = []
+                text = seg["text"]
+            segments.append({
+                "text": text,
+                "confidence": seg.get("confidence", 0.0),
+                "time_start": time_start,
+                "time_end": time_end,
+                "words": kept,
+            })
+            words_list.extend(kept)
+
+    confidences = [seg["confidence"] for seg in segments]
+    return TranscriptionResult(
+        text=" ".join(seg["text"] for seg in segments),
+        confidence=sum(confidences) / len(confidences) if confidences else 0.0,
+        language=language,
+        segments=segments,
+        words=words_list if enable_word_time_offsets else None,
+    )
+
+
+async def _transcribe_windows(
+    wav: PcmWav,
+    language_code: str,
+    model: Optional[str],
+    enable_word_time_offsets: bool,
+    max_in_flight: int,
+) -> TranscriptionResult:
+    frames = plan_windows(
+        wav,
+        window_seconds=settings.smartvoice_batch_window_seconds,
+        overlap_seconds=settings.smartvoice_batch_overlap_seconds,
+        search_seconds=settings.smartvoice_batch_silence_search_seconds,
+    )
+    slots = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def recognize(start: int, end: int) -> TranscriptionResult:
+        async with slots:
+            return await _recognize_pcm(
+                wav.pcm_bytes(start, end),
+                wav.sample_rate,
+                wav.channels,
+                language_code,
+                model,
+                enable_word_time_offsets,
+            )
+
+    tasks = [asyncio.create_task(recognize(start, end)) for start, end in frames]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    logger.info(f"Transcribed {wav.duration_seconds:.0f}s of audio in {len(frames)} windows")
+    lang = language_code.split("-")[0].lower() if language_code else "vi"
+    return stitch_windows(
+        [(start / wav.sample_rate, end / wav.sample_rate) for start, end in frames],
+        results,
+        lang,
+        enable_word_time_offsets,
+    )
+
+
 async def transcribe_audio_file(
     audio_path: str | Path,
     language_code: str = "vi-VN",
     model: Optional[str] = None,
     enable_word_time_offsets: bool = True,
+    max_in_flight: Optional[int] = None,
 ) -> TranscriptionResult:
     """
     Transcribe audio file using VNPT SmartVoice Recognize API (non-streaming).
     
     Args:
-        audio_path: Path to audio file (WAV format, 16kHz mono recommended)
+        audio_path: Path to audio file (16-bit PCM WAV, 16kHz mono recommended)
         language_code: Language code (default: "vi-VN")
         model: Model name (default: from settings)
         enable_word_time_offsets: Enable word-level timestamps
+        max_in_flight: Concurrent window requests for long recordings
+            (default: SMARTVOICE_BATCH_MAX_IN_FLIGHT)
         
     Returns:
         TranscriptionResult with text, confidence, segments, and words
@@ -104,122 +325,26 @@ async def transcribe_audio_file(
     if not audio_path.exists():
         raise FileNotFoundError(f"Audio file not found: {audio_path}")
     
-    # Read audio file
     try:
-        with wave.open(str(audio_path), "rb") as wf:
-            sample_rate = wf.getframerate()
-            audio_data = wf.readframes(wf.getnframes())
+        wav = open_pcm_wav(audio_path)
     except Exception as e:
         logger.error(f"Failed to read audio file: {e}")
         raise RuntimeError(f"Failed to read audio file: {e}")
-    
-    # Build metadata
-    metadata = _build_metadata()
-    
-    # Build recognition config
-    recognition_config = rasr.RecognitionConfig(
-        language_code=language_code,
-        encoding=ra.AudioEncoding.LINEAR_PCM,
-        sample_rate_hertz=sample_rate,
-        max_alternatives=1,
-        enable_automatic_punctuation=False,
-        enable_word_time_offsets=enable_word_time_offsets,
-        audio_channel_count=1,
-        model=model or settings.smartvoice_model or "fast_streaming",
-    )
-    
-    # Build request
-    request = rasr.RecognizeRequest(
-        config=recognition_config,
-        audio=audio_data,
-    )
-    
-    # Call API
-    insecure = os.getenv("SMARTVOICE_INSECURE", "0").lower() in {"1", "true", "yes"}
-    channel = grpc.aio.insecure_channel(settings.smartvoice_grpc_endpoint) if insecure else grpc.aio.secure_channel(
-        settings.smartvoice_grpc_endpoint, grpc.ssl_channel_credentials()
-    )
-    
-    try:
-        async with channel:
-            client = rasr_srv.VnptSpeechRecognitionStub(channel)
-            response = await client.Recognize(request, metadata=metadata)
-            
-            # Parse response
-            segments = []
-            words_list = []
-            full_text_parts = []
-            total_confidence = 0.0
-            segment_count = 0
-            
-            for result in getattr(response, "results", []) or []:
-                alternatives = getattr(result, "alternatives", None) or []
-                if not alternatives:
-                    continue
-                
-                alt = alternatives[0]
-                text = (getattr(alt, "transcript", "") or "").strip()
-                if not text:
-                    continue
-                
-                confidence = float(getattr(alt, "confidence", 0.0) or 0.0)
-                total_confidence += confidence
-                segment_count += 1
-                full_text_parts.append(text)
-                
-                # Get word-level timestamps
-                words = getattr(alt, "words", None) or []
-                segment_words = []
-                
-                time_start = None
-                time_end = None
-                if words:
-                    try:
-                        time_start = _smartvoice_time_to_seconds(words[0].start_time)
-                        time_end = _smartvoice_time_to_seconds(words[-1].end_time)
-                        
-                        for word_info in words:
-                            word_start = _smartvoice_time_to_seconds(word_info.start_time)
-                            word_end = _smartvoice_time_to_seconds(word_info.end_time)
-                            word_text = getattr(word_info, "word", "") or ""
-                            
-                            segment_words.append({
-                                "word": word_text,
-                                "start_time": word_start,
-                                "end_time": word_end,
-                            })
-                            words_list.append({
-                                "word": word_text,
-                                "start_time": word_start,
-                                "end_time": word_end,
-                            })
-                    except Exception as e:
-                        logger.warning(f"Failed to parse word timestamps: {e}")
-                
-                segments.append({
-                    "text": text,
-                    "confidence": confidence,
-                    "time_start": time_start,
-                    "time_end": time_end,
-                    "words": segment_words,
-                })
-            
-            avg_confidence = total_confidence / segment_count if segment_count > 0 else 0.0
-            full_text = " ".join(full_text_parts)
-            lang = language_code.split("-")[0].lower() if language_code else "vi"
-            
-            return TranscriptionResult(
-                text=full_text,
-                confidence=avg_confidence,
-                language=lang,
-                segments=segments,
-                words=words_list if enable_word_time_offsets else None,
-            )
-            
-    except grpc.RpcError as e:
-        logger.error(f"gRPC error during transcription: {e}")
-        raise RuntimeError(f"Transcription failed: {e.code()} - {e.details()}")
-    except Exception as e:
-        logger.error(f"Unexpected error during transcription: {e}")
-        raise RuntimeError(f"Transcription failed: {str(e)}")
 
+    with wav:
+        if wav.duration_seconds > settings.smartvoice_long_audio_threshold_seconds:
+            return await _transcribe_windows(
+                wav,
+                language_code,
+                model,
+                enable_word_time_offsets,
+                max_in_flight or settings.smartvoice_batch_max_in_flight,
+            )
+        return await _recognize_pcm(
+            wav.pcm_bytes(0, wav.frames),
+            wav.sample_rate,
+            wav.channels,
+            language_code,
+            model,
+            enable_word_time_offsets,
+        )
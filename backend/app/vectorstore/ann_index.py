@@ -0,0 +1,338 @@
+"""
+ANN index management for `knowledge_chunk.embedding` (pgvector).
+
+- `params_for_corpus`: HNSW (m, ef_construction) or ivfflat (lists) sized from the row count.
+- `search_settings` / `apply_search_settings`: per-query `hnsw.ef_search` or
+  `ivfflat.probes` for a requested recall level (1.0 = exact scan). Both use
+  SET LOCAL, so they only last until the current transaction ends.
+- `AnnIndexManager`: builds/rebuilds the shared index without blocking writes
+  (CREATE INDEX CONCURRENTLY under a temporary name, then swap), and keeps
+  partial per-project indexes for projects large enough that filtering the
+  shared index would lose recall.
+
+Scoped search filters on the denormalized `knowledge_chunk.scope_meeting` /
+`scope_project` columns (see infra/postgres/init/12_knowledge_chunk_ann.sql),
+so the planner can use the btree scope indexes or a project's partial index.
+
+CLI (from backend/):
+
+    python -m app.vectorstore.ann_index status
+    python -m app.vectorstore.ann_index rebuild [--method hnsw|ivfflat] [--force]
+    python -m app.vectorstore.ann_index projects [--min-rows N]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+TABLE = "knowledge_chunk"
+COLUMN = "embedding"
+INDEX_NAME = "idx_chunk_embedding"
+PROJECT_INDEX_PREFIX = "idx_chunk_embedding_p_"
+OPCLASS = "vector_cosine_ops"
+
+_HNSW_MAX_EF_SEARCH = 1000
+_INFO_TTL_S = 300.0
+
+
+@dataclass(frozen=True)
+class IndexParams:
+    method: str  # "hnsw" | "ivfflat"
+    m: int = 16
+    ef_construction: int = 64
+    lists: int = 100
+
+    def with_clause(self) -> str:
+        if self.method == "hnsw":
+            return f"(m = {int(self.m)}, ef_construction = {int(self.ef_construction)})"
+        return f"(lists = {int(self.lists)})"
+
+
+@dataclass(frozen=True)
+class IndexInfo:
+    name: str
+    method: str
+    options: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class SearchSettings:
+    ef_search: int
+    probes: int
+    exact: bool = False
+
+    def statements(self, method: Optional[str]) -> List[str]:
+        if self.exact:
+            return ["SET LOCAL enable_indexscan = off"]
+        if method == "hnsw":
+            return [f"SET LOCAL hnsw.ef_search = {int(self.ef_search)}"]
+        if method == "ivfflat":
+            return [f"SET LOCAL ivfflat.probes = {int(self.probes)}"]
+        return []
+
+
+def params_for_corpus(rows: int, method: str = "hnsw") -> IndexParams:
+    """Build parameters for a corpus of `rows` vectors."""
+    rows = max(0, int(rows))
+    if method == "ivfflat":
+        # pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond.
+        lists = rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows))
+        return IndexParams("ivfflat", lists=max(1, lists))
+    if rows < 100_000:
+        return IndexParams("hnsw", m=16, ef_construction=64)
+    if rows < 1_000_000:
+        return IndexParams("hnsw", m=24, ef_construction=128)
+    return IndexParams("hnsw", m=32, ef_construction=200)
+
+
+# (max recall, ef_search floor, ef_search per result, fraction of ivfflat lists probed).
+# Starting points; calibrate on real data with tests/bench_ann_index.py.
+_RECALL_TIERS = (
+    (0.90, 40, 2, 0.02),
+    (0.95, 80, 4, 0.05),
+    (0.98, 160, 8, 0.10),
+    (0.999, 320, 16, 0.25),
+)
+
+
+def search_settings(recall: float, k: int, lists: int = 100) -> SearchSettings:
+    """ef_search / probes for a target recall@k. recall >= 1.0 disables the ANN index."""
+    if recall >= 1.0:
+        return SearchSettings(ef_search=_HNSW_MAX_EF_SEARCH, probes=max(1, lists), exact=True)
+    k = max(1, int(k))
+    for max_recall, ef_floor, ef_per_k, probe_frac in _RECALL_TIERS:
+        if recall <= max_recall:
+            break
+    ef_search = min(_HNSW_MAX_EF_SEARCH, max(ef_floor, ef_per_k * k))
+    probes = min(max(1, lists), max(1, math.ceil(lists * probe_frac)))
+    return SearchSettings(ef_search=ef_search, probes=probes)
+
+
+_INDEXDEF_METHOD_RE = re.compile(r"USING\s+(\w+)", re.IGNORECASE)
+_INDEXDEF_OPTION_RE = re.compile(r"(\w+)\s*=\s*'?(\d+)'?")
+
+
+def parse_indexdef(name: str, indexdef: str) -> IndexInfo:
+    method_match = _INDEXDEF_METHOD_RE.search(indexdef)
+    with_part = indexdef.split(" WITH ", 1)[1] if " WITH " in indexdef else ""
+    options = {key: int(value) for key, value in _INDEXDEF_OPTION_RE.findall(with_part.split(" WHERE ", 1)[0])}
+    return IndexInfo(name=name, method=(method_match.group(1).lower() if method_match else ""), options=options)
+
+
+def build_index_sql(
+    index_name: str,
+    params: IndexParams,
+    *,
+    table: str = TABLE,
+    column: str = COLUMN,
+    where: Optional[str] = None,
+    concurrently: bool = True,
+) -> str:
+    sql = (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}{index_name} "
+        f"ON {table} USING {params.method} ({column} {OPCLASS}) WITH {params.with_clause()}"
+    )
+    if where:
+        sql += f" WHERE {where}"
+    return sql
+
+
+def project_index_name(project_id: Any) -> str:
+    return f"{PROJECT_INDEX_PREFIX}{UUID(str(project_id)).hex}"
+
+
+# ---- per-query settings ------------------------------------------------------------
+
+_info_cache: Dict[str, Any] = {"info": None, "at": 0.0}
+
+
+def describe_index(conn: Any, index_name: str = INDEX_NAME) -> Optional[IndexInfo]:
+    row = conn.execute(
+        text("SELECT indexdef FROM pg_indexes WHERE tablename = :table AND indexname = :name"),
+        {"table": TABLE, "name": index_name},
+    ).fetchone()
+    return parse_indexdef(index_name, row[0]) if row else None
+
+
+def _current_index(db: Any) -> Optional[IndexInfo]:
+    now = time.monotonic()
+    if _info_cache["at"] and now - _info_cache["at"] < _INFO_TTL_S:
+        return _info_cache["info"]
+    try:
+        info = describe_index(db)
+    except Exception as exc:
+        logger.warning("describe ANN index failed: %s", exc)
+        info = None
+    _info_cache.update(info=info, at=now)
+    return info
+
+
+def forget_index_info() -> None:
+    _info_cache.update(info=None, at=0.0)
+
+
+def apply_search_settings(db: Any, recall: Optional[float], k: int) -> SearchSettings:
+    """SET LOCAL the ANN search knobs for the next vector query in this transaction."""
+    if recall is None:
+        recall = get_settings().knowledge_search_recall
+    info = _current_index(db)
+    method = info.method if info else None
+    lists = info.options.get("lists", 100) if info else 100
+    settings = search_settings(float(recall), k, lists)
+    for stmt in settings.statements(method):
+        db.execute(text(stmt))
+    return settings
+
+
+# ---- index builds ------------------------------------------------------------------
+
+class AnnIndexManager:
+    def __init__(self, engine: Any = None) -> None:
+        if engine is None:
+            from app.db.session import engine as app_engine
+
+            engine = app_engine
+        self.engine = engine
+
+    def hnsw_supported(self) -> bool:
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT 1 FROM pg_am WHERE amname = 'hnsw'")).first() is not None
+
+    def corpus_size(self, project_id: Any = None) -> int:
+        sql = f"SELECT COUNT(*) FROM {TABLE}"
+        params: Dict[str, Any] = {}
+        if project_id:
+            sql += " WHERE scope_project = :project_id"
+            params["project_id"] = str(project_id)
+        with self.engine.connect() as conn:
+            return int(conn.execute(text(sql), params).scalar_one())
+
+    def describe(self, index_name: str = INDEX_NAME) -> Optional[IndexInfo]:
+        with self.engine.connect() as conn:
+            return describe_index(conn, index_name)
+
+    def plan(self, method: Optional[str] = None, rows: Optional[int] = None) -> IndexParams:
+        method = (method or get_settings().knowledge_ann_method or "hnsw").strip().lower()
+        if method == "hnsw" and not self.hnsw_supported():
+            logger.warning("pgvector has no hnsw access method (needs >= 0.5.0); using ivfflat")
+            method = "ivfflat"
+        return params_for_corpus(self.corpus_size() if rows is None else rows, method)
+
+    def needs_rebuild(self, method: Optional[str] = None) -> bool:
+        current = self.describe()
+        target = self.plan(method)
+        if current is None or current.method != target.method:
+            return True
+        if target.method == "ivfflat":
+            lists = current.options.get("lists", 0)
+            # ivfflat centroids are fixed at build time; rebuild once the corpus has drifted 2x.
+            return lists <= 0 or not (target.lists / 2 <= lists <= target.lists * 2)
+        return current.options.get("m") != target.m
+
+    def _autocommit(self):
+        return self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+    def _prepare_build(self, conn: Any) -> None:
+        mem = get_settings().knowledge_ann_maintenance_work_mem
+        if mem:
+            conn.execute(text("SET maintenance_work_mem = :mem"), {"mem": mem})
+
+    def rebuild(self, method: Optional[str] = None, force: bool = False) -> Optional[IndexParams]:
+        """(Re)build the shared index without blocking writes. Returns the params used, or None if skipped."""
+        if not force and not self.needs_rebuild(method):
+            return None
+        params = self.plan(method)
+        tmp_name = f"{INDEX_NAME}_new"
+        started = time.monotonic()
+        with self._autocommit() as conn:
+            self._prepare_build(conn)
+            # Leftover (possibly INVALID) index from an interrupted build.
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {tmp_name}"))
+            conn.execute(text(build_index_sql(tmp_name, params)))
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DROP INDEX IF EXISTS {INDEX_NAME}"))
+            conn.execute(text(f"ALTER INDEX {tmp_name} RENAME TO {INDEX_NAME}"))
+            conn.execute(text(f"ANALYZE {TABLE}"))
+        forget_index_info()
+        logger.info("rebuilt %s as %s %s in %.1fs", INDEX_NAME, params.method, params.with_clause(), time.monotonic() - started)
+        return params
+
+    def ensure_project_indexes(self, min_rows: Optional[int] = None, method: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Partial ANN index per project with at least `min_rows` chunks; drop ones whose
+        project fell below half of that (hysteresis avoids flapping).
+        """
+        if min_rows is None:
+            min_rows = get_settings().knowledge_ann_project_index_min_rows
+        with self.engine.connect() as conn:
+            counts = {
+                str(row[0]): int(row[1])
+                for row in conn.execute(
+                    text(f"SELECT scope_project, COUNT(*) FROM {TABLE} WHERE scope_project IS NOT NULL GROUP BY scope_project")
+                )
+            }
+            existing = {
+                row[0]
+                for row in conn.execute(
+                    text("SELECT indexname FROM pg_indexes WHERE tablename = :table AND indexname LIKE :prefix"),
+                    {"table": TABLE, "prefix": f"{PROJECT_INDEX_PREFIX}%"},
+                )
+            }
+        wanted = {project_index_name(pid): pid for pid, n in counts.items() if n >= min_rows}
+        keep = {project_index_name(pid) for pid, n in counts.items() if n >= min_rows // 2}
+        created: List[str] = []
+        dropped: List[str] = []
+        with self._autocommit() as conn:
+            self._prepare_build(conn)
+            for name, pid in wanted.items():
+                if name in existing:
+                    continue
+                params = self.plan(method, rows=counts[pid])
+                # project ids come from a uuid column (re-validated by project_index_name), safe to inline.
+                conn.execute(text(build_index_sql(name, params, where=f"scope_project = '{UUID(pid)}'")))
+                created.append(name)
+            for name in sorted(existing - keep):
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                dropped.append(name)
+        if created or dropped:
+            with self.engine.begin() as conn:
+                conn.execute(text(f"ANALYZE {TABLE}"))
+        return {"created": created, "dropped": dropped}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the knowledge_chunk ANN index")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("status")
+    rebuild = sub.add_parser("rebuild")
+    rebuild.add_argument("--method", choices=["hnsw", "ivfflat"])
+    rebuild.add_argument("--force", action="store_true")
+    projects = sub.add_parser("projects")
+    projects.add_argument("--min-rows", type=int)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    manager = AnnIndexManager()
+    if args.cmd == "status":
+        print(f"rows={manager.corpus_size()} index={manager.describe()} planned={manager.plan()} needs_rebuild={manager.needs_rebuild()}")
+    elif args.cmd == "rebuild":
+        params = manager.rebuild(args.method, force=args.force)
+        print(f"rebuilt with {params}" if params else "index is up to date (use --force to rebuild anyway)")
+    else:
+        print(manager.ensure_project_indexes(args.min_rows))
+
+
+if __name__ == "__main__":
+    main()
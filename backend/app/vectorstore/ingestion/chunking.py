@@ -0,0 +1,260 @@
+"""
+Structure-aware chunking for knowledge ingestion.
+
+Extracted text is read line by line and split into units: headings
+(markdown `#`, "Chương/Mục/Điều N", numbered or all-caps title lines), table
+rows (` | `-joined, as produced by the DOCX/XLSX loaders) and sentences of
+paragraphs. Units are packed into chunks of at most `max_tokens` tokens;
+a chunk never crosses a heading, and consecutive chunks of one section share
+up to `overlap_tokens` of trailing sentences. A unit larger than the budget is
+split on word boundaries.
+
+Each chunk keeps the page range and heading it came from (for citations) and
+a content hash over the text that is embedded plus the embedding model id,
+so identical chunks in any document can reuse a stored vector.
+
+The chunker is incremental (`feed` page by page, then `finish`) and
+deterministic: the same pages always produce the same chunk indexes, which is
+what lets a resumed ingestion job skip chunks stored by an earlier attempt.
+Running headers, footers and page numbers are dropped: a line at the top or
+bottom of a PDF page is dropped once the same line has appeared there on
+`_RUNNING_MIN_PAGES` pages. Digits only count as equal on page-number lines
+("Trang 3", "- 3 -", "3/12"); headings and table rows are never dropped.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.vectorstore.ingestion.loaders import normalize_for_embedding
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END_RE = re.compile(r"[.!?…]+[\"'”»)\]]*\s+")
+_HEADING_RES = (
+    re.compile(r"^#{1,6}\s+\S"),
+    re.compile(r"^(chương|mục|phần|điều|phụ lục|chapter|section|article|part|appendix)\s+[\dIVXLC]+\b", re.IGNORECASE),
+    re.compile(r"^([IVXLC]+|\d+(\.\d+)*)[.)]\s+\S"),
+)
+_HEADING_MAX_WORDS = 14
+_EDGE_LINES = 2  # lines at each end of a page checked for running headers/footers
+_RUNNING_MIN_PAGES = 3
+_PAGE_NUMBER_RE = re.compile(r"^[-–—\s]*((trang|page|tr\.|p\.)\s*)?\d+(\s*(/|of|trên)\s*\d+)?[-–—\s]*$", re.IGNORECASE)
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count: words and punctuation marks (no tokenizer dependency)."""
+    return len(_TOKEN_RE.findall(text))
+
+
+def content_hash(content: str, model_id: str) -> str:
+    """Key for embedding reuse: the embedded text (whitespace-folded) under one model."""
+    folded = " ".join(normalize_for_embedding(content).split())
+    return hashlib.sha256(f"{model_id}\x00{folded}".encode("utf-8")).hexdigest()
+
+
+def is_heading(line: str) -> bool:
+    words = line.split()
+    if not words or len(words) > _HEADING_MAX_WORDS or len(line) > 200:
+        return False
+    if line.startswith("#"):
+        return bool(_HEADING_RES[0].match(line))
+    if line[-1] in ".,;:" and not _HEADING_RES[1].match(line):
+        return False
+    if any(pattern.match(line) for pattern in _HEADING_RES[1:]):
+        return True
+    letters = [c for c in line if c.isalpha()]
+    return len(letters) >= 4 and all(c.isupper() for c in letters)
+
+
+@dataclass
+class Chunk:
+    index: int
+    content: str
+    token_count: int
+    page_start: Optional[int] = None
+    page_end: Optional[int] = None
+    section: Optional[str] = None
+
+
+@dataclass
+class _Unit:
+    text: str
+    tokens: int
+    page: Optional[int]
+    sep: str  # joins this unit to the previous one in a chunk
+    kind: str  # "heading" | "row" | "sentence"; only sentences are repeated as overlap
+
+
+class StructuredChunker:
+    def __init__(self, max_tokens: int = 256, overlap_tokens: int = 32) -> None:
+        self.max_tokens = max(16, int(max_tokens))
+        self.overlap_tokens = max(0, min(int(overlap_tokens), self.max_tokens // 2))
+        self._units: List[_Unit] = []
+        self._tokens = 0
+        self._section: Optional[str] = None
+        self._paragraph = ""  # unfinished sentence of the open paragraph
+        self._paragraph_page: Optional[int] = None
+        self._paragraph_open = False
+        self._page: Optional[int] = None
+        self._edge_pages: Dict[str, int] = {}  # page-edge line -> pages it appeared on
+        self._out: List[Chunk] = []
+        self._next_index = 0
+
+    # ---- input -------------------------------------------------------------------
+
+    def feed(self, text: str, page: Optional[int] = None) -> List[Chunk]:
+        """Add one page (or any piece) of text; returns the chunks completed so far."""
+        self._page = page
+        lines = (text or "").replace("\x00", "").splitlines()
+        if page is not None:
+            lines = self._drop_running_lines(lines)
+        for raw in lines:
+            line = raw.strip()
+            if not line:
+                self._close_paragraph()
+            elif is_heading(line):
+                self._close_paragraph()
+                if any(u.kind != "heading" for u in self._units):
+                    self._emit()  # stacked headings ("Chương I" / "Điều 1. ...") stay together
+                self._section = line.lstrip("#").strip()[:200]
+                self._add(_Unit(line, count_tokens(line), page, "\n", "heading"))
+            elif " | " in line or "\t" in line:
+                self._close_paragraph()
+                self._add(_Unit(line, count_tokens(line), page, "\n", "row"))
+            else:
+                self._paragraph = f"{self._paragraph} {line}" if self._paragraph else line
+                if self._paragraph_page is None:
+                    self._paragraph_page = page
+                self._split_sentences(final=False)
+        return self._take()
+
+    def finish(self) -> List[Chunk]:
+        self._close_paragraph()
+        self._emit()
+        return self._take()
+
+    def _drop_running_lines(self, lines: List[str]) -> List[str]:
+        nonblank = [i for i, line in enumerate(lines) if line.strip()]
+        edges = set(nonblank[:_EDGE_LINES] + nonblank[-_EDGE_LINES:])
+        kept = []
+        on_page: Set[str] = set()
+        for i, line in enumerate(lines):
+            if i in edges and not (is_heading(line.strip()) or " | " in line or "\t" in line):
+                key = " ".join(line.lower().split())
+                if _PAGE_NUMBER_RE.match(key):
+                    key = re.sub(r"\d+", "#", key)
+                if key not in on_page:
+                    on_page.add(key)
+                    self._edge_pages[key] = self._edge_pages.get(key, 0) + 1
+                if self._edge_pages[key] >= _RUNNING_MIN_PAGES:
+                    continue
+            kept.append(line)
+        return kept
+
+    # ---- units -------------------------------------------------------------------
+
+    def _split_sentences(self, final: bool) -> None:
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(self._paragraph):
+            nxt = self._paragraph[match.end() : match.end() + 1]
+            if nxt and nxt.islower():
+                continue  # abbreviation or list marker ("v.v. các", "khoản 2. a")
+            self._add_sentence(self._paragraph[start : match.end()].strip())
+            start = match.end()
+        rest = self._paragraph[start:].strip()
+        if final:
+            if rest:
+                self._add_sentence(rest)
+            self._paragraph = ""
+            self._paragraph_page = None
+            self._paragraph_open = False
+        else:
+            self._paragraph = rest
+            if start:
+                self._paragraph_page = self._page if rest else None
+
+    def _add_sentence(self, sentence: str) -> None:
+        sep = " " if self._paragraph_open else "\n"
+        self._paragraph_open = True
+        self._add(_Unit(sentence, count_tokens(sentence), self._paragraph_page, sep, "sentence"))
+
+    def _close_paragraph(self) -> None:
+        if self._paragraph or self._paragraph_open:
+            self._split_sentences(final=True)
+
+    def _add(self, unit: _Unit) -> None:
+        if unit.tokens > self.max_tokens:
+            for piece in self._split_words(unit.text):
+                self._add(_Unit(piece, count_tokens(piece), unit.page, unit.sep, unit.kind))
+                unit.sep = " "
+            return
+        if self._units and self._tokens + unit.tokens > self.max_tokens:
+            overlap = self._emit()
+            while overlap and sum(u.tokens for u in overlap) + unit.tokens > self.max_tokens:
+                overlap.pop(0)
+            if overlap:
+                overlap[0].sep = "\n"
+            self._units = overlap
+            self._tokens = sum(u.tokens for u in overlap)
+        self._units.append(unit)
+        self._tokens += unit.tokens
+
+    def _split_words(self, text: str) -> List[str]:
+        pieces: List[str] = []
+        words: List[str] = []
+        tokens = 0
+        for word in text.split():
+            n = count_tokens(word)
+            if words and tokens + n > self.max_tokens:
+                pieces.append(" ".join(words))
+                words, tokens = [], 0
+            words.append(word)
+            tokens += n
+        if words:
+            pieces.append(" ".join(words))
+        return pieces
+
+    # ---- output ------------------------------------------------------------------
+
+    def _emit(self) -> List[_Unit]:
+        """Close the current chunk; returns the trailing sentences to carry over as overlap."""
+        units, self._units, self._tokens = self._units, [], 0
+        if not units:
+            return []
+        content = units[0].text + "".join(u.sep + u.text for u in units[1:])
+        pages = [u.page for u in units if u.page is not None]
+        self._out.append(
+            Chunk(
+                index=self._next_index,
+                content=content,
+                token_count=sum(u.tokens for u in units),
+                page_start=pages[0] if pages else None,
+                page_end=pages[-1] if pages else None,
+                section=self._section,
+            )
+        )
+        self._next_index += 1
+        overlap: List[_Unit] = []
+        budget = self.overlap_tokens
+        for unit in reversed(units[1:]):
+            if unit.kind != "sentence" or unit.tokens > budget:
+                break
+            overlap.insert(0, _Unit(unit.text, unit.tokens, unit.page, unit.sep, unit.kind))
+            budget -= unit.tokens
+        return overlap
+
+    def _take(self) -> List[Chunk]:
+        out, self._out = self._out, []
+        return out
+
+
+def chunk_document(pages: List[Tuple[str, Optional[int]]], max_tokens: int = 256, overlap_tokens: int = 32) -> List[Chunk]:
+    """All chunks of a document given as (text, page) pieces."""
+    chunker = StructuredChunker(max_tokens, overlap_tokens)
+    chunks: List[Chunk] = []
+    for text, page in pages:
+        chunks.extend(chunker.feed(text, page))
+    chunks.extend(chunker.finish())
+    return chunks
@@ -0,0 +1,190 @@
+"""
+Parallel text extraction for knowledge ingestion.
+
+PDFs are split into page ranges and workbooks into sheets; each piece is
+parsed in a process pool so extraction uses every core and never holds the
+GIL of the API process. `iter_text` yields the pieces in document order as
+they finish, so chunking and embedding start before the last page is parsed.
+At most `max_workers * 2` pieces are in flight per document, which bounds the
+text waiting to be consumed.
+
+Each worker process runs under an address-space limit (`memory_limit_mb`),
+and a single parser call (a page range, a sheet, a whole file) that runs
+longer than `timeout_s` is abandoned: the pool is torn down (a hung parser
+can't be cancelled any other way) and ExtractionTimeout is raised. Only as
+many calls as there are workers are submitted at once, so the clock starts
+when a worker picks a call up, and time the caller spends between pieces
+(embedding, inserting) is never counted. Jobs that shared the pool see
+BrokenProcessPool and are retried by the indexing worker.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.vectorstore.ingestion import loaders
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionTimeout(RuntimeError):
+    pass
+
+
+def _limit_memory(limit_bytes: int) -> None:
+    """Pool initializer: cap the worker's address space (Linux/macOS)."""
+    if limit_bytes <= 0:
+        return
+    try:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+    except Exception as exc:  # not available on this platform
+        logger.warning("extraction memory limit not applied: %s", exc)
+
+
+def _docx_text(path: str) -> str:
+    return loaders.sanitize_text(loaders.extract_docx_text(path))
+
+
+def _plain_text(path: str) -> str:
+    return loaders.extract_text(path, "txt")
+
+
+class ExtractionEngine:
+    def __init__(
+        self,
+        max_workers: int = 0,
+        pages_per_task: int = 8,
+        timeout_s: float = 300.0,
+        memory_limit_mb: int = 1024,
+    ) -> None:
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+        self.pages_per_task = max(1, int(pages_per_task))
+        self.timeout_s = float(timeout_s)
+        self.memory_limit_mb = max(0, int(memory_limit_mb))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(self.max_workers)  # calls submitted to the pool
+        self.documents = 0
+        self.tasks = 0
+        self.timeouts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and DB/HTTP pools is unsafe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_limit_memory,
+                initargs=(self.memory_limit_mb * 1024 * 1024,),
+            )
+        return self._executor
+
+    def _kill_pool(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # shutdown() alone waits for running tasks; a stuck parser has to be terminated.
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._slots = asyncio.Semaphore(self.max_workers)
+
+    async def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            self.tasks += 1
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(self._get_executor(), fn, *args), self.timeout_s)
+            except BrokenProcessPool:
+                self._executor = None  # a worker died (e.g. hit the memory limit); start fresh next time
+                raise
+
+    async def _tasks(self, path: str, file_ext: str) -> List[Tuple[Callable[..., Any], tuple]]:
+        """Split the document into independent (fn, args) pieces, in document order."""
+        if file_ext == "pdf":
+            pages = await self._call(loaders.pdf_page_count, path)
+            step = self.pages_per_task
+            return [(loaders.extract_pdf_pages, (path, start, start + step)) for start in range(0, pages, step)]
+        if file_ext in ("xls", "xlsx"):
+            sheets = await self._call(loaders.excel_sheet_names, path)
+            return [(loaders.extract_excel_sheet, (path, name)) for name in sheets]
+        if file_ext in ("doc", "docx"):
+            # python-docx loads the whole package at once; there's nothing to split.
+            return [(_docx_text, (path,))]
+        return [(_plain_text, (path,))]
+
+    async def iter_text(self, path: str, file_ext: str) -> AsyncIterator[Tuple[str, Optional[int]]]:
+        """
+        Yield (text, page) pieces in document order: one per page for PDFs (page
+        numbers from 1), per sheet for workbooks, the whole text otherwise (page
+        None). Joined with "\\n" and sanitized, the texts equal
+        `loaders.extract_text(path, file_ext)`.
+        """
+        file_ext = (file_ext or "").lower()
+        self.documents += 1
+        window = self.max_workers * 2
+        in_flight: Deque[asyncio.Task] = deque()
+        try:
+            tasks: Iterator[Tuple[Callable[..., Any], tuple]] = iter(await self._tasks(path, file_ext))
+            excel_lines = 0
+            page = 0
+            while True:
+                while len(in_flight) < window:
+                    nxt = next(tasks, None)
+                    if nxt is None:
+                        break
+                    in_flight.append(asyncio.ensure_future(self._call(nxt[0], *nxt[1])))
+                if not in_flight:
+                    return
+                result = await in_flight.popleft()
+                if file_ext in ("xls", "xlsx"):
+                    yield "\n".join(result), None
+                    excel_lines += len(result)
+                    if excel_lines > loaders.EXCEL_MAX_LINES:
+                        return
+                elif isinstance(result, list):
+                    for page_text in result:
+                        page += 1
+                        yield page_text, page
+                else:
+                    yield result, None
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._kill_pool()
+            raise ExtractionTimeout(
+                f"extracting {os.path.basename(path)}: a parser call exceeded {self.timeout_s:.0f}s"
+            ) from None
+        finally:
+            for task in in_flight:
+                task.cancel()
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "documents": self.documents,
+            "tasks": self.tasks,
+            "timeouts": self.timeouts,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_settings = get_settings()
+extraction_engine = ExtractionEngine(
+    max_workers=_settings.knowledge_extract_workers,
+    pages_per_task=_settings.knowledge_extract_pages_per_task,
+    timeout_s=_settings.knowledge_extract_timeout_seconds,
+    memory_limit_mb=_settings.knowledge_extract_memory_limit_mb,
+)
@@ -1,5 +1,161 @@
+"""
+Text extraction for knowledge ingestion (chunking lives in chunking.py).
+
+Extractors read from a file path so large PDFs/workbooks are never held in
+memory as one bytes object; they return "" when a format can't be read.
+"""
+import logging
 from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
 
 
 def load_text(path: str) -> str:
-    return Path(path).read_text(encoding='utf-8')
\ No newline at end of file
+    return Path(path).read_text(encoding='utf-8')
+
+
+def sanitize_text(text: str) -> str:
+    """Remove NUL and trim."""
+    if not text:
+        return ""
+    return text.replace("\x00", "").strip()
+
+
+def normalize_for_embedding(text: str) -> str:
+    """Lowercase + sanitize for case-insensitive embeddings/search."""
+    return sanitize_text(text).lower()
+
+
+def pdf_page_count(path: str) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pdf_pages(path: str, start: int = 0, stop: Optional[int] = None) -> List[str]:
+    """Text of pages [start, stop) (raises on unreadable files; used by the extraction pool)."""
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        texts = []
+        for page in pdf.pages[start:stop]:
+            texts.append(page.extract_text() or "")
+            page.close()  # release per-page layout objects on long documents
+    return texts
+
+
+def extract_pdf_text(path: str) -> str:
+    """Extract text from a PDF using pdfplumber, page by page."""
+    try:
+        return "\n".join(extract_pdf_pages(path))
+    except Exception as exc:
+        logger.error("PDF extract failed: %s", exc)
+        return ""
+
+
+def extract_docx_text(path: str) -> str:
+    """Extract text from DOCX using python-docx if available."""
+    try:
+        from docx import Document  # type: ignore
+    except Exception as exc:
+        logger.error("DOCX extract skipped (python-docx not available?): %s", exc)
+        return ""
+    try:
+        doc = Document(path)
+        parts: List[str] = []
+        for p in doc.paragraphs:
+            text = (p.text or "").strip()
+            if text:
+                style = (getattr(p.style, "name", "") or "").lower()
+                # Mark headings for the chunker's section splitting.
+                parts.append(f"# {text}" if style.startswith(("heading", "title")) else text)
+        # Optionally extract table cells
+        rows: List[str] = []
+        for table in doc.tables:
+            for row in table.rows:
+                cells = [c.text.strip() for c in row.cells if c.text and c.text.strip()]
+                if cells:
+                    rows.append(" | ".join(cells))
+        if rows:
+            parts.append("\n".join(rows))
+        # Blank lines between paragraphs; PDF-style single newlines are line wraps.
+        return "\n\n".join(parts)
+    except Exception as exc:
+        logger.error("DOCX extract failed: %s", exc)
+        return ""
+
+
+EXCEL_MAX_ROWS_PER_SHEET = 200
+EXCEL_MAX_LINES = 2000
+
+
+def excel_sheet_names(path: str) -> List[str]:
+    from openpyxl import load_workbook  # type: ignore
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def extract_excel_sheet(path: str, sheet_name: str) -> List[str]:
+    """Lines of one worksheet: a `# title` header, then one ` | `-joined line per row."""
+    from openpyxl import load_workbook  # type: ignore
+
+    wb = load_workbook(path, data_only=True, read_only=True)
+    try:
+        sheet = wb[sheet_name]
+        lines: List[str] = [f"# {sheet.title}"]
+        for idx, row in enumerate(sheet.iter_rows(values_only=True)):
+            if idx >= EXCEL_MAX_ROWS_PER_SHEET:  # avoid huge sheets
+                break
+            cells = []
+            for val in row:
+                if val is None:
+                    continue
+                text = str(val).strip()
+                if text:
+                    cells.append(text)
+            if cells:
+                lines.append(" | ".join(cells))
+        return lines
+    finally:
+        wb.close()
+
+
+def extract_excel_text(path: str) -> str:
+    """Extract text from XLSX/XLS using openpyxl if available."""
+    try:
+        import openpyxl  # type: ignore  # noqa: F401
+    except Exception as exc:
+        logger.error("Excel extract skipped (openpyxl not available?): %s", exc)
+        return ""
+    try:
+        lines: List[str] = []
+        for name in excel_sheet_names(path):
+            lines.extend(extract_excel_sheet(path, name))
+            if len(lines) > EXCEL_MAX_LINES:
+                break
+        return "\n".join(lines)
+    except Exception as exc:
+        logger.error("Excel extract failed: %s", exc)
+        return ""
+
+
+def extract_text(path: str, file_ext: str) -> str:
+    """Sanitized text of the file at `path`, dispatched on its extension."""
+    file_ext = (file_ext or "").lower()
+    if file_ext == "pdf":
+        return sanitize_text(extract_pdf_text(path))
+    if file_ext in ("doc", "docx"):
+        return sanitize_text(extract_docx_text(path))
+    if file_ext in ("xls", "xlsx"):
+        return sanitize_text(extract_excel_text(path))
+    try:
+        return sanitize_text(Path(path).read_bytes().decode("utf-8", errors="ignore"))
+    except Exception as exc:
+        logger.error("Text extract failed: %s", exc)
+        return ""
@@ -1,16 +1,71 @@
 """
-Seed mock LPBank documents into pgvector (stub) and LightRAG dataset.
-Run manually if you want to populate local vector store.
+Seed mock LPBank documents into pgvector (knowledge_document + knowledge_chunk).
+Run manually if you want to populate local vector store:
+
+    python -m app.vectorstore.ingestion.lpbank_seed
+
+Ids are derived from the seed doc ids, so re-running updates the same rows.
 """
-from app.vectorstore.pgvector_client import PgVectorClient
+from uuid import NAMESPACE_URL, uuid5
+
+from sqlalchemy import text
+
+from app.db.session import SessionLocal
+from app.llm.clients.embeddings import embed_texts, get_provider
+from app.vectorstore.ingestion.chunking import content_hash
+from app.vectorstore.ingestion.loaders import normalize_for_embedding
 from app.vectorstore.light_rag import SEED_DOCS
+from app.vectorstore.pgvector_client import ChunkRow, pgvector_client
+
+
+def _seed_id(kind: str, doc_id: str) -> str:
+    return str(uuid5(NAMESPACE_URL, f"lpbank-seed/{kind}/{doc_id}"))
 
 
 def seed():
-    client = PgVectorClient()
     texts = [f"{d.title} :: {d.snippet}" for d in SEED_DOCS]
-    client.upsert(texts)
-    print(f"Seeded {len(texts)} LPBank mock docs into pgvector stub.")
+    vectors = embed_texts([normalize_for_embedding(t) for t in texts])
+    model_id = get_provider().model_id
+    db = SessionLocal()
+    try:
+        for d in SEED_DOCS:
+            db.execute(
+                text(
+                    """
+                    INSERT INTO knowledge_document (
+                        id, title, description, source, category, tags, embedding_model, indexed_at, created_at, updated_at
+                    ) VALUES (:id, :title, :description, 'LPBank seed', :category, :tags, :model_id, now(), now(), now())
+                    ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, description = EXCLUDED.description,
+                        embedding_model = EXCLUDED.embedding_model, indexed_at = now(), updated_at = now()
+                    """
+                ),
+                {
+                    "id": _seed_id("doc", d.doc_id),
+                    "title": d.title,
+                    "description": d.snippet,
+                    "category": d.metadata.get("doc_type"),
+                    "tags": [t for t in (d.bucket, d.topic_id) if t],
+                    "model_id": model_id,
+                },
+            )
+        pgvector_client.upsert_chunks(
+            db,
+            [
+                ChunkRow(
+                    id=_seed_id("chunk", d.doc_id),
+                    document_id=_seed_id("doc", d.doc_id),
+                    chunk_index=0,
+                    content=t,
+                    embedding=vec,
+                    content_hash=content_hash(t, model_id),
+                )
+                for d, t, vec in zip(SEED_DOCS, texts, vectors)
+            ],
+        )
+        db.commit()
+    finally:
+        db.close()
+    print(f"Seeded {len(texts)} LPBank mock docs into pgvector.")
 
 
 if __name__ == "__main__":
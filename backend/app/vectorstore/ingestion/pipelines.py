@@ -1,8 +1,628 @@
-from app.vectorstore.pgvector_client import PgVectorClient
+"""
+Knowledge document ingestion pipeline.
+
+An upload spools the file under UPLOAD_DIR, inserts `knowledge_document` plus a
+`knowledge_ingest_job` row and returns. `run_job` then works through:
+
+  stored     copy the staged file to object storage (when configured)
+  indexed    extract (process pool, page by page) -> chunk (chunking.py) ->
+             embed new content hashes (batched, concurrent) -> bulk insert
+             (binary COPY through pgvector_client),
+             batch by batch while extraction runs
+
+`stage` is the last completed step and `chunks_done` counts committed chunks
+out of `chunks_total` (the chunks produced so far; final once extraction ends),
+so a failed or interrupted job resumes where it stopped: chunking is
+deterministic, so a re-extracted document skips the chunks already stored.
+Blocking DB and storage work runs in worker threads, extraction in
+`extraction_engine`; `app.workers.indexing_worker` schedules jobs and retries them.
+"""
+import asyncio
+import logging
+import mimetypes
+import shutil
+from pathlib import Path
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from psycopg2.extras import execute_values
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.llm.clients.embeddings import aembed_texts, get_provider, is_embedding_available
 from app.vectorstore.ingestion import loaders
+from app.vectorstore.ingestion.chunking import Chunk, StructuredChunker, content_hash
+from app.vectorstore.ingestion.extraction import ExtractionTimeout, extraction_engine
+from app.vectorstore.pgvector_client import ChunkRow, as_vector, pgvector_client
+
+logger = logging.getLogger(__name__)
+
+# Served at /files (see app/main.py).
+UPLOAD_DIR = Path(__file__).resolve().parents[3] / "uploaded_files"
+
+STAGES = ("queued", "stored", "indexed")
+
+_JOB_COLUMNS = (
+    "id, document_id, status, stage, file_type, staging_path, chunks_total, chunks_done, "
+    "attempts, error, created_at, updated_at"
+)
+_UPDATABLE = {"status", "stage", "chunks_total", "chunks_done", "error", "staging_path"}
+
+# ---- staging -----------------------------------------------------------------------
+
+def stage_upload(fileobj: BinaryIO, document_id: UUID, file_ext: str) -> Path:
+    """Copy an uploaded file to UPLOAD_DIR in 1 MiB pieces (blocking; call via a thread)."""
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    path = UPLOAD_DIR / f"{document_id}.{file_ext}"
+    fileobj.seek(0)
+    with path.open("wb") as out:
+        shutil.copyfileobj(fileobj, out, 1024 * 1024)
+    return path
+
+
+# ---- job rows ------------------------------------------------------------------------
+
+def _stage_done(job: Dict[str, Any], stage: str) -> bool:
+    return STAGES.index(job["stage"]) >= STAGES.index(stage)
+
+
+def job_progress(job: Dict[str, Any]) -> float:
+    """0..1 for progress bars: storing is the first 5%, then indexed chunks out of those produced so far."""
+    if job["status"] == "done":
+        return 1.0
+    if not _stage_done(job, "stored"):
+        return 0.0
+    total = job.get("chunks_total") or 0
+    return 0.05 + 0.95 * (min(job.get("chunks_done") or 0, total) / total if total else 0.0)
+
+
+def create_job(db: Session, document_id: UUID, file_type: str, staging_path: Optional[Path]) -> UUID:
+    """Insert a queued job (no commit; the caller commits it with the document row)."""
+    job_id = uuid4()
+    db.execute(
+        text(
+            """
+            INSERT INTO knowledge_ingest_job (id, document_id, status, stage, file_type, staging_path, created_at, updated_at)
+            VALUES (:id, :document_id, 'queued', 'queued', :file_type, :staging_path, now(), now())
+            """
+        ),
+        {
+            "id": str(job_id),
+            "document_id": str(document_id),
+            "file_type": file_type,
+            "staging_path": str(staging_path) if staging_path else None,
+        },
+    )
+    return job_id
+
+
+def get_job(db: Session, job_id: Any) -> Optional[Dict[str, Any]]:
+    row = db.execute(
+        text(f"SELECT {_JOB_COLUMNS} FROM knowledge_ingest_job WHERE id = :id"),
+        {"id": str(job_id)},
+    ).mappings().first()
+    return dict(row) if row else None
+
+
+def claim_job(db: Session, job_id: Any, stale_after_s: float) -> Optional[Dict[str, Any]]:
+    """Mark a queued (or abandoned running) job as running; None if someone else has it."""
+    row = db.execute(
+        text(
+            f"""
+            UPDATE knowledge_ingest_job
+            SET status = 'running', attempts = attempts + 1, updated_at = now()
+            WHERE id = :id
+              AND (status = 'queued'
+                   OR (status = 'running' AND updated_at < now() - make_interval(secs => :stale)))
+            RETURNING {_JOB_COLUMNS}
+            """
+        ),
+        {"id": str(job_id), "stale": float(stale_after_s)},
+    ).mappings().first()
+    db.commit()
+    return dict(row) if row else None
+
+
+def update_job(db: Session, job_id: Any, **fields: Any) -> None:
+    unknown = set(fields) - _UPDATABLE
+    if unknown:
+        raise ValueError(f"unknown job fields: {sorted(unknown)}")
+    assignments = ", ".join([f"{name} = :{name}" for name in fields] + ["updated_at = now()"])
+    db.execute(
+        text(f"UPDATE knowledge_ingest_job SET {assignments} WHERE id = :id"),
+        {**fields, "id": str(job_id)},
+    )
+    db.commit()
+
+
+def requeue_failed_job(db: Session, job_id: Any) -> bool:
+    """Manual retry: put a failed job back in the queue with a fresh attempt budget."""
+    row = db.execute(
+        text(
+            """
+            UPDATE knowledge_ingest_job
+            SET status = 'queued', attempts = 0, error = NULL, updated_at = now()
+            WHERE id = :id AND status = 'failed'
+            RETURNING id
+            """
+        ),
+        {"id": str(job_id)},
+    ).first()
+    db.commit()
+    return row is not None
+
+
+def pending_job_ids(db: Session, stale_after_s: float) -> List[str]:
+    rows = db.execute(
+        text(
+            """
+            SELECT id FROM knowledge_ingest_job
+            WHERE status = 'queued'
+               OR (status = 'running' AND updated_at < now() - make_interval(secs => :stale))
+            ORDER BY created_at
+            """
+        ),
+        {"stale": float(stale_after_s)},
+    ).fetchall()
+    return [str(r[0]) for r in rows]
+
+
+def database_now(db: Session) -> Any:
+    return db.execute(text("SELECT now()")).scalar()
+
+
+def active_job_count(db: Session) -> int:
+    return db.execute(
+        text("SELECT count(*) FROM knowledge_ingest_job WHERE status IN ('queued', 'running')")
+    ).scalar() or 0
+
+
+def reindex_candidates(db: Session, model_id: str, since: Any, force: bool, limit: int) -> List[Dict[str, Any]]:
+    """
+    Documents a bulk reindex still has to queue: indexed under another embedding
+    model (or never), or with `force` anything not indexed since the run began.
+    Documents with an active job, or whose job failed during this run, are skipped.
+    """
+    rows = db.execute(
+        text(
+            """
+            SELECT d.id, d.file_type
+            FROM knowledge_document d
+            WHERE (d.embedding_model IS DISTINCT FROM :model_id
+                   OR (:force AND (d.indexed_at IS NULL OR d.indexed_at < :since)))
+              AND NOT EXISTS (
+                  SELECT 1 FROM knowledge_ingest_job j
+                  WHERE j.document_id = d.id
+                    AND (j.status IN ('queued', 'running') OR (j.status = 'failed' AND j.created_at >= :since)))
+            ORDER BY d.created_at
+            LIMIT :limit
+            """
+        ),
+        {"model_id": model_id, "since": since, "force": bool(force), "limit": int(limit)},
+    ).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def count_reindex_candidates(db: Session, model_id: str, since: Any, force: bool) -> int:
+    return db.execute(
+        text(
+            """
+            SELECT count(*) FROM knowledge_document d
+            WHERE d.embedding_model IS DISTINCT FROM :model_id
+               OR (:force AND (d.indexed_at IS NULL OR d.indexed_at < :since))
+            """
+        ),
+        {"model_id": model_id, "since": since, "force": bool(force)},
+    ).scalar() or 0
+
+
+def queue_reindex_job(db: Session, document_id: Any, file_type: Optional[str]) -> UUID:
+    """Create (and commit) a job that re-extracts the document from its stored file or metadata."""
+    job_id = create_job(db, document_id, (file_type or "").lower(), None)
+    db.commit()
+    return job_id
+
+
+def with_session(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run `fn(db, ...)` on a short-lived session (for asyncio.to_thread)."""
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+# ---- stages (blocking) -----------------------------------------------------------------
+
+def _document(db: Session, document_id: Any) -> Dict[str, Any]:
+    row = db.execute(
+        text(
+            """
+            SELECT id, title, description, file_type, file_url, storage_key, meeting_id, project_id
+            FROM knowledge_document WHERE id = :id
+            """
+        ),
+        {"id": str(document_id)},
+    ).mappings().first()
+    if not row:
+        raise LookupError(f"knowledge_document {document_id} no longer exists")
+    return dict(row)
+
+
+def _store(db: Session, job: Dict[str, Any], doc: Dict[str, Any]) -> None:
+    # app.services imports knowledge_service, which imports this module.
+    from app.services.storage_client import (
+        build_object_key,
+        generate_presigned_get_url,
+        is_storage_configured,
+        upload_bytes_to_storage,
+    )
+
+    staging = Path(job["staging_path"]) if job.get("staging_path") else None
+    if staging is not None and staging.exists() and not doc.get("storage_key") and is_storage_configured():
+        object_key = build_object_key(staging.name, prefix="knowledge")
+        content_type = mimetypes.guess_type(staging.name)[0]
+        try:
+            upload_bytes_to_storage(staging.read_bytes(), object_key, content_type=content_type)
+            db.execute(
+                text("UPDATE knowledge_document SET storage_key = :key, file_url = :url, updated_at = now() WHERE id = :id"),
+                {"key": object_key, "url": generate_presigned_get_url(object_key, expires_in=3600), "id": str(doc["id"])},
+            )
+            doc["storage_key"] = object_key
+        except Exception as exc:
+            # Same as before the pipeline existed: the local copy under /files stays the document's home.
+            logger.error("Upload to storage failed, keeping local file: %s", exc)
+    update_job(db, job["id"], stage="stored")
+
+
+def _source_path(db: Session, job: Dict[str, Any], doc: Dict[str, Any]) -> Optional[str]:
+    """
+    File to extract: the staged upload, else the document's local copy, else a
+    fresh download from object storage (re-indexing); None for metadata-only documents.
+    """
+    from app.services.storage_client import download_object_to_file
+
+    staging = job.get("staging_path")
+    if staging and Path(staging).exists():
+        return staging
+    file_url = doc.get("file_url") or ""
+    if file_url.startswith("/files/"):
+        local = UPLOAD_DIR / file_url[len("/files/"):]
+        if local.exists():
+            return str(local)
+    if doc.get("storage_key"):
+        UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        target = UPLOAD_DIR / f"{doc['id']}.{job['id']}.{job.get('file_type') or 'bin'}"
+        if download_object_to_file(doc["storage_key"], target):
+            # Recorded as the staging copy, so it is removed once the job is done.
+            update_job(db, job["id"], staging_path=str(target))
+            job["staging_path"] = str(target)
+            return str(target)
+    return None
+
+
+def _chunk_state(db: Session, document_id: Any, job_id: Any) -> List[Dict[str, Any]]:
+    """The document's live chunks plus the chunks this job staged in an earlier attempt."""
+    rows = db.execute(
+        text(
+            """
+            SELECT id, chunk_index, content_hash, is_live
+            FROM knowledge_chunk
+            WHERE document_id = :doc_id
+              AND (is_live OR (ingest_job_id = :job_id AND retired_at IS NULL))
+            """
+        ),
+        {"doc_id": str(document_id), "job_id": str(job_id)},
+    ).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def _stored_vectors(db: Session, hashes: Sequence[str]) -> Dict[str, Any]:
+    """content_hash -> vector for chunks already embedded in any document."""
+    return pgvector_client.vectors_by_hash(db, hashes)
+
+
+def _insert_chunks(
+    db: Session,
+    job_id: Any,
+    doc: Dict[str, Any],
+    rows: Sequence[Tuple[str, Chunk, str, Any]],
+    chunks_done: int,
+    chunks_total: int,
+) -> None:
+    """
+    Insert one embedded batch of (row id, chunk, content hash, vector) as
+    staged rows, invisible to search until `_publish`, and advance the job's
+    progress in the same transaction.
+    """
+    scope_meeting = str(doc["meeting_id"]) if doc.get("meeting_id") else None
+    scope_project = str(doc["project_id"]) if doc.get("project_id") else None
+    pgvector_client.upsert_chunks(
+        db,
+        [
+            ChunkRow(
+                id=row_id,
+                document_id=str(doc["id"]),
+                chunk_index=chunk.index,
+                content=chunk.content,
+                embedding=vector,
+                content_hash=digest,
+                scope_meeting=scope_meeting,
+                scope_project=scope_project,
+                page=chunk.page_start,
+                page_end=chunk.page_end,
+                section=chunk.section,
+                token_count=chunk.token_count,
+                ingest_job_id=str(job_id),
+                is_live=False,
+            )
+            for row_id, chunk, digest, vector in rows
+        ],
+    )
+    db.execute(
+        text(
+            "UPDATE knowledge_ingest_job SET chunks_done = :done, chunks_total = :total, updated_at = now() WHERE id = :id"
+        ),
+        {"done": chunks_done, "total": chunks_total, "id": str(job_id)},
+    )
+    db.commit()
+
+
+def _publish(
+    db: Session,
+    job: Dict[str, Any],
+    doc: Dict[str, Any],
+    kept: Sequence[Tuple[str, Chunk]],
+    staged_ids: Sequence[str],
+    model_id: str,
+    total: int,
+) -> bool:
+    """
+    Swap the document to the new chunk set in one transaction: kept rows take
+    their new positions, this job's staged rows go live, everything else that
+    was live is tombstoned. Returns False (and drops the staged rows) if a newer
+    job for the document exists; that job publishes instead.
+    """
+    doc_id, job_id = str(doc["id"]), str(job["id"])
+    # Serializes publishes of one document.
+    db.execute(text("SELECT id FROM knowledge_document WHERE id = :id FOR UPDATE"), {"id": doc_id})
+    superseded = db.execute(
+        text(
+            """
+            SELECT 1 FROM knowledge_ingest_job
+            WHERE document_id = :doc_id AND id <> :job_id AND created_at > :created_at AND status <> 'failed'
+            LIMIT 1
+            """
+        ),
+        {"doc_id": doc_id, "job_id": job_id, "created_at": job["created_at"]},
+    ).first() is not None
+    params = {"doc_id": doc_id, "job_id": job_id}
+    if superseded:
+        db.execute(
+            text("DELETE FROM knowledge_chunk WHERE ingest_job_id = :job_id AND NOT is_live AND retired_at IS NULL"),
+            params,
+        )
+    else:
+        if kept:
+            cursor = db.connection().connection.cursor()
+            try:
+                execute_values(
+                    cursor,
+                    """
+                    UPDATE knowledge_chunk AS kc
+                    SET chunk_index = v.idx, page = v.page, page_end = v.page_end, section = v.section,
+                        token_count = v.tokens, is_live = true, retired_at = NULL
+                    FROM (VALUES %s) AS v(id, idx, page, page_end, section, tokens)
+                    WHERE kc.id = v.id
+                    """,
+                    [
+                        (row_id, c.index, c.page_start, c.page_end, c.section, c.token_count)
+                        for row_id, c in kept
+                    ],
+                    template="(%s::uuid, %s::int, %s::int, %s::int, %s::text, %s::int)",
+                    page_size=1000,
+                )
+            finally:
+                cursor.close()
+        live_ids = [row_id for row_id, _ in kept] + list(staged_ids)
+        params["live_ids"] = live_ids
+        db.execute(
+            text(
+                """
+                UPDATE knowledge_chunk SET is_live = false, retired_at = now()
+                WHERE document_id = :doc_id AND is_live AND NOT (id = ANY(CAST(:live_ids AS uuid[])))
+                """
+            ),
+            params,
+        )
+        # Leftovers of an earlier attempt that the final chunk set no longer contains.
+        db.execute(
+            text(
+                """
+                DELETE FROM knowledge_chunk
+                WHERE ingest_job_id = :job_id AND NOT is_live AND retired_at IS NULL
+                  AND NOT (id = ANY(CAST(:live_ids AS uuid[])))
+                """
+            ),
+            params,
+        )
+        db.execute(
+            text("UPDATE knowledge_chunk SET is_live = true WHERE ingest_job_id = :job_id AND NOT is_live AND retired_at IS NULL"),
+            params,
+        )
+        db.execute(
+            text(
+                """
+                UPDATE knowledge_document
+                SET index_version = index_version + 1, indexed_at = now(), embedding_model = :model_id
+                WHERE id = :doc_id
+                """
+            ),
+            {**params, "model_id": model_id},
+        )
+    db.execute(
+        text(
+            """
+            UPDATE knowledge_ingest_job
+            SET status = 'done', stage = 'indexed', chunks_total = :total,
+                chunks_done = :total, error = NULL, updated_at = now()
+            WHERE id = :job_id
+            """
+        ),
+        {**params, "total": total},
+    )
+    db.commit()
+    return not superseded
+
+
+def purge_retired_chunks(db: Session, older_than_s: float) -> int:
+    """
+    Delete tombstoned chunks past their grace period, and staged chunks whose
+    job finished or disappeared. Until then a retired chunk's vector can still
+    be reused by content hash (e.g. when a revision is reverted).
+    """
+    result = db.execute(
+        text(
+            """
+            DELETE FROM knowledge_chunk kc
+            WHERE (kc.retired_at IS NOT NULL AND kc.retired_at < now() - make_interval(secs => :age))
+               OR (NOT kc.is_live AND kc.retired_at IS NULL AND NOT EXISTS (
+                       SELECT 1 FROM knowledge_ingest_job j
+                       WHERE j.id = kc.ingest_job_id AND j.status IN ('queued', 'running', 'failed')))
+            """
+        ),
+        {"age": float(older_than_s)},
+    )
+    db.commit()
+    return result.rowcount or 0
+
+
+# ---- orchestration -------------------------------------------------------------------
+
+async def _extracted_pieces(job: Dict[str, Any], doc: Dict[str, Any]) -> AsyncIterator[Tuple[str, Optional[int]]]:
+    source = await asyncio.to_thread(with_session, _source_path, job, doc)
+    if not source:
+        return
+    started = False
+    try:
+        async for piece in extraction_engine.iter_text(source, job.get("file_type") or doc.get("file_type") or ""):
+            started = True
+            yield piece
+    except (ExtractionTimeout, BrokenProcessPool):
+        raise
+    except Exception as exc:
+        if started:
+            raise
+        # Unreadable file (or parser not installed): index title/description, as before.
+        logger.error("Extract failed for knowledge document %s: %s", doc["id"], exc)
+
+
+async def _index(
+    job: Dict[str, Any], doc: Dict[str, Any], pieces: AsyncIterator[Tuple[str, Optional[int]]]
+) -> Dict[str, int]:
+    """
+    Chunk the extracted text and diff it against the document's live chunks by
+    content hash: unchanged chunks are kept, new ones are embedded (or reuse a
+    vector stored under the same hash) and staged, then `_publish` swaps the
+    document over atomically.
+    """
+    settings = get_settings()
+    batch_size = max(1, settings.knowledge_ingest_batch_chunks)
+    chunker = StructuredChunker(settings.knowledge_chunk_max_tokens, settings.knowledge_chunk_overlap_tokens)
+    model_id = get_provider().model_id
+
+    state = await asyncio.to_thread(with_session, _chunk_state, doc["id"], job["id"])
+    # Staged by an earlier attempt of this job (chunking is deterministic, so indexes line up).
+    staged = {(r["chunk_index"], r["content_hash"]): str(r["id"]) for r in state if not r["is_live"]}
+    live: Dict[str, List[str]] = {}
+    for r in state:
+        if r["is_live"] and r["content_hash"]:
+            live.setdefault(r["content_hash"], []).append(str(r["id"]))
+
+    kept: List[Tuple[str, Chunk]] = []
+    staged_ids: List[str] = []
+    pending: List[Tuple[Chunk, str]] = []
+    counts = {"chunks": 0, "kept": 0, "embedded": 0}
+    chunks_done = 0
+
+    def add(chunks: List[Chunk]) -> None:
+        nonlocal chunks_done
+        for chunk in chunks:
+            digest = content_hash(chunk.content, model_id)
+            counts["chunks"] += 1
+            if (chunk.index, digest) in staged:
+                staged_ids.append(staged[(chunk.index, digest)])
+                chunks_done += 1
+            elif live.get(digest):
+                kept.append((live[digest].pop(), chunk))
+                counts["kept"] += 1
+                chunks_done += 1
+            else:
+                pending.append((chunk, digest))
+
+    async def flush(size: int) -> None:
+        nonlocal chunks_done
+        batch = pending[:size]
+        del pending[:size]
+        vectors = await asyncio.to_thread(with_session, _stored_vectors, sorted({d for _, d in batch}))
+        # Embed each new hash once, even if it repeats within the batch.
+        missing = {d: chunk for chunk, d in batch if d not in vectors}
+        if missing:
+            if not is_embedding_available():
+                raise RuntimeError("no embedding provider available; retry once one is configured")
+            fresh = await aembed_texts([loaders.normalize_for_embedding(chunk.content) for chunk in missing.values()])
+            vectors.update({d: as_vector(vec) for d, vec in zip(missing, fresh)})
+            counts["embedded"] += len(missing)
+        rows = [(str(uuid4()), chunk, d, vectors[d]) for chunk, d in batch]
+        staged_ids.extend(row[0] for row in rows)
+        chunks_done += len(batch)
+        await asyncio.to_thread(with_session, _insert_chunks, job["id"], doc, rows, chunks_done, counts["chunks"])
+
+    async for piece, page in pieces:
+        add(chunker.feed(piece, page))
+        while len(pending) >= batch_size:
+            await flush(batch_size)
+    add(chunker.finish())
+    if counts["chunks"] == 0:
+        # Nothing extractable (or metadata-only document): index title/description.
+        meta = "\n\n".join(p for p in (doc.get("title"), doc.get("description")) if p)
+        add(chunker.feed(loaders.sanitize_text(meta)) + chunker.finish())
+    # Extraction is over, so the total is final; kept chunks count as done without a flush.
+    await asyncio.to_thread(
+        with_session, update_job, job["id"], chunks_total=counts["chunks"], chunks_done=chunks_done
+    )
+    while pending:
+        await flush(batch_size)
+
+    published = await asyncio.to_thread(
+        with_session, _publish, job, doc, kept, staged_ids, model_id, counts["chunks"]
+    )
+    counts["published"] = int(published)
+    return counts
+
+
+async def run_job(job: Dict[str, Any]) -> None:
+    """Run a claimed job from its last completed stage to the end."""
+    from app.services.knowledge_cache import answer_cache
 
+    doc = await asyncio.to_thread(with_session, _document, job["document_id"])
+    if not _stage_done(job, "stored"):
+        await asyncio.to_thread(with_session, _store, job, doc)
+    counts = await _index(job, doc, _extracted_pieces(job, doc))
 
-def ingest_path(path: str):
-    client = PgVectorClient()
-    text = loaders.load_text(path)
-    client.upsert([text])
\ No newline at end of file
+    staging = job.get("staging_path")
+    if staging and doc.get("storage_key"):
+        # The object store has the file now; the staged copy was only needed for extraction.
+        Path(staging).unlink(missing_ok=True)
+    if not counts["published"]:
+        logger.info("knowledge ingest job %s superseded by a newer job for document %s", job["id"], doc["id"])
+        return
+    answer_cache.invalidate(doc.get("meeting_id"), doc.get("project_id"))
+    logger.info(
+        "indexed knowledge document %s: %s chunks (%s unchanged, %s embedded)",
+        doc["id"], counts["chunks"], counts["kept"], counts["embedded"],
+    )
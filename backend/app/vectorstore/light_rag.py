@@ -1,6 +1,41 @@
+"""
+Scoped multi-bucket retrieval for in-meeting Q&A (LightRAG-lite).
+
+A question is searched in up to three buckets of `knowledge_chunk`, in
+parallel, each through PgVectorClient (best chunk per document):
+
+  meeting   chunks of documents attached to the meeting
+  project   chunks of documents attached to the project
+  global    chunks of documents attached to neither
+
+Scores are cosine similarity plus a bucket boost (meeting > project > global)
+and a topic boost when the document is tagged with the current topic. A chunk
+found in two buckets keeps its best score, and the top `limit` are kept with
+a bounded heap.
+
+Every request has a latency budget (`budget_ms`, embedding included). When it
+runs out, the buckets that have answered are merged and the rest are dropped;
+their queries are cancelled server-side by statement_timeout shortly after.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
-import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+from app.llm.clients.embeddings import is_embedding_available
+from app.vectorstore.pgvector_client import ChunkFilter, PgVectorClient, pgvector_client
+
+logger = logging.getLogger(__name__)
+
+BUCKET_BOOST = {"meeting": 0.25, "project": 0.15, "global": 0.0}
+TOPIC_BOOST = 0.1
+_STATEMENT_GRACE_MS = 50.0  # statement_timeout past the deadline for queries already running
 
 
 @dataclass
@@ -15,7 +50,7 @@ class RagDoc:
     metadata: Dict[str, Any]
 
 
-# Seeded LPBank-oriented snippets (mock pgvector rows)
+# LPBank-oriented sample documents; `ingestion/lpbank_seed.py` writes them to pgvector.
 SEED_DOCS: List[RagDoc] = [
     RagDoc(
         doc_id="lpb-core-001",
@@ -61,50 +96,162 @@ SEED_DOCS: List[RagDoc] = [
 
 
 class LightRAGRetriever:
-    def __init__(self, docs: Optional[List[RagDoc]] = None) -> None:
-        self.docs = docs or SEED_DOCS
-
-    def retrieve(self, question: str, meeting_id: str | None = None, project_id: str | None = None, topic_id: str | None = None) -> List[Dict[str, Any]]:
-        """Return prioritized snippets by bucket: meeting > project/topic > global."""
-        query_tokens = set((question or "").lower().split())
-
-        def score_doc(doc: RagDoc) -> float:
-            base = doc.score
-            bucket_bonus = {"meeting": 0.25, "project": 0.15, "global": 0.0}.get(doc.bucket, 0.0)
-            topic_bonus = 0.1 if topic_id and doc.topic_id and topic_id in doc.topic_id else 0.0
-            token_overlap = len(query_tokens.intersection(set(doc.snippet.lower().split()))) * 0.01
-            return base + bucket_bonus + topic_bonus + token_overlap
-
-        candidates: List[RagDoc] = []
-        for doc in self.docs:
-            # Bucket filter / assignment
-            if meeting_id and doc.bucket == "meeting":
-                candidates.append(doc)
-            elif project_id and doc.project_id == project_id:
-                candidates.append(doc)
-            elif doc.bucket == "global":
-                candidates.append(doc)
-            else:
-                candidates.append(doc)
-
-        ranked = sorted(
-            candidates,
-            key=lambda d: score_doc(d),
-            reverse=True,
+    def __init__(
+        self,
+        client: Optional[PgVectorClient] = None,
+        per_bucket: int = 8,
+        limit: int = 8,
+        budget_ms: float = 800.0,
+        max_workers: int = 8,
+    ) -> None:
+        self.client = client or pgvector_client
+        self.per_bucket = max(1, int(per_bucket))
+        self.limit = max(1, int(limit))
+        self.budget_ms = float(budget_ms)
+        self.max_workers = max(1, int(max_workers))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.partial = 0  # requests answered without every bucket
+        self.missed: Dict[str, int] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="light-rag")
+        return self._executor
+
+    @staticmethod
+    def buckets(meeting_id: Optional[str], project_id: Optional[str]) -> List[Tuple[str, ChunkFilter]]:
+        out: List[Tuple[str, ChunkFilter]] = []
+        if meeting_id:
+            out.append(("meeting", ChunkFilter(meeting_id=str(meeting_id))))
+        if project_id:
+            out.append(("project", ChunkFilter(project_id=str(project_id))))
+        out.append(("global", ChunkFilter(unscoped=True)))
+        return out
+
+    @staticmethod
+    def _embed(question: str) -> Sequence[float]:
+        from app.services.knowledge_cache import query_embedding_cache
+
+        return query_embedding_cache.embed(question)
+
+    def _search(self, filters: ChunkFilter, query_vec: Sequence[float], timeout_ms: float) -> List[Dict[str, Any]]:
+        return self.client.search(
+            query_vec, filters, top_k=self.per_bucket, per_document=True, timeout_ms=timeout_ms
         )
 
-        results: List[Dict[str, Any]] = []
-        for doc in ranked[:8]:
-            results.append(
-                {
-                    "doc_id": doc.doc_id,
-                    "title": doc.title,
-                    "snippet": doc.snippet,
-                    "bucket": doc.bucket,
-                    "topic_id": doc.topic_id,
-                    "project_id": doc.project_id,
-                    "score": round(score_doc(doc), 3),
-                    "metadata": doc.metadata,
-                }
-            )
-        return results
+    def _record_miss(self, names: Sequence[str]) -> None:
+        with self._lock:
+            self.partial += 1
+            for name in names:
+                self.missed[name] = self.missed.get(name, 0) + 1
+
+    @staticmethod
+    def _hit(bucket: str, row: Dict[str, Any], project_id: Optional[str], topic_id: Optional[str]) -> Dict[str, Any]:
+        tags = row.get("tags") or []
+        on_topic = bool(topic_id) and topic_id in tags
+        score = 1.0 - float(row["distance"]) + BUCKET_BOOST.get(bucket, 0.0) + (TOPIC_BOOST if on_topic else 0.0)
+        return {
+            "doc_id": str(row["id"]),
+            "title": row["title"],
+            "snippet": row["content"],
+            "bucket": bucket,
+            "topic_id": topic_id if on_topic else None,
+            "project_id": project_id if bucket == "project" else None,
+            "score": round(score, 3),
+            "metadata": {
+                "source": row.get("source"),
+                "category": row.get("category"),
+                "chunk_index": row.get("chunk_index"),
+                "page": row.get("page"),
+                "page_end": row.get("page_end"),
+                "section": row.get("section"),
+                "distance": float(row["distance"]),
+            },
+        }
+
+    def merge(self, results: Sequence[Tuple[str, List[Dict[str, Any]]]], project_id: Optional[str] = None, topic_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Boost, de-duplicate by chunk and keep the best `limit` hits (bounded min-heap), best first."""
+        best: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        for bucket, rows in results:
+            for row in rows:
+                hit = self._hit(bucket, row, project_id, topic_id)
+                key = (hit["doc_id"], hit["metadata"]["chunk_index"])
+                if key not in best or hit["score"] > best[key]["score"]:
+                    best[key] = hit
+        heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        for seq, hit in enumerate(best.values()):
+            item = (hit["score"], -seq, hit)  # earlier hits win ties
+            if len(heap) < self.limit:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+        return [hit for _, _, hit in sorted(heap, key=lambda item: item[:2], reverse=True)]
+
+    def retrieve(
+        self,
+        question: str,
+        meeting_id: str | None = None,
+        project_id: str | None = None,
+        topic_id: str | None = None,
+        budget_ms: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Scoped hits (meeting > project > global), best first; [] without an embedding provider."""
+        if not (question or "").strip() or not is_embedding_available():
+            return []
+        budget_ms = self.budget_ms if budget_ms is None else float(budget_ms)
+        deadline = time.monotonic() + budget_ms / 1000.0
+        with self._lock:
+            self.requests += 1
+        executor = self._get_executor()
+        buckets = self.buckets(meeting_id, project_id)
+        try:
+            query_vec = executor.submit(self._embed, question).result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            logger.warning("scoped retrieval: query embedding exceeded the %.0fms budget", budget_ms)
+            self._record_miss([name for name, _ in buckets])
+            return []
+        except Exception as exc:
+            logger.warning("scoped retrieval: query embedding failed: %s", exc)
+            return []
+
+        remaining_ms = max(0.0, (deadline - time.monotonic()) * 1000.0)
+        futures: Dict[Future, str] = {
+            executor.submit(self._search, filters, query_vec, remaining_ms + _STATEMENT_GRACE_MS): name for name, filters in buckets
+        }
+        done, pending = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        if pending:
+            for future in pending:
+                future.cancel()
+            missed = sorted(futures[f] for f in pending)
+            logger.info("scoped retrieval: %s bucket(s) missed the %.0fms budget", ",".join(missed), budget_ms)
+            self._record_miss(missed)
+
+        results: List[Tuple[str, List[Dict[str, Any]]]] = []
+        for future in futures:  # bucket order, so ties resolve meeting > project > global
+            if future not in done:
+                continue
+            try:
+                results.append((futures[future], future.result()))
+            except Exception as exc:
+                logger.warning("scoped retrieval: %s bucket failed: %s", futures[future], exc)
+        return self.merge(results, project_id=project_id, topic_id=topic_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "partial": self.partial, "missed": dict(self.missed)}
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_settings = get_settings()
+light_rag_retriever = LightRAGRetriever(
+    per_bucket=_settings.knowledge_scoped_rag_per_bucket,
+    limit=_settings.knowledge_scoped_rag_limit,
+    budget_ms=_settings.knowledge_scoped_rag_budget_ms,
+)
@@ -1,16 +1,27 @@
 from typing import List, Dict, Any
-from app.vectorstore.pgvector_client import PgVectorClient
-from app.vectorstore.light_rag import LightRAGRetriever
+from app.vectorstore.pgvector_client import ChunkFilter, pgvector_client
+from app.vectorstore.light_rag import light_rag_retriever
 
 
-def simple_retrieval(query: str, meeting_id: str | None = None):
-    client = PgVectorClient()
-    results = client.search(query)
-    for hit in results:
-        hit['meeting_id'] = meeting_id
-    return results
+def simple_retrieval(query: str, meeting_id: str | None = None, project_id: str | None = None, top_k: int = 5) -> List[Dict[str, Any]]:
+    """Best chunk of each of the `top_k` nearest knowledge documents (vector search only)."""
+    rows = pgvector_client.search_text(
+        query, ChunkFilter(meeting_id=meeting_id, project_id=project_id), top_k=top_k, per_document=True
+    )
+    return [
+        {
+            "source": r["title"],
+            "snippet": r["content"],
+            "document_id": str(r["id"]),
+            "page": r["page"],
+            "section": r["section"],
+            "score": 1.0 - float(r["distance"]),
+            "meeting_id": meeting_id,
+        }
+        for r in rows
+    ]
 
 
 def light_rag_retrieval(question: str, meeting_id: str | None = None, project_id: str | None = None, topic_id: str | None = None) -> List[Dict[str, Any]]:
-    retriever = LightRAGRetriever()
-    return retriever.retrieve(question=question, meeting_id=meeting_id, project_id=project_id, topic_id=topic_id)
+    """Meeting > project > global scoped hits within the configured latency budget."""
+    return light_rag_retriever.retrieve(question=question, meeting_id=meeting_id, project_id=project_id, topic_id=topic_id)
@@ -1,9 +1,13 @@
-from app.vectorstore.ingestion.pipelines import ingest_path
+from app.llm.clients.embeddings import embed_texts
+from app.vectorstore.ingestion import loaders
+from app.vectorstore.ingestion.chunking import chunk_document
 
 
 def enqueue_background_task(task: str):
     print(f"enqueue task: {task}")
 
 
-def warmup_embeddings(sample_path: str):
-    ingest_path(sample_path)
\ No newline at end of file
+def warmup_embeddings(sample_path: str, max_chunks: int = 8) -> int:
+    """Embed the first chunks of a sample file (nothing is stored) so the provider's pools are warm."""
+    chunks = chunk_document([(loaders.load_text(sample_path), None)])[:max_chunks]
+    return len(embed_texts([loaders.normalize_for_embedding(c.content) for c in chunks]))
@@ -1,6 +1,255 @@
-from app.vectorstore.ingestion.pipelines import ingest_path
+"""
+Background scheduler for knowledge ingestion jobs (see app/vectorstore/ingestion/pipelines.py).
 
+Jobs live in `knowledge_ingest_job`, so the in-process queue only holds ids:
+`submit` after an upload, and on start every queued job (or running job whose
+heartbeat went stale, i.e. its process died) is picked up again. `concurrency`
+workers run jobs; a failed job is retried with backoff up to `max_attempts`,
+then marked failed until retried explicitly. Tombstoned chunks are purged
+after each job once they are older than `tombstone_ttl_s`.
 
-def run_index_job(path: str):
-    ingest_path(path)
-    return {"status": "indexed", "path": path}
\ No newline at end of file
+`BulkReindexer` re-indexes every document for a new embedding model through
+the same jobs, throttled so uploads keep flowing and search keeps serving the
+old chunks of each document until its new ones are published.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import get_settings
+from app.llm.clients.embeddings import get_provider
+from app.vectorstore.ingestion.pipelines import (
+    active_job_count,
+    claim_job,
+    count_reindex_candidates,
+    database_now,
+    pending_job_ids,
+    purge_retired_chunks,
+    queue_reindex_job,
+    reindex_candidates,
+    run_job,
+    update_job,
+    with_session,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IndexingWorker:
+    def __init__(
+        self,
+        concurrency: int = 2,
+        max_attempts: int = 3,
+        retry_backoff_s: float = 10.0,
+        stale_after_s: float = 600.0,
+        tombstone_ttl_s: float = 3600.0,
+    ) -> None:
+        self.concurrency = max(1, int(concurrency))
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_backoff_s = float(retry_backoff_s)
+        self.stale_after_s = float(stale_after_s)
+        self.tombstone_ttl_s = float(tombstone_ttl_s)
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._retry_handles: Dict[str, asyncio.TimerHandle] = {}
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, job_id) -> None:
+        """Queue a job id. Before start() this is a no-op: start() picks up queued jobs from the DB."""
+        job_id = str(job_id)
+        if self._queue is None or job_id in self._queued:
+            return
+        self._queued.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    def _retry_later(self, job_id: str, delay: float) -> None:
+        def fire() -> None:
+            self._retry_handles.pop(job_id, None)
+            self.submit(job_id)
+
+        self._retry_handles[job_id] = asyncio.get_running_loop().call_later(delay, fire)
+
+    async def _process(self, job_id: str) -> None:
+        job = await asyncio.to_thread(with_session, claim_job, job_id, self.stale_after_s)
+        if job is None:
+            return  # done, failed, or running elsewhere
+        self.running += 1
+        try:
+            await run_job(job)
+            self.completed += 1
+            await self._purge()
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back so the next start resumes it right away.
+            await asyncio.shield(asyncio.to_thread(with_session, update_job, job_id, status="queued"))
+            raise
+        except Exception as exc:
+            logger.exception("knowledge ingestion failed (job_id=%s attempt=%s)", job_id, job["attempts"])
+            error = f"{type(exc).__name__}: {exc}"[:2000]
+            if job["attempts"] < self.max_attempts:
+                await asyncio.to_thread(with_session, update_job, job_id, status="queued", error=error)
+                self._retry_later(job_id, self.retry_backoff_s * (2 ** (job["attempts"] - 1)))
+            else:
+                await asyncio.to_thread(with_session, update_job, job_id, status="failed", error=error)
+                self.failed += 1
+        finally:
+            self.running -= 1
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("indexing worker error (job_id=%s)", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _purge(self) -> None:
+        try:
+            purged = await asyncio.to_thread(with_session, purge_retired_chunks, self.tombstone_ttl_s)
+        except Exception as exc:
+            logger.warning("purging retired knowledge chunks failed: %s", exc)
+            return
+        if purged:
+            logger.info("purged %s retired knowledge chunks", purged)
+
+    async def _resume(self) -> None:
+        try:
+            job_ids = await asyncio.to_thread(with_session, pending_job_ids, self.stale_after_s)
+        except Exception as exc:
+            logger.warning("could not load pending ingestion jobs: %s", exc)
+            return
+        for job_id in job_ids:
+            self.submit(job_id)
+        if job_ids:
+            logger.info("resuming %s knowledge ingestion jobs", len(job_ids))
+        await self._purge()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._resume()))
+
+    async def stop(self) -> None:
+        for handle in self._retry_handles.values():
+            handle.cancel()
+        self._retry_handles.clear()
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+        self._queued.clear()
+
+
+class BulkReindexer:
+    """
+    Re-index all documents whose live chunks were embedded by another model
+    (or, with `force`, every document). Documents are queued one batch at a
+    time: never more than `max_in_flight` active ingestion jobs (uploads count
+    too, so they are never starved) and `pause_s` between documents.
+    """
+
+    def __init__(self, worker: IndexingWorker, max_in_flight: int = 1, pause_s: float = 1.0, poll_s: float = 5.0) -> None:
+        self.worker = worker
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.pause_s = float(pause_s)
+        self.poll_s = float(poll_s)
+        self._task: Optional[asyncio.Task] = None
+        self._state: Dict[str, Any] = {"running": False}
+
+    def status(self) -> Dict[str, Any]:
+        return {**self._state, "running": self._task is not None and not self._task.done()}
+
+    def start(self, force: bool = False) -> bool:
+        """Start a run in the background; False if one is already running."""
+        if self._task is not None and not self._task.done():
+            return False
+        self._state = {
+            "model_id": get_provider().model_id,
+            "force": bool(force),
+            "started_at": None,
+            "finished_at": None,
+            "queued": 0,
+            "remaining": None,
+            "error": None,
+        }
+        self._task = asyncio.create_task(self._run(force))
+        return True
+
+    async def _run(self, force: bool) -> None:
+        state = self._state
+        model_id = state["model_id"]
+        try:
+            since = await asyncio.to_thread(with_session, database_now)
+            state["started_at"] = since
+            logger.info("bulk knowledge reindex started (model=%s force=%s)", model_id, force)
+            while True:
+                state["remaining"] = await asyncio.to_thread(with_session, count_reindex_candidates, model_id, since, force)
+                active = await asyncio.to_thread(with_session, active_job_count)
+                if active >= self.max_in_flight:
+                    await asyncio.sleep(self.poll_s)
+                    continue
+                docs = await asyncio.to_thread(
+                    with_session, reindex_candidates, model_id, since, force, self.max_in_flight - active
+                )
+                if not docs:
+                    if active == 0:
+                        break  # everything queued has been published (or failed)
+                    await asyncio.sleep(self.poll_s)
+                    continue
+                for doc in docs:
+                    job_id = await asyncio.to_thread(with_session, queue_reindex_job, doc["id"], doc["file_type"])
+                    self.worker.submit(job_id)
+                    state["queued"] += 1
+                    await asyncio.sleep(self.pause_s)
+            logger.info("bulk knowledge reindex finished: %s documents queued", state["queued"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            state["error"] = f"{type(exc).__name__}: {exc}"
+            logger.exception("bulk knowledge reindex failed")
+        finally:
+            state["finished_at"] = datetime.now(timezone.utc)
+
+    async def stop(self) -> None:
+        """Stop queueing; jobs already queued still run."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+_settings = get_settings()
+ingestion_worker = IndexingWorker(
+    concurrency=_settings.knowledge_ingest_workers,
+    max_attempts=_settings.knowledge_ingest_max_attempts,
+    retry_backoff_s=_settings.knowledge_ingest_retry_backoff_seconds,
+    stale_after_s=_settings.knowledge_ingest_stale_after_seconds,
+    tombstone_ttl_s=_settings.knowledge_chunk_tombstone_ttl_seconds,
+)
+bulk_reindexer = BulkReindexer(
+    ingestion_worker,
+    max_in_flight=_settings.knowledge_reindex_max_in_flight,
+    pause_s=_settings.knowledge_reindex_pause_seconds,
+)
@@ -0,0 +1,127 @@
+"""
+Benchmark: recall@k and latency of HNSW / ivfflat vs exact search (pgvector).
+
+Builds a synthetic clustered corpus in a scratch table, indexes it with the
+parameters app.vectorstore.ann_index would pick for that size, then runs the
+same queries at each recall level and compares against an exact scan. Needs a
+Postgres with pgvector (DATABASE_URL or --dsn). Run from backend/:
+
+    python -m tests.bench_ann_index --rows 100000 --dim 256 --queries 100 -k 10
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import List, Sequence
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import get_settings
+from app.vectorstore.ann_index import build_index_sql, params_for_corpus, search_settings
+
+TABLE = "bench_ann_chunk"
+RECALL_LEVELS = (0.90, 0.95, 0.98, 0.99)
+
+
+def _literal(vec: Sequence[float]) -> str:
+    return "[" + ",".join(f"{x:.5f}" for x in vec) + "]"
+
+
+def _corpus(rows: int, dim: int, clusters: int, rng: random.Random) -> List[List[float]]:
+    centers = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(clusters)]
+    out = []
+    for _ in range(rows):
+        center = centers[rng.randrange(clusters)]
+        out.append([c + rng.gauss(0, 0.35) for c in center])
+    return out
+
+
+def _load(engine, vectors: List[List[float]], dim: int) -> None:
+    from psycopg2.extras import execute_values
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        conn.execute(text(f"CREATE TABLE {TABLE} (id INT PRIMARY KEY, embedding VECTOR({dim}) NOT NULL)"))
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        execute_values(
+            cur,
+            f"INSERT INTO {TABLE} (id, embedding) VALUES %s",
+            ((i, _literal(v)) for i, v in enumerate(vectors)),
+            page_size=1000,
+        )
+        raw.commit()
+    finally:
+        raw.close()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def _search(engine, queries: List[str], k: int, statements: List[str]):
+    ids, latencies = [], []
+    sql = text(f"SELECT id FROM {TABLE} ORDER BY embedding <=> CAST(:q AS vector) LIMIT :k")
+    with engine.connect() as conn:
+        for q in queries:
+            with conn.begin():
+                for stmt in statements:
+                    conn.execute(text(stmt))
+                started = time.perf_counter()
+                rows = conn.execute(sql, {"q": q, "k": k}).fetchall()
+                latencies.append((time.perf_counter() - started) * 1000.0)
+            ids.append({r[0] for r in rows})
+    return ids, latencies
+
+
+def _report(label: str, ids, latencies, truth, k: int) -> None:
+    recall = statistics.mean(len(got & exp) / k for got, exp in zip(ids, truth))
+    p50 = statistics.median(latencies)
+    p95 = sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+    print(f"{label:<34} recall@{k}={recall:.3f}  p50={p50:7.2f}ms  p95={p95:7.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default=get_settings().database_url)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--methods", nargs="+", default=["hnsw", "ivfflat"])
+    parser.add_argument("--keep", action="store_true", help="keep the scratch table")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    engine = create_engine(args.dsn)
+    print(f"generating {args.rows} x {args.dim} vectors ...")
+    vectors = _corpus(args.rows, args.dim, args.clusters, rng)
+    started = time.perf_counter()
+    _load(engine, vectors, args.dim)
+    print(f"loaded in {time.perf_counter() - started:.1f}s")
+
+    queries = [_literal([x + rng.gauss(0, 0.2) for x in rng.choice(vectors)]) for _ in range(args.queries)]
+    truth, latencies = _search(engine, queries, args.k, ["SET LOCAL enable_indexscan = off"])
+    _report("exact (seq scan)", truth, latencies, truth, args.k)
+
+    try:
+        for method in args.methods:
+            params = params_for_corpus(args.rows, method)
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(text(f"DROP INDEX IF EXISTS {TABLE}_ann"))
+                started = time.perf_counter()
+                conn.execute(text(build_index_sql(f"{TABLE}_ann", params, table=TABLE, concurrently=False)))
+            print(f"\n{method} {params.with_clause()} built in {time.perf_counter() - started:.1f}s")
+            for level in RECALL_LEVELS:
+                settings = search_settings(level, args.k, params.lists)
+                ids, latencies = _search(engine, queries, args.k, settings.statements(method))
+                knob = f"ef_search={settings.ef_search}" if method == "hnsw" else f"probes={settings.probes}"
+                _report(f"  target {level:.2f} ({knob})", ids, latencies, truth, args.k)
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: wall-clock time of long-recording transcription
+(app.services.vnpt_stt_service) as the number of concurrent window requests grows.
+
+The recording is split into windows once per run (SMARTVOICE_BATCH_* settings)
+and recognized with each --in-flight value in turn; 1 is the serial baseline.
+Needs a reachable SmartVoice endpoint (SMARTVOICE_GRPC_ENDPOINT + credentials).
+Run from backend/:
+
+    python -m tests.bench_batch_stt --audio meeting.wav --in-flight 1 2 4 8
+"""
+import argparse
+import asyncio
+import time
+
+from app.services import vnpt_stt_service as stt
+from app.services.audio_processing import open_pcm_wav, plan_windows
+from app.services.smartvoice_channel import smartvoice_channels
+
+
+async def _run(args) -> None:
+    settings = stt.settings
+    with open_pcm_wav(args.audio) as wav:
+        windows = plan_windows(
+            wav,
+            window_seconds=settings.smartvoice_batch_window_seconds,
+            overlap_seconds=settings.smartvoice_batch_overlap_seconds,
+            search_seconds=settings.smartvoice_batch_silence_search_seconds,
+        )
+        print(f"{wav.duration_seconds:.0f}s audio, {len(windows)} windows of <= {settings.smartvoice_batch_window_seconds:.0f}s")
+    await smartvoice_channels.warmup()
+
+    baseline = None
+    for in_flight in args.in_flight:
+        started = time.perf_counter()
+        with open_pcm_wav(args.audio) as wav:
+            result = await stt._transcribe_windows(wav, args.language, None, True, in_flight)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(
+            f"  in_flight={in_flight:<3} {elapsed:8.1f}s  speedup={baseline / elapsed:5.2f}x"
+            f"  segments={len(result.segments)} words={len(result.words or [])}"
+        )
+    await smartvoice_channels.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--audio", required=True, help="16-bit PCM WAV")
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--language", default="vi-VN")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
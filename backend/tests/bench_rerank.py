@@ -0,0 +1,145 @@
+"""
+Benchmark: RAG prompt size and end-to-end latency with and without the
+cross-encoder rerank stage (app.services.knowledge_rerank).
+
+For each query the chunks are retrieved once (hybrid search over the live
+knowledge base), then the answer prompt is built and sent to the LLM twice:
+from all retrieved chunks (as with KNOWLEDGE_RERANK_ENABLED=false), and from
+the reranked chunks that fit the token budget. Prompt tokens are the
+approximate count from the chunker (words + punctuation). Needs the database,
+an embedding provider and sentence-transformers; without GROQ_API_KEY (or
+with --no-llm) only retrieval and rerank are timed. Run from backend/:
+
+    python -m tests.bench_rerank --queries queries.txt --limit 5 --top-n 6 --budget 1500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.llm.gemini_client import GeminiChat, is_gemini_available
+from app.schemas.knowledge import KnowledgeSearchRequest
+from app.services import knowledge_service as ks
+from app.services.hybrid_retrieval import hybrid_search_chunks
+from app.services.knowledge_rerank import CrossEncoderReranker
+from app.vectorstore.ingestion.chunking import count_tokens
+
+DEFAULT_QUERIES = [
+    "Thời gian lưu trữ log giao dịch theo Thông tư 09/2020/TT-NHNN là bao lâu?",
+    "Quy trình phê duyệt khoản vay doanh nghiệp gồm những bước nào?",
+    "Hạn mức chuyển tiền trực tuyến tối đa mỗi ngày?",
+    "Yêu cầu kiểm thử hiệu năng trước khi go-live Core Banking?",
+    "Ai chịu trách nhiệm phê duyệt thay đổi hạ tầng?",
+]
+
+
+def _pct(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))] if ordered else 0.0
+
+
+def _report(label: str, runs: List[Dict[str, float]]) -> None:
+    print(f"\n{label}")
+    for field in ("chunks", "prompt_tokens", "retrieval_ms", "rerank_ms", "llm_ms", "total_ms"):
+        values = [r[field] for r in runs if field in r]
+        if values:
+            print(
+                f"  {field:<14} mean={statistics.mean(values):9.1f}  p50={statistics.median(values):9.1f}"
+                f"  p95={_pct(values, 0.95):9.1f}"
+            )
+
+
+async def _llm(prompt: str) -> float:
+    chat = GeminiChat(system_prompt="Bạn là trợ lý RAG. Trả lời ngắn gọn bằng tiếng Việt. Chỉ dùng thông tin trong Context.")
+    started = time.perf_counter()
+    await chat.chat(prompt)
+    return (time.perf_counter() - started) * 1000.0
+
+
+async def _run(args) -> None:
+    settings = get_settings()
+    reranker = CrossEncoderReranker(
+        args.model or settings.knowledge_rerank_model,
+        enabled=True,
+        batch_size=args.batch_size,
+        top_n=args.top_n,
+        token_budget=args.budget,
+        cache_size=0 if args.cold else 4096,
+    )
+    if not reranker.is_available():
+        raise SystemExit("sentence-transformers is not installed")
+    use_llm = not args.no_llm and is_gemini_available()
+    queries = DEFAULT_QUERIES
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as fh:
+            queries = [line.strip() for line in fh if line.strip()]
+
+    # Load the model outside the measurements.
+    reranker.score("warm up", [("w", "warm up")])
+
+    baseline: List[Dict[str, float]] = []
+    reranked: List[Dict[str, float]] = []
+    db = SessionLocal()
+    try:
+        for _ in range(args.repeat):
+            for query in queries:
+                top_k = max(args.limit * 3, 12)
+                started = time.perf_counter()
+                query_vec = await ks._embed_query(query)
+                rows = await hybrid_search_chunks(
+                    db,
+                    query,
+                    ks._build_vector_filters(KnowledgeSearchRequest(query=query, limit=top_k)),
+                    query_vec=query_vec,
+                    top_k=top_k,
+                )
+                retrieval_ms = (time.perf_counter() - started) * 1000.0
+                chunks = [ks._rag_chunk(r) for r in rows]
+
+                started = time.perf_counter()
+                kept = await reranker.rerank(query, chunks)
+                rerank_ms = (time.perf_counter() - started) * 1000.0
+
+                for runs, selected, extra_ms in ((baseline, chunks, 0.0), (reranked, kept, rerank_ms)):
+                    prompt = ks._rag_prompt(query, "\n".join(ks._context_parts(selected[:top_k])))
+                    run = {
+                        "chunks": float(len(selected)),
+                        "prompt_tokens": float(count_tokens(prompt)),
+                        "retrieval_ms": retrieval_ms,
+                        "rerank_ms": extra_ms,
+                    }
+                    total = retrieval_ms + extra_ms
+                    if use_llm:
+                        run["llm_ms"] = await _llm(prompt)
+                        total += run["llm_ms"]
+                    run["total_ms"] = total
+                    runs.append(run)
+    finally:
+        db.close()
+
+    print(f"{len(queries)} queries x {args.repeat}, model={reranker.model_name}, llm={'on' if use_llm else 'off'}")
+    _report("without rerank (all retrieved chunks)", baseline)
+    _report(f"with rerank (top {args.top_n}, budget {args.budget} tokens)", reranked)
+    saved = statistics.mean(b["prompt_tokens"] - r["prompt_tokens"] for b, r in zip(baseline, reranked))
+    print(f"\nprompt tokens saved per query: {saved:.0f}; rerank cache: {reranker.stats()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", help="file with one query per line (default: built-in samples)")
+    parser.add_argument("--limit", type=int, default=5, help="KnowledgeQueryRequest.limit")
+    parser.add_argument("--model", help="cross-encoder (default: KNOWLEDGE_RERANK_MODEL)")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--top-n", type=int, default=6)
+    parser.add_argument("--budget", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=1, help="later rounds hit the score cache unless --cold")
+    parser.add_argument("--cold", action="store_true", help="disable the score cache")
+    parser.add_argument("--no-llm", action="store_true")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
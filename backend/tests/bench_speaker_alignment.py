@@ -0,0 +1,69 @@
+"""
+Benchmark: speaker attribution over synthetic multi-hour timelines.
+
+Compares the old per-segment linear scan (O(n*m)) with the sweep in
+app.services.speaker_alignment. Run from backend/:
+
+    python -m tests.bench_speaker_alignment --hours 2 3
+"""
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from app.services.speaker_alignment import align_speakers
+
+
+def _timeline(hours: float, mean_len: float, speakers: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    out, t, total = [], 0.0, hours * 3600.0
+    while t < total:
+        length = rng.uniform(0.3 * mean_len, 1.7 * mean_len)
+        out.append({"speaker": f"SPEAKER_{rng.randrange(speakers):02d}", "start": t, "end": t + length})
+        t += length + rng.uniform(0.0, 0.4)
+    return out
+
+
+def _naive(transcript: List[Dict[str, Any]], diar: List[Dict[str, Any]]) -> List[str]:
+    speakers = []
+    for seg in transcript:
+        best, best_overlap = None, 0.0
+        for d in diar:
+            overlap = min(seg["time_end"], d["end"]) - max(seg["time_start"], d["start"])
+            if overlap > best_overlap:
+                best, best_overlap = d["speaker"], overlap
+        speakers.append(best)
+    return speakers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", type=float, nargs="+", default=[1.0, 2.0, 3.0])
+    parser.add_argument("--skip-naive", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'hours':>6} {'transcript':>10} {'diar':>7} {'naive_s':>9} {'sweep_s':>9} {'speedup':>8}")
+    for hours in args.hours:
+        diar = _timeline(hours, mean_len=2.5, speakers=6, seed=1)
+        transcript = [
+            {"time_start": s["start"], "time_end": s["end"], "text": "x"}
+            for s in _timeline(hours, mean_len=4.0, speakers=1, seed=2)
+        ]
+
+        t0 = time.perf_counter()
+        aligned = align_speakers(transcript, diar)
+        sweep_s = time.perf_counter() - t0
+
+        naive_s = float("nan")
+        if not args.skip_naive:
+            t0 = time.perf_counter()
+            _naive(transcript, diar)
+            naive_s = time.perf_counter() - t0
+        assert len(aligned) == len(transcript)
+        print(
+            f"{hours:>6.1f} {len(transcript):>10} {len(diar):>7} {naive_s:>9.3f} {sweep_s:>9.3f} {naive_s / sweep_s:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
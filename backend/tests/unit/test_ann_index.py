@@ -0,0 +1,51 @@
+from uuid import UUID
+
+from app.vectorstore.ann_index import (
+    IndexParams,
+    build_index_sql,
+    params_for_corpus,
+    parse_indexdef,
+    project_index_name,
+    search_settings,
+)
+
+
+def test_params_scale_with_corpus() -> None:
+    assert params_for_corpus(0, "ivfflat").lists == 1
+    assert params_for_corpus(250_000, "ivfflat").lists == 250
+    assert params_for_corpus(4_000_000, "ivfflat").lists == 2000
+    small, large = params_for_corpus(10_000), params_for_corpus(2_000_000)
+    assert small.method == "hnsw" and small.m < large.m
+    assert small.ef_construction < large.ef_construction
+
+
+def test_search_settings_monotonic_in_recall() -> None:
+    levels = [search_settings(r, k=10, lists=500) for r in (0.85, 0.95, 0.98, 0.995)]
+    assert [s.ef_search for s in levels] == sorted(s.ef_search for s in levels)
+    assert [s.probes for s in levels] == sorted(s.probes for s in levels)
+    assert all(s.ef_search >= 10 for s in levels)
+    assert search_settings(0.95, k=5000, lists=10).ef_search == 1000  # pgvector cap
+    assert search_settings(0.99, k=10, lists=10).probes <= 10
+
+    exact = search_settings(1.0, k=10)
+    assert exact.exact
+    assert exact.statements("hnsw") == ["SET LOCAL enable_indexscan = off"]
+    assert search_settings(0.95, k=10).statements("hnsw") == ["SET LOCAL hnsw.ef_search = 80"]
+    assert search_settings(0.95, k=10).statements(None) == []
+
+
+def test_parse_indexdef_and_build_sql() -> None:
+    info = parse_indexdef(
+        "idx_chunk_embedding",
+        "CREATE INDEX idx_chunk_embedding ON public.knowledge_chunk USING hnsw "
+        "(embedding vector_cosine_ops) WITH (m='16', ef_construction='64')",
+    )
+    assert info.method == "hnsw" and info.options == {"m": 16, "ef_construction": 64}
+    assert parse_indexdef("x", "CREATE INDEX x ON t USING ivfflat (e vector_cosine_ops) WITH (lists='100')").options == {"lists": 100}
+
+    pid = UUID("12345678-1234-5678-1234-567812345678")
+    name = project_index_name(pid)
+    assert len(name) <= 63
+    sql = build_index_sql(name, IndexParams("ivfflat", lists=40), where=f"scope_project = '{pid}'")
+    assert sql.startswith(f"CREATE INDEX CONCURRENTLY {name} ON knowledge_chunk USING ivfflat")
+    assert sql.endswith("WITH (lists = 40) WHERE scope_project = '12345678-1234-5678-1234-567812345678'")
@@ -0,0 +1,85 @@
+import asyncio
+
+import numpy as np
+
+from app.services.audio_ingest_buffer import AudioIngestBuffer, StreamTimeline
+from app.services.audio_vad import AudioFrame, VoiceActivityGate
+
+RATE = 16000
+MS = RATE * 2 // 1000  # bytes per millisecond, 16 kHz mono
+
+
+def _frame(pos_ms: int, ms: int, voiced: bool = True) -> AudioFrame:
+    return AudioFrame(pos=pos_ms * RATE // 1000, pcm=b"\x01\x00" * (ms * RATE // 1000), voiced=voiced)
+
+
+async def _drain(buf: AudioIngestBuffer):
+    out = []
+    while (chunk := await buf.get()) is not None:
+        out.append(chunk)
+    return out
+
+
+def test_coalesces_contiguous_frames_and_splits_at_gaps() -> None:
+    buf = AudioIngestBuffer(RATE, frame_ms=100)
+    for pos in range(0, 200, 20):
+        buf.push(_frame(pos, 20))
+    buf.push(_frame(500, 20))  # after a gap: starts a new frame
+    buf.close()
+    sizes = [len(c) // MS for c in asyncio.run(_drain(buf))]
+    assert sizes == [100, 100, 20]
+    assert buf.timeline.to_stream_time(0.15) == 0.15
+    assert buf.timeline.to_stream_time(0.2) == 0.5
+
+
+def test_budget_drops_silent_frames_first() -> None:
+    buf = AudioIngestBuffer(RATE, frame_ms=100, max_bytes=300 * MS)
+    buf.push(_frame(0, 100, voiced=True))
+    buf.push(_frame(100, 100, voiced=False))
+    buf.push(_frame(200, 100, voiced=True))
+    assert buf.congested and buf.dropped_silent_bytes == 0
+    buf.push(_frame(300, 100, voiced=True))  # over budget: the silent frame goes
+    assert buf.dropped_silent_bytes == 100 * MS and buf.dropped_voiced_bytes == 0
+    buf.push(_frame(400, 100, voiced=True))  # no silence left: the oldest speech goes
+    assert buf.dropped_voiced_bytes == 100 * MS
+    buf.close()
+    assert len(asyncio.run(_drain(buf))) == 3
+    # Frames at stream 200/300/400 ms were sent as 0-300 ms.
+    assert buf.timeline.to_stream_time(0.05) == 0.25
+
+
+def test_partial_frame_is_flushed_after_hold() -> None:
+    async def run():
+        buf = AudioIngestBuffer(RATE, frame_ms=100, max_hold_ms=20)
+        buf.push(_frame(0, 30))
+        chunk = await asyncio.wait_for(buf.get(), timeout=1.0)
+        assert len(chunk) == 30 * MS
+        assert buf.stats()["lag_ms_last"] >= 20
+
+    asyncio.run(run())
+
+
+def test_stream_times_survive_vad_suppression() -> None:
+    gate = VoiceActivityGate(RATE, hangover_ms=300, preroll_ms=200)
+    buf = AudioIngestBuffer(RATE, frame_ms=100)
+    t = np.arange(RATE) / RATE
+    tone = (6000 * np.sin(2 * np.pi * 300 * t)).astype("<i2")
+    silence = np.zeros(3 * RATE, dtype="<i2")
+    audio = np.concatenate([tone, silence, tone])
+    for i in range(0, len(audio), RATE // 10):
+        for frame in gate.process(audio[i : i + RATE // 10].tobytes()):
+            buf.push(frame)
+    buf.close()
+    asyncio.run(_drain(buf))
+    timeline = buf.timeline
+    # Forwarded: 1 s speech + 0.3 s hangover, 0.2 s pre-roll (stream 3.8-4.0 s), 1 s speech.
+    assert timeline.to_stream_time(1.3, end=True) == 1.3
+    assert timeline.to_stream_time(1.3) == 3.8
+    assert timeline.to_stream_time(2.0) == 4.5
+
+
+def test_timeline_without_gaps_is_identity() -> None:
+    timeline = StreamTimeline(RATE)
+    timeline.record(0, RATE)
+    timeline.record(RATE, RATE)
+    assert timeline.to_stream_time(1.7) == 1.7
@@ -0,0 +1,95 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.websocket import in_meeting_ws
+from app.core.config import get_settings
+from app.core.realtime_security import create_audio_ingest_token
+from app.services.realtime_session_store import session_store
+
+FRAME = b"\x01\x00" * 1600  # 100 ms of 16 kHz mono
+
+
+def _client(monkeypatch, received):
+    async def fake_stream_recognize(audio, cfg):
+        while (chunk := await audio.get()) is not None:
+            received.append(len(chunk))
+        if False:
+            yield None
+
+    monkeypatch.setattr(in_meeting_ws, "stream_recognize", fake_stream_recognize)
+    async def no_stream_worker(session_id):
+        return None
+
+    monkeypatch.setattr(in_meeting_ws, "_ensure_stream_worker", no_stream_worker)
+    monkeypatch.setattr(get_settings(), "audio_vad_enabled", False)
+    monkeypatch.setattr(get_settings(), "audio_ingest_frame_ms", 100)
+    app = FastAPI()
+    app.include_router(in_meeting_ws.router)
+    return TestClient(app)
+
+
+def _connect(client, session_id, **start):
+    ws = client.websocket_connect(f"/audio/{session_id}?token={create_audio_ingest_token(session_id)}&stt=1")
+    conn = ws.__enter__()
+    assert conn.receive_json()["event"] == "connected"
+    conn.send_json({"type": "start", **start})
+    ack = conn.receive_json()
+    assert ack["event"] == "audio_start_ack"
+    return ws, conn, ack
+
+
+def test_reconnect_resumes_clock_and_skips_resent_audio(monkeypatch) -> None:
+    received = []
+    session_id = session_store.ensure("resume-test").session_id
+    with _client(monkeypatch, received) as client:
+        ws, conn, ack = _connect(client, session_id)
+        assert ack["resume"] == {"resumed": False, "offset_bytes": 0, "clock_s": 0.0}
+        for _ in range(5):
+            conn.send_bytes(FRAME)
+        assert conn.receive_json()["event"] == "audio_ingest_ok"
+        ws.__exit__(None, None, None)  # dropped without "stop"
+
+        state = in_meeting_ws.audio_ingest_sessions[session_id]
+        stt_task = state.stt_task
+        # The client resends its last 2 frames (it only knows 3 were delivered).
+        ws, conn, ack = _connect(client, session_id, resume_offset_bytes=3 * len(FRAME))
+        assert ack["resume"] == {"resumed": True, "offset_bytes": 5 * len(FRAME), "clock_s": 0.5}
+        for _ in range(4):
+            conn.send_bytes(FRAME)
+        conn.send_json({"type": "stop"})
+        ws.__exit__(None, None, None)
+
+    assert state.stt_task is stt_task and state.reconnects == 1  # same SmartVoice stream
+    assert state.received_bytes == 7 * len(FRAME)
+    assert state.clock.now_s() == 0.7
+    assert session_id not in in_meeting_ws.audio_ingest_sessions
+    assert sum(received) == 7 * len(FRAME)
+
+
+def test_resume_without_server_state_starts_clock_at_offset(monkeypatch) -> None:
+    received = []
+    session_id = session_store.ensure("resume-cold").session_id
+    with _client(monkeypatch, received) as client:
+        ws, conn, ack = _connect(client, session_id, resume_offset_bytes=30 * len(FRAME))
+        assert ack["resume"] == {"resumed": False, "offset_bytes": 30 * len(FRAME), "clock_s": 3.0}
+        state = in_meeting_ws.audio_ingest_sessions[session_id]
+        conn.send_bytes(FRAME)
+        conn.send_json({"type": "stop"})
+        ws.__exit__(None, None, None)
+    # STT saw only the new frame; its times map onto the stream from 3.0 s.
+    assert received == [len(FRAME)]
+    assert state.buffer.timeline.to_stream_time(0.05) == 3.05
+
+
+def test_detached_session_expires_after_grace(monkeypatch) -> None:
+    async def run():
+        monkeypatch.setattr(get_settings(), "audio_resume_grace_seconds", 0.01)
+        state = in_meeting_ws._AudioIngestSession(session_id="expire", clock=in_meeting_ws._AudioClock(16000, 1))
+        in_meeting_ws.audio_ingest_sessions["expire"] = state
+        in_meeting_ws._detach_audio_session(state)
+        await asyncio.sleep(0.05)
+        assert "expire" not in in_meeting_ws.audio_ingest_sessions
+
+    asyncio.run(run())
@@ -0,0 +1,62 @@
+import numpy as np
+
+from app.services.audio_vad import VoiceActivityGate
+
+RATE = 16000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (6000 * np.sin(2 * np.pi * 300 * t)).astype("<i2")
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * RATE), dtype="<i2")
+
+
+def _feed(gate: VoiceActivityGate, audio: np.ndarray, frame_ms: int = 100) -> bytes:
+    step = RATE * frame_ms // 1000
+    out = b""
+    for i in range(0, len(audio), step):
+        out += b"".join(frame.pcm for frame in gate.process(audio[i : i + step].tobytes()))
+    return out
+
+
+def test_gate_drops_silence_and_keeps_hangover_and_preroll() -> None:
+    gate = VoiceActivityGate(RATE, hangover_ms=300, preroll_ms=200)
+    audio = np.concatenate([_tone(1.0), _silence(3.0), _tone(1.0)])
+    sent = np.frombuffer(_feed(gate, audio), dtype="<i2")
+
+    # 1 s speech + 0.3 s hangover + 0.2 s pre-roll + 1 s speech; 2.5 s of silence dropped.
+    assert len(sent) == int(2.5 * RATE)
+    stats = gate.stats()
+    assert stats["received_seconds"] == 5.0 and stats["suppressed_seconds"] == 2.5
+    assert stats["suppressed_ratio"] == 0.5 and stats["gaps"] == 1
+    # The second utterance reaches SmartVoice intact.
+    assert np.array_equal(sent[-RATE:], audio[-RATE:])
+
+
+def test_frames_keep_stream_positions() -> None:
+    gate = VoiceActivityGate(RATE, frame_ms=100, hangover_ms=100, preroll_ms=100)
+    frames = gate.process(np.concatenate([_tone(0.5), _silence(1.0), _tone(0.3)]).tobytes())
+    positions = [f.pos / RATE for f in frames]
+    # Speech, 0.1 s hangover, then 0.1 s pre-roll right before the second utterance.
+    assert positions == [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 1.4, 1.5, 1.6, 1.7]
+    assert [f.voiced for f in frames] == [True] * 5 + [False, False] + [True] * 3
+
+
+def test_rising_background_noise_is_learned() -> None:
+    gate = VoiceActivityGate(RATE, threshold_dbfs=-50.0, hangover_ms=0, preroll_ms=0)
+    rng = np.random.default_rng(0)
+    # Hiss rising from ~ -61 to ~ -44 dBFS over 20 s, then steady for 10 s.
+    level = np.concatenate([np.linspace(30, 200, 20 * RATE), np.full(10 * RATE, 200.0)])
+    noise = (rng.normal(0, 1, 30 * RATE) * level).astype("<i2")
+    assert _feed(gate, noise) == b""
+    assert gate.stats()["suppressed_ratio"] == 1.0
+
+
+def test_long_continuous_utterance_is_not_gated() -> None:
+    gate = VoiceActivityGate(RATE)
+    audio = _tone(60.0)  # ~ -18 dBFS for a full minute
+    assert len(_feed(gate, audio)) == 2 * len(audio)
+    assert gate.stats()["suppressed_seconds"] == 0.0
@@ -0,0 +1,103 @@
+import asyncio
+import wave
+
+import numpy as np
+
+from app.services import vnpt_stt_service as stt
+from app.services.audio_processing import open_pcm_wav, plan_windows
+from app.services.vnpt_stt_service import TranscriptionResult, stitch_windows
+
+RATE = 16000
+
+
+def _write_wav(path, samples: np.ndarray) -> None:
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(samples.astype("<i2").tobytes())
+
+
+def _speech_with_pauses(seconds: int, pauses) -> np.ndarray:
+    t = np.arange(seconds * RATE) / RATE
+    audio = (8000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+    for at in pauses:  # 0.4 s of silence starting at `at`
+        audio[int(at * RATE) : int((at + 0.4) * RATE)] = 0
+    return audio
+
+
+def test_open_pcm_wav_maps_samples(tmp_path) -> None:
+    audio = _speech_with_pauses(3, [1.0])
+    _write_wav(tmp_path / "a.wav", audio)
+    with open_pcm_wav(tmp_path / "a.wav") as wav:
+        assert wav.sample_rate == RATE and wav.frames == len(audio)
+        assert wav.pcm_bytes(100, 200) == audio[100:200].tobytes()
+
+
+def test_plan_windows_cuts_at_pauses_with_overlap(tmp_path) -> None:
+    _write_wav(tmp_path / "a.wav", _speech_with_pauses(25, [8.0, 16.5]))
+    with open_pcm_wav(tmp_path / "a.wav") as wav:
+        windows = plan_windows(wav, window_seconds=10, overlap_seconds=1, search_seconds=3)
+    assert windows[0][0] == 0 and windows[-1][1] == 25 * RATE
+    cuts = [end / RATE for _, end in windows[:-1]]
+    assert 8.0 <= cuts[0] <= 8.4 and 16.5 <= cuts[1] <= 16.9
+    for (_, end), (start, _) in zip(windows, windows[1:]):
+        assert end - start == RATE  # the next window starts one overlap before the cut
+
+
+def _word(word, start, end):
+    return {"word": word, "start_time": start, "end_time": end}
+
+
+def _result(*segments):
+    return TranscriptionResult(
+        text=" ".join(s["text"] for s in segments),
+        confidence=0.9,
+        language="vi",
+        segments=list(segments),
+    )
+
+
+def _segment(*words):
+    return {
+        "text": " ".join(w["word"] for w in words),
+        "confidence": 0.9,
+        "time_start": words[0]["start_time"],
+        "time_end": words[-1]["end_time"],
+        "words": list(words),
+    }
+
+
+def test_stitch_windows_offsets_and_dedupes_overlap() -> None:
+    # Window 1 covers 0-10 s; window 2 starts at 9 s (1 s overlap before the cut at 10 s).
+    first = _result(_segment(_word("xin", 1.0, 1.4), _word("chào", 1.5, 2.0)), _segment(_word("hôm", 9.2, 9.6), _word("nay", 9.6, 9.9)))
+    second = _result(_segment(_word("nay", 0.6, 0.9), _word("họp", 1.2, 1.6), _word("tiếp", 1.7, 2.0)))
+    stitched = stitch_windows([(0.0, 10.0), (9.0, 20.0)], [first, second], "vi")
+    assert stitched.text == "xin chào hôm nay họp tiếp"
+    assert [w["start_time"] for w in stitched.words][-2:] == [10.2, 10.7]
+    assert stitched.segments[-1]["time_start"] == 10.2
+
+
+def test_long_audio_windows_run_concurrently_within_limit(tmp_path, monkeypatch) -> None:
+    _write_wav(tmp_path / "a.wav", _speech_with_pauses(30, [8.0, 17.0, 26.0]))
+    monkeypatch.setattr(stt.settings, "smartvoice_batch_window_seconds", 10.0)
+    monkeypatch.setattr(stt.settings, "smartvoice_batch_overlap_seconds", 1.0)
+    monkeypatch.setattr(stt.settings, "smartvoice_batch_silence_search_seconds", 3.0)
+    active = {"now": 0, "max": 0, "calls": 0}
+
+    async def recognize(audio, rate, channels, language_code, model, words):
+        active["now"] += 1
+        active["calls"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        n = active["calls"]
+        return _result(_segment(_word(f"w{n}", 2.0, 2.5)))
+
+    monkeypatch.setattr(stt, "_recognize_pcm", recognize)
+    with open_pcm_wav(tmp_path / "a.wav") as wav:
+        result = asyncio.run(stt._transcribe_windows(wav, "vi-VN", None, True, max_in_flight=2))
+    assert active["calls"] == 4 and active["max"] == 2
+    assert len(result.segments) == 4
+    starts = [s["time_start"] for s in result.segments]
+    assert starts == sorted(starts) and starts[0] == 2.0
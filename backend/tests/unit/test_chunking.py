@@ -0,0 +1,118 @@
+import asyncio
+
+from app.vectorstore.ingestion import pipelines
+from app.vectorstore.ingestion.chunking import StructuredChunker, chunk_document, content_hash
+
+POLICY = [
+    (
+        "NGÂN HÀNG ABC\n"
+        "Chương I\n"
+        "Điều 1. Phạm vi điều chỉnh\n"
+        "Quy chế này quy định việc chi tiêu nội bộ. Áp dụng cho toàn bộ nhân viên\n"
+        "của ngân hàng trên toàn quốc.\n"
+        "Điều 2. Hạn mức\n"
+        "Hạng mục | Hạn mức\n"
+        "Ăn trưa | 50.000\n"
+        "Trang 1",
+        1,
+    ),
+    (
+        "NGÂN HÀNG ABC\n"
+        "Điều 3. Hiệu lực\n"
+        + "Quy chế có hiệu lực kể từ ngày ký ban hành. " * 30
+        + "\nTrang 2",
+        2,
+    ),
+]
+
+
+def test_chunks_follow_sections_pages_and_budget() -> None:
+    chunks = chunk_document(POLICY, max_tokens=64, overlap_tokens=16)
+    assert [c.index for c in chunks] == list(range(len(chunks)))
+    assert all(c.token_count <= 64 for c in chunks)
+    by_section = {c.section: c for c in chunks}
+    assert by_section["Điều 1. Phạm vi điều chỉnh"].content.startswith("NGÂN HÀNG ABC\nChương I\nĐiều 1.")
+    assert "nhân viên của ngân hàng" in by_section["Điều 1. Phạm vi điều chỉnh"].content
+    assert by_section["Điều 2. Hạn mức"].content.endswith("Ăn trưa | 50.000\nTrang 1")
+    article3 = [c for c in chunks if c.section == "Điều 3. Hiệu lực"]
+    assert len(article3) > 1 and all(c.page_start == c.page_end == 2 for c in article3)
+    # Two pages aren't enough to tell a running header from content.
+    assert article3[-1].content.endswith("Trang 2")
+
+
+def test_running_headers_need_several_pages_and_spare_headings_and_rows() -> None:
+    pages = [
+        (f"Ngân hàng ABC - Quy chế chi tiêu\nĐiều {n}\nNội dung điều {n} của quy chế.\nTổng | {n * 100}\n- {n} -", n)
+        for n in range(1, 5)
+    ]
+    content = "\n".join(c.content for c in chunk_document(pages, max_tokens=512))
+    # Header and page number: kept on pages 1-2, dropped from the third page on.
+    assert content.count("Ngân hàng ABC") == 2
+    assert "- 2 -" in content and "- 3 -" not in content and "- 4 -" not in content
+    # Headings and table rows at the page edges all survive, numbers included.
+    assert all(f"Điều {n}" in content and f"Tổng | {n * 100}" in content for n in range(1, 5))
+
+
+def test_chunking_is_deterministic_and_hash_depends_on_model() -> None:
+    first = chunk_document(POLICY)
+    chunker = StructuredChunker()
+    again = chunker.feed(*POLICY[0]) + chunker.feed(*POLICY[1]) + chunker.finish()
+    assert first == again
+    assert content_hash("Điều 1.  Phạm vi", "m1") == content_hash("điều 1. phạm vi", "m1")
+    assert content_hash("Điều 1. Phạm vi", "m1") != content_hash("Điều 1. Phạm vi", "m2")
+
+
+def test_revised_document_only_embeds_changed_sections(monkeypatch) -> None:
+    table = {}  # row id -> {"hash", "vector", "live", "job"}
+    embedded = []
+
+    def chunk_state(db, doc_id, job_id):
+        return [
+            {"id": rid, "chunk_index": 0, "content_hash": r["hash"], "is_live": r["live"]}
+            for rid, r in table.items()
+            if r["live"] or r["job"] == job_id
+        ]
+
+    def insert_chunks(db, job_id, doc, rows, chunks_done, chunks_total):
+        for rid, _, digest, vector in rows:
+            table[rid] = {"hash": digest, "vector": vector, "live": False, "job": job_id}
+
+    def publish(db, job, doc, kept, staged_ids, model_id, total):
+        live = {rid for rid, _ in kept} | set(staged_ids)
+        for rid, r in table.items():
+            r["live"] = rid in live
+        return True
+
+    async def aembed_texts(texts):
+        embedded.extend(texts)
+        return [[float(len(t))] for t in texts]
+
+    monkeypatch.setattr(pipelines, "with_session", lambda fn, *a, **kw: fn(None, *a, **kw))
+    monkeypatch.setattr(pipelines, "_chunk_state", chunk_state)
+    monkeypatch.setattr(pipelines, "_stored_vectors", lambda db, hashes: {
+        r["hash"]: r["vector"] for r in table.values() if r["hash"] in hashes
+    })
+    monkeypatch.setattr(pipelines, "_insert_chunks", insert_chunks)
+    monkeypatch.setattr(pipelines, "_publish", publish)
+    monkeypatch.setattr(pipelines, "update_job", lambda db, job_id, **fields: None)
+    monkeypatch.setattr(pipelines, "is_embedding_available", lambda: True)
+    monkeypatch.setattr(pipelines, "aembed_texts", aembed_texts)
+
+    async def pieces(pages):
+        for piece in pages:
+            yield piece
+
+    def index(job_id, pages):
+        doc = {"id": "doc", "meeting_id": None, "project_id": None}
+        return asyncio.run(pipelines._index({"id": job_id}, doc, pieces(pages)))
+
+    first = index("job-1", POLICY)
+    assert first["embedded"] == first["chunks"] == len(embedded) and first["kept"] == 0
+
+    revised = [(POLICY[0][0].replace("50.000", "70.000"), 1), POLICY[1]]
+    embedded.clear()
+    second = index("job-2", revised)
+    assert second["embedded"] == 1 and "70.000" in embedded[0]
+    assert second["kept"] == second["chunks"] - 1
+    live = [r for r in table.values() if r["live"]]
+    assert len(live) == second["chunks"]
@@ -0,0 +1,90 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.llm.clients import embeddings
+from app.llm.clients.embeddings import EmbeddingProvider, LocalServerEmbeddingProvider, aembed_texts, split_batches
+
+
+def _settings(**overrides):
+    base = dict(
+        embedding_batch_size=2,
+        embedding_batch_max_chars=1000,
+        embedding_max_concurrency=4,
+        embedding_timeout_seconds=5.0,
+        embedding_max_retries=2,
+    )
+    base.update(overrides)
+    return SimpleNamespace(**base)
+
+
+class _EchoProvider(EmbeddingProvider):
+    """Returns [len(text)] per input after a random delay, so batches finish out of order."""
+
+    def __init__(self) -> None:
+        self.batches = []
+
+    def is_available(self) -> bool:
+        return True
+
+    async def aembed_batch(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(random.random() / 100)
+        return [[float(len(t))] for t in texts]
+
+    def embed_batch(self, texts):
+        return [[float(len(t))] for t in texts]
+
+
+def test_split_batches_bounds_items_and_chars() -> None:
+    texts = ["a" * 4, "b" * 4, "c" * 4, "d" * 9, "e"]
+    batches = split_batches(texts, max_items=3, max_chars=10)
+    assert [(start, [len(t) for t in batch]) for start, batch in batches] == [
+        (0, [4, 4]),
+        (2, [4]),
+        (3, [9, 1]),
+    ]
+
+
+async def test_aembed_texts_keeps_input_order_across_concurrent_batches(monkeypatch) -> None:
+    monkeypatch.setattr(embeddings, "get_settings", lambda: _settings())
+    provider = _EchoProvider()
+    texts = ["x" * n for n in range(1, 12)]
+
+    vectors = await aembed_texts(texts, provider=provider)
+
+    assert vectors == [[float(n)] for n in range(1, 12)]
+    assert len(provider.batches) == 6
+
+
+async def test_http_provider_retries_429_then_succeeds(monkeypatch) -> None:
+    monkeypatch.setattr(embeddings, "get_settings", lambda: _settings(embedding_batch_size=64))
+    monkeypatch.setattr(embeddings, "_retry_delay", lambda attempt, response: 0.0)
+    calls = {"n": 0}
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return httpx.Response(429, json={"detail": "slow down"})
+        return httpx.Response(200, json={"embeddings": [[1.0], [2.0]]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    monkeypatch.setattr(embeddings, "_get_async_client", lambda: (client, asyncio.Semaphore(4)))
+
+    vectors = await aembed_texts(["a", "b"], provider=LocalServerEmbeddingProvider("http://embed.local"))
+
+    assert vectors == [[1.0], [2.0]]
+    assert calls["n"] == 2
+    await client.aclose()
+
+
+def test_incomplete_provider_fails_at_construction() -> None:
+    class _NoParser(embeddings.HttpEmbeddingProvider):
+        def build_request(self, texts):
+            return "http://embed.invalid", {"texts": texts}, {}
+
+    with pytest.raises(TypeError, match="parse_response"):
+        _NoParser()
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+
+from app.vectorstore.ingestion import loaders
+from app.vectorstore.ingestion.extraction import ExtractionEngine, ExtractionTimeout
+
+
+def test_iter_text_runs_in_process_pool(tmp_path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("  Biên bản họp\x00 dự án  \n", encoding="utf-8")
+    engine = ExtractionEngine(max_workers=1, timeout_s=60)
+
+    async def collect():
+        return [piece async for piece in engine.iter_text(str(path), "txt")]
+
+    try:
+        assert asyncio.run(collect()) == [(loaders.extract_text(str(path), "txt"), None)]
+        assert engine.stats()["tasks"] == 1
+    finally:
+        engine.shutdown()
+
+
+def test_iter_text_times_out_and_resets_pool(tmp_path, monkeypatch) -> None:
+    engine = ExtractionEngine(max_workers=1, timeout_s=0.5)
+
+    async def hung_parser(path, file_ext):
+        return [(time.sleep, (30,))]
+
+    monkeypatch.setattr(engine, "_tasks", hung_parser)
+
+    async def collect():
+        return [piece async for piece in engine.iter_text(str(tmp_path / "big.pdf"), "pdf")]
+
+    started = time.monotonic()
+    with pytest.raises(ExtractionTimeout):
+        asyncio.run(collect())
+    assert time.monotonic() - started < 10
+    assert engine.timeouts == 1 and engine._executor is None
+
+
+def test_time_between_pieces_is_not_counted(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("Điều 1", encoding="utf-8")
+    engine = ExtractionEngine(max_workers=1, timeout_s=3)
+
+    async def three_pieces(path, file_ext):
+        return [(loaders.extract_text, (path, "txt"))] * 3
+
+    monkeypatch.setattr(engine, "_tasks", three_pieces)
+
+    async def slow_consumer():
+        await engine._call(loaders.extract_text, str(path), "txt")  # start the worker process
+        pieces = []
+        async for piece in engine.iter_text(str(path), "txt"):
+            pieces.append(piece)
+            await asyncio.sleep(1.5)  # e.g. a slow embedding API
+        return pieces
+
+    try:
+        assert asyncio.run(slow_consumer()) == [("Điều 1", None)] * 3
+        assert engine.timeouts == 0
+    finally:
+        engine.shutdown()
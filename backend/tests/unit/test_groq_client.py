@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.llm.clients import groq_client
+
+
+class _FakeCompletions:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        message = SimpleNamespace(content=f"echo:{kwargs['messages'][-1]['content']}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _settings(**overrides):
+    base = dict(
+        groq_api_key="test-key",
+        groq_model="test-model",
+        ai_temperature=0.1,
+        ai_max_tokens=64,
+        llm_timeout_seconds=5.0,
+        llm_max_concurrency=2,
+        llm_max_connections=4,
+        llm_max_retries=0,
+    )
+    base.update(overrides)
+    return SimpleNamespace(**base)
+
+
+@pytest.mark.asyncio
+async def test_achat_completion_without_key_returns_empty(monkeypatch) -> None:
+    monkeypatch.setattr(groq_client, "get_settings", lambda: _settings(groq_api_key=""))
+    assert await groq_client.achat_completion([{"role": "user", "content": "hi"}]) == ""
+
+
+@pytest.mark.asyncio
+async def test_achat_completion_caps_concurrency_and_reuses_client(monkeypatch) -> None:
+    completions = _FakeCompletions()
+    created = []
+
+    class _FakeAsyncGroq:
+        def __init__(self, **kwargs) -> None:
+            created.append(kwargs)
+            self.chat = SimpleNamespace(completions=completions)
+
+        async def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(groq_client, "get_settings", lambda: _settings())
+    monkeypatch.setattr(groq_client, "AsyncGroq", _FakeAsyncGroq)
+    monkeypatch.setattr(groq_client, "_async_clients", groq_client.weakref.WeakKeyDictionary())
+
+    results = await asyncio.gather(
+        *(groq_client.achat_completion([{"role": "user", "content": str(i)}]) for i in range(6))
+    )
+
+    assert results == [f"echo:{i}" for i in range(6)]
+    assert completions.calls == 6
+    assert completions.peak <= 2
+    assert len(created) == 1
@@ -0,0 +1,64 @@
+import asyncio
+
+from app.services import hybrid_retrieval
+from app.services.hybrid_retrieval import lexical_terms, reciprocal_rank_fusion
+from app.vectorstore.pgvector_client import ChunkFilter
+
+
+def test_lexical_terms_extracts_regulation_codes() -> None:
+    words, codes = lexical_terms("Thông tư 09/2020/TT-NHNN quy định gì về sao lưu dữ liệu?")
+    assert codes == ["09/2020/tt-nhnn"]
+    assert "gì" not in words and "về" not in words
+    assert {"thông", "tư", "09", "2020", "nhnn", "sao", "lưu", "dữ", "liệu"} <= set(words)
+    assert lexical_terms("   ") == ([], [])
+    # Hyphenated words without digits are plain words, not codes.
+    assert lexical_terms("e-banking policy")[1] == []
+
+
+def test_rrf_rewards_agreement_between_rankings() -> None:
+    vector = ["a", "b", "c", "d"]
+    lexical = ["d", "c", "x"]
+    fused = reciprocal_rank_fusion([vector, lexical], k=60)
+    keys = [key for key, _ in fused]
+    assert set(keys) == {"a", "b", "c", "d", "x"}
+    # c and d appear in both lists, so they outrank a (only first in one list).
+    assert keys.index("c") < keys.index("a") and keys.index("d") < keys.index("a")
+    assert keys[-1] == "x"
+
+    only_lexical = reciprocal_rank_fusion([[], ["p", "q"]])
+    assert [key for key, _ in only_lexical] == ["p", "q"]
+
+    weighted = reciprocal_rank_fusion([["a"], ["b"]], weights=(1.0, 2.0))
+    assert weighted[0][0] == "b"
+
+
+def test_hybrid_search_merges_legs(monkeypatch) -> None:
+    def row(doc, idx, **extra):
+        return {"id": doc, "chunk_index": idx, "title": doc, "content": "", **extra}
+
+    monkeypatch.setattr(
+        hybrid_retrieval, "_vector_leg", lambda *a: [row("d1", 0, distance=0.1), row("d2", 0, distance=0.2)]
+    )
+    monkeypatch.setattr(
+        hybrid_retrieval, "_lexical_leg", lambda *a: [row("d2", 0, lexical_score=1.5), row("d3", 4, lexical_score=0.2)]
+    )
+
+    class _Db:
+        def get_bind(self):
+            return None
+
+    rows = asyncio.run(
+        hybrid_retrieval.hybrid_search_chunks(_Db(), "09/2020/TT-NHNN", ChunkFilter(), query_vec=[0.0], top_k=10)
+    )
+    assert [(r["id"], r["chunk_index"]) for r in rows] == [("d2", 0), ("d1", 0), ("d3", 4)]
+    assert rows[0]["distance"] == 0.2 and rows[0]["lexical_score"] == 1.5
+    assert rows[2]["distance"] is None
+
+    def boom(*a):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(hybrid_retrieval, "_vector_leg", boom)
+    rows = asyncio.run(
+        hybrid_retrieval.hybrid_search_chunks(_Db(), "nhnn", ChunkFilter(), query_vec=[0.0], top_k=10)
+    )
+    assert [r["id"] for r in rows] == ["d2", "d3"]
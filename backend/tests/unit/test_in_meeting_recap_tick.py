@@ -1,8 +1,10 @@
+import asyncio
 import time
 
 from app.api.v1.websocket import in_meeting_ws
 from app.llm.chains import in_meeting_chain
 from app.services.realtime_session_store import FinalTranscriptChunk, InMeetingStreamState
+from app.services.session_event_bus import SessionEventBus
 
 
 def _chunk(seq: int, start: float, end: float, text: str) -> FinalTranscriptChunk:
@@ -129,3 +131,84 @@ def test_run_recap_tick_skips_short_window(monkeypatch) -> None:
     assert payload is None
     assert state.recap_cursor_seq == 1
     assert state.last_recap_tick_anchor == state.max_seen_time_end
+
+
+async def test_schedule_recap_tick_runs_off_consumer_and_merges(monkeypatch) -> None:
+    import threading
+
+    release = threading.Event()
+
+    def _slow_summary(_: str, meta: dict) -> dict:
+        release.wait(timeout=5)
+        meta["parse_ok"] = True
+        return {
+            "recap": "Status: async",
+            "topic": {"new_topic": True, "topic_id": "T2", "title": "Beta", "start_t": 0.0, "end_t": 40.0},
+            "intent": {"label": "NO_INTENT", "slots": {}},
+        }
+
+    published = []
+
+    async def _fake_publish(session_id: str, state: dict) -> None:
+        published.append((session_id, state))
+
+    monkeypatch.setattr(in_meeting_ws, "summarize_and_classify", _slow_summary)
+    monkeypatch.setattr(in_meeting_ws, "_publish_state_event", _fake_publish)
+
+    state = InMeetingStreamState()
+    state.rolling_window.extend([_chunk(1, 0.0, 20.0, "hello"), _chunk(2, 20.0, 40.0, "world")])
+    state.max_seen_time_end = 40.0
+    state.last_transcript_seq = 2
+    state.last_final_seq = 2
+
+    assert in_meeting_ws._schedule_recap_tick("sess-3", state, time.time()) is True
+    # While the LLM is in flight the consumer is free and a second tick is refused.
+    assert in_meeting_ws.recap_tick_pool.is_busy("sess-3")
+    assert in_meeting_ws._schedule_recap_tick("sess-3", state, time.time()) is False
+    assert state.recap_cursor_seq == 0
+
+    state.last_transcript_seq = 3  # ingestion keeps moving meanwhile
+    release.set()
+    await in_meeting_ws.recap_tick_pool.wait_idle("sess-3")
+
+    assert state.recap_cursor_seq == 2
+    assert state.current_topic_id == "T2"
+    assert published and published[0][1]["recap"] == "Status: async"
+
+
+def test_apply_recap_result_drops_stale_job() -> None:
+    state = InMeetingStreamState()
+    state.rolling_window.extend([_chunk(1, 0.0, 20.0, "hello"), _chunk(2, 20.0, 40.0, "world")])
+    state.max_seen_time_end = 40.0
+    state.last_transcript_seq = 2
+    state.last_final_seq = 2
+    job = in_meeting_ws._prepare_recap_tick("sess-4", state, time.time())
+    assert job is not None
+
+    state.recap_cursor_seq = 5  # a newer tick was merged first
+    result = {"recap": "old", "topic": {}, "intent": {}}
+    assert in_meeting_ws._apply_recap_result("sess-4", state, job, result, time.time()) is None
+    assert state.last_recap is None
+
+
+async def test_stream_worker_stands_by_while_another_worker_holds_the_lease(monkeypatch) -> None:
+    class Bus(SessionEventBus):
+        holder = "other-worker"
+
+        async def claim_consumer(self, session_id, ttl_s):
+            return self.holder is None
+
+    bus = Bus()
+    monkeypatch.setattr(in_meeting_ws, "session_bus", bus)
+    monkeypatch.setattr(in_meeting_ws, "CONSUMER_LEASE_SEC", 0.03)
+
+    await in_meeting_ws._ensure_stream_worker("lease-test")
+    assert not bus.subscribers.get("lease-test")  # no consumer here
+
+    bus.holder = None  # the other worker's lease expired
+    await asyncio.sleep(0.05)
+    assert bus.subscribers.get("lease-test")
+    worker = in_meeting_ws.stream_workers["lease-test"]
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+    assert not bus.subscribers.get("lease-test") and "lease-test" not in in_meeting_ws.stream_workers
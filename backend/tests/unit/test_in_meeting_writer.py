@@ -0,0 +1,64 @@
+import asyncio
+
+from sqlalchemy.exc import OperationalError
+
+from app.schemas.transcript import TranscriptChunkCreate
+from app.services.in_meeting_writer import WriteBehindQueue
+
+MEETING_ID = "c0000001-0000-0000-0000-000000000001"
+
+
+def _chunk(idx: int, text: str = "x") -> TranscriptChunkCreate:
+    return TranscriptChunkCreate(meeting_id=MEETING_ID, chunk_index=idx, start_time=idx, end_time=idx + 1, text=text)
+
+
+async def test_coalesces_and_flushes_on_size_threshold() -> None:
+    batches = []
+    queue = WriteBehindQueue(flush_max_items=3, writer=lambda mid, batch: batches.append(batch))
+
+    queue.enqueue_transcripts(MEETING_ID, [_chunk(1, "a"), _chunk(2)])
+    queue.enqueue_transcripts(MEETING_ID, [_chunk(1, "b")])  # same chunk_index: coalesced
+    assert batches == [] and queue.pending() == 2
+
+    queue.enqueue_topic_segment(MEETING_ID, {"topic_id": "T1", "start_t": 0.0})
+    await queue.flush(MEETING_ID)
+
+    assert len(batches) == 1
+    assert batches[0].transcripts[1].text == "b"
+    assert queue.pending() == 0
+
+
+async def test_retries_transient_errors_then_succeeds() -> None:
+    calls = {"n": 0}
+
+    def _flaky(meeting_id, batch):
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise OperationalError("INSERT", {}, Exception("connection reset"))
+
+    queue = WriteBehindQueue(writer=_flaky, retry_backoff_s=0.0)
+    queue.enqueue_topic_segment(MEETING_ID, {"topic_id": "T1", "title": "Ngân sách", "start_t": 0.0, "end_t": 30.0})
+    await queue.close_session(MEETING_ID)
+
+    assert calls["n"] == 3
+    assert queue.stats()["flushed_batches"] == 1 and queue.pending() == 0
+
+
+async def test_requeues_when_db_stays_down_and_flushes_on_interval() -> None:
+    state = {"down": True, "written": []}
+
+    def _writer(meeting_id, batch):
+        if state["down"]:
+            raise OperationalError("INSERT", {}, Exception("db down"))
+        state["written"].append(batch)
+
+    queue = WriteBehindQueue(flush_interval_s=0.0, max_retries=1, retry_backoff_s=0.0, writer=_writer)
+    queue.enqueue_transcripts(MEETING_ID, [_chunk(1)])
+    await queue.flush(MEETING_ID)
+    assert queue.pending() == 1  # kept, not lost
+
+    state["down"] = False
+    queue.enqueue_transcripts(MEETING_ID, [_chunk(2)])
+    await queue.flush_due()
+    await asyncio.sleep(0.05)
+    assert sorted(state["written"][0].transcripts) == [1, 2]
@@ -0,0 +1,147 @@
+import asyncio
+import io
+from uuid import uuid4
+
+import pytest
+
+from app.vectorstore.ingestion import pipelines
+from app.vectorstore.ingestion.chunking import chunk_document
+from app.vectorstore.ingestion.loaders import extract_text
+from app.workers import indexing_worker
+from app.workers.indexing_worker import IndexingWorker
+
+
+def test_job_progress_by_stage() -> None:
+    job = {"status": "running", "stage": "queued", "chunks_total": 0, "chunks_done": 0}
+    assert pipelines.job_progress(job) == 0.0
+    assert pipelines.job_progress({**job, "stage": "stored"}) == 0.05
+    assert pipelines.job_progress({**job, "stage": "stored", "chunks_total": 10, "chunks_done": 5}) == pytest.approx(0.525)
+    assert pipelines.job_progress({**job, "stage": "stored", "chunks_total": 500, "chunks_done": 500}) == pytest.approx(1.0)
+    assert pipelines.job_progress({**job, "status": "done", "stage": "indexed"}) == 1.0
+
+
+def test_stage_upload_and_extract_plain_text(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(pipelines, "UPLOAD_DIR", tmp_path)
+    doc_id = uuid4()
+    path = pipelines.stage_upload(io.BytesIO(("Điều 1. " * 400).encode("utf-8")), doc_id, "txt")
+    assert path == tmp_path / f"{doc_id}.txt"
+    text = extract_text(str(path), "txt")
+    assert text.startswith("Điều 1.")
+    chunks = chunk_document([(text, None)], max_tokens=128)
+    assert len(chunks) > 1 and all(c.token_count <= 128 for c in chunks)
+
+
+def _fake_db(monkeypatch, jobs, updates):
+    def claim_job(db, job_id, stale):
+        job = jobs[job_id]
+        if job["status"] != "queued":
+            return None
+        job["status"] = "running"
+        job["attempts"] += 1
+        return dict(job)
+
+    def update_job(db, job_id, **fields):
+        jobs[job_id].update(fields)
+        updates.append((job_id, fields))
+
+    monkeypatch.setattr(indexing_worker, "with_session", lambda fn, *a, **kw: fn(None, *a, **kw))
+    monkeypatch.setattr(indexing_worker, "claim_job", claim_job)
+    monkeypatch.setattr(indexing_worker, "update_job", update_job)
+    monkeypatch.setattr(indexing_worker, "pending_job_ids", lambda db, stale: [j for j, v in jobs.items() if v["status"] == "queued"])
+    monkeypatch.setattr(indexing_worker, "purge_retired_chunks", lambda db, ttl: 0)
+
+
+def test_worker_resumes_pending_jobs_and_retries_failures(monkeypatch) -> None:
+    jobs = {
+        "ok": {"id": "ok", "status": "queued", "attempts": 0},
+        "flaky": {"id": "flaky", "status": "queued", "attempts": 0},
+        "broken": {"id": "broken", "status": "queued", "attempts": 0},
+    }
+    updates = []
+    _fake_db(monkeypatch, jobs, updates)
+
+    async def run_job(job):
+        if job["id"] == "broken" or (job["id"] == "flaky" and job["attempts"] == 1):
+            raise RuntimeError(f"{job['id']} failed")
+        jobs[job["id"]]["status"] = "done"
+
+    monkeypatch.setattr(indexing_worker, "run_job", run_job)
+
+    async def scenario():
+        worker = IndexingWorker(concurrency=2, max_attempts=2, retry_backoff_s=0.01)
+        worker.start()  # picks up all three queued jobs from the "DB"
+        for _ in range(100):
+            if all(j["status"] in ("done", "failed") for j in jobs.values()):
+                break
+            await asyncio.sleep(0.01)
+        await worker.stop()
+        return worker
+
+    worker = asyncio.run(scenario())
+    assert jobs["ok"]["status"] == "done"
+    assert jobs["flaky"]["status"] == "done" and jobs["flaky"]["attempts"] == 2
+    assert jobs["broken"]["status"] == "failed" and "broken failed" in jobs["broken"]["error"]
+    assert worker.completed == 2 and worker.failed == 1
+
+
+def test_worker_hands_job_back_on_shutdown(monkeypatch) -> None:
+    jobs = {"slow": {"id": "slow", "status": "queued", "attempts": 0}}
+    updates = []
+    _fake_db(monkeypatch, jobs, updates)
+    started = None
+
+    async def run_job(job):
+        started.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(indexing_worker, "run_job", run_job)
+
+    async def scenario():
+        nonlocal started
+        started = asyncio.Event()
+        worker = IndexingWorker(concurrency=1)
+        worker.start()
+        await asyncio.wait_for(started.wait(), 1)
+        await worker.stop()
+
+    asyncio.run(scenario())
+    assert jobs["slow"]["status"] == "queued"
+
+
+def test_bulk_reindex_throttles_and_stops_when_done(monkeypatch) -> None:
+    docs = {f"d{i}": "stale" for i in range(5)}
+    active = []
+    peak = 0
+
+    def candidates(db, model_id, since, force, limit):
+        return [{"id": d, "file_type": "pdf"} for d, s in docs.items() if s == "stale"][:limit]
+
+    def queue(db, doc_id, file_type):
+        nonlocal peak
+        docs[doc_id] = "queued"
+        active.append(doc_id)
+        peak = max(peak, len(active))
+        return f"job-{doc_id}"
+
+    class Worker:
+        def submit(self, job_id):
+            # The job "runs" right away and publishes the document.
+            docs[active.pop()] = "done"
+
+    monkeypatch.setattr(indexing_worker, "with_session", lambda fn, *a, **kw: fn(None, *a, **kw))
+    monkeypatch.setattr(indexing_worker, "database_now", lambda db: "t0")
+    monkeypatch.setattr(indexing_worker, "active_job_count", lambda db: len(active))
+    monkeypatch.setattr(indexing_worker, "count_reindex_candidates", lambda db, m, s, f: sum(v == "stale" for v in docs.values()))
+    monkeypatch.setattr(indexing_worker, "reindex_candidates", candidates)
+    monkeypatch.setattr(indexing_worker, "queue_reindex_job", queue)
+
+    async def scenario():
+        reindexer = indexing_worker.BulkReindexer(Worker(), max_in_flight=1, pause_s=0, poll_s=0.01)
+        assert reindexer.start()
+        assert not reindexer.start()  # already running
+        await asyncio.wait_for(reindexer._task, 2)
+        return reindexer.status()
+
+    status = asyncio.run(scenario())
+    assert set(docs.values()) == {"done"} and peak == 1
+    assert status["queued"] == 5 and status["remaining"] == 0 and not status["running"] and status["error"] is None
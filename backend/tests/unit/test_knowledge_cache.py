@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+from app.llm.clients.embeddings import EmbeddingProvider
+from app.services.knowledge_cache import QueryEmbeddingCache, SemanticAnswerCache, normalize_query
+
+
+class _CountingProvider(EmbeddingProvider):
+    name = "counting"
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def is_available(self) -> bool:
+        return True
+
+    async def aembed_batch(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_batch(self, texts):
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def test_query_embedding_cache_hits_on_normalized_query() -> None:
+    provider = _CountingProvider()
+    cache = QueryEmbeddingCache(max_entries=8, ttl_s=60)
+
+    async def run():
+        first = await cache.aembed("  Data   Retention Policy ", provider=provider)
+        second = await cache.aembed("data retention policy", provider=provider)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert provider.calls == [["data retention policy"]]
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+    assert normalize_query("A\x00  b\n") == "a b"
+
+
+def test_query_embedding_cache_evicts_lru_and_expires() -> None:
+    cache = QueryEmbeddingCache(max_entries=2, ttl_s=60)
+    cache.put(("p", "a"), [1.0])
+    cache.put(("p", "b"), [2.0])
+    assert cache.get(("p", "a")) == [1.0]  # "a" is now most recent
+    cache.put(("p", "c"), [3.0])
+    assert cache.get(("p", "b")) is None
+    assert cache.get(("p", "a")) == [1.0]
+
+    expiring = QueryEmbeddingCache(max_entries=2, ttl_s=1e-9)
+    expiring.put(("p", "a"), [1.0])
+    assert expiring.get(("p", "a")) is None
+
+
+def test_answer_cache_requires_similar_query_and_same_chunks() -> None:
+    cache = SemanticAnswerCache(max_entries_per_scope=4, ttl_s=60, threshold=0.95)
+    scope = cache.scope_key("m1", None, 5)
+    chunks = frozenset({("doc-1", 0), ("doc-2", 3)})
+    cache.store(scope, [1.0, 0.0], chunks, "answer")
+
+    assert cache.lookup(scope, [0.99, 0.05], chunks) == "answer"
+    assert cache.lookup(scope, [0.0, 1.0], chunks) is None  # different question
+    assert cache.lookup(scope, [1.0, 0.0], frozenset({("doc-1", 0)})) is None  # context changed
+    assert cache.lookup(cache.scope_key("m2", None, 5), [1.0, 0.0], chunks) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+
+def test_answer_cache_invalidation_by_scope() -> None:
+    cache = SemanticAnswerCache(max_entries_per_scope=4, ttl_s=60, threshold=0.9)
+    chunks = frozenset({("doc", 0)})
+    scopes = {
+        "global": cache.scope_key(None, None, 5),
+        "m1": cache.scope_key("m1", None, 5),
+        "m2": cache.scope_key("m2", None, 5),
+        "p1": cache.scope_key(None, "p1", 5),
+    }
+    for scope in scopes.values():
+        cache.store(scope, [1.0], chunks, "x")
+
+    cache.invalidate(meeting_id="m1")
+    assert cache.lookup(scopes["global"], [1.0], chunks) is None
+    assert cache.lookup(scopes["m1"], [1.0], chunks) is None
+    assert cache.lookup(scopes["m2"], [1.0], chunks) == "x"
+    assert cache.lookup(scopes["p1"], [1.0], chunks) == "x"
+
+    cache.invalidate_all()
+    assert cache.stats()["size"] == 0
+
+
+def test_query_embedding_cache_is_keyed_by_model_and_thread_safe() -> None:
+    class _Model(_CountingProvider):
+        def __init__(self, model: str) -> None:
+            super().__init__()
+            self.model = model
+
+        @property
+        def model_id(self) -> str:
+            return f"counting:{self.model}"
+
+    cache = QueryEmbeddingCache(max_entries=16, ttl_s=60)
+    small, large = _Model("small"), _Model("large")
+    asyncio.run(cache.aembed("q", provider=small))
+    asyncio.run(cache.aembed("q", provider=large))
+    assert len(large.calls) == 1  # same provider name, different vector space
+
+    def hammer(i: int) -> None:
+        for n in range(200):
+            cache.put(("p", f"{i}:{n}"), [float(n)])
+            cache.get(("p", f"{i}:{n - 1}"))
+
+    threads = [threading.Thread(target=hammer, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats()["size"] == 16
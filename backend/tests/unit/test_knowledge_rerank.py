@@ -0,0 +1,44 @@
+import asyncio
+
+from app.services.knowledge_rerank import CrossEncoderReranker, select_within_budget
+
+
+def test_select_within_budget_keeps_best_that_fit() -> None:
+    scores = [0.1, 0.9, 0.5, 0.7]
+    tokens = [10, 60, 50, 30]
+    assert select_within_budget(scores, tokens, top_n=3, token_budget=100) == [1, 3, 0]
+    assert select_within_budget(scores, tokens, top_n=1, token_budget=100) == [1]
+    # The best chunk is kept even when it alone exceeds the budget.
+    assert select_within_budget(scores, tokens, top_n=3, token_budget=20) == [1]
+
+
+class _Model:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, pairs, show_progress_bar=False):
+        self.calls.append(len(pairs))
+        return [float(len(text)) for _, text in pairs]
+
+
+def test_rerank_batches_caches_and_trims(monkeypatch) -> None:
+    reranker = CrossEncoderReranker("test-model", enabled=True, batch_size=2, top_n=2, token_budget=100)
+    model = _Model()
+    reranker._model = model
+    monkeypatch.setattr(reranker, "is_available", lambda: True)
+    chunks = [{"key": ("d", i), "text": "x " * n} for i, n in enumerate((3, 9, 1, 6, 2))]
+
+    kept = asyncio.run(reranker.rerank("Hạn mức?", chunks))
+    assert [c["key"] for c in kept] == [("d", 1), ("d", 3)]
+    assert kept[0]["rerank_score"] > kept[1]["rerank_score"]
+    assert model.calls == [2, 2, 1]
+
+    # Same query (after normalization): every pair comes from the cache.
+    asyncio.run(reranker.rerank("  hạn mức? ", chunks))
+    assert model.calls == [2, 2, 1] and reranker.hits == 5
+    reranker.shutdown()
+
+
+def test_rerank_passes_through_when_disabled() -> None:
+    chunks = [{"key": 1, "text": "a"}, {"key": 2, "text": "b"}]
+    assert asyncio.run(CrossEncoderReranker("m", enabled=False).rerank("q", chunks)) is chunks
@@ -0,0 +1,55 @@
+import time
+
+from app.vectorstore import light_rag
+from app.vectorstore.light_rag import LightRAGRetriever
+
+
+def _row(doc, distance, chunk_index=0, tags=None):
+    return {"id": doc, "title": doc, "content": f"{doc} text", "chunk_index": chunk_index, "tags": tags or [], "distance": distance}
+
+
+class _Client:
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.rows = {
+            "meeting": [_row("m1", 0.40)],
+            "project": [_row("m1", 0.40), _row("p1", 0.30, tags=["risk"])],
+            "global": [_row("g1", 0.10), _row("g2", 0.60)],
+        }
+
+    def search(self, query_vec, filters, *, top_k, per_document, timeout_ms):
+        bucket = "meeting" if filters.meeting_id else "project" if filters.project_id else "global"
+        assert per_document and (bucket != "global" or filters.unscoped)
+        time.sleep(self.delays.get(bucket, 0))
+        return self.rows[bucket][:top_k]
+
+
+def _retriever(monkeypatch, client, **kw):
+    monkeypatch.setattr(light_rag, "is_embedding_available", lambda: True)
+    monkeypatch.setattr(LightRAGRetriever, "_embed", staticmethod(lambda q: [0.1, 0.2]))
+    return LightRAGRetriever(client=client, **kw)
+
+
+def test_buckets_follow_scope() -> None:
+    assert [n for n, _ in LightRAGRetriever.buckets(None, None)] == ["global"]
+    names = [n for n, _ in LightRAGRetriever.buckets("m", "p")]
+    assert names == ["meeting", "project", "global"]
+
+
+def test_merge_boosts_buckets_and_dedups(monkeypatch) -> None:
+    retriever = _retriever(monkeypatch, _Client(), limit=3)
+    hits = retriever.retrieve("rủi ro latency", meeting_id="m", project_id="p", topic_id="risk")
+    # m1: 0.60 + meeting boost beats its project copy; p1: 0.70 + project + topic; g1: 0.90 unboosted.
+    assert [(h["doc_id"], h["bucket"]) for h in hits] == [("p1", "project"), ("g1", "global"), ("m1", "meeting")]
+    assert hits[0]["score"] == 0.95 and hits[0]["topic_id"] == "risk"
+    assert retriever.stats()["partial"] == 0
+
+
+def test_slow_bucket_is_dropped_at_deadline(monkeypatch) -> None:
+    retriever = _retriever(monkeypatch, _Client(delays={"global": 0.5}))
+    started = time.monotonic()
+    hits = retriever.retrieve("q", meeting_id="m", project_id="p", budget_ms=100)
+    assert time.monotonic() - started < 0.4
+    assert {h["bucket"] for h in hits} == {"meeting", "project"}
+    assert retriever.stats()["missed"] == {"global": 1}
+    retriever.shutdown()
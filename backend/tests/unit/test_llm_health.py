@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.llm.clients import llm_health as llm_health_module
+from app.llm.clients.llm_health import LLMHealthMonitor
+
+
+def _settings(**overrides):
+    base = dict(
+        groq_api_key="test-key",
+        llm_health_probe_interval_seconds=60.0,
+        llm_health_ttl_seconds=180.0,
+        llm_circuit_failure_threshold=3,
+        llm_circuit_open_seconds=30.0,
+    )
+    base.update(overrides)
+    return SimpleNamespace(**base)
+
+
+def test_no_api_key_reports_down(monkeypatch) -> None:
+    monkeypatch.setattr(llm_health_module, "get_settings", lambda: _settings(groq_api_key=""))
+    assert LLMHealthMonitor().is_available() is False
+
+
+def test_circuit_opens_after_consecutive_failures(monkeypatch) -> None:
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(llm_health_module, "get_settings", lambda: _settings())
+    monkeypatch.setattr(llm_health_module.time, "time", lambda: clock["now"])
+    monitor = LLMHealthMonitor()
+
+    assert monitor.is_available() is True  # unknown -> optimistic
+    monitor.record_failure("boom")
+    monitor.record_failure("boom")
+    assert monitor.is_available() is True
+    monitor.record_failure("boom")
+    assert monitor.is_available() is False
+    assert monitor.snapshot()["circuit_open"] is True
+
+    clock["now"] += 31.0
+    assert monitor.is_available() is True  # half-open trial allowed
+    monitor.record_failure("still down")
+    assert monitor.is_available() is False
+
+    clock["now"] += 31.0
+    monitor.record_success()
+    assert monitor.is_available() is True
+    assert monitor.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_probe_once_updates_cached_state(monkeypatch) -> None:
+    monkeypatch.setattr(llm_health_module, "get_settings", lambda: _settings(llm_circuit_failure_threshold=1))
+    calls = {"n": 0}
+
+    async def _failing_probe() -> None:
+        calls["n"] += 1
+        raise RuntimeError("unreachable")
+
+    monitor = LLMHealthMonitor(probe=_failing_probe)
+    assert await monitor.probe_once() is False
+    assert monitor.is_available() is False
+    # Reads never trigger another probe.
+    monitor.is_available()
+    assert calls["n"] == 1
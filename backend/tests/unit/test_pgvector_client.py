@@ -0,0 +1,77 @@
+import struct
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from pgvector.utils import from_db_binary
+
+from app.vectorstore.pgvector_client import ChunkFilter, ChunkRow, as_vector, encode_copy_binary
+
+
+def test_chunk_filter_compiles_typed_conditions() -> None:
+    assert ChunkFilter().to_sql() == ("kc.is_live", {})
+    assert ChunkFilter(live_only=False).to_sql() == ("true", {})
+
+    clause, params = ChunkFilter(meeting_id="m1", source="NHNN", tags=("policy",), document_ids=[]).to_sql()
+    assert clause.split(" AND ") == [
+        "kc.is_live",
+        "kc.scope_meeting = CAST(:f_meeting_id AS uuid)",
+        "kc.document_id = ANY(CAST(:f_document_ids AS uuid[]))",
+        "kd.source = :f_source",
+        "kd.tags && CAST(:f_tags AS text[])",
+    ]
+    assert params == {"f_meeting_id": "m1", "f_document_ids": [], "f_source": "NHNN", "f_tags": ["policy"]}
+
+
+def _fields(payload: bytes, count: int):
+    """Decode the tuples of a binary COPY payload into raw field bytes (None for NULL)."""
+    assert payload.startswith(b"PGCOPY\n\xff\r\n\x00")
+    pos = 19
+    tuples = []
+    while True:
+        (n,) = struct.unpack_from(">h", payload, pos)
+        pos += 2
+        if n == -1:
+            break
+        assert n == count
+        fields = []
+        for _ in range(n):
+            (size,) = struct.unpack_from(">i", payload, pos)
+            pos += 4
+            if size < 0:
+                fields.append(None)
+            else:
+                fields.append(payload[pos : pos + size])
+                pos += size
+        tuples.append(fields)
+    assert pos == len(payload)
+    return tuples
+
+
+def test_copy_payload_uses_binary_vectors() -> None:
+    row = ChunkRow(
+        id=str(uuid4()),
+        document_id=str(uuid4()),
+        chunk_index=3,
+        content="Điều 1. Phạm vi",
+        embedding=[0.25, -1.5, 3.0],
+        content_hash="abc",
+        page=2,
+        is_live=False,
+    )
+    [fields] = _fields(encode_copy_binary([row]), 14)
+    assert fields[0] == bytes.fromhex(row.id.replace("-", ""))
+    assert struct.unpack(">i", fields[2])[0] == 3
+    assert fields[3].decode("utf-8") == "Điều 1. Phạm vi"
+    assert np.array_equal(from_db_binary(fields[4]), np.array([0.25, -1.5, 3.0], dtype=np.float32))
+    assert fields[5] is None and fields[6] is None  # no meeting/project scope
+    assert struct.unpack(">i", fields[7])[0] == 2 and fields[8] is None
+    assert fields[13] == b"\x00"
+
+
+def test_as_vector_rejects_bad_shapes() -> None:
+    assert as_vector([1, 2]).dtype == np.float32
+    with pytest.raises(ValueError):
+        as_vector([])
+    with pytest.raises(ValueError):
+        as_vector([[1.0], [2.0]])
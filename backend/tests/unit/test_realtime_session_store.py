@@ -0,0 +1,100 @@
+import threading
+from typing import Any, Dict, Optional
+
+from app.services import realtime_session_store
+from app.services.realtime_session_snapshot import SessionSnapshotBackend
+from app.services.realtime_session_store import (
+    FinalTranscriptChunk,
+    RealtimeSessionStore,
+    session_from_dict,
+    session_to_dict,
+)
+
+
+class _DictBackend(SessionSnapshotBackend):
+    persistent = True
+
+    def __init__(self) -> None:
+        self.data: Dict[str, Dict[str, Any]] = {}
+
+    def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        self.data[session_id] = data
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return self.data.get(session_id)
+
+    def delete(self, session_id: str) -> None:
+        self.data.pop(session_id, None)
+
+
+def _chunk(seq: int) -> FinalTranscriptChunk:
+    return FinalTranscriptChunk(seq=seq, time_start=seq, time_end=seq + 1, speaker="A", lang="vi", confidence=1.0, text=f"t{seq}")
+
+
+def test_session_round_trip_keeps_chunk_identity() -> None:
+    store = RealtimeSessionStore()
+    session = store.ensure("s1")
+    state = session.stream_state
+    for seq in (1, 2):
+        chunk = _chunk(seq)
+        state.final_stream.append(chunk)
+        state.final_by_seq[seq] = chunk
+        state.rolling_window.append(chunk)
+    state.recap_cursor_seq = 2
+    store.append_transcript("s1", "hello")
+
+    restored = session_from_dict(session_to_dict(session))
+    assert restored.transcript_buffer == "hello"
+    assert restored.stream_state.recap_cursor_seq == 2
+    assert restored.stream_state.final_by_seq[2] is restored.stream_state.final_stream[1]
+    assert restored.stream_state.rolling_window[0] is restored.stream_state.final_stream[0]
+
+
+def test_evict_idle_snapshots_then_restores_on_get() -> None:
+    backend = _DictBackend()
+    store = RealtimeSessionStore(backend=backend, idle_ttl_s=10)
+    store.ensure("idle").last_activity_s = 100.0
+    store.ensure("busy").last_activity_s = 195.0
+    store.next_state_version("idle")
+    store.get("idle").last_activity_s = 100.0
+
+    assert store.evict_idle(now=200.0) == ["idle"]
+    assert len(store) == 1
+    assert backend.data["idle"]["state_version"] == 1
+
+    restored = store.get("idle")
+    assert restored is not None and restored.state_version == 1
+    assert store.get("idle") is restored
+
+
+def test_memory_backend_evicts_without_snapshot() -> None:
+    store = RealtimeSessionStore(idle_ttl_s=10)
+    store.ensure("s").last_activity_s = 0.0
+    assert store.evict_idle(now=100.0) == ["s"]
+    assert store.get("s") is None
+
+
+async def test_sweep_serializes_and_evicts_on_the_loop_thread(monkeypatch) -> None:
+    class _FlakyBackend(_DictBackend):
+        fail = True
+
+        def save(self, session_id, data):
+            if self.fail:
+                self.fail = False
+                raise OSError("redis down")
+            super().save(session_id, data)
+
+    backend = _FlakyBackend()
+    store = RealtimeSessionStore(backend=backend, idle_ttl_s=10)
+    store.ensure("idle").last_activity_s = 1.0
+    on_loop = []
+    real_to_dict = session_to_dict
+
+    def to_dict(sess):
+        on_loop.append(threading.current_thread() is threading.main_thread())
+        return real_to_dict(sess)
+
+    monkeypatch.setattr(realtime_session_store, "session_to_dict", to_dict)
+    assert await store.sweep_once() == []  # save failed: kept, not re-serialized off the loop
+    assert await store.sweep_once() == ["idle"]
+    assert on_loop == [True, True] and "idle" in backend.data
@@ -0,0 +1,41 @@
+from app.services.realtime_timeline import FinalChunkLog, SpeakerTimeline
+
+
+def test_final_chunk_log_is_bounded_and_spills_oldest() -> None:
+    log = FinalChunkLog(max_chunks=3)
+    for seq in range(1, 6):
+        log.append(seq)
+
+    assert list(log) == [3, 4, 5]
+    assert log.pending_spill() == 2
+    assert log.unspilled() == [1, 2, 3, 4, 5]
+    assert log.take_spill() == [1, 2]
+    assert log.spilled == 2 and log.pending_spill() == 0
+
+
+def test_final_chunk_log_drops_when_spill_is_never_drained() -> None:
+    log = FinalChunkLog(max_chunks=2)
+    for seq in range(10):
+        log.append(seq)
+    assert len(log) == 2 and log.pending_spill() == 2
+    assert log.dropped == 6
+
+
+def test_speaker_timeline_keeps_start_order_and_best_overlap() -> None:
+    timeline = SpeakerTimeline()
+    timeline.add("B", 5.0, 9.0)
+    timeline.add("A", 0.0, 6.0, 0.5)
+    timeline.add("C", 9.0, 12.0)
+
+    assert [seg["speaker"] for seg in timeline.to_list()] == ["A", "B", "C"]
+    assert timeline.best_match(4.0, 8.0)["speaker"] == "B"
+    assert timeline.best_match(20.0, 21.0) is None
+    assert [seg["speaker"] for seg in timeline.overlapping(5.5, 9.5)] == ["A", "B", "C"]
+
+
+def test_speaker_timeline_trims_oldest_segments() -> None:
+    timeline = SpeakerTimeline(max_segments=8)
+    for i in range(20):
+        timeline.add("S", float(i), float(i) + 1.0)
+    assert len(timeline) <= 9
+    assert timeline.to_list()[-1]["start"] == 19.0
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.services.session_event_bus import RedisStreamSessionEventBus, SessionEventBus
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+async def _drain(queue: asyncio.Queue, count: int) -> list:
+    return [await asyncio.wait_for(queue.get(), timeout=2) for _ in range(count)]
+
+
+async def test_memory_bus_seq_is_monotonic_per_session() -> None:
+    bus = SessionEventBus()
+    queue = await bus.subscribe("s1")
+    await bus.publish("s1", {"event": "a"})
+    await bus.publish("s2", {"event": "b"})
+    await bus.publish("s1", {"event": "c"})
+    events = await _drain(queue, 2)
+    assert [e["seq"] for e in events] == [1, 2]
+
+
+async def test_redis_bus_fans_out_across_processes_in_seq_order() -> None:
+    server = fakeredis.FakeServer()
+    # Two bus instances sharing one Redis emulate two uvicorn workers.
+    worker_a = RedisStreamSessionEventBus(fakeredis.FakeAsyncRedis(server=server), block_ms=50)
+    worker_b = RedisStreamSessionEventBus(fakeredis.FakeAsyncRedis(server=server), block_ms=50)
+
+    frontend_queue = await worker_b.subscribe("sess")
+
+    env1 = await worker_a.publish("sess", {"event": "transcript_event", "payload": {"chunk": "xin chao"}})
+    env2 = await worker_b.publish("sess", {"event": "state", "payload": {"recap": "ok"}})
+    env3 = await worker_a.publish("sess", {"event": "transcript_event", "payload": {"chunk": "tiep"}})
+    assert [env1["seq"], env2["seq"], env3["seq"]] == [1, 2, 3]
+
+    events = await _drain(frontend_queue, 3)
+    assert [e["seq"] for e in events] == [1, 2, 3]
+    assert events[0]["payload"]["chunk"] == "xin chao"
+    assert all(e["session_id"] == "sess" for e in events)
+
+    worker_b.unsubscribe("sess", frontend_queue)
+    assert "sess" not in worker_b._readers
+    await worker_a.close()
+    await worker_b.close()
+
+
+async def test_redis_bus_consumer_lease_has_one_holder() -> None:
+    server = fakeredis.FakeServer()
+    worker_a = RedisStreamSessionEventBus(fakeredis.FakeAsyncRedis(server=server))
+    worker_b = RedisStreamSessionEventBus(fakeredis.FakeAsyncRedis(server=server))
+
+    assert await worker_a.claim_consumer("sess", ttl_s=30)
+    assert not await worker_b.claim_consumer("sess", ttl_s=30)
+    assert await worker_a.claim_consumer("sess", ttl_s=30)  # renewal
+    await worker_b.release_consumer("sess")  # not the holder: no effect
+    assert not await worker_b.claim_consumer("sess", ttl_s=30)
+    await worker_a.release_consumer("sess")
+    assert await worker_b.claim_consumer("sess", ttl_s=30)
+    await worker_a.close()
+    await worker_b.close()
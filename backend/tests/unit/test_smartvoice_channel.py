@@ -0,0 +1,100 @@
+import asyncio
+
+import grpc
+import pytest
+
+from app.core.config import get_settings
+from app.services import smartvoice_channel as sc
+
+
+@pytest.fixture
+def auth_settings(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "smartvoice_access_token", "")
+    monkeypatch.setattr(settings, "smartvoice_auth_url", "https://auth.example/token")
+    monkeypatch.setattr(settings, "smartvoice_token_id", "id")
+    monkeypatch.setattr(settings, "smartvoice_token_key", "key")
+    return settings
+
+
+def test_token_expiry_sources() -> None:
+    assert sc.token_expiry({"expires_in": 600}, "t", 1000.0, 50.0) == 1600.0
+    assert sc.token_expiry({"data": {"token": "t", "expires_at": 5000}}, "t", 1000.0, 50.0) == 5000.0
+    jwt = "e30.eyJleHAiOiAzMDAwfQ.sig"  # payload {"exp": 3000}
+    assert sc.token_expiry({"access_token": jwt}, jwt, 1000.0, 50.0) == 3000.0
+    assert sc.token_expiry({"access_token": "opaque"}, "opaque", 1000.0, 50.0) == 1050.0
+
+
+def test_token_cache_single_flight_and_stale_fallback(auth_settings, monkeypatch) -> None:
+    cache = sc.SmartVoiceTokenCache(refresh_margin_s=60.0, default_ttl_s=3000.0)
+    now = [1000.0]
+    monkeypatch.setattr(sc.time, "time", lambda: now[0])
+    calls = []
+
+    async def fetch():
+        calls.append(now[0])
+        await asyncio.sleep(0)
+        if len(calls) > 1:
+            raise RuntimeError("auth down")
+        return "tok", now[0] + 600.0
+
+    monkeypatch.setattr(cache, "_fetch", fetch)
+
+    async def run():
+        tokens = await asyncio.gather(*(cache.get() for _ in range(5)))
+        assert tokens == ["tok"] * 5 and len(calls) == 1
+        now[0] = 1560.0  # inside the refresh margin: refresh fails, cached token is still valid
+        assert await cache.get() == "tok"
+        now[0] = 1700.0  # expired and refresh fails
+        with pytest.raises(RuntimeError):
+            await cache.get()
+
+    asyncio.run(run())
+    assert cache.fetches == 1
+
+
+def _rpc_error(code: grpc.StatusCode) -> grpc.aio.AioRpcError:
+    return grpc.aio.AioRpcError(code, grpc.aio.Metadata(), grpc.aio.Metadata(), details=code.name)
+
+
+def test_call_retries_unavailable_and_reauths_once(monkeypatch) -> None:
+    manager = sc.SmartVoiceChannelManager(max_retries=2, retry_backoff_s=0.0)
+    monkeypatch.setattr(manager, "channel", lambda: "channel")
+    invalidated = []
+    monkeypatch.setattr(manager.tokens, "invalidate", lambda: invalidated.append(True))
+
+    async def metadata():
+        return [("authorization", "Bearer t")]
+
+    monkeypatch.setattr(manager, "metadata", metadata)
+    failures = [grpc.StatusCode.UNAUTHENTICATED, grpc.StatusCode.UNAVAILABLE]
+
+    async def call(channel, md):
+        assert channel == "channel" and md
+        if failures:
+            raise _rpc_error(failures.pop(0))
+        return "ok"
+
+    assert asyncio.run(manager.call(call)) == "ok"
+    assert invalidated == [True] and manager.retries == 2
+
+    async def always_unavailable(channel, md):
+        raise _rpc_error(grpc.StatusCode.UNAVAILABLE)
+
+    with pytest.raises(grpc.aio.AioRpcError):
+        asyncio.run(manager.call(always_unavailable))
+    assert manager.retries == 4  # max_retries, then the error propagates
+
+    async def invalid(channel, md):
+        raise _rpc_error(grpc.StatusCode.INVALID_ARGUMENT)
+
+    with pytest.raises(grpc.aio.AioRpcError):
+        asyncio.run(manager.call(invalid))
+    assert manager.retries == 4
+
+
+def test_keepalive_pings_only_during_calls() -> None:
+    options = dict(sc.SmartVoiceChannelManager(keepalive_s=30.0)._options())
+    assert options["grpc.keepalive_time_ms"] == 30_000
+    assert options["grpc.keepalive_permit_without_calls"] == 0
+    assert "grpc.http2.max_pings_without_data" not in options  # keep gRPC's default cap
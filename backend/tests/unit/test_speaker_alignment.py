@@ -0,0 +1,50 @@
+from app.services.realtime_timeline import SpeakerTimeline
+from app.services.speaker_alignment import align_speakers, best_overlap
+
+DIAR = [
+    {"speaker": "A", "start": 0.0, "end": 4.0},
+    {"speaker": "B", "start": 4.0, "end": 10.0},
+    {"speaker": "A", "start": 10.0, "end": 12.0},
+]
+
+
+def test_picks_max_overlap_not_first_overlap() -> None:
+    # Overlaps A for 1s and B for 4s: the old first-match merge returned A.
+    out = align_speakers([{"time_start": 3.0, "time_end": 8.0, "text": "x"}], DIAR)
+    assert out[0]["speaker"] == "B"
+
+
+def test_keeps_input_order_and_default_speaker() -> None:
+    segments = [
+        {"time_start": 10.5, "time_end": 11.0, "text": "late"},
+        {"time_start": 0.5, "time_end": 1.0, "text": "early"},
+        {"time_start": 50.0, "time_end": 51.0, "text": "silence"},
+    ]
+    out = align_speakers(segments, DIAR, default_speaker="UNKNOWN")
+    assert [(s["text"], s["speaker"]) for s in out] == [("late", "A"), ("early", "A"), ("silence", "UNKNOWN")]
+
+
+def test_splits_on_speaker_change_using_word_timings() -> None:
+    seg = {
+        "time_start": 2.0,
+        "time_end": 6.0,
+        "text": "xin chao cac ban",
+        "words": [
+            {"word": "xin", "start_time": 2.0, "end_time": 2.5},
+            {"word": "chao", "start_time": 2.6, "end_time": 3.5},
+            {"word": "cac", "start_time": 4.2, "end_time": 4.8},
+            {"word": "ban", "start_time": 5.0, "end_time": 6.0},
+        ],
+    }
+    out = align_speakers([seg], DIAR, split_on_speaker_change=True)
+    assert [(s["speaker"], s["text"], s["time_start"], s["time_end"]) for s in out] == [
+        ("A", "xin chao", 2.0, 3.5),
+        ("B", "cac ban", 4.2, 6.0),
+    ]
+
+
+def test_best_overlap_uses_timeline_index_or_list() -> None:
+    timeline = SpeakerTimeline(DIAR)
+    assert best_overlap(timeline, 3.0, 8.0)["speaker"] == "B"
+    assert best_overlap(DIAR, 3.0, 8.0)["speaker"] == "B"
+    assert best_overlap(DIAR, 30.0, 31.0) is None
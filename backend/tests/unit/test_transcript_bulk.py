@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pytest
+
+from app.schemas.transcript import TranscriptChunkCreate
+from app.services import transcript_service
+
+MEETING_ID = "c0000001-0000-0000-0000-000000000001"
+
+
+class _FakeCursor:
+    def close(self) -> None:
+        pass
+
+
+class _FakeDB:
+    def __init__(self) -> None:
+        self.commits = 0
+        self.rollbacks = 0
+
+    def connection(self):
+        return type("Conn", (), {"connection": type("Raw", (), {"cursor": lambda self: _FakeCursor()})()})()
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+def _chunk(idx: int, text: str = "x") -> TranscriptChunkCreate:
+    return TranscriptChunkCreate(
+        meeting_id=MEETING_ID, chunk_index=idx, start_time=float(idx), end_time=idx + 1.0, text=text
+    )
+
+
+def _record_pages(monkeypatch):
+    pages = []
+
+    def _fake_execute_values(cursor, sql, rows, template=None, page_size=100, fetch=False):
+        pages.append(rows)
+        return [(f"id-{row[2]}", row[2], datetime(2024, 1, 1)) for row in rows]
+
+    monkeypatch.setattr(transcript_service, "execute_values", _fake_execute_values)
+    return pages
+
+
+def test_bulk_upsert_streams_pages_in_one_transaction(monkeypatch) -> None:
+    pages = _record_pages(monkeypatch)
+    db = _FakeDB()
+
+    written = transcript_service.bulk_upsert_transcript_chunks(
+        db, MEETING_ID, (_chunk(i) for i in range(1, 1201)), page_size=500
+    )
+
+    assert written == 1200
+    assert [len(p) for p in pages] == [500, 500, 200]
+    assert db.commits == 1
+
+
+def test_batch_create_dedupes_keys_within_a_page(monkeypatch) -> None:
+    pages = _record_pages(monkeypatch)
+    db = _FakeDB()
+
+    result = transcript_service.create_batch_transcript_chunks(
+        db, MEETING_ID, [_chunk(1, "old"), _chunk(2), _chunk(1, "new")]
+    )
+
+    assert len(pages) == 1 and len(pages[0]) == 2
+    assert {c.chunk_index: c.text for c in result.chunks} == {1: "new", 2: "x"}
+    assert result.chunks[0].id == "id-1"
+
+
+def test_bulk_upsert_rolls_back_on_failure(monkeypatch) -> None:
+    def _boom(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(transcript_service, "execute_values", _boom)
+    db = _FakeDB()
+    with pytest.raises(RuntimeError):
+        transcript_service.bulk_upsert_transcript_chunks(db, MEETING_ID, [_chunk(1)])
+    assert db.rollbacks == 1 and db.commits == 0
@@ -0,0 +1,11 @@
+-- Snapshots of live in-meeting session state (REALTIME_SESSION_BACKEND=postgres)
+-- Lets a restarted / different backend worker resume a running meeting.
+
+CREATE TABLE IF NOT EXISTS realtime_session_snapshot (
+    session_id TEXT PRIMARY KEY,
+    data JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_realtime_session_snapshot_updated_at
+    ON realtime_session_snapshot (updated_at);
@@ -0,0 +1,45 @@
+-- One row per (meeting_id, chunk_index) so bulk transcript ingest can upsert
+-- (reprocessing a video / re-ending a meeting must not duplicate chunks).
+-- Existing duplicates are collapsed first: the latest row per key is kept and
+-- references to the other rows are moved onto it.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_indexes
+        WHERE tablename = 'transcript_chunk' AND indexname = 'uq_transcript_chunk_meeting_index'
+    ) THEN
+        CREATE TEMP TABLE transcript_chunk_dupes ON COMMIT DROP AS
+        SELECT id, keep_id
+        FROM (
+            SELECT id,
+                   first_value(id) OVER (
+                       PARTITION BY meeting_id, chunk_index
+                       ORDER BY created_at DESC NULLS LAST, id DESC
+                   ) AS keep_id
+            FROM transcript_chunk
+            WHERE meeting_id IS NOT NULL AND chunk_index IS NOT NULL
+        ) ranked
+        WHERE id <> keep_id;
+
+        IF EXISTS (SELECT 1 FROM transcript_chunk_dupes) THEN
+            RAISE NOTICE 'transcript_chunk: removing % duplicate (meeting_id, chunk_index) rows',
+                (SELECT count(*) FROM transcript_chunk_dupes);
+            UPDATE live_recap_snapshot t SET from_chunk_id = d.keep_id
+                FROM transcript_chunk_dupes d WHERE t.from_chunk_id = d.id;
+            UPDATE live_recap_snapshot t SET to_chunk_id = d.keep_id
+                FROM transcript_chunk_dupes d WHERE t.to_chunk_id = d.id;
+            UPDATE action_item t SET source_chunk_id = d.keep_id
+                FROM transcript_chunk_dupes d WHERE t.source_chunk_id = d.id;
+            UPDATE decision_item t SET source_chunk_id = d.keep_id
+                FROM transcript_chunk_dupes d WHERE t.source_chunk_id = d.id;
+            UPDATE risk_item t SET source_chunk_id = d.keep_id
+                FROM transcript_chunk_dupes d WHERE t.source_chunk_id = d.id;
+            -- transcript_embedding rows of the removed chunks go with them (ON DELETE CASCADE).
+            DELETE FROM transcript_chunk c USING transcript_chunk_dupes d WHERE c.id = d.id;
+        END IF;
+
+        CREATE UNIQUE INDEX uq_transcript_chunk_meeting_index
+            ON transcript_chunk (meeting_id, chunk_index);
+    END IF;
+END $$;
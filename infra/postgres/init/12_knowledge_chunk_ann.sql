@@ -0,0 +1,35 @@
+-- Scoped vector search filters on knowledge_chunk.scope_meeting / scope_project
+-- directly (instead of COALESCE(kd.meeting_id, kc.scope_meeting)), so the btree
+-- scope indexes and per-project partial ANN indexes are usable. Copy the document
+-- scope onto its chunks; the app keeps them in step on upload/update.
+UPDATE knowledge_chunk kc
+SET scope_meeting = COALESCE(kd.meeting_id, kc.scope_meeting),
+    scope_project = COALESCE(kd.project_id, kc.scope_project)
+FROM knowledge_document kd
+WHERE kc.document_id = kd.id
+  AND (
+      (kd.meeting_id IS NOT NULL AND kc.scope_meeting IS DISTINCT FROM kd.meeting_id)
+      OR (kd.project_id IS NOT NULL AND kc.scope_project IS DISTINCT FROM kd.project_id)
+  );
+
+-- Replace the ivfflat index (lists = 100, trained on whatever rows existed at init)
+-- with HNSW when pgvector supports it (>= 0.5.0). HNSW needs no training data and
+-- keeps recall as the corpus grows. Rebuild/tune later with:
+--   python -m app.vectorstore.ann_index rebuild
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_am WHERE amname = 'hnsw')
+       AND NOT EXISTS (
+           SELECT 1 FROM pg_indexes
+           WHERE tablename = 'knowledge_chunk' AND indexname = 'idx_chunk_embedding'
+             AND indexdef ILIKE '%USING hnsw%'
+       ) THEN
+        DROP INDEX IF EXISTS idx_chunk_embedding;
+        CREATE INDEX idx_chunk_embedding ON knowledge_chunk
+            USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+    ELSIF NOT EXISTS (SELECT 1 FROM pg_am WHERE amname = 'hnsw') THEN
+        RAISE NOTICE 'pgvector < 0.5.0: keeping ivfflat idx_chunk_embedding';
+    END IF;
+END $$;
+
+ANALYZE knowledge_chunk;
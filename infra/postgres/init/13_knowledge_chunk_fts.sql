@@ -0,0 +1,23 @@
+-- Lexical leg of hybrid knowledge retrieval (app/services/hybrid_retrieval.py).
+-- Vietnamese text is matched diacritic-insensitively ("quy dinh" finds "quy định",
+-- "đ" folds to "d") via unaccent; regulation numbers like "09/2020/TT-NHNN" are
+-- matched as substrings through a trigram index on the same normalized text.
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- unaccent() is only STABLE (it depends on search_path); pin the dictionary so the
+-- wrapper can be IMMUTABLE and used in generated columns and index expressions.
+CREATE OR REPLACE FUNCTION meetmate_unaccent(text)
+RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+
+ALTER TABLE knowledge_chunk
+    ADD COLUMN IF NOT EXISTS content_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, meetmate_unaccent(lower(content)))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_chunk_content_tsv
+    ON knowledge_chunk USING gin (content_tsv);
+
+CREATE INDEX IF NOT EXISTS idx_chunk_content_trgm
+    ON knowledge_chunk USING gin (meetmate_unaccent(lower(content)) gin_trgm_ops);
@@ -0,0 +1,21 @@
+-- Background ingestion jobs for knowledge documents (app/vectorstore/ingestion/pipelines.py).
+-- stage records the last completed step (queued -> stored -> indexed) so a
+-- failed or interrupted job resumes where it stopped; updated_at doubles as a heartbeat.
+CREATE TABLE IF NOT EXISTS knowledge_ingest_job (
+    id UUID PRIMARY KEY,
+    document_id UUID NOT NULL REFERENCES knowledge_document(id) ON DELETE CASCADE,
+    status TEXT NOT NULL DEFAULT 'queued',   -- queued | running | done | failed
+    stage TEXT NOT NULL DEFAULT 'queued',    -- queued | stored | indexed
+    file_type TEXT,
+    staging_path TEXT,                       -- uploaded file on local disk until stored and indexed
+    chunks_total INT NOT NULL DEFAULT 0,
+    chunks_done INT NOT NULL DEFAULT 0,
+    attempts INT NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_ingest_job_document ON knowledge_ingest_job(document_id);
+CREATE INDEX IF NOT EXISTS idx_ingest_job_pending ON knowledge_ingest_job(updated_at)
+    WHERE status IN ('queued', 'running');
@@ -0,0 +1,10 @@
+-- Structure-aware chunks (app/vectorstore/ingestion/chunking.py): page range and
+-- section for citations, and a content hash (embedded text + embedding model id)
+-- so identical chunks in any document reuse the stored vector instead of being
+-- embedded again. `page` and `section` already exist from 04_knowledge_rag.sql.
+ALTER TABLE knowledge_chunk ADD COLUMN IF NOT EXISTS page_end INT;
+ALTER TABLE knowledge_chunk ADD COLUMN IF NOT EXISTS token_count INT;
+ALTER TABLE knowledge_chunk ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_chunk_content_hash
+    ON knowledge_chunk(content_hash) WHERE content_hash IS NOT NULL;
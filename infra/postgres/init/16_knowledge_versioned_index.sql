@@ -0,0 +1,19 @@
+-- Versioned, incremental (re)indexing of knowledge documents (app/vectorstore/ingestion/pipelines.py).
+-- An ingestion job stages its new chunks (is_live = false, ingest_job_id = job) while
+-- searches keep reading the live set (WHERE kc.is_live); `_publish` then swaps in one
+-- transaction: unchanged chunks (same content_hash) stay, staged ones go live and the
+-- rest are tombstoned (retired_at) until purged.
+ALTER TABLE knowledge_chunk ADD COLUMN IF NOT EXISTS is_live BOOLEAN NOT NULL DEFAULT true;
+ALTER TABLE knowledge_chunk ADD COLUMN IF NOT EXISTS retired_at TIMESTAMPTZ;
+ALTER TABLE knowledge_chunk ADD COLUMN IF NOT EXISTS ingest_job_id UUID;
+
+ALTER TABLE knowledge_document ADD COLUMN IF NOT EXISTS index_version INT NOT NULL DEFAULT 0;
+ALTER TABLE knowledge_document ADD COLUMN IF NOT EXISTS indexed_at TIMESTAMPTZ;
+-- Embedding model id of the live chunks; NULL/different ones are picked up by a bulk reindex.
+ALTER TABLE knowledge_document ADD COLUMN IF NOT EXISTS embedding_model TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_chunk_staged ON knowledge_chunk(ingest_job_id)
+    WHERE NOT is_live AND retired_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_chunk_retired ON knowledge_chunk(retired_at)
+    WHERE retired_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ingest_job_document_created ON knowledge_ingest_job(document_id, created_at);
@@ -18,6 +18,7 @@ from models.diarization_model import DiarizationModel
 from models.transcription_model import TranscriptionModel
 from models.speaker_embedding_model import SpeakerEmbeddingModel
 from utils.audio_utils import convert_audio_to_16khz_mono
+from utils.speaker_alignment import align_speakers
 
 # ============================================================================
 # App Configuration
@@ -305,34 +306,14 @@ def merge_transcription_with_diarization(
     """
     Merge transcription segments với diarization segments
     
-    Simple overlap-based matching
+    Max-overlap sweep (utils.speaker_alignment), không còn quét O(n·m)
     """
-    merged = []
-    
-    for trans_seg in transcription_segments:
-        trans_start = trans_seg["start"]
-        trans_end = trans_seg["end"]
-        
-        # Find overlapping diarization segment
-        best_speaker = None
-        max_overlap = 0
-        
-        for dia_seg in diarization_segments:
-            # Calculate overlap
-            overlap_start = max(trans_start, dia_seg["start"])
-            overlap_end = min(trans_end, dia_seg["end"])
-            overlap = max(0, overlap_end - overlap_start)
-            
-            if overlap > max_overlap:
-                max_overlap = overlap
-                best_speaker = dia_seg["speaker"]
-        
-        merged.append({
-            **trans_seg,
-            "speaker": best_speaker
-        })
-    
-    return merged
+    return align_speakers(
+        transcription_segments,
+        diarization_segments,
+        start_key="start",
+        end_key="end",
+    )
 
 
 # ============================================================================
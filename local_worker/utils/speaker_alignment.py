@@ -0,0 +1,131 @@
+"""
+Speaker attribution: align transcript segments with diarization segments.
+
+One sweep over both timelines sorted by start time (O((n + m) log m) plus the
+overlapping pairs) instead of scanning every diarization segment for every
+transcript segment. Each transcript segment gets the speaker with the largest
+total overlap; with `split_on_speaker_change`, segments carrying word timings
+are split where the best speaker changes between words.
+
+Copy of backend/app/services/speaker_alignment.py (this worker is deployed
+on its own and cannot import the backend package) - keep the two in sync.
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Segment = Dict[str, Any]
+
+
+def _word_bounds(word: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    start = word.get("start_time", word.get("start"))
+    end = word.get("end_time", word.get("end"))
+    if start is None or end is None:
+        return None, None
+    return float(start), float(end)
+
+
+def _best_speaker(active: Iterable[Tuple[float, float, str]], t_start: float, t_end: float) -> Optional[str]:
+    totals: Dict[str, float] = {}
+    for start, end, speaker in active:
+        overlap = min(t_end, end) - max(t_start, start)
+        if overlap > 0:
+            totals[speaker] = totals.get(speaker, 0.0) + overlap
+    if not totals:
+        return None
+    return max(totals.items(), key=lambda item: item[1])[0]
+
+
+def best_overlap(segments: Any, t_start: float, t_end: float) -> Optional[Segment]:
+    """
+    Single lookup: the diarization segment overlapping [t_start, t_end] the most.
+    Uses the bisect index when given a `SpeakerTimeline`; falls back to a scan for plain lists.
+    """
+    best_match = getattr(segments, "best_match", None)
+    if best_match is not None:
+        return best_match(t_start, t_end)
+    best = None
+    best_len = 0.0
+    for seg in segments or []:
+        overlap = min(t_end, seg["end"]) - max(t_start, seg["start"])
+        if overlap > best_len:
+            best_len = overlap
+            best = seg
+    return best
+
+
+def _split_by_words(seg: Segment, words: List[Dict[str, Any]], speakers: List[Optional[str]], default: Optional[str], start_key: str, end_key: str) -> List[Segment]:
+    pieces: List[Segment] = []
+    current: Optional[Segment] = None
+    for word, speaker in zip(words, speakers):
+        speaker = speaker or (current["speaker"] if current else None) or default
+        w_start, w_end = _word_bounds(word)
+        text = (word.get("word") or word.get("text") or "").strip()
+        if current is None or speaker != current["speaker"]:
+            current = {**seg, "speaker": speaker, start_key: w_start, end_key: w_end, "text": text, "words": [word]}
+            pieces.append(current)
+        else:
+            current[end_key] = w_end
+            current["text"] = f"{current['text']} {text}".strip()
+            current["words"].append(word)
+    return pieces
+
+
+def align_speakers(
+    transcript_segments: Sequence[Segment],
+    diarization_segments: Iterable[Segment],
+    *,
+    start_key: str = "time_start",
+    end_key: str = "time_end",
+    default_speaker: Optional[str] = None,
+    split_on_speaker_change: bool = False,
+    words_key: str = "words",
+) -> List[Segment]:
+    """
+    Return copies of `transcript_segments` (input order) with a "speaker" key.
+
+    Diarization segments are dicts with "speaker", "start", "end". Transcript
+    segments without any overlapping speaker get `default_speaker`.
+    """
+    diar = sorted(
+        (float(d["start"]), float(d["end"]), d["speaker"]) for d in diarization_segments if d.get("speaker") is not None
+    )
+    order = sorted(range(len(transcript_segments)), key=lambda i: float(transcript_segments[i].get(start_key) or 0.0))
+
+    results: List[List[Segment]] = [[] for _ in transcript_segments]
+    active: List[Tuple[float, float, str]] = []  # heap by end time
+    j = 0
+    for i in order:
+        seg = transcript_segments[i]
+        t_start = float(seg.get(start_key) or 0.0)
+        t_end = float(seg.get(end_key) or t_start)
+        words = seg.get(words_key) if split_on_speaker_change else None
+        # Word timings can run slightly past the segment bounds.
+        if words:
+            bounds = [b for b in (_word_bounds(w) for w in words) if b[0] is not None]
+            if bounds:
+                t_start = min(t_start, min(b[0] for b in bounds))
+                t_end = max(t_end, max(b[1] for b in bounds))
+        while j < len(diar) and diar[j][0] < t_end:
+            heapq.heappush(active, (diar[j][1], diar[j][0], diar[j][2]))
+            j += 1
+        # Starts are visited in order, so anything ending before this start is done for good.
+        while active and active[0][0] <= t_start:
+            heapq.heappop(active)
+        candidates = [(start, end, speaker) for end, start, speaker in active]
+
+        if words and len(candidates) > 1:
+            speakers = []
+            for word in words:
+                w_start, w_end = _word_bounds(word)
+                speakers.append(None if w_start is None else _best_speaker(candidates, w_start, max(w_end, w_start + 1e-3)))
+            if len({s for s in speakers if s}) > 1:
+                fallback = _best_speaker(candidates, t_start, t_end) or default_speaker
+                results[i] = _split_by_words(seg, words, speakers, fallback, start_key, end_key)
+                continue
+
+        speaker = _best_speaker(candidates, t_start, t_end) if t_end > t_start else _best_speaker(candidates, t_start, t_start + 1e-3)
+        results[i] = [{**seg, "speaker": speaker or default_speaker}]
+
+    return [piece for pieces in results for piece in pieces]